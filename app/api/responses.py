@@ -0,0 +1,62 @@
+from collections.abc import Mapping
+from typing import Any
+
+from fastapi.responses import JSONResponse, Response
+from pydantic import BaseModel
+from starlette.background import BackgroundTask
+from starlette.types import Receive, Scope, Send
+
+
+class ModelResponse(Response):
+    """JSON response for a response model the service already built from trusted rows.
+
+    Returning a Response makes FastAPI skip re-validating the body against the route's
+    `response_model`, which stays declared so the OpenAPI schema is unchanged. The route
+    returns before its function-scoped DB session closes, so the model is only rendered when
+    the response is sent: pydantic-core serializes it straight to bytes and a plain Response
+    carrying those bytes goes out, with no pool connection held while it renders.
+    """
+
+    media_type = "application/json"
+
+    def __init__(
+        self,
+        content: Any,
+        status_code: int = 200,
+        headers: Mapping[str, str] | None = None,
+        media_type: str | None = None,
+        background: BackgroundTask | None = None,
+    ) -> None:
+        self.content = content
+        super().__init__(
+            status_code=status_code,
+            headers=headers,
+            media_type=media_type,
+            background=background,
+        )
+
+    def to_response(self) -> Response:
+        if isinstance(self.content, BaseModel):
+            response = Response(
+                self.content.__pydantic_serializer__.to_json(self.content),
+                self.status_code,
+                media_type=self.media_type,
+                background=self.background,
+            )
+        else:
+            response = JSONResponse(
+                self.content,
+                self.status_code,
+                media_type=self.media_type,
+                background=self.background,
+            )
+        # Route and dependency headers (cookies included); the body sets its own length/type.
+        response.headers.raw.extend(
+            (key, value)
+            for key, value in self.headers.raw
+            if key not in {b"content-length", b"content-type"}
+        )
+        return response
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await self.to_response()(scope, receive, send)
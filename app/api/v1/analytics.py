@@ -0,0 +1,74 @@
+from datetime import date
+
+from fastapi import APIRouter, Depends, Query
+
+from app.api.responses import ModelResponse
+from app.core.dependencies import get_analytics_service
+from app.schemas.analytics import (
+    RoomDailyUsageResponse,
+    RoomOccupancyResponse,
+    ScriptMonthlyUsageResponse,
+    StoreDmWorkloadResponse,
+)
+from app.services.analytics_service import AnalyticsService
+
+router = APIRouter(prefix="/stores/{store_id}/analytics")
+
+
+@router.get("/room-hours", response_model=RoomDailyUsageResponse)
+async def get_room_daily_usage(
+    store_id: int,
+    date_from: date = Query(alias="from"),
+    date_to: date = Query(alias="to"),
+    service: AnalyticsService = Depends(get_analytics_service),
+) -> ModelResponse:
+    return ModelResponse(
+        await service.get_room_daily_usage(
+            store_id=store_id,
+            date_from=date_from,
+            date_to=date_to,
+        )
+    )
+
+
+@router.get("/room-occupancy", response_model=RoomOccupancyResponse)
+async def get_room_occupancy(
+    store_id: int,
+    date_from: date = Query(alias="from"),
+    date_to: date = Query(alias="to"),
+    open_hours_per_day: int = Query(default=12, ge=1, le=24),
+    service: AnalyticsService = Depends(get_analytics_service),
+) -> ModelResponse:
+    return ModelResponse(
+        await service.get_room_occupancy(
+            store_id=store_id,
+            date_from=date_from,
+            date_to=date_to,
+            open_hours_per_day=open_hours_per_day,
+        )
+    )
+
+
+@router.get("/script-bookings", response_model=ScriptMonthlyUsageResponse)
+async def get_script_monthly_usage(
+    store_id: int,
+    date_from: date = Query(alias="from"),
+    date_to: date = Query(alias="to"),
+    service: AnalyticsService = Depends(get_analytics_service),
+) -> ModelResponse:
+    return ModelResponse(
+        await service.get_script_monthly_usage(
+            store_id=store_id,
+            date_from=date_from,
+            date_to=date_to,
+        )
+    )
+
+
+@router.get("/dm-workload", response_model=StoreDmWorkloadResponse)
+async def get_store_dm_workload(
+    store_id: int,
+    month: date = Query(),
+    service: AnalyticsService = Depends(get_analytics_service),
+) -> ModelResponse:
+    return ModelResponse(await service.get_store_dm_workload(store_id=store_id, month=month))
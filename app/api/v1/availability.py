@@ -0,0 +1,80 @@
+from datetime import date
+
+from fastapi import APIRouter, Depends, Query
+from pydantic import AwareDatetime
+
+from app.api.responses import ModelResponse
+from app.core.dependencies import get_availability_service
+from app.schemas.availability import (
+    AvailabilityResponse,
+    HeatmapResponse,
+    OccupancyMaskResponse,
+    SuggestionResponse,
+)
+from app.services.availability_service import AvailabilityService
+
+router = APIRouter(prefix="/stores/{store_id}")
+
+
+@router.get("/availability", response_model=AvailabilityResponse)
+async def get_availability(
+    store_id: int,
+    script_id: int = Query(ge=1),
+    start_from: AwareDatetime = Query(alias="from"),
+    start_to: AwareDatetime = Query(alias="to"),
+    step: int = Query(default=30, ge=5, le=240),
+    service: AvailabilityService = Depends(get_availability_service),
+) -> ModelResponse:
+    return ModelResponse(
+        await service.get_availability(
+            store_id=store_id,
+            script_id=script_id,
+            start_from=start_from,
+            start_to=start_to,
+            step_minutes=step,
+        )
+    )
+
+
+@router.get("/suggestions", response_model=SuggestionResponse)
+async def get_suggestions(
+    store_id: int,
+    script_id: int = Query(ge=1),
+    start_from: AwareDatetime = Query(alias="from"),
+    start_to: AwareDatetime = Query(alias="to"),
+    step: int = Query(default=30, ge=5, le=240),
+    service: AvailabilityService = Depends(get_availability_service),
+) -> ModelResponse:
+    return ModelResponse(
+        await service.get_suggestions(
+            store_id=store_id,
+            script_id=script_id,
+            start_from=start_from,
+            start_to=start_to,
+            step_minutes=step,
+        )
+    )
+
+
+@router.get("/occupancy", response_model=OccupancyMaskResponse)
+async def get_occupancy(
+    store_id: int,
+    date_from: date = Query(alias="from"),
+    date_to: date = Query(alias="to"),
+    service: AvailabilityService = Depends(get_availability_service),
+) -> ModelResponse:
+    return ModelResponse(
+        await service.get_occupancy(store_id=store_id, date_from=date_from, date_to=date_to)
+    )
+
+
+@router.get("/heatmap", response_model=HeatmapResponse)
+async def get_heatmap(
+    store_id: int,
+    month: date = Query(),
+    bucket: int = Query(default=30, ge=15, le=1440),
+    service: AvailabilityService = Depends(get_availability_service),
+) -> ModelResponse:
+    return ModelResponse(
+        await service.get_heatmap(store_id=store_id, month=month, bucket_minutes=bucket)
+    )
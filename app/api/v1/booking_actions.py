@@ -1,13 +1,26 @@
 from datetime import date
 
 from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+from pydantic import AwareDatetime
 
-from app.core.dependencies import get_booking_service
-from app.schemas.booking import BookingItem, BookingListResponse, ConfirmBookingRequest
+from app.api.responses import ModelResponse
+from app.core.dependencies import get_booking_export_service, get_booking_service
+from app.schemas.booking import (
+    BookingExportFormat,
+    BookingItem,
+    BookingListResponse,
+    ConfirmBookingRequest,
+)
 from app.services.booking_service import BookingService
 
 router = APIRouter(prefix="/stores/{store_id}/bookings")
 
+EXPORT_MEDIA_TYPES = {
+    BookingExportFormat.CSV: "text/csv; charset=utf-8",
+    BookingExportFormat.NDJSON: "application/x-ndjson",
+}
+
 
 @router.get("", response_model=BookingListResponse)
 async def list_bookings(
@@ -18,15 +31,39 @@ async def list_bookings(
     limit: int = Query(default=20, ge=1, le=100),
     offset: int = Query(default=0, ge=0),
     service: BookingService = Depends(get_booking_service),
-) -> BookingListResponse:
+) -> ModelResponse:
     target_month_value = target_month.isoformat() if target_month else None
-    return await service.list_bookings(
+    return ModelResponse(
+        await service.list_bookings(
+            store_id=store_id,
+            booking_status_id=booking_status_id,
+            target_month=target_month_value,
+            has_conflict=has_conflict,
+            limit=limit,
+            offset=offset,
+        )
+    )
+
+
+@router.get("/export", response_class=StreamingResponse)
+async def export_bookings(
+    store_id: int,
+    start_from: AwareDatetime | None = Query(default=None, alias="from"),
+    start_to: AwareDatetime | None = Query(default=None, alias="to"),
+    export_format: BookingExportFormat = Query(default=BookingExportFormat.CSV, alias="format"),
+    service: BookingService = Depends(get_booking_export_service),
+) -> StreamingResponse:
+    chunks = await service.export_bookings(
         store_id=store_id,
-        booking_status_id=booking_status_id,
-        target_month=target_month_value,
-        has_conflict=has_conflict,
-        limit=limit,
-        offset=offset,
+        start_from=start_from,
+        start_to=start_to,
+        export_format=export_format,
+    )
+    filename = f"store-{store_id}-bookings.{export_format.value}"
+    return StreamingResponse(
+        chunks,
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
     )
 
 
@@ -35,8 +72,8 @@ async def get_booking(
     store_id: int,
     booking_id: int,
     service: BookingService = Depends(get_booking_service),
-) -> BookingItem:
-    return await service.get_booking(store_id=store_id, booking_id=booking_id)
+) -> ModelResponse:
+    return ModelResponse(await service.get_booking(store_id=store_id, booking_id=booking_id))
 
 
 @router.post("/{booking_id}/confirm", response_model=BookingItem)
@@ -45,8 +82,10 @@ async def confirm_booking(
     booking_id: int,
     payload: ConfirmBookingRequest,
     service: BookingService = Depends(get_booking_service),
-) -> BookingItem:
-    return await service.confirm_booking(store_id=store_id, booking_id=booking_id, payload=payload)
+) -> ModelResponse:
+    return ModelResponse(
+        await service.confirm_booking(store_id=store_id, booking_id=booking_id, payload=payload)
+    )
 
 
 @router.post("/{booking_id}/cancel", response_model=BookingItem)
@@ -54,8 +93,8 @@ async def cancel_booking(
     store_id: int,
     booking_id: int,
     service: BookingService = Depends(get_booking_service),
-) -> BookingItem:
-    return await service.cancel_booking(store_id=store_id, booking_id=booking_id)
+) -> ModelResponse:
+    return ModelResponse(await service.cancel_booking(store_id=store_id, booking_id=booking_id))
 
 
 @router.post("/{booking_id}/complete", response_model=BookingItem)
@@ -63,5 +102,5 @@ async def complete_booking(
     store_id: int,
     booking_id: int,
     service: BookingService = Depends(get_booking_service),
-) -> BookingItem:
-    return await service.complete_booking(store_id=store_id, booking_id=booking_id)
+) -> ModelResponse:
+    return ModelResponse(await service.complete_booking(store_id=store_id, booking_id=booking_id))
@@ -1,5 +1,6 @@
 from fastapi import APIRouter, Depends, Response, status
 
+from app.api.responses import ModelResponse
 from app.core.dependencies import (
     get_booking_service,
     get_character_client_match_service,
@@ -28,8 +29,10 @@ async def add_booking_client(
     booking_id: int,
     payload: AddBookingClientRequest,
     service: BookingService = Depends(get_booking_service),
-) -> BookingItem:
-    return await service.add_booking_client(store_id=store_id, booking_id=booking_id, payload=payload)
+) -> ModelResponse:
+    return ModelResponse(
+        await service.add_booking_client(store_id=store_id, booking_id=booking_id, payload=payload)
+    )
 
 
 @router.delete("/clients/{client_id}", response_model=BookingItem)
@@ -38,11 +41,13 @@ async def remove_booking_client(
     booking_id: int,
     client_id: int,
     service: BookingService = Depends(get_booking_service),
-) -> BookingItem:
-    return await service.remove_booking_client(
-        store_id=store_id,
-        booking_id=booking_id,
-        client_id=client_id,
+) -> ModelResponse:
+    return ModelResponse(
+        await service.remove_booking_client(
+            store_id=store_id,
+            booking_id=booking_id,
+            client_id=client_id,
+        )
     )
 
 
@@ -1,7 +1,15 @@
 from fastapi import APIRouter, Depends, Query, Response, status
 
-from app.core.dependencies import get_client_service
-from app.schemas.client import ClientItem, ClientListResponse, CreateClientRequest, UpdateClientRequest
+from app.api.responses import ModelResponse
+from app.core.dependencies import ActorContext, get_actor_context, get_client_service
+from app.schemas.client import (
+    ClientBookingListResponse,
+    ClientItem,
+    ClientListResponse,
+    ClientSearchResponse,
+    CreateClientRequest,
+    UpdateClientRequest,
+)
 from app.services.client_service import ClientService
 
 router = APIRouter(prefix="/clients")
@@ -12,8 +20,8 @@ async def list_clients(
     limit: int = Query(default=20, ge=1, le=100),
     offset: int = Query(default=0, ge=0),
     service: ClientService = Depends(get_client_service),
-) -> ClientListResponse:
-    return await service.list_clients(limit=limit, offset=offset)
+) -> ModelResponse:
+    return ModelResponse(await service.list_clients(limit=limit, offset=offset))
 
 
 @router.post("", response_model=ClientItem, status_code=status.HTTP_201_CREATED)
@@ -24,6 +32,15 @@ async def create_client(
     return await service.create_client(payload=payload)
 
 
+@router.get("/search", response_model=ClientSearchResponse)
+async def search_clients(
+    q: str = Query(min_length=1, max_length=100),
+    limit: int = Query(default=20, ge=1, le=50),
+    service: ClientService = Depends(get_client_service),
+) -> ModelResponse:
+    return ModelResponse(await service.search_clients(q=q, limit=limit))
+
+
 @router.get("/{client_id}", response_model=ClientItem)
 async def get_client(
     client_id: int,
@@ -32,6 +49,24 @@ async def get_client(
     return await service.get_client(client_id=client_id)
 
 
+@router.get("/{client_id}/bookings", response_model=ClientBookingListResponse)
+async def list_client_bookings(
+    client_id: int,
+    limit: int = Query(default=20, ge=1, le=100),
+    cursor: str | None = Query(default=None, max_length=200),
+    actor: ActorContext = Depends(get_actor_context),
+    service: ClientService = Depends(get_client_service),
+) -> ModelResponse:
+    return ModelResponse(
+        await service.list_client_bookings(
+            client_id=client_id,
+            allowed_store_ids=actor.allowed_store_ids,
+            limit=limit,
+            cursor=cursor,
+        )
+    )
+
+
 @router.patch("/{client_id}", response_model=ClientItem)
 async def update_client(
     client_id: int,
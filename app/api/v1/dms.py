@@ -1,13 +1,19 @@
+from datetime import date
+
 from fastapi import APIRouter, Depends, Query, Response, status
+from pydantic import AwareDatetime
 
-from app.core.dependencies import get_dm_service
+from app.api.responses import ModelResponse
+from app.core.dependencies import ActorContext, get_actor_context, get_dm_service
 from app.schemas.dm import (
     CreateDmRequest,
     CreateDmStoreMembershipRequest,
+    DmFreeBusyResponse,
     DmItem,
     DmListResponse,
     DmStoreMembershipItem,
     DmStoreMembershipListResponse,
+    DmWorkloadResponse,
     UpdateDmRequest,
 )
 from app.services.dm_service import DmService
@@ -20,8 +26,8 @@ async def list_dms(
     limit: int = Query(default=20, ge=1, le=100),
     offset: int = Query(default=0, ge=0),
     service: DmService = Depends(get_dm_service),
-) -> DmListResponse:
-    return await service.list_dms(limit=limit, offset=offset)
+) -> ModelResponse:
+    return ModelResponse(await service.list_dms(limit=limit, offset=offset))
 
 
 @router.post("", response_model=DmItem, status_code=status.HTTP_201_CREATED)
@@ -58,14 +64,50 @@ async def delete_dm(
     return Response(status_code=status.HTTP_204_NO_CONTENT)
 
 
+@router.get("/{dm_id}/workload", response_model=DmWorkloadResponse)
+async def get_dm_workload(
+    dm_id: int,
+    month: date = Query(),
+    actor: ActorContext = Depends(get_actor_context),
+    service: DmService = Depends(get_dm_service),
+) -> ModelResponse:
+    return ModelResponse(
+        await service.get_dm_workload(
+            dm_id=dm_id,
+            month=month,
+            allowed_store_ids=actor.allowed_store_ids,
+        )
+    )
+
+
+@router.get("/{dm_id}/free-busy", response_model=DmFreeBusyResponse)
+async def get_dm_free_busy(
+    dm_id: int,
+    start_from: AwareDatetime = Query(alias="from"),
+    start_to: AwareDatetime = Query(alias="to"),
+    actor: ActorContext = Depends(get_actor_context),
+    service: DmService = Depends(get_dm_service),
+) -> ModelResponse:
+    return ModelResponse(
+        await service.get_dm_free_busy(
+            dm_id=dm_id,
+            start_from=start_from,
+            start_to=start_to,
+            allowed_store_ids=actor.allowed_store_ids,
+        )
+    )
+
+
 @router.get("/{dm_id}/stores", response_model=DmStoreMembershipListResponse)
 async def list_dm_store_memberships(
     dm_id: int,
     limit: int = Query(default=20, ge=1, le=100),
     offset: int = Query(default=0, ge=0),
     service: DmService = Depends(get_dm_service),
-) -> DmStoreMembershipListResponse:
-    return await service.list_dm_store_memberships(dm_id=dm_id, limit=limit, offset=offset)
+) -> ModelResponse:
+    return ModelResponse(
+        await service.list_dm_store_memberships(dm_id=dm_id, limit=limit, offset=offset)
+    )
 
 
 @router.post("/{dm_id}/stores", response_model=DmStoreMembershipItem, status_code=status.HTTP_201_CREATED)
@@ -1,5 +1,6 @@
 from fastapi import APIRouter, Depends, status
 
+from app.api.responses import ModelResponse
 from app.core.dependencies import get_booking_service
 from app.schemas.booking import CreateIncompleteBookingRequest, BookingItem, UpdateIncompleteBookingRequest
 from app.services.booking_service import BookingService
@@ -12,8 +13,11 @@ async def create_incomplete_booking(
     store_id: int,
     payload: CreateIncompleteBookingRequest,
     service: BookingService = Depends(get_booking_service),
-) -> BookingItem:
-    return await service.create_incomplete_booking(store_id=store_id, payload=payload)
+) -> ModelResponse:
+    return ModelResponse(
+        await service.create_incomplete_booking(store_id=store_id, payload=payload),
+        status_code=status.HTTP_201_CREATED,
+    )
 
 
 @router.patch("/{booking_id}", response_model=BookingItem)
@@ -22,9 +26,11 @@ async def update_incomplete_booking(
     booking_id: int,
     payload: UpdateIncompleteBookingRequest,
     service: BookingService = Depends(get_booking_service),
-) -> BookingItem:
-    return await service.update_incomplete_booking(
-        store_id=store_id,
-        booking_id=booking_id,
-        payload=payload,
+) -> ModelResponse:
+    return ModelResponse(
+        await service.update_incomplete_booking(
+            store_id=store_id,
+            booking_id=booking_id,
+            payload=payload,
+        )
     )
@@ -0,0 +1,20 @@
+from datetime import date
+
+from fastapi import APIRouter, Depends
+
+from app.api.responses import ModelResponse
+from app.core.dependencies import get_room_service
+from app.schemas.room import RepackDayRequest, RepackDayResponse
+from app.services.room_service import RoomService
+
+router = APIRouter(prefix="/stores/{store_id}/days")
+
+
+@router.post("/{day}/repack", response_model=RepackDayResponse)
+async def repack_day(
+    store_id: int,
+    day: date,
+    payload: RepackDayRequest,
+    service: RoomService = Depends(get_room_service),
+) -> ModelResponse:
+    return ModelResponse(await service.repack_day(store_id=store_id, day=day, apply=payload.apply))
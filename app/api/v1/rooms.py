@@ -1,5 +1,6 @@
 from fastapi import APIRouter, Depends, Query, Response, status
 
+from app.api.responses import ModelResponse
 from app.core.dependencies import get_room_service
 from app.schemas.room import CreateRoomRequest, RoomItem, RoomListResponse, UpdateRoomRequest
 from app.services.room_service import RoomService
@@ -13,8 +14,8 @@ async def list_rooms(
     limit: int = Query(default=20, ge=1, le=100),
     offset: int = Query(default=0, ge=0),
     service: RoomService = Depends(get_room_service),
-) -> RoomListResponse:
-    return await service.list_rooms(store_id=store_id, limit=limit, offset=offset)
+) -> ModelResponse:
+    return ModelResponse(await service.list_rooms(store_id=store_id, limit=limit, offset=offset))
 
 
 @router.post("", response_model=RoomItem, status_code=status.HTTP_201_CREATED)
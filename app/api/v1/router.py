@@ -1,10 +1,13 @@
 from fastapi import APIRouter
 
+from app.api.v1.analytics import router as analytics_router
+from app.api.v1.availability import router as availability_router
 from app.api.v1.booking_actions import router as booking_actions_router
 from app.api.v1.booking_details import router as booking_details_router
 from app.api.v1.clients import router as clients_router
 from app.api.v1.dms import router as dms_router
 from app.api.v1.incomplete_bookings import router as incomplete_bookings_router
+from app.api.v1.repack import router as repack_router
 from app.api.v1.rooms import router as rooms_router
 from app.api.v1.script_characters import router as script_characters_router
 from app.api.v1.scripts import router as scripts_router
@@ -24,3 +27,6 @@ v1_router.include_router(rooms_router, tags=["rooms"])
 v1_router.include_router(scripts_router, tags=["scripts"])
 v1_router.include_router(store_scripts_router, tags=["store-scripts"])
 v1_router.include_router(script_characters_router, tags=["script-characters"])
+v1_router.include_router(analytics_router, tags=["analytics"])
+v1_router.include_router(availability_router, tags=["availability"])
+v1_router.include_router(repack_router, tags=["rooms"])
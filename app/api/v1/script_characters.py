@@ -1,5 +1,6 @@
 from fastapi import APIRouter, Depends, Query, Response, status
 
+from app.api.responses import ModelResponse
 from app.core.dependencies import get_script_character_service
 from app.schemas.script_character import (
     CreateScriptCharacterRequest,
@@ -18,8 +19,10 @@ async def list_script_characters(
     limit: int = Query(default=20, ge=1, le=100),
     offset: int = Query(default=0, ge=0),
     service: ScriptCharacterService = Depends(get_script_character_service),
-) -> ScriptCharacterListResponse:
-    return await service.list_script_characters(script_id=script_id, limit=limit, offset=offset)
+) -> ModelResponse:
+    return ModelResponse(
+        await service.list_script_characters(script_id=script_id, limit=limit, offset=offset)
+    )
 
 
 @router.post("", response_model=ScriptCharacterItem, status_code=status.HTTP_201_CREATED)
@@ -1,5 +1,6 @@
 from fastapi import APIRouter, Depends, Query, Response
 
+from app.api.responses import ModelResponse
 from app.core.dependencies import get_global_script_service
 from app.schemas.script import (
     CreateScriptRequest,
@@ -16,9 +17,13 @@ router = APIRouter(prefix="/scripts")
 async def list_scripts(
     limit: int = Query(default=20, ge=1, le=100),
     offset: int = Query(default=0, ge=0),
+    players: int | None = Query(default=None, ge=1, le=50),
+    q: str | None = Query(default=None, max_length=100),
     service: ScriptService = Depends(get_global_script_service),
-) -> ScriptListResponse:
-    return await service.list_scripts(limit=limit, offset=offset)
+) -> ModelResponse:
+    return ModelResponse(
+        await service.list_scripts(limit=limit, offset=offset, players=players, q=q)
+    )
 
 
 @router.post("", response_model=ScriptItem, status_code=201)
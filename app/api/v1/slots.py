@@ -1,5 +1,6 @@
 from fastapi import APIRouter, Depends, Query, Response, status
 
+from app.api.responses import ModelResponse
 from app.core.dependencies import get_slot_service
 from app.schemas.slot import CreateSlotRequest, SlotItem, SlotListResponse, UpdateSlotRequest
 from app.services.slot_service import SlotService
@@ -13,8 +14,8 @@ async def list_slots(
     limit: int = Query(default=20, ge=1, le=100),
     offset: int = Query(default=0, ge=0),
     service: SlotService = Depends(get_slot_service),
-) -> SlotListResponse:
-    return await service.list_slots(store_id=store_id, limit=limit, offset=offset)
+) -> ModelResponse:
+    return ModelResponse(await service.list_slots(store_id=store_id, limit=limit, offset=offset))
 
 
 @router.post("", response_model=SlotItem, status_code=status.HTTP_201_CREATED)
@@ -1,10 +1,12 @@
 from fastapi import APIRouter, Depends, Query, Response
 
+from app.api.responses import ModelResponse
 from app.core.dependencies import get_script_service
 from app.schemas.script import (
     CreateStoreScriptRequest,
     StoreScriptItem,
     StoreScriptListResponse,
+    UnplayedStoreScriptListResponse,
     UpdateStoreScriptRequest,
 )
 from app.services.script_service import ScriptService
@@ -17,9 +19,30 @@ async def list_store_scripts(
     store_id: int,
     limit: int = Query(default=20, ge=1, le=100),
     offset: int = Query(default=0, ge=0),
+    players: int | None = Query(default=None, ge=1, le=50),
+    q: str | None = Query(default=None, max_length=100),
     service: ScriptService = Depends(get_script_service),
-) -> StoreScriptListResponse:
-    return await service.list_store_scripts(store_id=store_id, limit=limit, offset=offset)
+) -> ModelResponse:
+    return ModelResponse(
+        await service.list_store_scripts(
+            store_id=store_id,
+            limit=limit,
+            offset=offset,
+            players=players,
+            q=q,
+        )
+    )
+
+
+@router.get("/unplayed", response_model=UnplayedStoreScriptListResponse)
+async def list_unplayed_store_scripts(
+    store_id: int,
+    client_ids: list[int] = Query(min_length=1, max_length=10),
+    service: ScriptService = Depends(get_script_service),
+) -> ModelResponse:
+    return ModelResponse(
+        await service.list_unplayed_store_scripts(store_id=store_id, client_ids=client_ids)
+    )
 
 
 @router.post("", response_model=StoreScriptItem, status_code=201)
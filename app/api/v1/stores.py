@@ -1,5 +1,6 @@
 from fastapi import APIRouter, Depends, Query, Response, status
 
+from app.api.responses import ModelResponse
 from app.core.dependencies import ActorContext, get_actor_context, get_scoped_store_service, get_store_service
 from app.schemas.store import CreateStoreRequest, StoreItem, StoreListResponse, UpdateStoreRequest
 from app.services.store_service import StoreService
@@ -13,11 +14,13 @@ async def list_stores(
     offset: int = Query(default=0, ge=0),
     actor: ActorContext = Depends(get_actor_context),
     service: StoreService = Depends(get_store_service),
-) -> StoreListResponse:
-    return await service.list_stores(
-        allowed_store_ids=actor.allowed_store_ids,
-        limit=limit,
-        offset=offset,
+) -> ModelResponse:
+    return ModelResponse(
+        await service.list_stores(
+            allowed_store_ids=actor.allowed_store_ids,
+            limit=limit,
+            offset=offset,
+        )
     )
 
 
@@ -7,9 +7,29 @@ class Settings(BaseSettings):
     model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8")
 
     database_url: str
+    # Optional streaming replica for GET/HEAD requests; unset sends everything to the primary.
+    database_replica_url: str | None = None
+    # "<first_store_id>=<url>,...": stores from each first id up to the next one live on that
+    # shard; stores below the lowest first id stay on the primary.
+    database_shard_urls: str | None = None
     redis_url: str | None = None
     cors_allowed_origins: str | None = None
 
+    def get_database_shards(self) -> list[tuple[int, str]]:
+        if not self.database_shard_urls:
+            return []
+        shards = []
+        for item in self.database_shard_urls.split(","):
+            if not item.strip():
+                continue
+            first_store_id, _, url = item.strip().partition("=")
+            if not url:
+                raise ValueError(
+                    f"DATABASE_SHARD_URLS entry {item!r} is not <first_store_id>=<url>."
+                )
+            shards.append((int(first_store_id), url))
+        return sorted(shards)
+
     def get_cors_allowed_origins(self) -> list[str]:
         if self.cors_allowed_origins:
             return [item.strip() for item in self.cors_allowed_origins.split(",") if item.strip()]
@@ -1,9 +1,43 @@
-from collections.abc import AsyncGenerator
-from functools import lru_cache
+from bisect import bisect_right
+from collections.abc import AsyncGenerator, AsyncIterator
+from contextlib import asynccontextmanager
+from functools import cache, lru_cache
 
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from fastapi import Path, Request
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import (
+    AsyncConnection,
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.orm import Session
 
 from app.core.config import get_settings
+from app.core.errors import BadRequestError
+
+READ_METHODS = frozenset({"GET", "HEAD"})
+ACTOR_ID_HEADER = "X-Actor-Id"
+READ_AFTER_LSN_HEADER = "X-Read-After-LSN"
+ACTOR_WRITE_LSN_SIZE = 10_000
+TRACK_WRITE_LSN = "track_write_lsn"
+WRITE_LSN = "write_lsn"
+
+# Primary WAL position of each actor's last write, kept until the replica has replayed past
+# it. Per process, like the heatmap cache, and bounded to ACTOR_WRITE_LSN_SIZE actors with the
+# oldest entry evicted first; an evicted actor may read from a lagging replica. Clients that
+# may reach another worker send the X-Read-After-LSN value returned by their write instead.
+_actor_write_lsn: dict[str, int] = {}
+
+
+def parse_lsn(value: str) -> int:
+    high, low = value.split("/")
+    return (int(high, 16) << 32) | int(low, 16)
+
+
+def format_lsn(lsn: int) -> str:
+    return f"{lsn >> 32:X}/{lsn & 0xFFFFFFFF:X}"
 
 
 @lru_cache(maxsize=1)
@@ -13,16 +47,178 @@ def get_engine():
 
 
 @lru_cache(maxsize=1)
-def get_session_maker() -> async_sessionmaker[AsyncSession]:
+def get_replica_engine() -> AsyncEngine | None:
+    settings = get_settings()
+    if not settings.database_replica_url:
+        return None
+    return create_async_engine(settings.database_replica_url, pool_pre_ping=True)
+
+
+def _make_session_maker(
+    engine: AsyncEngine, *, read_only: bool = False
+) -> async_sessionmaker[AsyncSession]:
+    if read_only:
+        # Shares the engine's pool; transactions on it open as BEGIN READ ONLY.
+        engine = engine.execution_options(postgresql_readonly=True)
     return async_sessionmaker(
-        bind=get_engine(),
+        bind=engine,
         class_=AsyncSession,
         expire_on_commit=False,
     )
 
 
-async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
-    session_maker = get_session_maker()
-    async with session_maker() as session:
+@lru_cache(maxsize=1)
+def get_session_maker() -> async_sessionmaker[AsyncSession]:
+    return _make_session_maker(get_engine())
+
+
+@lru_cache(maxsize=1)
+def get_read_session_maker() -> async_sessionmaker[AsyncSession]:
+    return _make_session_maker(get_engine(), read_only=True)
+
+
+@lru_cache(maxsize=1)
+def get_replica_session_maker() -> async_sessionmaker[AsyncSession] | None:
+    replica_engine = get_replica_engine()
+    if replica_engine is None:
+        return None
+    return _make_session_maker(replica_engine, read_only=True)
+
+
+@lru_cache(maxsize=1)
+def get_shard_map() -> tuple[tuple[int, str], ...]:
+    """(first_store_id, url) per shard, ordered by first_store_id; empty without shards."""
+    return tuple(get_settings().get_database_shards())
+
+
+@cache
+def get_shard_engine(url: str) -> AsyncEngine:
+    return create_async_engine(url, pool_pre_ping=True)
+
+
+@cache
+def get_shard_session_maker(
+    url: str, read_only: bool = False
+) -> async_sessionmaker[AsyncSession]:
+    return _make_session_maker(get_shard_engine(url), read_only=read_only)
+
+
+def get_store_shard_url(store_id: int) -> str | None:
+    """URL of the shard holding `store_id`'s scoped data, or None for the primary."""
+    shard_map = get_shard_map()
+    index = bisect_right(shard_map, store_id, key=lambda shard: shard[0]) - 1
+    return shard_map[index][1] if index >= 0 else None
+
+
+def _required_replica_lsn(request: Request) -> int:
+    """WAL position a read has to see: the actor's last write or X-Read-After-LSN, else 0."""
+    actor_id = request.headers.get(ACTOR_ID_HEADER)
+    min_lsn = _actor_write_lsn.get(actor_id, 0) if actor_id else 0
+    read_after = request.headers.get(READ_AFTER_LSN_HEADER)
+    if read_after:
+        try:
+            min_lsn = max(min_lsn, parse_lsn(read_after))
+        except ValueError as exc:
+            raise BadRequestError(f"{READ_AFTER_LSN_HEADER} is not a valid LSN.") from exc
+    return min_lsn
+
+
+async def _replica_has_replayed(conn: AsyncConnection, lsn: int) -> bool:
+    result = await conn.execute(
+        text(
+            """
+            SELECT NOT pg_is_in_recovery()
+                   OR pg_last_wal_replay_lsn() >= CAST(:lsn AS pg_lsn)
+            """
+        ),
+        {"lsn": lsn},
+    )
+    return bool(result.scalar_one())
+
+
+@event.listens_for(Session, "before_commit")
+def _read_write_lsn(session: Session) -> None:
+    # Read on the write's own connection, just before its commit record: a replica that has
+    # replayed this far has the write's rows and is at most the commit record behind.
+    if session.info.get(TRACK_WRITE_LSN) and session.in_transaction():
+        result = session.execute(text("SELECT pg_current_wal_insert_lsn()::text"))
+        session.info[WRITE_LSN] = parse_lsn(result.scalar_one())
+
+
+def _record_actor_write(request: Request, session: AsyncSession) -> None:
+    """Remember the WAL position of `session`'s commit for the actor and the response header.
+
+    `_actor_write_lsn` holds at most ACTOR_WRITE_LSN_SIZE actors; the oldest is dropped first.
+    """
+    lsn = session.info.get(WRITE_LSN)
+    if lsn is None:
+        return
+    actor_id = request.headers[ACTOR_ID_HEADER]
+    lsn = max(lsn, _actor_write_lsn.get(actor_id, 0))
+    if actor_id not in _actor_write_lsn and len(_actor_write_lsn) >= ACTOR_WRITE_LSN_SIZE:
+        del _actor_write_lsn[next(iter(_actor_write_lsn))]
+    _actor_write_lsn[actor_id] = lsn
+    request.state.read_after_lsn = format_lsn(lsn)
+
+
+@asynccontextmanager
+async def _request_session(request: Request) -> AsyncIterator[AsyncSession]:
+    """Replica for reads once it has replayed the actor's last write; primary otherwise.
+
+    Reads get READ ONLY transactions on either database.
+    """
+    if request.method not in READ_METHODS:
+        async with get_session_maker()() as session:
+            if request.headers.get(ACTOR_ID_HEADER) and get_replica_session_maker() is not None:
+                session.info[TRACK_WRITE_LSN] = True
+            yield session
+            _record_actor_write(request, session)
+        return
+    replica_session_maker = get_replica_session_maker()
+    if replica_session_maker is None:
+        async with get_read_session_maker()() as session:
+            yield session
+        return
+
+    min_lsn = _required_replica_lsn(request)
+    if not min_lsn:
+        async with replica_session_maker() as session:
+            yield session
+        return
+    # The read reuses the connection the replay check ran on, so it needs no second checkout.
+    # The check's transaction is ended first: the session starts its own, with whatever
+    # isolation options the service asks for (the export's REPEATABLE READ snapshot).
+    async with replica_session_maker.kw["bind"].connect() as conn:
+        replayed = await _replica_has_replayed(conn, min_lsn)
+        await conn.rollback()
+        if replayed:
+            actor_id = request.headers.get(ACTOR_ID_HEADER)
+            if actor_id and _actor_write_lsn.get(actor_id, 0) <= min_lsn:
+                _actor_write_lsn.pop(actor_id, None)
+            async with replica_session_maker(bind=conn) as session:
+                yield session
+            return
+    async with get_read_session_maker()() as session:
         yield session
 
+
+async def get_async_session(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    async with _request_session(request) as session:
+        yield session
+
+
+async def get_store_session(
+    request: Request,
+    store_id: int = Path(..., ge=1),
+) -> AsyncGenerator[AsyncSession, None]:
+    """Session on the database that owns `store_id`; the primary path keeps replica routing."""
+    shard_url = get_store_shard_url(store_id)
+    if shard_url is None:
+        session_context = _request_session(request)
+    else:
+        session_maker = get_shard_session_maker(
+            shard_url, read_only=request.method in READ_METHODS
+        )
+        session_context = session_maker()
+    async with session_context as session:
+        yield session
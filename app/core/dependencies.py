@@ -3,7 +3,9 @@ from dataclasses import dataclass
 from fastapi import Depends, Header, HTTPException, Path, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.database import get_async_session
+from app.core.database import get_async_session, get_store_session
+from app.services.analytics_service import AnalyticsService
+from app.services.availability_service import AvailabilityService
 from app.services.booking_service import BookingService
 from app.services.client_service import ClientService
 from app.services.character_client_match_service import CharacterClientMatchService
@@ -56,83 +58,105 @@ def require_store_access(
 
 def get_booking_service(
     _actor: ActorContext = Depends(require_store_access),
-    session: AsyncSession = Depends(get_async_session),
+    session: AsyncSession = Depends(get_store_session, scope="function"),
 ) -> BookingService:
     return BookingService(session=session)
 
 
+def get_booking_export_service(
+    _actor: ActorContext = Depends(require_store_access),
+    # The export streams rows after the route returns, so its session lives for the request.
+    session: AsyncSession = Depends(get_store_session),
+) -> BookingService:
+    return BookingService(session=session)
+
+
+def get_analytics_service(
+    _actor: ActorContext = Depends(require_store_access),
+    session: AsyncSession = Depends(get_store_session, scope="function"),
+) -> AnalyticsService:
+    return AnalyticsService(session=session)
+
+
+def get_availability_service(
+    _actor: ActorContext = Depends(require_store_access),
+    session: AsyncSession = Depends(get_store_session, scope="function"),
+) -> AvailabilityService:
+    return AvailabilityService(session=session)
+
+
 def get_slot_service(
     _actor: ActorContext = Depends(require_store_access),
-    session: AsyncSession = Depends(get_async_session),
+    session: AsyncSession = Depends(get_store_session, scope="function"),
 ) -> SlotService:
     return SlotService(session=session)
 
 
 def get_room_service(
     _actor: ActorContext = Depends(require_store_access),
-    session: AsyncSession = Depends(get_async_session),
+    session: AsyncSession = Depends(get_store_session, scope="function"),
 ) -> RoomService:
     return RoomService(session=session)
 
 
 def get_script_service(
     _actor: ActorContext = Depends(require_store_access),
-    session: AsyncSession = Depends(get_async_session),
+    session: AsyncSession = Depends(get_store_session, scope="function"),
 ) -> ScriptService:
     return ScriptService(session=session)
 
 
 def get_global_script_service(
     _actor: ActorContext = Depends(get_actor_context),
-    session: AsyncSession = Depends(get_async_session),
+    session: AsyncSession = Depends(get_async_session, scope="function"),
 ) -> ScriptService:
     return ScriptService(session=session)
 
 
 def get_script_character_service(
     _actor: ActorContext = Depends(get_actor_context),
-    session: AsyncSession = Depends(get_async_session),
+    session: AsyncSession = Depends(get_async_session, scope="function"),
 ) -> ScriptCharacterService:
     return ScriptCharacterService(session=session)
 
 
 def get_store_service(
     _actor: ActorContext = Depends(get_actor_context),
-    session: AsyncSession = Depends(get_async_session),
+    session: AsyncSession = Depends(get_async_session, scope="function"),
 ) -> StoreService:
     return StoreService(session=session)
 
 
 def get_scoped_store_service(
     _actor: ActorContext = Depends(require_store_access),
-    session: AsyncSession = Depends(get_async_session),
+    session: AsyncSession = Depends(get_async_session, scope="function"),
 ) -> StoreService:
     return StoreService(session=session)
 
 
 def get_client_service(
     _actor: ActorContext = Depends(get_actor_context),
-    session: AsyncSession = Depends(get_async_session),
+    session: AsyncSession = Depends(get_async_session, scope="function"),
 ) -> ClientService:
     return ClientService(session=session)
 
 
 def get_dm_service(
     _actor: ActorContext = Depends(get_actor_context),
-    session: AsyncSession = Depends(get_async_session),
+    session: AsyncSession = Depends(get_async_session, scope="function"),
 ) -> DmService:
     return DmService(session=session)
 
 
 def get_character_client_match_service(
     _actor: ActorContext = Depends(require_store_access),
-    session: AsyncSession = Depends(get_async_session),
+    session: AsyncSession = Depends(get_store_session, scope="function"),
 ) -> CharacterClientMatchService:
     return CharacterClientMatchService(session=session)
 
 
 def get_character_dm_match_service(
     _actor: ActorContext = Depends(require_store_access),
-    session: AsyncSession = Depends(get_async_session),
+    session: AsyncSession = Depends(get_store_session, scope="function"),
 ) -> CharacterDmMatchService:
     return CharacterDmMatchService(session=session)
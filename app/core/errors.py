@@ -10,6 +10,11 @@ class ServiceError(RuntimeError):
         super().__init__(message)
 
 
+class BadRequestError(ServiceError):
+    status_code = 400
+    code = "bad_request"
+
+
 class NotFoundError(ServiceError):
     status_code = 404
     code = "not_found"
@@ -18,3 +23,8 @@ class NotFoundError(ServiceError):
 class ConflictError(ServiceError):
     status_code = 409
     code = "conflict"
+
+
+class QueryTimeoutError(ServiceError):
+    status_code = 503
+    code = "query_timeout"
@@ -1,4 +1,4 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from pydantic import ValidationError
@@ -8,6 +8,7 @@ from sqlalchemy.ext.asyncio import create_async_engine
 
 from app.api.router import api_router
 from app.core.config import get_settings
+from app.core.database import READ_AFTER_LSN_HEADER
 from app.core.errors import FeatureNotImplementedError, ServiceError
 
 app = FastAPI(title="Store Scheduler API", version="0.1.0")
@@ -19,8 +20,19 @@ app.add_middleware(
     allow_credentials=False,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[READ_AFTER_LSN_HEADER],
 )
 
+
+@app.middleware("http")
+async def expose_read_after_lsn(request: Request, call_next):
+    # Set by the session dependency from the write's own commit when a replica is configured.
+    response = await call_next(request)
+    read_after_lsn = getattr(request.state, "read_after_lsn", None)
+    if read_after_lsn is not None and response.status_code < 400:
+        response.headers[READ_AFTER_LSN_HEADER] = read_after_lsn
+    return response
+
 app.include_router(api_router)
 
 
@@ -61,12 +73,45 @@ async def ready() -> JSONResponse:
     finally:
         await engine.dispose()
 
-    status_code = 200 if db_status == "ok" and redis_status == "ok" else 503
+    content = {"db": db_status, "redis": redis_status}
+    shards = settings.get_database_shards()
+    if shards:
+        content["shards"] = await _shard_status([url for _first_store_id, url in shards])
+
+    status_code = 200 if all(value == "ok" for value in content.values()) else 503
     status_text = "ok" if status_code == 200 else "error"
-    return JSONResponse(
-        status_code=status_code,
-        content={"status": status_text, "db": db_status, "redis": redis_status},
-    )
+    return JSONResponse(status_code=status_code, content={"status": status_text, **content})
+
+
+async def _shard_status(shard_urls: list[str]) -> str:
+    """Worst shard state: unreachable, or catalog subscription missing or disabled.
+
+    The subscription is created with disable_on_error, so a failed apply stops catalog
+    replication and shows up here instead of retrying silently.
+    """
+    status = "ok"
+    for shard_url in shard_urls:
+        engine = create_async_engine(shard_url, pool_pre_ping=True)
+        try:
+            async with engine.connect() as conn:
+                result = await conn.execute(
+                    text(
+                        """
+                        SELECT bool_and(subenabled)
+                        FROM pg_subscription
+                        WHERE subdbid = (
+                            SELECT oid FROM pg_database WHERE datname = current_database()
+                        )
+                        """
+                    )
+                )
+                if not result.scalar_one():
+                    status = "catalog_disabled"
+        except Exception:
+            return "down"
+        finally:
+            await engine.dispose()
+    return status
 
 
 @app.exception_handler(FeatureNotImplementedError)
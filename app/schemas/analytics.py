@@ -0,0 +1,62 @@
+from datetime import date
+
+from pydantic import BaseModel, Field
+
+
+class RoomDailyUsageItem(BaseModel):
+    usage_date: date
+    store_room_id: int
+    room_name: str
+    booking_count: int
+    booked_minutes: int
+
+
+class RoomDailyUsageResponse(BaseModel):
+    store_id: int
+    date_from: date
+    date_to: date
+    items: list[RoomDailyUsageItem] = Field(default_factory=list)
+
+
+class RoomOccupancyItem(BaseModel):
+    store_room_id: int
+    room_name: str
+    booking_count: int
+    booked_minutes: int
+    available_minutes: int
+    occupancy_pct: float
+
+
+class RoomOccupancyResponse(BaseModel):
+    store_id: int
+    date_from: date
+    date_to: date
+    open_hours_per_day: int
+    items: list[RoomOccupancyItem] = Field(default_factory=list)
+
+
+class ScriptMonthlyUsageItem(BaseModel):
+    usage_month: date
+    script_id: int
+    script_name: str
+    booking_count: int
+
+
+class ScriptMonthlyUsageResponse(BaseModel):
+    store_id: int
+    date_from: date
+    date_to: date
+    items: list[ScriptMonthlyUsageItem] = Field(default_factory=list)
+
+
+class StoreDmWorkloadItem(BaseModel):
+    dm_id: int
+    display_name: str
+    session_count: int
+    worked_minutes: int
+
+
+class StoreDmWorkloadResponse(BaseModel):
+    store_id: int
+    month: date
+    items: list[StoreDmWorkloadItem] = Field(default_factory=list)
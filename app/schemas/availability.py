@@ -0,0 +1,78 @@
+from datetime import date
+
+from pydantic import AwareDatetime, BaseModel, Field
+
+
+class AvailabilityInterval(BaseModel):
+    start_at: AwareDatetime
+    end_at: AwareDatetime
+
+
+class RoomAvailabilityItem(BaseModel):
+    store_room_id: int
+    room_name: str
+    free_intervals: list[AvailabilityInterval] = Field(default_factory=list)
+    start_times: list[AwareDatetime] = Field(default_factory=list)
+
+
+class AvailabilityResponse(BaseModel):
+    store_id: int
+    script_id: int
+    estimated_minutes: int
+    start_from: AwareDatetime
+    start_to: AwareDatetime
+    step_minutes: int
+    rooms: list[RoomAvailabilityItem] = Field(default_factory=list)
+
+
+class SuggestionItem(BaseModel):
+    start_at: AwareDatetime
+    end_at: AwareDatetime
+    store_room_ids: list[int] = Field(default_factory=list)
+    dm_ids: list[int] = Field(default_factory=list)
+
+
+class SuggestionResponse(BaseModel):
+    store_id: int
+    script_id: int
+    estimated_minutes: int
+    dm_count: int
+    start_from: AwareDatetime
+    start_to: AwareDatetime
+    step_minutes: int
+    suggestions: list[SuggestionItem] = Field(default_factory=list)
+
+
+class OccupancyDayItem(BaseModel):
+    occupancy_date: date
+    quarter_hours: str
+    occupied_minutes: int
+
+
+class RoomOccupancyMaskItem(BaseModel):
+    store_room_id: int
+    room_name: str
+    occupied_minutes: int
+    days: list[OccupancyDayItem] = Field(default_factory=list)
+
+
+class OccupancyMaskResponse(BaseModel):
+    store_id: int
+    date_from: date
+    date_to: date
+    quarter_minutes: int
+    rooms: list[RoomOccupancyMaskItem] = Field(default_factory=list)
+
+
+class HeatmapRoomItem(BaseModel):
+    store_room_id: int
+    room_name: str
+    occupied_days: list[int] = Field(default_factory=list)
+
+
+class HeatmapResponse(BaseModel):
+    store_id: int
+    month: date
+    bucket_minutes: int
+    days_in_month: int
+    rooms: list[HeatmapRoomItem] = Field(default_factory=list)
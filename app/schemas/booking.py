@@ -1,4 +1,5 @@
 from datetime import date
+from enum import StrEnum
 
 from pydantic import AwareDatetime, BaseModel, Field, field_validator, model_validator
 
@@ -22,6 +23,10 @@ class BookingItem(BaseModel):
     has_conflict: bool = False
     conflict_count: int = 0
     conflict_booking_ids: list[int] = Field(default_factory=list)
+    has_dm_conflict: bool = False
+    dm_conflict_booking_ids: list[int] = Field(default_factory=list)
+    has_client_conflict: bool = False
+    client_conflict_booking_ids: list[int] = Field(default_factory=list)
 
 
 class BookingListResponse(BaseModel):
@@ -31,6 +36,26 @@ class BookingListResponse(BaseModel):
     total: int
 
 
+class BookingExportFormat(StrEnum):
+    CSV = "csv"
+    NDJSON = "ndjson"
+
+
+class BookingExportRow(BaseModel):
+    booking_id: int
+    booking_status_id: int
+    target_month: date | None
+    start_at: AwareDatetime | None
+    end_at: AwareDatetime | None
+    script_id: int | None
+    script_name: str | None
+    store_room_id: int | None
+    room_name: str | None
+    client_ids: list[int] = Field(default_factory=list)
+    dm_ids: list[int] = Field(default_factory=list)
+    conflict_booking_ids: list[int] = Field(default_factory=list)
+
+
 class CreateIncompleteBookingRequest(BaseModel):
     target_month: date
     client_ids: list[int] = Field(min_length=1)
@@ -1,4 +1,6 @@
-from pydantic import BaseModel, Field, model_validator
+from datetime import date
+
+from pydantic import AwareDatetime, BaseModel, Field, model_validator
 
 
 class ClientItem(BaseModel):
@@ -15,6 +17,11 @@ class ClientListResponse(BaseModel):
     total: int
 
 
+class ClientSearchResponse(BaseModel):
+    items: list[ClientItem] = Field(default_factory=list)
+    limit: int
+
+
 class CreateClientRequest(BaseModel):
     display_name: str = Field(min_length=1)
     phone: str | None = None
@@ -31,3 +38,21 @@ class UpdateClientRequest(BaseModel):
         if not self.model_fields_set:
             raise ValueError("At least one field must be provided.")
         return self
+
+
+class ClientBookingItem(BaseModel):
+    booking_id: int
+    store_id: int
+    store_name: str
+    script_id: int | None
+    script_name: str | None
+    booking_status_id: int
+    target_month: date | None
+    start_at: AwareDatetime | None
+    end_at: AwareDatetime | None
+
+
+class ClientBookingListResponse(BaseModel):
+    items: list[ClientBookingItem] = Field(default_factory=list)
+    limit: int
+    next_cursor: str | None = None
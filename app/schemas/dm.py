@@ -1,4 +1,6 @@
-from pydantic import BaseModel, Field, model_validator
+from datetime import date
+
+from pydantic import AwareDatetime, BaseModel, Field, model_validator
 
 
 class DmItem(BaseModel):
@@ -47,3 +49,37 @@ class DmStoreMembershipListResponse(BaseModel):
 
 class CreateDmStoreMembershipRequest(BaseModel):
     store_id: int = Field(ge=1)
+
+
+class DmWorkloadStoreItem(BaseModel):
+    store_id: int
+    store_name: str
+    session_count: int
+    worked_minutes: int
+
+
+class DmWorkloadResponse(BaseModel):
+    dm_id: int
+    month: date
+    session_count: int
+    worked_minutes: int
+    stores: list[DmWorkloadStoreItem] = Field(default_factory=list)
+
+
+class DmBusyBlock(BaseModel):
+    start_at: AwareDatetime
+    end_at: AwareDatetime
+    booking_ids: list[int] = Field(default_factory=list)
+
+
+class DmFreeInterval(BaseModel):
+    start_at: AwareDatetime
+    end_at: AwareDatetime
+
+
+class DmFreeBusyResponse(BaseModel):
+    dm_id: int
+    start_from: AwareDatetime
+    start_to: AwareDatetime
+    busy: list[DmBusyBlock] = Field(default_factory=list)
+    free: list[DmFreeInterval] = Field(default_factory=list)
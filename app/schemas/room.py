@@ -1,4 +1,6 @@
-from pydantic import BaseModel, Field, model_validator
+from datetime import date
+
+from pydantic import AwareDatetime, BaseModel, Field, model_validator
 
 
 class CreateRoomRequest(BaseModel):
@@ -31,3 +33,24 @@ class RoomListResponse(BaseModel):
     limit: int
     offset: int
     total: int
+
+
+class RepackDayRequest(BaseModel):
+    apply: bool = False
+
+
+class RepackMove(BaseModel):
+    booking_id: int
+    start_at: AwareDatetime
+    end_at: AwareDatetime
+    from_store_room_id: int | None
+    to_store_room_id: int
+
+
+class RepackDayResponse(BaseModel):
+    store_id: int
+    day: date
+    booking_count: int
+    applied: bool
+    moves: list[RepackMove] = Field(default_factory=list)
+    unresolved_booking_ids: list[int] = Field(default_factory=list)
@@ -6,6 +6,8 @@ class ScriptItem(BaseModel):
     name: str
     estimated_minutes: int
     pic_storage_key: str | None = None
+    player_count: int
+    dm_count: int
 
 
 class ScriptListResponse(BaseModel):
@@ -38,6 +40,8 @@ class StoreScriptItem(BaseModel):
     name: str
     estimated_minutes: int
     pic_storage_key: str | None = None
+    player_count: int
+    dm_count: int
     is_active: bool
 
 
@@ -48,6 +52,11 @@ class StoreScriptListResponse(BaseModel):
     total: int
 
 
+class UnplayedStoreScriptListResponse(BaseModel):
+    client_ids: list[int] = Field(default_factory=list)
+    items: list[StoreScriptItem] = Field(default_factory=list)
+
+
 class CreateStoreScriptRequest(BaseModel):
     script_id: int = Field(ge=1)
     is_active: bool = True
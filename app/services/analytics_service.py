@@ -0,0 +1,199 @@
+from datetime import date
+
+from sqlalchemy import text
+
+from app.core.errors import BadRequestError, NotFoundError
+from app.schemas.analytics import (
+    RoomDailyUsageItem,
+    RoomDailyUsageResponse,
+    RoomOccupancyItem,
+    RoomOccupancyResponse,
+    ScriptMonthlyUsageItem,
+    ScriptMonthlyUsageResponse,
+    StoreDmWorkloadItem,
+    StoreDmWorkloadResponse,
+)
+from app.services.base import BaseService
+
+MAX_RANGE_DAYS = 366
+
+
+class AnalyticsService(BaseService):
+    """Dashboard reads served from the booking usage rollups.
+
+    `store_room_daily_usage`, `store_script_monthly_usage` and `dm_daily_workload` are
+    maintained by triggers (migrations 0005 and 0006), keyed by store-local day, so these
+    reads never touch booking history.
+    """
+
+    async def _assert_store_exists(self, store_id: int) -> None:
+        result = await self.session.execute(
+            text("SELECT 1 FROM store WHERE store_id = :store_id"),
+            {"store_id": store_id},
+        )
+        if result.scalar_one_or_none() is None:
+            raise NotFoundError(f"store_id={store_id} was not found.")
+
+    @staticmethod
+    def _validate_range(date_from: date, date_to: date) -> int:
+        days = (date_to - date_from).days + 1
+        if days < 1:
+            raise BadRequestError("to must not be before from.")
+        if days > MAX_RANGE_DAYS:
+            raise BadRequestError(f"date range cannot exceed {MAX_RANGE_DAYS} days.")
+        return days
+
+    async def get_room_daily_usage(
+        self,
+        store_id: int,
+        *,
+        date_from: date,
+        date_to: date,
+    ) -> RoomDailyUsageResponse:
+        self._validate_range(date_from, date_to)
+        await self._assert_store_exists(store_id=store_id)
+        result = await self.session.execute(
+            text(
+                """
+                SELECT u.usage_date,
+                       u.store_room_id,
+                       r.name AS room_name,
+                       u.booking_count,
+                       u.booked_minutes
+                FROM store_room_daily_usage AS u
+                JOIN store_room AS r
+                  ON r.store_room_id = u.store_room_id
+                WHERE u.store_id = :store_id
+                  AND u.usage_date BETWEEN :date_from AND :date_to
+                  AND u.booking_count > 0
+                ORDER BY u.usage_date, u.store_room_id
+                """
+            ),
+            {"store_id": store_id, "date_from": date_from, "date_to": date_to},
+        )
+        return RoomDailyUsageResponse.model_construct(
+            store_id=store_id,
+            date_from=date_from,
+            date_to=date_to,
+            items=[RoomDailyUsageItem.model_construct(**row) for row in result.mappings().all()],
+        )
+
+    async def get_room_occupancy(
+        self,
+        store_id: int,
+        *,
+        date_from: date,
+        date_to: date,
+        open_hours_per_day: int,
+    ) -> RoomOccupancyResponse:
+        days = self._validate_range(date_from, date_to)
+        await self._assert_store_exists(store_id=store_id)
+        result = await self.session.execute(
+            text(
+                """
+                SELECT r.store_room_id,
+                       r.name AS room_name,
+                       COALESCE(sum(u.booking_count), 0) AS booking_count,
+                       COALESCE(sum(u.booked_minutes), 0) AS booked_minutes
+                FROM store_room AS r
+                LEFT JOIN store_room_daily_usage AS u
+                  ON u.store_room_id = r.store_room_id
+                 AND u.usage_date BETWEEN :date_from AND :date_to
+                WHERE r.store_id = :store_id
+                  AND r.is_active = true
+                GROUP BY r.store_room_id, r.name
+                ORDER BY r.store_room_id
+                """
+            ),
+            {"store_id": store_id, "date_from": date_from, "date_to": date_to},
+        )
+        available_minutes = days * open_hours_per_day * 60
+        items = [
+            RoomOccupancyItem.model_construct(
+                store_room_id=row["store_room_id"],
+                room_name=row["room_name"],
+                booking_count=row["booking_count"],
+                booked_minutes=row["booked_minutes"],
+                available_minutes=available_minutes,
+                occupancy_pct=round(100 * row["booked_minutes"] / available_minutes, 1),
+            )
+            for row in result.mappings().all()
+        ]
+        return RoomOccupancyResponse.model_construct(
+            store_id=store_id,
+            date_from=date_from,
+            date_to=date_to,
+            open_hours_per_day=open_hours_per_day,
+            items=items,
+        )
+
+    async def get_script_monthly_usage(
+        self,
+        store_id: int,
+        *,
+        date_from: date,
+        date_to: date,
+    ) -> ScriptMonthlyUsageResponse:
+        self._validate_range(date_from, date_to)
+        await self._assert_store_exists(store_id=store_id)
+        result = await self.session.execute(
+            text(
+                """
+                SELECT u.usage_month,
+                       u.script_id,
+                       s.name AS script_name,
+                       u.booking_count
+                FROM store_script_monthly_usage AS u
+                JOIN script AS s
+                  ON s.script_id = u.script_id
+                WHERE u.store_id = :store_id
+                  AND u.usage_month BETWEEN :month_from AND :date_to
+                  AND u.booking_count > 0
+                ORDER BY u.usage_month, u.booking_count DESC, u.script_id
+                """
+            ),
+            {
+                "store_id": store_id,
+                "month_from": date_from.replace(day=1),
+                "date_to": date_to,
+            },
+        )
+        return ScriptMonthlyUsageResponse.model_construct(
+            store_id=store_id,
+            date_from=date_from,
+            date_to=date_to,
+            items=[
+                ScriptMonthlyUsageItem.model_construct(**row) for row in result.mappings().all()
+            ],
+        )
+
+    async def get_store_dm_workload(self, store_id: int, *, month: date) -> StoreDmWorkloadResponse:
+        if month.day != 1:
+            raise BadRequestError("month must be the first day of a month.")
+        await self._assert_store_exists(store_id=store_id)
+        next_month = date(month.year + month.month // 12, month.month % 12 + 1, 1)
+        result = await self.session.execute(
+            text(
+                """
+                SELECT w.dm_id,
+                       d.display_name,
+                       sum(w.session_count) AS session_count,
+                       sum(w.worked_minutes) AS worked_minutes
+                FROM dm_daily_workload AS w
+                JOIN dm AS d
+                  ON d.dm_id = w.dm_id
+                WHERE w.store_id = :store_id
+                  AND w.work_date >= :month
+                  AND w.work_date < :next_month
+                GROUP BY w.dm_id, d.display_name
+                HAVING sum(w.session_count) > 0
+                ORDER BY d.display_name, w.dm_id
+                """
+            ),
+            {"store_id": store_id, "month": month, "next_month": next_month},
+        )
+        return StoreDmWorkloadResponse.model_construct(
+            store_id=store_id,
+            month=month,
+            items=[StoreDmWorkloadItem.model_construct(**row) for row in result.mappings().all()],
+        )
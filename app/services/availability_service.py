@@ -0,0 +1,467 @@
+from collections.abc import Iterable
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import text
+
+from app.core.errors import BadRequestError, NotFoundError
+from app.schemas.availability import (
+    AvailabilityInterval,
+    AvailabilityResponse,
+    HeatmapResponse,
+    HeatmapRoomItem,
+    OccupancyDayItem,
+    OccupancyMaskResponse,
+    RoomAvailabilityItem,
+    RoomOccupancyMaskItem,
+    SuggestionItem,
+    SuggestionResponse,
+)
+from app.services.base import BaseService
+from app.services.occupancy import (
+    QUARTER_MINUTES,
+    QUARTERS_PER_DAY,
+    bucket_any,
+    chain_days,
+    column_masks,
+    day_slice,
+    format_quarter_hours,
+    parse_quarter_hours,
+)
+
+MAX_WINDOW_DAYS = 31
+MAX_OCCUPANCY_DAYS = 62
+HEATMAP_CACHE_SIZE = 256
+
+# Rendered heatmaps keyed by (store_id, month, bucket_minutes), each stored with the
+# store_occupancy_version it was computed at. Every request re-reads the version, so
+# entries are reused only until the store's occupancy or room set next changes, in any
+# process.
+_heatmap_cache: dict[tuple[int, date, int], tuple[int, HeatmapResponse]] = {}
+
+
+def _merge_busy(intervals: Iterable[tuple[datetime, datetime]]) -> list[tuple[datetime, datetime]]:
+    """Union of start-ordered intervals; conflicting bookings collapse into one block."""
+    merged: list[tuple[datetime, datetime]] = []
+    for start_at, end_at in intervals:
+        if merged and start_at <= merged[-1][1]:
+            if end_at > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end_at)
+        else:
+            merged.append((start_at, end_at))
+    return merged
+
+
+def _free_gaps(
+    busy: list[tuple[datetime, datetime]],
+    window_start: datetime,
+    window_end: datetime,
+    duration: timedelta,
+) -> list[tuple[datetime, datetime]]:
+    """Gaps between merged busy blocks inside the window that can hold `duration`."""
+    gaps: list[tuple[datetime, datetime]] = []
+    cursor = window_start
+    for busy_start, busy_end in busy:
+        if busy_start - cursor >= duration:
+            gaps.append((cursor, busy_start))
+        cursor = max(cursor, busy_end)
+    if window_end - cursor >= duration:
+        gaps.append((cursor, window_end))
+    return gaps
+
+
+def _grid_starts(
+    gaps: list[tuple[datetime, datetime]],
+    start_from: datetime,
+    start_to: datetime,
+    step: timedelta,
+    duration: timedelta,
+) -> list[datetime]:
+    """Step-aligned start times (counted from `start_from`) that fit inside a gap."""
+    starts: list[datetime] = []
+    for gap_start, gap_end in gaps:
+        offset = -((start_from - gap_start) // step)
+        start_at = start_from + offset * step
+        while start_at < start_to and start_at + duration <= gap_end:
+            starts.append(start_at)
+            start_at += step
+    return starts
+
+
+def _sweep_suggestions(
+    starts: list[datetime],
+    room_busy: dict[int, list[tuple[datetime, datetime]]],
+    dm_busy: dict[int, list[tuple[datetime, datetime]]],
+    duration: timedelta,
+    dms_needed: int,
+) -> list[tuple[datetime, list[int], list[int]]]:
+    """Starts with a free room and `dms_needed` free DMs, with the free room and DM ids.
+
+    A busy interval (s, e) rules out every start in the open interval (s - duration, e),
+    so each becomes a block/release event pair. Candidate starts are swept in the same
+    order: releases at a time apply before a candidate there and blocks after it, which
+    keeps back-to-back bookings feasible.
+    """
+    events: list[tuple[datetime, int, int, int]] = []
+    for kind, busy_by_id in ((0, room_busy), (1, dm_busy)):
+        for resource_id, busy in busy_by_id.items():
+            for start_at, end_at in busy:
+                events.append((start_at - duration, 2, kind, resource_id))
+                events.append((end_at, 0, kind, resource_id))
+    events.extend((start_at, 1, -1, 0) for start_at in starts)
+    events.sort()
+
+    room_ids = sorted(room_busy)
+    dm_ids = sorted(dm_busy)
+    block_counts: tuple[dict[int, int], dict[int, int]] = ({}, {})
+    suggestions: list[tuple[datetime, list[int], list[int]]] = []
+    for at, rank, kind, resource_id in events:
+        if rank == 1:
+            rooms_blocked, dms_blocked = block_counts
+            if len(rooms_blocked) < len(room_ids) and len(dm_ids) - len(dms_blocked) >= dms_needed:
+                suggestions.append(
+                    (
+                        at,
+                        [room_id for room_id in room_ids if room_id not in rooms_blocked],
+                        [dm_id for dm_id in dm_ids if dm_id not in dms_blocked],
+                    )
+                )
+            continue
+        counts = block_counts[kind]
+        if rank == 2:
+            counts[resource_id] = counts.get(resource_id, 0) + 1
+        elif counts[resource_id] == 1:
+            del counts[resource_id]
+        else:
+            counts[resource_id] -= 1
+    return suggestions
+
+
+class AvailabilityService(BaseService):
+    """Free start times per active room, for front-desk booking searches."""
+
+    async def _load_room_busy(
+        self, store_id: int, start_from: datetime, window_end: datetime
+    ) -> dict[int, tuple[str, list[tuple[datetime, datetime]]]]:
+        """Start-ordered busy intervals per active room overlapping [start_from, window_end)."""
+        # One range query for every active room. The (store_room_id, start_at) scan is
+        # bounded below by the longest occupying booking (ix_booking_occupied_duration),
+        # so bookings still running at `from` are found without reading older history.
+        result = await self.session.execute(
+            text(
+                """
+                SELECT r.store_room_id, r.name AS room_name, b.start_at, b.end_at
+                FROM store_room AS r
+                LEFT JOIN booking AS b
+                  ON b.store_room_id = r.store_room_id
+                 AND b.booking_status_id IN (2, 4)
+                 AND b.start_at > CAST(:start_from AS timestamptz) - longest_booking()
+                 AND b.start_at < :window_end
+                 AND b.end_at > :start_from
+                WHERE r.store_id = :store_id
+                  AND r.is_active
+                ORDER BY r.store_room_id, b.start_at
+                """
+            ),
+            {"store_id": store_id, "start_from": start_from, "window_end": window_end},
+        )
+
+        rooms: dict[int, tuple[str, list[tuple[datetime, datetime]]]] = {}
+        for row in result.mappings():
+            _, busy = rooms.setdefault(row["store_room_id"], (row["room_name"], []))
+            if row["start_at"] is not None:
+                busy.append((row["start_at"], row["end_at"]))
+        return rooms
+
+    async def get_availability(
+        self,
+        store_id: int,
+        *,
+        script_id: int,
+        start_from: datetime,
+        start_to: datetime,
+        step_minutes: int,
+    ) -> AvailabilityResponse:
+        if start_to <= start_from:
+            raise BadRequestError("to must be after from.")
+        if start_to - start_from > timedelta(days=MAX_WINDOW_DAYS):
+            raise BadRequestError(f"availability window cannot exceed {MAX_WINDOW_DAYS} days.")
+
+        script_result = await self.session.execute(
+            text(
+                """
+                SELECT s.estimated_minutes
+                FROM store_script AS ss
+                JOIN script AS s ON s.script_id = ss.script_id
+                WHERE ss.store_id = :store_id
+                  AND ss.script_id = :script_id
+                  AND ss.is_active
+                """
+            ),
+            {"store_id": store_id, "script_id": script_id},
+        )
+        estimated_minutes = script_result.scalar_one_or_none()
+        if estimated_minutes is None:
+            raise NotFoundError(f"store_id={store_id} does not have active script_id={script_id}.")
+
+        duration = timedelta(minutes=estimated_minutes)
+        window_end = start_to + duration
+        rooms = await self._load_room_busy(store_id, start_from, window_end)
+
+        step = timedelta(minutes=step_minutes)
+        items = []
+        for store_room_id, (room_name, busy) in rooms.items():
+            gaps = _free_gaps(_merge_busy(busy), start_from, window_end, duration)
+            items.append(
+                RoomAvailabilityItem.model_construct(
+                    store_room_id=store_room_id,
+                    room_name=room_name,
+                    free_intervals=[
+                        AvailabilityInterval.model_construct(start_at=gap_start, end_at=gap_end)
+                        for gap_start, gap_end in gaps
+                    ],
+                    start_times=_grid_starts(gaps, start_from, start_to, step, duration),
+                )
+            )
+        return AvailabilityResponse.model_construct(
+            store_id=store_id,
+            script_id=script_id,
+            estimated_minutes=estimated_minutes,
+            start_from=start_from,
+            start_to=start_to,
+            step_minutes=step_minutes,
+            rooms=items,
+        )
+
+    async def get_suggestions(
+        self,
+        store_id: int,
+        *,
+        script_id: int,
+        start_from: datetime,
+        start_to: datetime,
+        step_minutes: int,
+    ) -> SuggestionResponse:
+        """Start times where an active room and enough member DMs are free together.
+
+        DM bookings in other stores count as busy. A script with no DM characters only
+        needs a room.
+        """
+        if start_to <= start_from:
+            raise BadRequestError("to must be after from.")
+        if start_to - start_from > timedelta(days=MAX_WINDOW_DAYS):
+            raise BadRequestError(f"suggestion window cannot exceed {MAX_WINDOW_DAYS} days.")
+
+        script_result = await self.session.execute(
+            text(
+                """
+                SELECT s.estimated_minutes, s.dm_count
+                FROM store_script AS ss
+                JOIN script AS s ON s.script_id = ss.script_id
+                WHERE ss.store_id = :store_id
+                  AND ss.script_id = :script_id
+                  AND ss.is_active
+                """
+            ),
+            {"store_id": store_id, "script_id": script_id},
+        )
+        script = script_result.mappings().one_or_none()
+        if script is None:
+            raise NotFoundError(f"store_id={store_id} does not have active script_id={script_id}.")
+
+        duration = timedelta(minutes=script["estimated_minutes"])
+        window_end = start_to + duration
+        rooms = await self._load_room_busy(store_id, start_from, window_end)
+        # Same bounded range scan as the rooms, on ix_dm_booking_interval_dm_start_at.
+        dm_result = await self.session.execute(
+            text(
+                """
+                SELECT m.dm_id, i.start_at, i.end_at
+                FROM dm_store_membership AS m
+                JOIN dm AS d
+                  ON d.dm_id = m.dm_id
+                 AND d.is_active
+                LEFT JOIN dm_booking_interval AS i
+                  ON i.dm_id = m.dm_id
+                 AND i.start_at > CAST(:start_from AS timestamptz) - longest_booking()
+                 AND i.start_at < :window_end
+                 AND i.end_at > :start_from
+                WHERE m.store_id = :store_id
+                ORDER BY m.dm_id, i.start_at
+                """
+            ),
+            {"store_id": store_id, "start_from": start_from, "window_end": window_end},
+        )
+        dm_busy: dict[int, list[tuple[datetime, datetime]]] = {}
+        for row in dm_result.mappings():
+            busy = dm_busy.setdefault(row["dm_id"], [])
+            if row["start_at"] is not None:
+                busy.append((row["start_at"], row["end_at"]))
+
+        step = timedelta(minutes=step_minutes)
+        starts = []
+        start_at = start_from
+        while start_at < start_to:
+            starts.append(start_at)
+            start_at += step
+        suggestions = _sweep_suggestions(
+            starts,
+            {store_room_id: busy for store_room_id, (_, busy) in rooms.items()},
+            dm_busy,
+            duration,
+            script["dm_count"],
+        )
+        return SuggestionResponse.model_construct(
+            store_id=store_id,
+            script_id=script_id,
+            estimated_minutes=script["estimated_minutes"],
+            dm_count=script["dm_count"],
+            start_from=start_from,
+            start_to=start_to,
+            step_minutes=step_minutes,
+            suggestions=[
+                SuggestionItem.model_construct(
+                    start_at=start_at,
+                    end_at=start_at + duration,
+                    store_room_ids=store_room_ids,
+                    dm_ids=dm_ids,
+                )
+                for start_at, store_room_ids, dm_ids in suggestions
+            ],
+        )
+
+    async def _load_occupancy_masks(
+        self, store_id: int, date_from: date, date_to: date
+    ) -> dict[int, tuple[str, int]]:
+        """Chained quarter-hour masks per active store room, day 0 being `date_from`."""
+        result = await self.session.execute(
+            text(
+                """
+                SELECT r.store_room_id,
+                       r.name AS room_name,
+                       o.occupancy_date,
+                       o.quarter_hours::text AS quarter_hours
+                FROM store_room AS r
+                LEFT JOIN store_room_day_occupancy AS o
+                  ON o.store_room_id = r.store_room_id
+                 AND o.occupancy_date BETWEEN :date_from AND :date_to
+                WHERE r.store_id = :store_id
+                  AND r.is_active
+                ORDER BY r.store_room_id, o.occupancy_date
+                """
+            ),
+            {"store_id": store_id, "date_from": date_from, "date_to": date_to},
+        )
+        rooms: dict[int, tuple[str, list[tuple[date, int]]]] = {}
+        for row in result.mappings():
+            _, days = rooms.setdefault(row["store_room_id"], (row["room_name"], []))
+            if row["occupancy_date"] is not None:
+                days.append((row["occupancy_date"], parse_quarter_hours(row["quarter_hours"])))
+        return {
+            store_room_id: (room_name, chain_days(days, date_from))
+            for store_room_id, (room_name, days) in rooms.items()
+        }
+
+    async def get_occupancy(
+        self,
+        store_id: int,
+        *,
+        date_from: date,
+        date_to: date,
+    ) -> OccupancyMaskResponse:
+        days = (date_to - date_from).days + 1
+        if days < 1:
+            raise BadRequestError("to must not be before from.")
+        if days > MAX_OCCUPANCY_DAYS:
+            raise BadRequestError(f"date range cannot exceed {MAX_OCCUPANCY_DAYS} days.")
+
+        masks = await self._load_occupancy_masks(store_id, date_from, date_to)
+        rooms = []
+        for store_room_id, (room_name, chained) in masks.items():
+            day_items = []
+            for day_index in range(days):
+                day_mask = day_slice(chained, day_index)
+                if day_mask:
+                    day_items.append(
+                        OccupancyDayItem.model_construct(
+                            occupancy_date=date_from + timedelta(days=day_index),
+                            quarter_hours=format_quarter_hours(day_mask),
+                            occupied_minutes=day_mask.bit_count() * QUARTER_MINUTES,
+                        )
+                    )
+            rooms.append(
+                RoomOccupancyMaskItem.model_construct(
+                    store_room_id=store_room_id,
+                    room_name=room_name,
+                    occupied_minutes=chained.bit_count() * QUARTER_MINUTES,
+                    days=day_items,
+                )
+            )
+        return OccupancyMaskResponse.model_construct(
+            store_id=store_id,
+            date_from=date_from,
+            date_to=date_to,
+            quarter_minutes=QUARTER_MINUTES,
+            rooms=rooms,
+        )
+
+    async def get_heatmap(
+        self,
+        store_id: int,
+        *,
+        month: date,
+        bucket_minutes: int,
+    ) -> HeatmapResponse:
+        if month.day != 1:
+            raise BadRequestError("month must be the first day of a month.")
+        quarters_per_bucket, remainder = divmod(bucket_minutes, QUARTER_MINUTES)
+        if remainder or quarters_per_bucket < 1 or QUARTERS_PER_DAY % quarters_per_bucket:
+            raise BadRequestError(
+                f"bucket must be a multiple of {QUARTER_MINUTES} minutes that divides a day."
+            )
+
+        version_result = await self.session.execute(
+            text(
+                """
+                SELECT COALESCE(v.version, 0)
+                FROM store AS s
+                LEFT JOIN store_occupancy_version AS v
+                  ON v.store_id = s.store_id
+                WHERE s.store_id = :store_id
+                """
+            ),
+            {"store_id": store_id},
+        )
+        version = version_result.scalar_one_or_none()
+        if version is None:
+            raise NotFoundError(f"store_id={store_id} was not found.")
+        cache_key = (store_id, month, bucket_minutes)
+        cached = _heatmap_cache.get(cache_key)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+
+        next_month = date(month.year + month.month // 12, month.month % 12 + 1, 1)
+        days = (next_month - month).days
+        masks = await self._load_occupancy_masks(store_id, month, next_month - timedelta(days=1))
+        columns = column_masks(days, quarters_per_bucket)
+        response = HeatmapResponse.model_construct(
+            store_id=store_id,
+            month=month,
+            bucket_minutes=bucket_minutes,
+            days_in_month=days,
+            rooms=[
+                HeatmapRoomItem.model_construct(
+                    store_room_id=store_room_id,
+                    room_name=room_name,
+                    occupied_days=[
+                        (bucket_any(chained, quarters_per_bucket) & column).bit_count()
+                        for column in columns
+                    ],
+                )
+                for store_room_id, (room_name, chained) in masks.items()
+            ],
+        )
+
+        if cache_key not in _heatmap_cache and len(_heatmap_cache) >= HEATMAP_CACHE_SIZE:
+            del _heatmap_cache[next(iter(_heatmap_cache))]
+        _heatmap_cache[cache_key] = (version, response)
+        return response
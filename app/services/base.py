@@ -1,6 +1,12 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 
 
+def contains_pattern(value: str) -> str:
+    """LIKE/ILIKE pattern matching ``value`` anywhere, with wildcards escaped."""
+    escaped = value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
 class BaseService:
     def __init__(self, session: AsyncSession) -> None:
         self.session = session
@@ -1,11 +1,18 @@
-from datetime import timedelta
+import csv
+import io
+from collections.abc import AsyncIterator
+from datetime import date, datetime, time, timedelta
+from zoneinfo import ZoneInfo
 
 from sqlalchemy import text
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncResult
 
 from app.core.errors import ConflictError, NotFoundError
 from app.schemas.booking import (
     AddBookingClientRequest,
+    BookingExportFormat,
+    BookingExportRow,
     BookingItem,
     BookingListResponse,
     ConfirmBookingRequest,
@@ -14,6 +21,60 @@ from app.schemas.booking import (
 )
 from app.services.base import BaseService
 
+EXPORT_CHUNK_ROWS = 500
+EXPORT_COLUMNS = list(BookingExportRow.model_fields)
+EXPORT_SELECT_SQL = """
+    SELECT b.booking_id,
+           b.booking_status_id,
+           b.target_month,
+           b.start_at,
+           b.end_at,
+           b.script_id,
+           s.name AS script_name,
+           b.store_room_id,
+           r.name AS room_name,
+           ARRAY(
+               SELECT bc.client_id
+               FROM {booking_client} AS bc
+               WHERE bc.booking_id = b.booking_id
+               ORDER BY bc.client_id
+           ) AS client_ids,
+           ARRAY(
+               SELECT m.dm_id
+               FROM {character_dm_match} AS m
+               WHERE m.booking_id = b.booking_id
+               ORDER BY m.dm_id
+           ) AS dm_ids,
+           b.conflict_booking_ids
+    FROM {booking} AS b
+    LEFT JOIN script AS s
+      ON s.script_id = b.script_id
+    LEFT JOIN store_room AS r
+      ON r.store_room_id = b.store_room_id
+    WHERE {where_clause}
+"""
+LIST_SELECT_SQL = """
+    SELECT b.booking_id,
+           b.store_id,
+           b.script_id,
+           b.booking_status_id,
+           b.target_month,
+           b.start_at,
+           b.end_at,
+           b.duration_override_minutes,
+           b.conflict_booking_ids,
+           b.updated_at,
+           {archived} AS archived
+    FROM {booking} AS b
+    WHERE {where_clause}
+"""
+STORE_TIME_ZONE = ZoneInfo("America/Toronto")
+
+
+def _month_sort_at(target_month: str) -> datetime:
+    """`booking_sort_at()` of an unscheduled booking in `target_month`."""
+    return datetime.combine(date.fromisoformat(target_month), time(), STORE_TIME_ZONE)
+
 
 class BookingService(BaseService):
     async def _assert_store_exists(self, store_id: int) -> None:
@@ -24,10 +85,32 @@ class BookingService(BaseService):
         if result.scalar_one_or_none() is None:
             raise NotFoundError(f"store_id={store_id} was not found.")
 
-    async def _get_booking_row(self, store_id: int, booking_id: int) -> dict:
+    async def _get_archive_horizon(self, store_id: int) -> datetime | None:
+        """Every archived booking of the store sorts before this; None when none are."""
         result = await self.session.execute(
             text(
                 """
+                SELECT h.archived_before
+                FROM store AS st
+                LEFT JOIN booking_archive_horizon AS h
+                  ON h.store_id = st.store_id
+                WHERE st.store_id = :store_id
+                """
+            ),
+            {"store_id": store_id},
+        )
+        row = result.mappings().one_or_none()
+        if row is None:
+            raise NotFoundError(f"store_id={store_id} was not found.")
+        return row["archived_before"]
+
+    async def _get_booking_row(
+        self, store_id: int, booking_id: int, *, archived: bool = False
+    ) -> dict:
+        table_name = "booking_archive" if archived else "booking"
+        result = await self.session.execute(
+            text(
+                f"""
                 SELECT booking_id,
                        store_id,
                        script_id,
@@ -35,8 +118,9 @@ class BookingService(BaseService):
                        target_month,
                        start_at,
                        end_at,
-                       duration_override_minutes
-                FROM booking
+                       duration_override_minutes,
+                       conflict_booking_ids
+                FROM {table_name}
                 WHERE store_id = :store_id
                   AND booking_id = :booking_id
                 """
@@ -48,124 +132,180 @@ class BookingService(BaseService):
             raise NotFoundError(f"booking_id={booking_id} was not found.")
         return row
 
-    async def _get_booking_client_ids(self, booking_id: int) -> list[int]:
+    async def _get_client_map(
+        self, booking_ids: list[int], *, archived: bool = False
+    ) -> dict[int, list[int]]:
+        table_name = "booking_client_archive" if archived else "booking_client"
         result = await self.session.execute(
             text(
-                """
-                SELECT client_id
-                FROM booking_client
-                WHERE booking_id = :booking_id
+                f"""
+                SELECT booking_id, client_id
+                FROM {table_name}
+                WHERE booking_id = ANY(:booking_ids)
                 ORDER BY client_id
                 """
             ),
-            {"booking_id": booking_id},
+            {"booking_ids": booking_ids},
         )
-        return [row["client_id"] for row in result.mappings().all()]
+        client_map: dict[int, list[int]] = {booking_id: [] for booking_id in booking_ids}
+        for row in result.mappings().all():
+            client_map[row["booking_id"]].append(row["client_id"])
+        return client_map
 
-    async def _get_conflicts(self, booking_id: int) -> tuple[bool, int, list[int]]:
-        booking_result = await self.session.execute(
-            text(
-                """
-                SELECT booking_id, store_room_id, start_at, end_at, booking_status_id
-                FROM booking
-                WHERE booking_id = :booking_id
-                """
-            ),
-            {"booking_id": booking_id},
-        )
-        booking_row = booking_result.mappings().one_or_none()
-        if booking_row is None:
-            return False, 0, []
-        if (
-            booking_row["store_room_id"] is None
-            or booking_row["start_at"] is None
-            or booking_row["end_at"] is None
-        ):
-            return False, 0, []
-        if booking_row["booking_status_id"] not in (2, 4):
-            return False, 0, []
-        conflict_result = await self.session.execute(
+    async def _get_conflict_maps(self, rows: list[dict]) -> dict[str, dict[int, list[int]]]:
+        """DM and client conflicting booking ids, in one statement for all rows.
+
+        `dm` is a shared matched DM and `client` a shared client, both across stores;
+        same-room conflicts are stored on the booking row itself. Every lookup is a range
+        scan bounded below by the longest booking.
+        """
+        conflict_maps: dict[str, dict[int, list[int]]] = {
+            kind: {row["booking_id"]: [] for row in rows} for kind in ("dm", "client")
+        }
+        booking_ids = [
+            row["booking_id"]
+            for row in rows
+            if row["booking_status_id"] in (2, 4) and row["start_at"] is not None
+        ]
+        if not booking_ids:
+            return conflict_maps
+        result = await self.session.execute(
             text(
                 """
-                SELECT b2.booking_id
-                FROM booking AS b2
-                WHERE b2.store_room_id = :store_room_id
-                  AND b2.booking_id <> :booking_id
-                  AND b2.booking_status_id IN (2, 4)
-                  AND b2.start_at < :end_at
-                  AND b2.end_at > :start_at
-                ORDER BY b2.booking_id
+                WITH span AS (
+                    SELECT longest_booking() AS longest
+                )
+                SELECT DISTINCT 'dm' AS conflict_kind,
+                       i.booking_id,
+                       i2.booking_id AS conflict_booking_id
+                FROM dm_booking_interval AS i
+                JOIN dm_booking_interval AS i2
+                  ON i2.dm_id = i.dm_id
+                 AND i2.booking_id <> i.booking_id
+                 AND i2.start_at > i.start_at - (SELECT longest FROM span)
+                 AND i2.start_at < i.end_at
+                 AND i2.end_at > i.start_at
+                WHERE i.booking_id = ANY(:booking_ids)
+                UNION ALL
+                SELECT DISTINCT 'client',
+                       b.booking_id,
+                       b2.booking_id
+                FROM booking AS b
+                JOIN booking_client AS bc
+                  ON bc.booking_id = b.booking_id
+                JOIN booking_client AS bc2
+                  ON bc2.client_id = bc.client_id
+                 AND bc2.booking_id <> bc.booking_id
+                 AND bc2.booking_sort_at > bc.booking_sort_at - (SELECT longest FROM span)
+                 AND bc2.booking_sort_at < b.end_at
+                JOIN LATERAL (
+                    -- LIMIT keeps this a primary-key probe per candidate; flattened, the
+                    -- planner hashes the whole booking table.
+                    SELECT b2.booking_id
+                    FROM booking AS b2
+                    WHERE b2.booking_id = bc2.booking_id
+                      AND b2.booking_status_id IN (2, 4)
+                      AND b2.end_at > b.start_at
+                    LIMIT 1
+                ) AS b2 ON true
+                WHERE b.booking_id = ANY(:booking_ids)
+                  AND b.booking_status_id IN (2, 4)
+                ORDER BY conflict_booking_id
                 """
             ),
-            {
-                "store_room_id": booking_row["store_room_id"],
-                "booking_id": booking_id,
-                "start_at": booking_row["start_at"],
-                "end_at": booking_row["end_at"],
-            },
+            {"booking_ids": booking_ids},
         )
-        conflict_ids = [row["booking_id"] for row in conflict_result.mappings().all()]
-        return bool(conflict_ids), len(conflict_ids), conflict_ids
+        for row in result.mappings().all():
+            conflict_maps[row["conflict_kind"]][row["booking_id"]].append(
+                row["conflict_booking_id"]
+            )
+        return conflict_maps
 
-    async def _build_booking_item(self, row: dict) -> BookingItem:
-        client_ids = await self._get_booking_client_ids(booking_id=row["booking_id"])
-        has_conflict, conflict_count, conflict_booking_ids = await self._get_conflicts(
-            booking_id=row["booking_id"]
+    async def _build_booking_items(
+        self, rows: list[dict], *, archived: bool = False
+    ) -> list[BookingItem]:
+        if not rows:
+            return []
+        client_map = await self._get_client_map(
+            [row["booking_id"] for row in rows], archived=archived
         )
-        return BookingItem(
-            booking_id=row["booking_id"],
-            store_id=row["store_id"],
-            script_id=row["script_id"],
-            booking_status_id=row["booking_status_id"],
-            target_month=row["target_month"],
-            start_at=row["start_at"],
-            end_at=row["end_at"],
-            duration_override_minutes=row["duration_override_minutes"],
-            client_ids=client_ids,
-            has_conflict=has_conflict,
-            conflict_count=conflict_count,
-            conflict_booking_ids=conflict_booking_ids,
+        # Archived bookings have no DM intervals or live client rows left to overlap, so
+        # only the same-room ids stored when they were archived are reported.
+        conflict_maps = (
+            {kind: {row["booking_id"]: [] for row in rows} for kind in ("dm", "client")}
+            if archived
+            else await self._get_conflict_maps(rows)
         )
+        items: list[BookingItem] = []
+        for row in rows:
+            conflict_booking_ids = row["conflict_booking_ids"]
+            dm_conflict_booking_ids = conflict_maps["dm"][row["booking_id"]]
+            client_conflict_booking_ids = conflict_maps["client"][row["booking_id"]]
+            items.append(
+                BookingItem.model_construct(
+                    booking_id=row["booking_id"],
+                    store_id=row["store_id"],
+                    script_id=row["script_id"],
+                    booking_status_id=row["booking_status_id"],
+                    target_month=row["target_month"],
+                    start_at=row["start_at"],
+                    end_at=row["end_at"],
+                    duration_override_minutes=row["duration_override_minutes"],
+                    client_ids=client_map[row["booking_id"]],
+                    has_conflict=bool(conflict_booking_ids),
+                    conflict_count=len(conflict_booking_ids),
+                    conflict_booking_ids=conflict_booking_ids,
+                    has_dm_conflict=bool(dm_conflict_booking_ids),
+                    dm_conflict_booking_ids=dm_conflict_booking_ids,
+                    has_client_conflict=bool(client_conflict_booking_ids),
+                    client_conflict_booking_ids=client_conflict_booking_ids,
+                )
+            )
+        return items
+
+    async def _build_booking_item(self, row: dict, *, archived: bool = False) -> BookingItem:
+        items = await self._build_booking_items([row], archived=archived)
+        return items[0]
 
     async def create_incomplete_booking(
         self,
         store_id: int,
         payload: CreateIncompleteBookingRequest,
     ) -> BookingItem:
-        await self._assert_store_exists(store_id=store_id)
-        if payload.script_id is not None:
-            script_result = await self.session.execute(
+        async with self.session.begin():
+            await self._assert_store_exists(store_id=store_id)
+            if payload.script_id is not None:
+                script_result = await self.session.execute(
+                    text(
+                        """
+                        SELECT 1
+                        FROM store_script
+                        WHERE store_id = :store_id
+                          AND script_id = :script_id
+                        """
+                    ),
+                    {"store_id": store_id, "script_id": payload.script_id},
+                )
+                if script_result.scalar_one_or_none() is None:
+                    raise NotFoundError(
+                        f"script_id={payload.script_id} is not available for store_id={store_id}."
+                    )
+
+            client_result = await self.session.execute(
                 text(
                     """
-                    SELECT 1
-                    FROM store_script
-                    WHERE store_id = :store_id
-                      AND script_id = :script_id
+                    SELECT client_id
+                    FROM client
+                    WHERE client_id = ANY(:client_ids)
                     """
                 ),
-                {"store_id": store_id, "script_id": payload.script_id},
+                {"client_ids": payload.client_ids},
             )
-            if script_result.scalar_one_or_none() is None:
-                raise NotFoundError(
-                    f"script_id={payload.script_id} is not available for store_id={store_id}."
-                )
+            found_client_ids = {row["client_id"] for row in client_result.mappings().all()}
+            missing_clients = [cid for cid in payload.client_ids if cid not in found_client_ids]
+            if missing_clients:
+                raise NotFoundError(f"client_ids not found: {missing_clients}")
 
-        client_result = await self.session.execute(
-            text(
-                """
-                SELECT client_id
-                FROM client
-                WHERE client_id = ANY(:client_ids)
-                """
-            ),
-            {"client_ids": payload.client_ids},
-        )
-        found_client_ids = {row["client_id"] for row in client_result.mappings().all()}
-        missing_clients = [cid for cid in payload.client_ids if cid not in found_client_ids]
-        if missing_clients:
-            raise NotFoundError(f"client_ids not found: {missing_clients}")
-
-        async with self.session.begin():
             booking_result = await self.session.execute(
                 text(
                     """
@@ -178,7 +318,8 @@ class BookingService(BaseService):
                               target_month,
                               start_at,
                               end_at,
-                              duration_override_minutes
+                              duration_override_minutes,
+                              conflict_booking_ids
                     """
                 ),
                 {
@@ -193,12 +334,12 @@ class BookingService(BaseService):
                 text(
                     """
                     INSERT INTO booking_client (booking_id, client_id)
-                    SELECT :booking_id, unnest(:client_ids)
+                    SELECT :booking_id, unnest(CAST(:client_ids AS bigint[]))
                     """
                 ),
                 {"booking_id": booking_row["booking_id"], "client_ids": payload.client_ids},
             )
-        return await self._build_booking_item(booking_row)
+            return await self._build_booking_item(booking_row)
 
     async def list_bookings(
         self,
@@ -210,7 +351,7 @@ class BookingService(BaseService):
         limit: int,
         offset: int,
     ) -> BookingListResponse:
-        await self._assert_store_exists(store_id=store_id)
+        archived_before = await self._get_archive_horizon(store_id=store_id)
         conditions = ["b.store_id = :store_id"]
         params: dict[str, object] = {"store_id": store_id, "limit": limit, "offset": offset}
         if booking_status_id is not None:
@@ -219,38 +360,38 @@ class BookingService(BaseService):
         if target_month is not None:
             conditions.append("b.target_month = :target_month")
             params["target_month"] = target_month
+        archive_conditions = list(conditions)
         if has_conflict is not None:
-            conflict_clause = """
-                EXISTS (
-                    SELECT 1
-                    FROM booking AS b2
-                    WHERE b2.store_room_id = b.store_room_id
-                      AND b2.booking_id <> b.booking_id
-                      AND b2.booking_status_id IN (2, 4)
-                      AND b.booking_status_id IN (2, 4)
-                      AND b.start_at IS NOT NULL
-                      AND b.end_at IS NOT NULL
-                      AND b2.start_at < b.end_at
-                      AND b2.end_at > b.start_at
-                )
-            """
-            conditions.append(conflict_clause if has_conflict else f"NOT {conflict_clause}")
+            conditions.append("b.conflict_count > 0" if has_conflict else "b.conflict_count = 0")
+            archive_conditions.append(
+                "cardinality(b.conflict_booking_ids) > 0"
+                if has_conflict
+                else "cardinality(b.conflict_booking_ids) = 0"
+            )
 
         where_clause = " AND ".join(conditions)
+        query = LIST_SELECT_SQL.format(
+            booking="booking", archived="false", where_clause=where_clause
+        )
+        total_query = f"SELECT count(*) FROM booking AS b WHERE {where_clause}"
+        # Archived bookings are cancelled or completed and sort before the horizon; one with a
+        # target month was never scheduled and sorts at that month's start.
+        if (
+            archived_before is not None
+            and booking_status_id in (None, 3, 4)
+            and (target_month is None or _month_sort_at(target_month) < archived_before)
+        ):
+            archive_where_clause = " AND ".join(archive_conditions)
+            query += "UNION ALL" + LIST_SELECT_SQL.format(
+                booking="booking_archive", archived="true", where_clause=archive_where_clause
+            )
+            total_query = (
+                f"SELECT ({total_query}) + "
+                f"(SELECT count(*) FROM booking_archive AS b WHERE {archive_where_clause})"
+            )
         items_result = await self.session.execute(
             text(
-                f"""
-                SELECT b.booking_id,
-                       b.store_id,
-                       b.script_id,
-                       b.booking_status_id,
-                       b.target_month,
-                       b.start_at,
-                       b.end_at,
-                       b.duration_override_minutes
-                FROM booking AS b
-                WHERE {where_clause}
-                ORDER BY b.updated_at DESC, b.booking_id DESC
+                f"""{query}ORDER BY updated_at DESC, booking_id DESC
                 LIMIT :limit
                 OFFSET :offset
                 """
@@ -258,61 +399,109 @@ class BookingService(BaseService):
             params,
         )
         rows = items_result.mappings().all()
-        if not rows:
-            total_result = await self.session.execute(
-                text(f"SELECT count(*) FROM booking AS b WHERE {where_clause}"),
-                {k: v for k, v in params.items() if k not in {"limit", "offset"}},
-            )
-            total = total_result.scalar_one()
-            return BookingListResponse(items=[], limit=limit, offset=offset, total=total)
-
-        booking_ids = [row["booking_id"] for row in rows]
-        client_result = await self.session.execute(
-            text(
-                """
-                SELECT booking_id, client_id
-                FROM booking_client
-                WHERE booking_id = ANY(:booking_ids)
-                ORDER BY client_id
-                """
+        built = [
+            *await self._build_booking_items([row for row in rows if not row["archived"]]),
+            *await self._build_booking_items(
+                [row for row in rows if row["archived"]], archived=True
             ),
-            {"booking_ids": booking_ids},
-        )
-        client_map: dict[int, list[int]] = {bid: [] for bid in booking_ids}
-        for row in client_result.mappings().all():
-            client_map[row["booking_id"]].append(row["client_id"])
-
-        items: list[BookingItem] = []
-        for row in rows:
-            has_conflict_value, conflict_count, conflict_booking_ids = await self._get_conflicts(
-                booking_id=row["booking_id"]
-            )
-            items.append(
-                BookingItem(
-                    booking_id=row["booking_id"],
-                    store_id=row["store_id"],
-                    script_id=row["script_id"],
-                    booking_status_id=row["booking_status_id"],
-                    target_month=row["target_month"],
-                    start_at=row["start_at"],
-                    end_at=row["end_at"],
-                    duration_override_minutes=row["duration_override_minutes"],
-                    client_ids=client_map.get(row["booking_id"], []),
-                    has_conflict=has_conflict_value,
-                    conflict_count=conflict_count,
-                    conflict_booking_ids=conflict_booking_ids,
-                )
-            )
+        ]
+        items_by_id = {item.booking_id: item for item in built}
+        items = [items_by_id[row["booking_id"]] for row in rows]
 
         total_result = await self.session.execute(
-            text(f"SELECT count(*) FROM booking AS b WHERE {where_clause}"),
+            text(total_query),
             {k: v for k, v in params.items() if k not in {"limit", "offset"}},
         )
         total = total_result.scalar_one()
-        return BookingListResponse(items=items, limit=limit, offset=offset, total=total)
+        return BookingListResponse.model_construct(
+            items=items,
+            limit=limit,
+            offset=offset,
+            total=total,
+        )
+
+    async def export_bookings(
+        self,
+        store_id: int,
+        *,
+        start_from: datetime | None,
+        start_to: datetime | None,
+        export_format: BookingExportFormat,
+    ) -> AsyncIterator[bytes]:
+        # The whole export reads one REPEATABLE READ snapshot, so rows committed while it
+        # streams never show up half way through a month. Conflict ids are the ones stored
+        # on the booking row. Archived bookings are only read when the range reaches them.
+        await self.session.connection(
+            execution_options={"isolation_level": "REPEATABLE READ", "postgresql_readonly": True}
+        )
+        archived_before = await self._get_archive_horizon(store_id=store_id)
+        conditions = ["b.store_id = :store_id"]
+        params: dict[str, object] = {"store_id": store_id}
+        if start_from is not None:
+            conditions.append("b.start_at >= :start_from")
+            params["start_from"] = start_from
+        if start_to is not None:
+            conditions.append("b.start_at < :start_to")
+            params["start_to"] = start_to
+
+        where_clause = " AND ".join(conditions)
+        query = EXPORT_SELECT_SQL.format(
+            booking="booking",
+            booking_client="booking_client",
+            character_dm_match="character_dm_match",
+            where_clause=where_clause,
+        )
+        if archived_before is not None and (start_from is None or start_from < archived_before):
+            query += "UNION ALL" + EXPORT_SELECT_SQL.format(
+                booking="booking_archive",
+                booking_client="booking_client_archive",
+                character_dm_match="character_dm_match_archive",
+                where_clause=where_clause,
+            )
+        result = await self.session.stream(
+            text(f"{query}ORDER BY start_at NULLS LAST, booking_id"),
+            params,
+            execution_options={"yield_per": EXPORT_CHUNK_ROWS},
+        )
+        return self._render_export(result, export_format)
+
+    async def _render_export(
+        self,
+        result: AsyncResult,
+        export_format: BookingExportFormat,
+    ) -> AsyncIterator[bytes]:
+        try:
+            if export_format is BookingExportFormat.CSV:
+                buffer = io.StringIO()
+                writer = csv.DictWriter(buffer, fieldnames=EXPORT_COLUMNS)
+                writer.writeheader()
+                yield buffer.getvalue().encode()
+            async for rows in result.mappings().partitions():
+                items = [BookingExportRow.model_construct(**row) for row in rows]
+                if export_format is BookingExportFormat.NDJSON:
+                    serializer = BookingExportRow.__pydantic_serializer__
+                    yield b"".join(serializer.to_json(item) + b"\n" for item in items)
+                    continue
+                buffer.seek(0)
+                buffer.truncate()
+                for item in items:
+                    record = item.model_dump(mode="json")
+                    for column in ("client_ids", "dm_ids", "conflict_booking_ids"):
+                        record[column] = " ".join(str(value) for value in record[column])
+                    writer.writerow(record)
+                yield buffer.getvalue().encode()
+        finally:
+            await result.close()
+            await self.session.rollback()
 
     async def get_booking(self, store_id: int, booking_id: int) -> BookingItem:
-        row = await self._get_booking_row(store_id=store_id, booking_id=booking_id)
+        try:
+            row = await self._get_booking_row(store_id=store_id, booking_id=booking_id)
+        except NotFoundError:
+            row = await self._get_booking_row(
+                store_id=store_id, booking_id=booking_id, archived=True
+            )
+            return await self._build_booking_item(row, archived=True)
         return await self._build_booking_item(row)
 
     async def update_incomplete_booking(
@@ -324,23 +513,6 @@ class BookingService(BaseService):
         if payload.clear_script and payload.script_id is not None:
             raise ConflictError("clear_script cannot be combined with script_id.")
 
-        if payload.script_id is not None:
-            script_result = await self.session.execute(
-                text(
-                    """
-                    SELECT 1
-                    FROM store_script
-                    WHERE store_id = :store_id
-                      AND script_id = :script_id
-                    """
-                ),
-                {"store_id": store_id, "script_id": payload.script_id},
-            )
-            if script_result.scalar_one_or_none() is None:
-                raise NotFoundError(
-                    f"script_id={payload.script_id} is not available for store_id={store_id}."
-                )
-
         values = {"store_id": store_id, "booking_id": booking_id}
         updates = []
         if payload.target_month is not None:
@@ -365,14 +537,32 @@ class BookingService(BaseService):
                       target_month,
                       start_at,
                       end_at,
-                      duration_override_minutes
+                      duration_override_minutes,
+                      conflict_booking_ids
         """
         async with self.session.begin():
+            if payload.script_id is not None:
+                script_result = await self.session.execute(
+                    text(
+                        """
+                        SELECT 1
+                        FROM store_script
+                        WHERE store_id = :store_id
+                          AND script_id = :script_id
+                        """
+                    ),
+                    {"store_id": store_id, "script_id": payload.script_id},
+                )
+                if script_result.scalar_one_or_none() is None:
+                    raise NotFoundError(
+                        f"script_id={payload.script_id} is not available for store_id={store_id}."
+                    )
+
             result = await self.session.execute(text(query), values)
             row = result.mappings().one_or_none()
             if row is None:
                 raise ConflictError("booking is not incomplete or was not found.")
-        return await self._build_booking_item(row)
+            return await self._build_booking_item(row)
 
     async def confirm_booking(
         self,
@@ -471,64 +661,53 @@ class BookingService(BaseService):
             room_result = await self.session.execute(
                 text(
                     """
-                    SELECT store_room_id
-                    FROM store_room
-                    WHERE store_id = :store_id
-                      AND is_active = true
-                    ORDER BY store_room_id
+                    WITH span AS (
+                        SELECT CAST(:start_at AS timestamptz) - longest_booking() AS earliest_start
+                    )
+                    SELECT r.store_room_id,
+                           EXISTS (
+                               SELECT 1
+                               FROM booking AS b2
+                               WHERE b2.store_room_id = r.store_room_id
+                                 AND b2.booking_status_id IN (2, 4)
+                                 AND b2.start_at > (SELECT earliest_start FROM span)
+                                 AND b2.start_at < :end_at
+                                 AND b2.end_at > :start_at
+                           ) AS has_conflict
+                    FROM store_room AS r
+                    WHERE r.store_id = :store_id
+                      AND r.is_active = true
+                    ORDER BY r.store_room_id
                     """
                 ),
-                {"store_id": store_id},
+                {"store_id": store_id, "start_at": payload.start_at, "end_at": end_at},
             )
-            room_ids = [row["store_room_id"] for row in room_result.mappings().all()]
-            if not room_ids:
+            room_conflicts = {
+                row["store_room_id"]: row["has_conflict"] for row in room_result.mappings().all()
+            }
+            if not room_conflicts:
                 raise ConflictError("store has no active rooms.")
 
-            async def has_conflict(room_id: int) -> bool:
-                conflict_check = await self.session.execute(
-                    text(
-                        """
-                        SELECT 1
-                        FROM booking AS b2
-                        WHERE b2.store_room_id = :store_room_id
-                          AND b2.booking_status_id IN (2, 4)
-                          AND b2.start_at < :end_at
-                          AND b2.end_at > :start_at
-                        LIMIT 1
-                        """
-                    ),
-                    {"store_room_id": room_id, "start_at": payload.start_at, "end_at": end_at},
-                )
-                return conflict_check.scalar_one_or_none() is not None
-
             selected_room_id = None
             preferred_id = payload.preferred_room_id
             if preferred_id is not None:
-                room_exists = await self.session.execute(
-                    text(
-                        """
-                        SELECT 1
-                        FROM store_room
-                        WHERE store_id = :store_id
-                          AND store_room_id = :store_room_id
-                          AND is_active = true
-                        """
-                    ),
-                    {"store_id": store_id, "store_room_id": preferred_id},
-                )
-                if room_exists.scalar_one_or_none() is None:
+                if preferred_id not in room_conflicts:
                     raise NotFoundError(f"store_room_id={preferred_id} was not found.")
-                if not await has_conflict(preferred_id):
+                if not room_conflicts[preferred_id]:
                     selected_room_id = preferred_id
 
             if selected_room_id is None:
-                for room_id in room_ids:
-                    if not await has_conflict(room_id):
-                        selected_room_id = room_id
-                        break
+                selected_room_id = next(
+                    (
+                        room_id
+                        for room_id, has_conflict in room_conflicts.items()
+                        if not has_conflict
+                    ),
+                    None,
+                )
 
             if selected_room_id is None:
-                selected_room_id = preferred_id or room_ids[0]
+                selected_room_id = preferred_id or next(iter(room_conflicts))
 
             slot_result = await self.session.execute(
                 text(
@@ -560,6 +739,7 @@ class BookingService(BaseService):
                     """
                     UPDATE booking
                     SET booking_status_id = 2,
+                        target_month = NULL,
                         slot_id = :slot_id,
                         store_room_id = :store_room_id,
                         start_at = :start_at,
@@ -572,7 +752,8 @@ class BookingService(BaseService):
                               target_month,
                               start_at,
                               end_at,
-                              duration_override_minutes
+                              duration_override_minutes,
+                              conflict_booking_ids
                     """
                 ),
                 {
@@ -583,7 +764,7 @@ class BookingService(BaseService):
                 },
             )
             updated_row = update_result.mappings().one()
-        return await self._build_booking_item(updated_row)
+            return await self._build_booking_item(updated_row)
 
     async def cancel_booking(self, store_id: int, booking_id: int) -> BookingItem:
         async with self.session.begin():
@@ -602,7 +783,8 @@ class BookingService(BaseService):
                               target_month,
                               start_at,
                               end_at,
-                              duration_override_minutes
+                              duration_override_minutes,
+                              conflict_booking_ids
                     """
                 ),
                 {"store_id": store_id, "booking_id": booking_id},
@@ -610,7 +792,7 @@ class BookingService(BaseService):
             row = result.mappings().one_or_none()
             if row is None:
                 raise NotFoundError(f"booking_id={booking_id} was not found.")
-        return await self._build_booking_item(row)
+            return await self._build_booking_item(row)
 
     async def complete_booking(self, store_id: int, booking_id: int) -> BookingItem:
         async with self.session.begin():
@@ -646,13 +828,14 @@ class BookingService(BaseService):
                               target_month,
                               start_at,
                               end_at,
-                              duration_override_minutes
+                              duration_override_minutes,
+                              conflict_booking_ids
                     """
                 ),
                 {"store_id": store_id, "booking_id": booking_id},
             )
             row = result.mappings().one()
-        return await self._build_booking_item(row)
+            return await self._build_booking_item(row)
 
     async def add_booking_client(
         self,
@@ -699,7 +882,7 @@ class BookingService(BaseService):
                 raise ConflictError("client already linked to booking.") from exc
 
             booking_row = await self._get_booking_row(store_id=store_id, booking_id=booking_id)
-        return await self._build_booking_item(booking_row)
+            return await self._build_booking_item(booking_row)
 
     async def remove_booking_client(
         self,
@@ -753,4 +936,4 @@ class BookingService(BaseService):
                 )
 
             booking_row = await self._get_booking_row(store_id=store_id, booking_id=booking_id)
-        return await self._build_booking_item(booking_row)
+            return await self._build_booking_item(booking_row)
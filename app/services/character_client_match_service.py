@@ -34,11 +34,12 @@ class CharacterClientMatchService(BaseService):
         booking_id: int,
         payload: CreateCharacterClientMatchRequest,
     ) -> CharacterClientMatchItem:
-        status_id = await self._assert_booking(store_id=store_id, booking_id=booking_id)
-        if status_id != 1:
-            raise ConflictError("matches can only be modified for incomplete bookings.")
         try:
             async with self.session.begin():
+                status_id = await self._assert_booking(store_id=store_id, booking_id=booking_id)
+                if status_id != 1:
+                    raise ConflictError("matches can only be modified for incomplete bookings.")
+
                 result = await self.session.execute(
                     text(
                         """
@@ -68,10 +69,6 @@ class CharacterClientMatchService(BaseService):
         match_id: int,
         payload: UpdateCharacterClientMatchRequest,
     ) -> CharacterClientMatchItem:
-        status_id = await self._assert_booking(store_id=store_id, booking_id=booking_id)
-        if status_id != 1:
-            raise ConflictError("matches can only be modified for incomplete bookings.")
-
         values = {"booking_id": booking_id, "match_id": match_id}
         updates = []
         if payload.character_id is not None:
@@ -93,6 +90,10 @@ class CharacterClientMatchService(BaseService):
         """
         try:
             async with self.session.begin():
+                status_id = await self._assert_booking(store_id=store_id, booking_id=booking_id)
+                if status_id != 1:
+                    raise ConflictError("matches can only be modified for incomplete bookings.")
+
                 result = await self.session.execute(text(query), values)
                 row = result.mappings().one_or_none()
                 if row is None:
@@ -104,11 +105,11 @@ class CharacterClientMatchService(BaseService):
         return CharacterClientMatchItem(**row)
 
     async def delete_match(self, store_id: int, booking_id: int, match_id: int) -> None:
-        status_id = await self._assert_booking(store_id=store_id, booking_id=booking_id)
-        if status_id != 1:
-            raise ConflictError("matches can only be modified for incomplete bookings.")
-
         async with self.session.begin():
+            status_id = await self._assert_booking(store_id=store_id, booking_id=booking_id)
+            if status_id != 1:
+                raise ConflictError("matches can only be modified for incomplete bookings.")
+
             result = await self.session.execute(
                 text(
                     """
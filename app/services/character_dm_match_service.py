@@ -34,11 +34,12 @@ class CharacterDmMatchService(BaseService):
         booking_id: int,
         payload: CreateCharacterDmMatchRequest,
     ) -> CharacterDmMatchItem:
-        status_id = await self._assert_booking(store_id=store_id, booking_id=booking_id)
-        if status_id != 1:
-            raise ConflictError("matches can only be modified for incomplete bookings.")
         try:
             async with self.session.begin():
+                status_id = await self._assert_booking(store_id=store_id, booking_id=booking_id)
+                if status_id != 1:
+                    raise ConflictError("matches can only be modified for incomplete bookings.")
+
                 result = await self.session.execute(
                     text(
                         """
@@ -68,10 +69,6 @@ class CharacterDmMatchService(BaseService):
         match_id: int,
         payload: UpdateCharacterDmMatchRequest,
     ) -> CharacterDmMatchItem:
-        status_id = await self._assert_booking(store_id=store_id, booking_id=booking_id)
-        if status_id != 1:
-            raise ConflictError("matches can only be modified for incomplete bookings.")
-
         values = {"booking_id": booking_id, "match_id": match_id}
         updates = []
         if payload.dm_id is not None:
@@ -95,6 +92,10 @@ class CharacterDmMatchService(BaseService):
         """
         try:
             async with self.session.begin():
+                status_id = await self._assert_booking(store_id=store_id, booking_id=booking_id)
+                if status_id != 1:
+                    raise ConflictError("matches can only be modified for incomplete bookings.")
+
                 result = await self.session.execute(text(query), values)
                 row = result.mappings().one_or_none()
                 if row is None:
@@ -106,11 +107,11 @@ class CharacterDmMatchService(BaseService):
         return CharacterDmMatchItem(**row)
 
     async def delete_match(self, store_id: int, booking_id: int, match_id: int) -> None:
-        status_id = await self._assert_booking(store_id=store_id, booking_id=booking_id)
-        if status_id != 1:
-            raise ConflictError("matches can only be modified for incomplete bookings.")
-
         async with self.session.begin():
+            status_id = await self._assert_booking(store_id=store_id, booking_id=booking_id)
+            if status_id != 1:
+                raise ConflictError("matches can only be modified for incomplete bookings.")
+
             result = await self.session.execute(
                 text(
                     """
@@ -1,9 +1,69 @@
+import base64
+import binascii
+import re
+from datetime import datetime
+
 from sqlalchemy import text
-from sqlalchemy.exc import IntegrityError
+from sqlalchemy.exc import DBAPIError, IntegrityError
+
+from app.core.errors import BadRequestError, ConflictError, NotFoundError, QueryTimeoutError
+from app.schemas.client import (
+    ClientBookingItem,
+    ClientBookingListResponse,
+    ClientItem,
+    ClientListResponse,
+    ClientSearchResponse,
+    CreateClientRequest,
+    UpdateClientRequest,
+)
+from app.services.base import BaseService, contains_pattern
+
+
+SEARCH_TIMEOUT_MS = 300
+MIN_PHONE_SEARCH_DIGITS = 3
+QUERY_CANCELED_SQLSTATE = "57014"
+CLIENT_BOOKING_PAGE_SQL = """
+    SELECT b.booking_id,
+           b.store_id,
+           st.name AS store_name,
+           b.script_id,
+           s.name AS script_name,
+           b.booking_status_id,
+           b.target_month,
+           b.start_at,
+           b.end_at,
+           page.booking_sort_at
+    FROM (
+        SELECT bc.booking_id, bc.booking_sort_at
+        FROM {booking_client} AS bc
+        WHERE {where_clause}
+        ORDER BY bc.booking_sort_at DESC, bc.booking_id DESC
+        LIMIT :fetch
+    ) AS page
+    JOIN {booking} AS b
+      ON b.booking_id = page.booking_id
+    JOIN store AS st
+      ON st.store_id = b.store_id
+    LEFT JOIN script AS s
+      ON s.script_id = b.script_id
+    ORDER BY page.booking_sort_at DESC, page.booking_id DESC
+"""
+
+
+def _encode_booking_cursor(sort_at: datetime, booking_id: int) -> str:
+    raw = f"{sort_at.isoformat()}|{booking_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode()
 
-from app.core.errors import ConflictError, NotFoundError
-from app.schemas.client import ClientItem, ClientListResponse, CreateClientRequest, UpdateClientRequest
-from app.services.base import BaseService
+
+def _decode_booking_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        sort_at, booking_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        parsed = datetime.fromisoformat(sort_at), int(booking_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError) as exc:
+        raise BadRequestError("cursor is invalid.") from exc
+    if parsed[0].tzinfo is None:
+        raise BadRequestError("cursor is invalid.")
+    return parsed
 
 
 class ClientService(BaseService):
@@ -20,10 +80,72 @@ class ClientService(BaseService):
             ),
             {"limit": limit, "offset": offset},
         )
-        items = [ClientItem(**row) for row in items_result.mappings().all()]
+        items = [ClientItem.model_construct(**row) for row in items_result.mappings().all()]
         total_result = await self.session.execute(text("SELECT count(*) FROM client"))
         total = total_result.scalar_one()
-        return ClientListResponse(items=items, limit=limit, offset=offset, total=total)
+        return ClientListResponse.model_construct(
+            items=items,
+            limit=limit,
+            offset=offset,
+            total=total,
+        )
+
+    async def search_clients(self, q: str, limit: int) -> ClientSearchResponse:
+        q = q.strip()
+        if not q:
+            raise BadRequestError("q must not be blank.")
+
+        # Both predicates are substring matches served by the trigram indexes on
+        # display_name and phone_digits.
+        conditions = ["c.display_name ILIKE :name_pattern"]
+        params: dict[str, object] = {
+            "q": q,
+            "name_pattern": contains_pattern(q),
+            "phone_digits": None,
+            "limit": limit,
+        }
+        digits = re.sub(r"\D", "", q)
+        if len(digits) >= MIN_PHONE_SEARCH_DIGITS:
+            conditions.append("c.phone_digits LIKE :phone_pattern")
+            params["phone_digits"] = digits
+            params["phone_pattern"] = contains_pattern(digits)
+
+        try:
+            async with self.session.begin():
+                await self.session.execute(
+                    text(f"SET LOCAL statement_timeout = {SEARCH_TIMEOUT_MS}")
+                )
+                result = await self.session.execute(
+                    text(
+                        f"""
+                        SELECT c.client_id, c.display_name, c.phone, c.pic_storage_key
+                        FROM client AS c
+                        WHERE {" OR ".join(conditions)}
+                        ORDER BY
+                            CASE
+                                WHEN lower(c.display_name) = lower(:q)
+                                  OR c.phone_digits = :phone_digits THEN 0
+                                WHEN starts_with(lower(c.display_name), lower(:q))
+                                  OR starts_with(c.phone_digits, :phone_digits) THEN 1
+                                ELSE 2
+                            END,
+                            length(c.display_name),
+                            c.updated_at DESC,
+                            c.client_id DESC
+                        LIMIT :limit
+                        """
+                    ),
+                    params,
+                )
+                rows = result.mappings().all()
+        except DBAPIError as exc:
+            if getattr(exc.orig, "sqlstate", None) == QUERY_CANCELED_SQLSTATE:
+                raise QueryTimeoutError("client search took too long; refine q.") from exc
+            raise
+        return ClientSearchResponse.model_construct(
+            items=[ClientItem.model_construct(**row) for row in rows],
+            limit=limit,
+        )
 
     async def get_client(self, client_id: int) -> ClientItem:
         result = await self.session.execute(
@@ -41,6 +163,93 @@ class ClientService(BaseService):
             raise NotFoundError(f"client_id={client_id} was not found.")
         return ClientItem(**row)
 
+    async def list_client_bookings(
+        self,
+        client_id: int,
+        *,
+        allowed_store_ids: set[int],
+        limit: int,
+        cursor: str | None,
+    ) -> ClientBookingListResponse:
+        conditions = ["bc.client_id = :client_id", "bc.store_id = ANY(:allowed_store_ids)"]
+        params: dict[str, object] = {
+            "client_id": client_id,
+            "allowed_store_ids": sorted(allowed_store_ids),
+            "fetch": limit + 1,
+        }
+        if cursor is not None:
+            params["cursor_sort_at"], params["cursor_booking_id"] = _decode_booking_cursor(cursor)
+            conditions.append(
+                "(bc.booking_sort_at, bc.booking_id) < (:cursor_sort_at, :cursor_booking_id)"
+            )
+
+        client_result = await self.session.execute(
+            text(
+                """
+                SELECT (
+                    SELECT max(h.archived_before)
+                    FROM booking_archive_horizon AS h
+                    WHERE h.store_id = ANY(:allowed_store_ids)
+                ) AS archived_before
+                FROM client
+                WHERE client_id = :client_id
+                """
+            ),
+            {"client_id": client_id, "allowed_store_ids": params["allowed_store_ids"]},
+        )
+        client_row = client_result.mappings().one_or_none()
+        if client_row is None:
+            raise NotFoundError(f"client_id={client_id} was not found.")
+
+        # The page is picked from ix_booking_client_history alone; booking rows are only
+        # joined for the bookings being returned. Archived bookings all sort before
+        # `archived_before`, so the archive is only read when the page reaches past it.
+        where_clause = " AND ".join(conditions)
+        result = await self.session.execute(
+            text(
+                CLIENT_BOOKING_PAGE_SQL.format(
+                    booking_client="booking_client", booking="booking", where_clause=where_clause
+                )
+            ),
+            params,
+        )
+        rows = result.mappings().all()
+        archived_before = client_row["archived_before"]
+        if archived_before is not None and (
+            len(rows) <= limit or rows[-1]["booking_sort_at"] < archived_before
+        ):
+            archive_result = await self.session.execute(
+                text(
+                    CLIENT_BOOKING_PAGE_SQL.format(
+                        booking_client="booking_client_archive",
+                        booking="booking_archive",
+                        where_clause=where_clause,
+                    )
+                ),
+                params,
+            )
+            rows = sorted(
+                [*rows, *archive_result.mappings().all()],
+                key=lambda row: (row["booking_sort_at"], row["booking_id"]),
+                reverse=True,
+            )[: limit + 1]
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last = rows[-1]
+            next_cursor = _encode_booking_cursor(last["booking_sort_at"], last["booking_id"])
+        items = [
+            ClientBookingItem.model_construct(
+                **{key: value for key, value in row.items() if key != "booking_sort_at"}
+            )
+            for row in rows
+        ]
+        return ClientBookingListResponse.model_construct(
+            items=items,
+            limit=limit,
+            next_cursor=next_cursor,
+        )
+
     async def create_client(self, payload: CreateClientRequest) -> ClientItem:
         try:
             async with self.session.begin():
@@ -94,13 +303,21 @@ class ClientService(BaseService):
             if exists_result.scalar_one_or_none() is None:
                 raise NotFoundError(f"client_id={client_id} was not found.")
 
+            # Archived bookings still link the client, so each check covers both tables.
             dependency_checks = (
-                ("booking_client", "client is linked to bookings."),
-                ("character_client_match", "client is linked to character matches."),
+                (("booking_client", "booking_client_archive"), "client is linked to bookings."),
+                (
+                    ("character_client_match", "character_client_match_archive"),
+                    "client is linked to character matches.",
+                ),
             )
-            for table_name, message in dependency_checks:
+            for table_names, message in dependency_checks:
+                probes = " UNION ALL ".join(
+                    f"SELECT 1 FROM {table_name} WHERE client_id = :client_id"
+                    for table_name in table_names
+                )
                 result = await self.session.execute(
-                    text(f"SELECT 1 FROM {table_name} WHERE client_id = :client_id LIMIT 1"),
+                    text(f"{probes} LIMIT 1"),
                     {"client_id": client_id},
                 )
                 if result.scalar_one_or_none() is not None:
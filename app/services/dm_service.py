@@ -1,18 +1,27 @@
+from datetime import date, datetime, timedelta
+
 from sqlalchemy import text
 from sqlalchemy.exc import IntegrityError
 
-from app.core.errors import ConflictError, NotFoundError
+from app.core.errors import BadRequestError, ConflictError, NotFoundError
 from app.schemas.dm import (
     CreateDmRequest,
     CreateDmStoreMembershipRequest,
     DmItem,
+    DmBusyBlock,
+    DmFreeBusyResponse,
+    DmFreeInterval,
     DmListResponse,
     DmStoreMembershipItem,
     DmStoreMembershipListResponse,
+    DmWorkloadResponse,
+    DmWorkloadStoreItem,
     UpdateDmRequest,
 )
 from app.services.base import BaseService
 
+MAX_FREE_BUSY_DAYS = 31
+
 
 class DmService(BaseService):
     async def _assert_dm_exists(self, dm_id: int) -> None:
@@ -36,10 +45,10 @@ class DmService(BaseService):
             ),
             {"limit": limit, "offset": offset},
         )
-        items = [DmItem(**row) for row in items_result.mappings().all()]
+        items = [DmItem.model_construct(**row) for row in items_result.mappings().all()]
         total_result = await self.session.execute(text("SELECT count(*) FROM dm"))
         total = total_result.scalar_one()
-        return DmListResponse(items=items, limit=limit, offset=offset, total=total)
+        return DmListResponse.model_construct(items=items, limit=limit, offset=offset, total=total)
 
     async def get_dm(self, dm_id: int) -> DmItem:
         result = await self.session.execute(
@@ -111,7 +120,14 @@ class DmService(BaseService):
                 raise NotFoundError(f"dm_id={dm_id} was not found.")
 
             match_result = await self.session.execute(
-                text("SELECT 1 FROM character_dm_match WHERE dm_id = :dm_id LIMIT 1"),
+                text(
+                    """
+                    SELECT 1 FROM character_dm_match WHERE dm_id = :dm_id
+                    UNION ALL
+                    SELECT 1 FROM character_dm_match_archive WHERE dm_id = :dm_id
+                    LIMIT 1
+                    """
+                ),
                 {"dm_id": dm_id},
             )
             if match_result.scalar_one_or_none() is not None:
@@ -142,13 +158,20 @@ class DmService(BaseService):
             ),
             {"dm_id": dm_id, "limit": limit, "offset": offset},
         )
-        items = [DmStoreMembershipItem(**row) for row in items_result.mappings().all()]
+        items = [
+            DmStoreMembershipItem.model_construct(**row) for row in items_result.mappings().all()
+        ]
         total_result = await self.session.execute(
             text("SELECT count(*) FROM dm_store_membership WHERE dm_id = :dm_id"),
             {"dm_id": dm_id},
         )
         total = total_result.scalar_one()
-        return DmStoreMembershipListResponse(items=items, limit=limit, offset=offset, total=total)
+        return DmStoreMembershipListResponse.model_construct(
+            items=items,
+            limit=limit,
+            offset=offset,
+            total=total,
+        )
 
     async def create_dm_store_membership(
         self, dm_id: int, payload: CreateDmStoreMembershipRequest
@@ -218,3 +241,110 @@ class DmService(BaseService):
             )
             if result.scalar_one_or_none() is None:
                 raise NotFoundError(f"dm_id={dm_id} does not have store_id={store_id} membership.")
+
+    async def get_dm_workload(
+        self,
+        dm_id: int,
+        *,
+        month: date,
+        allowed_store_ids: set[int],
+    ) -> DmWorkloadResponse:
+        if month.day != 1:
+            raise BadRequestError("month must be the first day of a month.")
+        await self._assert_dm_exists(dm_id=dm_id)
+        next_month = date(month.year + month.month // 12, month.month % 12 + 1, 1)
+        result = await self.session.execute(
+            text(
+                """
+                SELECT w.store_id,
+                       s.name AS store_name,
+                       sum(w.session_count) AS session_count,
+                       sum(w.worked_minutes) AS worked_minutes
+                FROM dm_daily_workload AS w
+                JOIN store AS s
+                  ON s.store_id = w.store_id
+                WHERE w.dm_id = :dm_id
+                  AND w.work_date >= :month
+                  AND w.work_date < :next_month
+                  AND w.store_id = ANY(:allowed_store_ids)
+                GROUP BY w.store_id, s.name
+                HAVING sum(w.session_count) > 0
+                ORDER BY s.name, w.store_id
+                """
+            ),
+            {
+                "dm_id": dm_id,
+                "month": month,
+                "next_month": next_month,
+                "allowed_store_ids": sorted(allowed_store_ids),
+            },
+        )
+        stores = [DmWorkloadStoreItem.model_construct(**row) for row in result.mappings().all()]
+        return DmWorkloadResponse.model_construct(
+            dm_id=dm_id,
+            month=month,
+            session_count=sum(item.session_count for item in stores),
+            worked_minutes=sum(item.worked_minutes for item in stores),
+            stores=stores,
+        )
+
+    async def get_dm_free_busy(
+        self,
+        dm_id: int,
+        *,
+        start_from: datetime,
+        start_to: datetime,
+        allowed_store_ids: set[int],
+    ) -> DmFreeBusyResponse:
+        """Merged busy blocks and the free time between them, across every store.
+
+        Bookings in stores outside `allowed_store_ids` still make the DM busy, but their
+        ids are not listed.
+        """
+        if start_to <= start_from:
+            raise BadRequestError("to must be after from.")
+        if start_to - start_from > timedelta(days=MAX_FREE_BUSY_DAYS):
+            raise BadRequestError(f"window must be at most {MAX_FREE_BUSY_DAYS} days.")
+        await self._assert_dm_exists(dm_id=dm_id)
+        result = await self.session.execute(
+            text(
+                """
+                SELECT booking_id, store_id, start_at, end_at
+                FROM dm_booking_interval
+                WHERE dm_id = :dm_id
+                  AND start_at > CAST(:start_from AS timestamptz) - longest_booking()
+                  AND start_at < :start_to
+                  AND end_at > :start_from
+                ORDER BY start_at, booking_id
+                """
+            ),
+            {"dm_id": dm_id, "start_from": start_from, "start_to": start_to},
+        )
+        busy: list[DmBusyBlock] = []
+        for row in result.mappings().all():
+            if busy and row["start_at"] < busy[-1].end_at:
+                block = busy[-1]
+                block.end_at = max(block.end_at, row["end_at"])
+            else:
+                block = DmBusyBlock.model_construct(
+                    start_at=row["start_at"], end_at=row["end_at"], booking_ids=[]
+                )
+                busy.append(block)
+            if row["store_id"] in allowed_store_ids:
+                block.booking_ids.append(row["booking_id"])
+
+        free: list[DmFreeInterval] = []
+        cursor = start_from
+        for block in busy:
+            if block.start_at > cursor:
+                free.append(DmFreeInterval.model_construct(start_at=cursor, end_at=block.start_at))
+            cursor = max(cursor, block.end_at)
+        if cursor < start_to:
+            free.append(DmFreeInterval.model_construct(start_at=cursor, end_at=start_to))
+        return DmFreeBusyResponse.model_construct(
+            dm_id=dm_id,
+            start_from=start_from,
+            start_to=start_to,
+            busy=busy,
+            free=free,
+        )
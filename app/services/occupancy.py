@@ -0,0 +1,61 @@
+"""Quarter-hour occupancy bitsets for `store_room_day_occupancy`.
+
+Postgres stores one ``bit(96)`` per room and store-local day with quarter 0 leftmost.
+In Python a day is an ``int`` with quarter N at bit N, and consecutive days chain into
+one ``int`` (day D occupies bits ``D * 96`` to ``D * 96 + 95``), so a month of a room is
+evaluated with a handful of big-integer shifts and masks.
+"""
+
+from collections.abc import Iterable
+from datetime import date
+
+QUARTER_MINUTES = 15
+QUARTERS_PER_DAY = 96
+DAY_MASK = (1 << QUARTERS_PER_DAY) - 1
+
+
+def parse_quarter_hours(bits: str) -> int:
+    return int(bits[::-1], 2)
+
+
+def format_quarter_hours(mask: int) -> str:
+    return format(mask & DAY_MASK, f"0{QUARTERS_PER_DAY}b")[::-1]
+
+
+def chain_days(day_masks: Iterable[tuple[date, int]], date_from: date) -> int:
+    chained = 0
+    for day, mask in day_masks:
+        chained |= mask << ((day - date_from).days * QUARTERS_PER_DAY)
+    return chained
+
+
+def day_slice(chained: int, day_index: int) -> int:
+    return (chained >> (day_index * QUARTERS_PER_DAY)) & DAY_MASK
+
+
+def run_starts(free: int, length: int) -> int:
+    """Bits p of `free` for which bits p .. p + length - 1 are all set."""
+    starts = free
+    covered = 1
+    while covered < length:
+        step = min(covered, length - covered)
+        starts &= starts >> step
+        covered += step
+    return starts
+
+
+def bucket_any(chained: int, quarters_per_bucket: int) -> int:
+    """Sets the first bit of each bucket that has any occupied quarter (others are noise)."""
+    merged = chained
+    for shift in range(1, quarters_per_bucket):
+        merged |= chained >> shift
+    return merged
+
+
+def column_masks(days: int, quarters_per_bucket: int) -> list[int]:
+    """One mask per time-of-day bucket, selecting that bucket's first bit on every day."""
+    day_starts = sum(1 << (day * QUARTERS_PER_DAY) for day in range(days))
+    return [
+        day_starts << bucket_start
+        for bucket_start in range(0, QUARTERS_PER_DAY, quarters_per_bucket)
+    ]
@@ -1,10 +1,126 @@
+from collections.abc import Mapping
+from datetime import date, datetime
+from functools import partial
+
 from sqlalchemy import text
 from sqlalchemy.exc import IntegrityError
 
 from app.core.errors import ConflictError, NotFoundError
-from app.schemas.room import CreateRoomRequest, RoomItem, RoomListResponse, UpdateRoomRequest
+from app.schemas.room import (
+    CreateRoomRequest,
+    RepackDayResponse,
+    RepackMove,
+    RoomItem,
+    RoomListResponse,
+    UpdateRoomRequest,
+)
 from app.services.base import BaseService
 
+REPACK_SEARCH_LIMIT = 20_000
+
+
+def _room_preference(
+    room_id: int,
+    *,
+    current_id: int,
+    start_at: datetime,
+    current_starts: Mapping[int, list[datetime]],
+) -> tuple:
+    """Current room first, then rooms with no later booking, then the latest next booking."""
+    later = [other for other in current_starts[room_id] if other > start_at]
+    return (room_id != current_id, bool(later), -min(later).timestamp() if later else 0)
+
+
+def _repack_rooms(
+    bookings: list[Mapping],
+    room_ids: list[int],
+    fixed: Mapping[int, list[tuple[datetime, datetime]]],
+) -> tuple[dict[int, int], list[int]]:
+    """Room per booking leaving the fewest bookings unresolved, then making the fewest moves.
+
+    A depth-first search places bookings in start order, so a room is free exactly when the
+    last booking put in it has ended. Each booking tries its current room first, then the
+    rooms whose next booking starts latest. A booking no room can take stays in its room as
+    unresolved and still holds that room against later bookings. The search is exhaustive
+    within REPACK_SEARCH_LIMIT steps; a busier day gets the best assignment found by then.
+    """
+    ordered = sorted(bookings, key=lambda row: (row["start_at"], row["booking_id"]))
+    current_starts: dict[int, list[datetime]] = {room_id: [] for room_id in room_ids}
+    for row in ordered:
+        if row["store_room_id"] in current_starts:
+            current_starts[row["store_room_id"]].append(row["start_at"])
+
+    candidates: list[list[int]] = []
+    for row in ordered:
+        current_id, start_at, end_at = row["store_room_id"], row["start_at"], row["end_at"]
+        candidates.append(
+            sorted(
+                (
+                    room_id
+                    for room_id in room_ids
+                    if not any(
+                        fixed_start < end_at and fixed_end > start_at
+                        for fixed_start, fixed_end in fixed.get(room_id, ())
+                    )
+                ),
+                key=partial(
+                    _room_preference,
+                    current_id=current_id,
+                    start_at=start_at,
+                    current_starts=current_starts,
+                ),
+            )
+        )
+
+    free_at: dict[int, datetime | None] = {room_id: None for room_id in room_ids}
+    chosen: list[tuple[int, bool]] = []
+    best_score: tuple[int, int] | None = None
+    best: list[tuple[int, bool]] = []
+    steps = 0
+
+    def search(index: int, unresolved_count: int, moves: int) -> None:
+        nonlocal best_score, best, steps
+        if best_score is not None and (unresolved_count, moves) >= best_score:
+            return
+        if index == len(ordered):
+            best_score, best = (unresolved_count, moves), list(chosen)
+            return
+        steps += 1
+        if steps > REPACK_SEARCH_LIMIT and best_score is not None:
+            return
+        row = ordered[index]
+        current_id, start_at, end_at = row["store_room_id"], row["start_at"], row["end_at"]
+        for room_id in candidates[index]:
+            previous = free_at[room_id]
+            if previous is not None and previous > start_at:
+                continue
+            free_at[room_id] = end_at
+            chosen.append((room_id, False))
+            search(index + 1, unresolved_count, moves + (room_id != current_id))
+            chosen.pop()
+            free_at[room_id] = previous
+
+        # Left in place, overlapping whatever holds its room; it keeps holding the room.
+        previous = free_at.get(current_id)
+        if current_id in free_at and (previous is None or previous < end_at):
+            free_at[current_id] = end_at
+        chosen.append((current_id, True))
+        search(index + 1, unresolved_count + 1, moves)
+        chosen.pop()
+        if current_id in free_at:
+            free_at[current_id] = previous
+
+    search(0, 0, 0)
+    assignment = {
+        row["booking_id"]: room_id for row, (room_id, _) in zip(ordered, best, strict=True)
+    }
+    unresolved = [
+        row["booking_id"]
+        for row, (_, is_unresolved) in zip(ordered, best, strict=True)
+        if is_unresolved
+    ]
+    return assignment, unresolved
+
 
 class RoomService(BaseService):
     async def _assert_store_exists(self, store_id: int) -> None:
@@ -30,18 +146,23 @@ class RoomService(BaseService):
             ),
             {"store_id": store_id, "limit": limit, "offset": offset},
         )
-        items = [RoomItem(**row) for row in items_result.mappings().all()]
+        items = [RoomItem.model_construct(**row) for row in items_result.mappings().all()]
         total_result = await self.session.execute(
             text("SELECT count(*) FROM store_room WHERE store_id = :store_id"),
             {"store_id": store_id},
         )
         total = total_result.scalar_one()
-        return RoomListResponse(items=items, limit=limit, offset=offset, total=total)
+        return RoomListResponse.model_construct(
+            items=items,
+            limit=limit,
+            offset=offset,
+            total=total,
+        )
 
     async def create_room(self, store_id: int, payload: CreateRoomRequest) -> RoomItem:
-        await self._assert_store_exists(store_id=store_id)
         try:
             async with self.session.begin():
+                await self._assert_store_exists(store_id=store_id)
                 result = await self.session.execute(
                     text(
                         """
@@ -129,3 +250,114 @@ class RoomService(BaseService):
                 raise NotFoundError(
                     f"store_id={store_id} does not have store_room_id={store_room_id}."
                 )
+
+    async def repack_day(self, store_id: int, *, day: date, apply: bool) -> RepackDayResponse:
+        async with self.session.begin():
+            room_result = await self.session.execute(
+                text(
+                    """
+                    SELECT s.store_id, r.store_room_id, r.is_active
+                    FROM store AS s
+                    LEFT JOIN store_room AS r
+                      ON r.store_id = s.store_id
+                    WHERE s.store_id = :store_id
+                    ORDER BY r.store_room_id
+                    """
+                ),
+                {"store_id": store_id},
+            )
+            room_rows = room_result.mappings().all()
+            if not room_rows:
+                raise NotFoundError(f"store_id={store_id} was not found.")
+            all_room_ids = [
+                row["store_room_id"] for row in room_rows if row["store_room_id"] is not None
+            ]
+            active_room_ids = [row["store_room_id"] for row in room_rows if row["is_active"]]
+            if not active_room_ids:
+                raise ConflictError("store has no active rooms.")
+
+            # Scheduled bookings starting on the store-local day are movable; anything else
+            # occupying a room around the day (completed, or spilling over from the days on
+            # either side) stays where it is and blocks its room.
+            lock_clause = "FOR UPDATE OF b" if apply else ""
+            booking_result = await self.session.execute(
+                text(
+                    f"""
+                    WITH day AS (
+                        SELECT CAST(:day AS date)::timestamp AT TIME ZONE 'America/Toronto'
+                                   AS day_start,
+                               (CAST(:day AS date) + 1)::timestamp AT TIME ZONE 'America/Toronto'
+                                   AS day_end,
+                               longest_booking() AS max_duration
+                    )
+                    SELECT b.booking_id,
+                           b.store_room_id,
+                           b.start_at,
+                           b.end_at,
+                           (
+                               b.booking_status_id = 2
+                               AND b.start_at >= day.day_start
+                               AND b.start_at < day.day_end
+                           ) AS is_movable
+                    FROM booking AS b
+                    CROSS JOIN day
+                    WHERE b.store_room_id = ANY(:room_ids)
+                      AND b.booking_status_id IN (2, 4)
+                      AND b.start_at > day.day_start - day.max_duration
+                      AND b.start_at < day.day_end + day.max_duration
+                    ORDER BY b.start_at, b.booking_id
+                    {lock_clause}
+                    """
+                ),
+                {"day": day, "room_ids": all_room_ids},
+            )
+            booking_rows = booking_result.mappings().all()
+            movable = [row for row in booking_rows if row["is_movable"]]
+            fixed: dict[int, list[tuple[datetime, datetime]]] = {}
+            for row in booking_rows:
+                if not row["is_movable"]:
+                    fixed.setdefault(row["store_room_id"], []).append(
+                        (row["start_at"], row["end_at"])
+                    )
+
+            assignment, unresolved = _repack_rooms(movable, active_room_ids, fixed)
+            moves = [
+                RepackMove.model_construct(
+                    booking_id=row["booking_id"],
+                    start_at=row["start_at"],
+                    end_at=row["end_at"],
+                    from_store_room_id=row["store_room_id"],
+                    to_store_room_id=assignment[row["booking_id"]],
+                )
+                for row in movable
+                if assignment[row["booking_id"]] != row["store_room_id"]
+            ]
+
+            if apply and moves:
+                await self.session.execute(
+                    text(
+                        """
+                        UPDATE booking AS b
+                        SET store_room_id = moved.store_room_id,
+                            updated_at = now()
+                        FROM unnest(
+                            CAST(:booking_ids AS bigint[]),
+                            CAST(:store_room_ids AS bigint[])
+                        ) AS moved(booking_id, store_room_id)
+                        WHERE b.booking_id = moved.booking_id
+                        """
+                    ),
+                    {
+                        "booking_ids": [move.booking_id for move in moves],
+                        "store_room_ids": [move.to_store_room_id for move in moves],
+                    },
+                )
+
+        return RepackDayResponse.model_construct(
+            store_id=store_id,
+            day=day,
+            booking_count=len(movable),
+            applied=apply,
+            moves=moves,
+            unresolved_booking_ids=unresolved,
+        )
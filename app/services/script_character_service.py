@@ -37,20 +37,27 @@ class ScriptCharacterService(BaseService):
             ),
             {"script_id": script_id, "limit": limit, "offset": offset},
         )
-        items = [ScriptCharacterItem(**row) for row in items_result.mappings().all()]
+        items = [
+            ScriptCharacterItem.model_construct(**row) for row in items_result.mappings().all()
+        ]
         total_result = await self.session.execute(
             text("SELECT count(*) FROM script_character WHERE script_id = :script_id"),
             {"script_id": script_id},
         )
         total = total_result.scalar_one()
-        return ScriptCharacterListResponse(items=items, limit=limit, offset=offset, total=total)
+        return ScriptCharacterListResponse.model_construct(
+            items=items,
+            limit=limit,
+            offset=offset,
+            total=total,
+        )
 
     async def create_script_character(
         self, script_id: int, payload: CreateScriptCharacterRequest
     ) -> ScriptCharacterItem:
-        await self._assert_script_exists(script_id=script_id)
         try:
             async with self.session.begin():
+                await self._assert_script_exists(script_id=script_id)
                 result = await self.session.execute(
                     text(
                         """
@@ -9,36 +9,76 @@ from app.schemas.script import (
     ScriptListResponse,
     StoreScriptItem,
     StoreScriptListResponse,
+    UnplayedStoreScriptListResponse,
     UpdateScriptRequest,
     UpdateStoreScriptRequest,
 )
-from app.services.base import BaseService
+from app.services.base import BaseService, contains_pattern
+
+
+def _catalog_filters(
+    *, players: int | None, q: str | None
+) -> tuple[list[str], dict[str, object]]:
+    # player_count is maintained from active non-DM script_character rows, so group-size
+    # filtering reads script columns instead of aggregating characters per request.
+    conditions: list[str] = []
+    params: dict[str, object] = {}
+    if players is not None:
+        conditions.append("s.player_count = :players")
+        params["players"] = players
+    if q is not None and q.strip():
+        conditions.append("s.name ILIKE :name_pattern")
+        params["name_pattern"] = contains_pattern(q.strip())
+    return conditions, params
 
 
 class ScriptService(BaseService):
-    async def list_scripts(self, limit: int, offset: int) -> ScriptListResponse:
+    async def list_scripts(
+        self,
+        limit: int,
+        offset: int,
+        *,
+        players: int | None = None,
+        q: str | None = None,
+    ) -> ScriptListResponse:
+        conditions, params = _catalog_filters(players=players, q=q)
+        where_sql = f"WHERE {' AND '.join(conditions)}" if conditions else ""
         items_result = await self.session.execute(
             text(
-                """
-                SELECT script_id, name, estimated_minutes, pic_storage_key
-                FROM script
-                ORDER BY updated_at DESC, script_id DESC
+                f"""
+                SELECT s.script_id,
+                       s.name,
+                       s.estimated_minutes,
+                       s.pic_storage_key,
+                       s.player_count,
+                       s.dm_count
+                FROM script AS s
+                {where_sql}
+                ORDER BY s.updated_at DESC, s.script_id DESC
                 LIMIT :limit
                 OFFSET :offset
                 """
             ),
-            {"limit": limit, "offset": offset},
+            {**params, "limit": limit, "offset": offset},
+        )
+        items = [ScriptItem.model_construct(**row) for row in items_result.mappings().all()]
+        total_result = await self.session.execute(
+            text(f"SELECT count(*) FROM script AS s {where_sql}"),
+            params,
         )
-        items = [ScriptItem(**row) for row in items_result.mappings().all()]
-        total_result = await self.session.execute(text("SELECT count(*) FROM script"))
         total = total_result.scalar_one()
-        return ScriptListResponse(items=items, limit=limit, offset=offset, total=total)
+        return ScriptListResponse.model_construct(
+            items=items,
+            limit=limit,
+            offset=offset,
+            total=total,
+        )
 
     async def get_script(self, script_id: int) -> ScriptItem:
         result = await self.session.execute(
             text(
                 """
-                SELECT script_id, name, estimated_minutes, pic_storage_key
+                SELECT script_id, name, estimated_minutes, pic_storage_key, player_count, dm_count
                 FROM script
                 WHERE script_id = :script_id
                 """
@@ -58,7 +98,8 @@ class ScriptService(BaseService):
                         """
                         INSERT INTO script (name, estimated_minutes, pic_storage_key)
                         VALUES (:name, :estimated_minutes, :pic_storage_key)
-                        RETURNING script_id, name, estimated_minutes, pic_storage_key
+                        RETURNING script_id, name, estimated_minutes, pic_storage_key,
+                                  player_count, dm_count
                         """
                     ),
                     payload.model_dump(),
@@ -85,7 +126,8 @@ class ScriptService(BaseService):
             UPDATE script
             SET {", ".join(updates)}
             WHERE script_id = :script_id
-            RETURNING script_id, name, estimated_minutes, pic_storage_key
+            RETURNING script_id, name, estimated_minutes, pic_storage_key,
+                      player_count, dm_count
         """
         try:
             async with self.session.begin():
@@ -145,29 +187,112 @@ class ScriptService(BaseService):
             )
 
     async def list_store_scripts(
-        self, store_id: int, limit: int, offset: int
+        self,
+        store_id: int,
+        limit: int,
+        offset: int,
+        *,
+        players: int | None = None,
+        q: str | None = None,
     ) -> StoreScriptListResponse:
+        conditions, params = _catalog_filters(players=players, q=q)
+        conditions.insert(0, "ss.store_id = :store_id")
+        params["store_id"] = store_id
+        where_sql = " AND ".join(conditions)
         items_result = await self.session.execute(
             text(
-                """
-                SELECT s.script_id, s.name, s.estimated_minutes, s.pic_storage_key, ss.is_active
+                f"""
+                SELECT s.script_id,
+                       s.name,
+                       s.estimated_minutes,
+                       s.pic_storage_key,
+                       s.player_count,
+                       s.dm_count,
+                       ss.is_active
                 FROM store_script AS ss
                 JOIN script AS s ON s.script_id = ss.script_id
-                WHERE ss.store_id = :store_id
+                WHERE {where_sql}
                 ORDER BY ss.updated_at DESC, s.script_id DESC
                 LIMIT :limit
                 OFFSET :offset
                 """
             ),
-            {"store_id": store_id, "limit": limit, "offset": offset},
+            {**params, "limit": limit, "offset": offset},
         )
-        items = [StoreScriptItem(**row) for row in items_result.mappings().all()]
+        items = [StoreScriptItem.model_construct(**row) for row in items_result.mappings().all()]
         total_result = await self.session.execute(
-            text("SELECT count(*) FROM store_script WHERE store_id = :store_id"),
-            {"store_id": store_id},
+            text(
+                f"""
+                SELECT count(*)
+                FROM store_script AS ss
+                JOIN script AS s ON s.script_id = ss.script_id
+                WHERE {where_sql}
+                """
+            ),
+            params,
         )
         total = total_result.scalar_one()
-        return StoreScriptListResponse(items=items, limit=limit, offset=offset, total=total)
+        return StoreScriptListResponse.model_construct(
+            items=items,
+            limit=limit,
+            offset=offset,
+            total=total,
+        )
+
+    async def list_unplayed_store_scripts(
+        self, store_id: int, client_ids: list[int]
+    ) -> UnplayedStoreScriptListResponse:
+        client_ids = sorted(set(client_ids))
+        missing_result = await self.session.execute(
+            text(
+                """
+                SELECT requested.client_id
+                FROM unnest(CAST(:client_ids AS bigint[])) AS requested(client_id)
+                LEFT JOIN client AS c ON c.client_id = requested.client_id
+                WHERE c.client_id IS NULL
+                ORDER BY requested.client_id
+                """
+            ),
+            {"client_ids": client_ids},
+        )
+        missing = missing_result.scalars().all()
+        if missing:
+            raise NotFoundError(f"client_id={missing[0]} was not found.")
+
+        # client_played_script is maintained by triggers on booking and booking_client,
+        # so the anti-join probes one small index range per client instead of walking
+        # every booking the group has been on.
+        items_result = await self.session.execute(
+            text(
+                """
+                SELECT s.script_id,
+                       s.name,
+                       s.estimated_minutes,
+                       s.pic_storage_key,
+                       s.player_count,
+                       s.dm_count,
+                       ss.is_active
+                FROM store_script AS ss
+                JOIN script AS s ON s.script_id = ss.script_id
+                WHERE ss.store_id = :store_id
+                  AND ss.is_active
+                  AND NOT EXISTS (
+                      SELECT 1
+                      FROM client_played_script AS cps
+                      WHERE cps.client_id = ANY(:client_ids)
+                        AND cps.script_id = ss.script_id
+                        AND cps.play_count > 0
+                  )
+                ORDER BY s.name, s.script_id
+                """
+            ),
+            {"store_id": store_id, "client_ids": client_ids},
+        )
+        items = [StoreScriptItem.model_construct(**row) for row in items_result.mappings().all()]
+        return UnplayedStoreScriptListResponse.model_construct(
+            client_ids=client_ids,
+            items=items,
+        )
 
     async def create_store_script(
         self, store_id: int, payload: CreateStoreScriptRequest
@@ -220,7 +345,13 @@ class ScriptService(BaseService):
             result = await self.session.execute(
                 text(
                     """
-                    SELECT s.script_id, s.name, s.estimated_minutes, s.pic_storage_key, ss.is_active
+                    SELECT s.script_id,
+                           s.name,
+                           s.estimated_minutes,
+                           s.pic_storage_key,
+                           s.player_count,
+                           s.dm_count,
+                           ss.is_active
                     FROM store_script AS ss
                     JOIN script AS s ON s.script_id = ss.script_id
                     WHERE ss.store_id = :store_id
@@ -257,7 +388,13 @@ class ScriptService(BaseService):
             item_result = await self.session.execute(
                 text(
                     """
-                    SELECT s.script_id, s.name, s.estimated_minutes, s.pic_storage_key, ss.is_active
+                    SELECT s.script_id,
+                           s.name,
+                           s.estimated_minutes,
+                           s.pic_storage_key,
+                           s.player_count,
+                           s.dm_count,
+                           ss.is_active
                     FROM store_script AS ss
                     JOIN script AS s ON s.script_id = ss.script_id
                     WHERE ss.store_id = :store_id
@@ -30,18 +30,23 @@ class SlotService(BaseService):
             ),
             {"store_id": store_id, "limit": limit, "offset": offset},
         )
-        items = [SlotItem(**row) for row in items_result.mappings().all()]
+        items = [SlotItem.model_construct(**row) for row in items_result.mappings().all()]
         total_result = await self.session.execute(
             text("SELECT count(*) FROM slot WHERE store_id = :store_id"),
             {"store_id": store_id},
         )
         total = total_result.scalar_one()
-        return SlotListResponse(items=items, limit=limit, offset=offset, total=total)
+        return SlotListResponse.model_construct(
+            items=items,
+            limit=limit,
+            offset=offset,
+            total=total,
+        )
 
     async def create_slot(self, store_id: int, payload: CreateSlotRequest) -> SlotItem:
-        await self._assert_store_exists(store_id=store_id)
         try:
             async with self.session.begin():
+                await self._assert_store_exists(store_id=store_id)
                 result = await self.session.execute(
                     text(
                         """
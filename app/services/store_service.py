@@ -24,13 +24,18 @@ class StoreService(BaseService):
             ),
             {"allowed_store_ids": store_ids, "limit": limit, "offset": offset},
         )
-        items = [StoreItem(**row) for row in items_result.mappings().all()]
+        items = [StoreItem.model_construct(**row) for row in items_result.mappings().all()]
         total_result = await self.session.execute(
             text("SELECT count(*) FROM store WHERE store_id = ANY(:allowed_store_ids)"),
             {"allowed_store_ids": store_ids},
         )
         total = total_result.scalar_one()
-        return StoreListResponse(items=items, limit=limit, offset=offset, total=total)
+        return StoreListResponse.model_construct(
+            items=items,
+            limit=limit,
+            offset=offset,
+            total=total,
+        )
 
     async def get_store(self, store_id: int) -> StoreItem:
         result = await self.session.execute(
@@ -99,14 +104,18 @@ class StoreService(BaseService):
                 raise NotFoundError(f"store_id={store_id} was not found.")
 
             dependency_checks = (
-                ("store_room", "store has rooms."),
-                ("slot", "store has slots."),
-                ("booking", "store has bookings."),
-                ("store_script", "store has script mappings."),
+                (("store_room",), "store has rooms."),
+                (("slot",), "store has slots."),
+                (("booking", "booking_archive"), "store has bookings."),
+                (("store_script",), "store has script mappings."),
             )
-            for table_name, message in dependency_checks:
+            for table_names, message in dependency_checks:
+                probes = " UNION ALL ".join(
+                    f"SELECT 1 FROM {table_name} WHERE store_id = :store_id"
+                    for table_name in table_names
+                )
                 result = await self.session.execute(
-                    text(f"SELECT 1 FROM {table_name} WHERE store_id = :store_id LIMIT 1"),
+                    text(f"{probes} LIMIT 1"),
                     {"store_id": store_id},
                 )
                 if result.scalar_one_or_none() is not None:
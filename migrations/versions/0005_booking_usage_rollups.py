@@ -0,0 +1,209 @@
+"""0005_booking_usage_rollups
+
+Revision ID: 0005_booking_usage_rollups
+Revises: 0004_pic_key_standardization
+Create Date: 2026-10-19 09:00:00
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "0005_booking_usage_rollups"
+down_revision: Union[str, Sequence[str], None] = "0004_pic_key_standardization"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # All stores operate in Toronto; rollups are keyed by the store-local calendar day.
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION store_local_date(ts timestamptz)
+        RETURNS date AS $$
+            SELECT (ts AT TIME ZONE 'America/Toronto')::date
+        $$ LANGUAGE sql IMMUTABLE;
+        """
+    )
+
+    op.create_table(
+        "store_room_daily_usage",
+        sa.Column("store_room_id", sa.BigInteger(), nullable=False),
+        sa.Column("usage_date", sa.Date(), nullable=False),
+        sa.Column("store_id", sa.BigInteger(), nullable=False),
+        sa.Column("booking_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("booked_minutes", sa.Integer(), nullable=False, server_default="0"),
+        sa.ForeignKeyConstraint(
+            ["store_id"],
+            ["store.store_id"],
+            name="fk_store_room_daily_usage_store_id",
+            ondelete="CASCADE",
+        ),
+        sa.ForeignKeyConstraint(
+            ["store_room_id"],
+            ["store_room.store_room_id"],
+            name="fk_store_room_daily_usage_store_room_id",
+            ondelete="CASCADE",
+        ),
+        sa.PrimaryKeyConstraint("store_room_id", "usage_date", name="pk_store_room_daily_usage"),
+    )
+    op.create_index(
+        "ix_store_room_daily_usage_store_date",
+        "store_room_daily_usage",
+        ["store_id", "usage_date"],
+        unique=False,
+    )
+
+    op.create_table(
+        "store_script_monthly_usage",
+        sa.Column("store_id", sa.BigInteger(), nullable=False),
+        sa.Column("usage_month", sa.Date(), nullable=False),
+        sa.Column("script_id", sa.BigInteger(), nullable=False),
+        sa.Column("booking_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.ForeignKeyConstraint(
+            ["store_id"],
+            ["store.store_id"],
+            name="fk_store_script_monthly_usage_store_id",
+            ondelete="CASCADE",
+        ),
+        sa.ForeignKeyConstraint(
+            ["script_id"],
+            ["script.script_id"],
+            name="fk_store_script_monthly_usage_script_id",
+            ondelete="CASCADE",
+        ),
+        sa.PrimaryKeyConstraint(
+            "store_id",
+            "usage_month",
+            "script_id",
+            name="pk_store_script_monthly_usage",
+        ),
+        sa.CheckConstraint(
+            "usage_month = date_trunc('month', usage_month)::date",
+            name="ck_store_script_monthly_usage_month_first_day",
+        ),
+    )
+
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION apply_booking_usage(
+            p_store_id bigint,
+            p_store_room_id bigint,
+            p_script_id bigint,
+            p_start_at timestamptz,
+            p_end_at timestamptz,
+            p_sign integer
+        )
+        RETURNS void AS $$
+        DECLARE
+            local_date date := store_local_date(p_start_at);
+            minutes integer := round(extract(epoch FROM p_end_at - p_start_at) / 60)::integer;
+        BEGIN
+            INSERT INTO store_room_daily_usage (
+                store_room_id, usage_date, store_id, booking_count, booked_minutes
+            )
+            VALUES (p_store_room_id, local_date, p_store_id, p_sign, p_sign * minutes)
+            ON CONFLICT (store_room_id, usage_date) DO UPDATE
+            SET booking_count = store_room_daily_usage.booking_count + EXCLUDED.booking_count,
+                booked_minutes = store_room_daily_usage.booked_minutes + EXCLUDED.booked_minutes;
+
+            INSERT INTO store_script_monthly_usage (store_id, usage_month, script_id, booking_count)
+            VALUES (p_store_id, date_trunc('month', local_date)::date, p_script_id, p_sign)
+            ON CONFLICT (store_id, usage_month, script_id) DO UPDATE
+            SET booking_count = store_script_monthly_usage.booking_count + EXCLUDED.booking_count;
+        END;
+        $$ LANGUAGE plpgsql;
+        """
+    )
+
+    # Scheduled and completed bookings occupy a room; every transition in or out of
+    # those states moves the booking's contribution between rollup rows.
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION refresh_booking_usage()
+        RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP IN ('UPDATE', 'DELETE') AND OLD.booking_status_id IN (2, 4) THEN
+                PERFORM apply_booking_usage(
+                    OLD.store_id, OLD.store_room_id, OLD.script_id, OLD.start_at, OLD.end_at, -1
+                );
+            END IF;
+            IF TG_OP IN ('INSERT', 'UPDATE') AND NEW.booking_status_id IN (2, 4) THEN
+                PERFORM apply_booking_usage(
+                    NEW.store_id, NEW.store_room_id, NEW.script_id, NEW.start_at, NEW.end_at, 1
+                );
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER trg_booking_usage_insert_delete
+        AFTER INSERT OR DELETE ON booking
+        FOR EACH ROW
+        EXECUTE FUNCTION refresh_booking_usage();
+        """
+    )
+    # `end_at` is written by set_booking_end_at(), and UPDATE OF only sees columns named
+    # in the statement, so the duration inputs have to be listed as well.
+    op.execute(
+        """
+        CREATE TRIGGER trg_booking_usage_update
+        AFTER UPDATE OF
+            booking_status_id, store_room_id, script_id, start_at, end_at, duration_override_minutes
+        ON booking
+        FOR EACH ROW
+        WHEN (
+            (OLD.booking_status_id, OLD.store_room_id, OLD.script_id, OLD.start_at, OLD.end_at)
+            IS DISTINCT FROM
+            (NEW.booking_status_id, NEW.store_room_id, NEW.script_id, NEW.start_at, NEW.end_at)
+        )
+        EXECUTE FUNCTION refresh_booking_usage();
+        """
+    )
+
+    op.execute(
+        """
+        INSERT INTO store_room_daily_usage (
+            store_room_id, usage_date, store_id, booking_count, booked_minutes
+        )
+        SELECT store_room_id,
+               store_local_date(start_at),
+               store_id,
+               count(*),
+               sum(round(extract(epoch FROM end_at - start_at) / 60))::integer
+        FROM booking
+        WHERE booking_status_id IN (2, 4)
+        GROUP BY store_room_id, store_local_date(start_at), store_id
+        """
+    )
+    op.execute(
+        """
+        INSERT INTO store_script_monthly_usage (store_id, usage_month, script_id, booking_count)
+        SELECT store_id,
+               date_trunc('month', store_local_date(start_at))::date,
+               script_id,
+               count(*)
+        FROM booking
+        WHERE booking_status_id IN (2, 4)
+        GROUP BY store_id, date_trunc('month', store_local_date(start_at))::date, script_id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS trg_booking_usage_update ON booking;")
+    op.execute("DROP TRIGGER IF EXISTS trg_booking_usage_insert_delete ON booking;")
+    op.execute("DROP FUNCTION IF EXISTS refresh_booking_usage();")
+    op.execute(
+        "DROP FUNCTION IF EXISTS apply_booking_usage(bigint, bigint, bigint, timestamptz, timestamptz, integer);"
+    )
+    op.drop_table("store_script_monthly_usage")
+    op.drop_index("ix_store_room_daily_usage_store_date", table_name="store_room_daily_usage")
+    op.drop_table("store_room_daily_usage")
+    op.execute("DROP FUNCTION IF EXISTS store_local_date(timestamptz);")
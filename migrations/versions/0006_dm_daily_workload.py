@@ -0,0 +1,276 @@
+"""0006_dm_daily_workload
+
+Revision ID: 0006_dm_daily_workload
+Revises: 0005_booking_usage_rollups
+Create Date: 2026-10-19 11:00:00
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "0006_dm_daily_workload"
+down_revision: Union[str, Sequence[str], None] = "0005_booking_usage_rollups"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "dm_daily_workload",
+        sa.Column("dm_id", sa.BigInteger(), nullable=False),
+        sa.Column("work_date", sa.Date(), nullable=False),
+        sa.Column("store_id", sa.BigInteger(), nullable=False),
+        sa.Column("session_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("worked_minutes", sa.Integer(), nullable=False, server_default="0"),
+        sa.ForeignKeyConstraint(
+            ["dm_id"],
+            ["dm.dm_id"],
+            name="fk_dm_daily_workload_dm_id",
+            ondelete="CASCADE",
+        ),
+        sa.ForeignKeyConstraint(
+            ["store_id"],
+            ["store.store_id"],
+            name="fk_dm_daily_workload_store_id",
+            ondelete="CASCADE",
+        ),
+        sa.PrimaryKeyConstraint("dm_id", "work_date", "store_id", name="pk_dm_daily_workload"),
+    )
+    op.create_index(
+        "ix_dm_daily_workload_store_date",
+        "dm_daily_workload",
+        ["store_id", "work_date"],
+        unique=False,
+    )
+
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION apply_dm_workload(
+            p_dm_id bigint,
+            p_store_id bigint,
+            p_start_at timestamptz,
+            p_end_at timestamptz,
+            p_sign integer
+        )
+        RETURNS void AS $$
+        BEGIN
+            INSERT INTO dm_daily_workload (dm_id, work_date, store_id, session_count, worked_minutes)
+            VALUES (
+                p_dm_id,
+                store_local_date(p_start_at),
+                p_store_id,
+                p_sign,
+                p_sign * round(extract(epoch FROM p_end_at - p_start_at) / 60)::integer
+            )
+            ON CONFLICT (dm_id, work_date, store_id) DO UPDATE
+            SET session_count = dm_daily_workload.session_count + EXCLUDED.session_count,
+                worked_minutes = dm_daily_workload.worked_minutes + EXCLUDED.worked_minutes;
+        END;
+        $$ LANGUAGE plpgsql;
+        """
+    )
+
+    # A DM is paid once per completed booking however many characters they host in it,
+    # so a booking counts when it gains its first match for the DM and stops counting
+    # when the last one goes. Pair counts before the statement are rebuilt from the
+    # transition tables, which keeps multi-row statements correct.
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION apply_dm_match_changes(
+            old_booking_ids bigint[],
+            old_dm_ids bigint[],
+            new_booking_ids bigint[],
+            new_dm_ids bigint[]
+        )
+        RETURNS void AS $$
+        BEGIN
+            WITH changed AS (
+                SELECT booking_id, dm_id, sum(old_n) AS old_n, sum(new_n) AS new_n
+                FROM (
+                    SELECT booking_id, dm_id, 1 AS old_n, 0 AS new_n
+                    FROM unnest(old_booking_ids, old_dm_ids) AS o(booking_id, dm_id)
+                    UNION ALL
+                    SELECT booking_id, dm_id, 0, 1
+                    FROM unnest(new_booking_ids, new_dm_ids) AS n(booking_id, dm_id)
+                ) AS pairs
+                GROUP BY booking_id, dm_id
+            ),
+            deltas AS (
+                SELECT c.dm_id,
+                       b.store_id,
+                       store_local_date(b.start_at) AS work_date,
+                       round(extract(epoch FROM b.end_at - b.start_at) / 60)::integer AS minutes,
+                       (cur.n > 0)::integer - (cur.n - c.new_n + c.old_n > 0)::integer AS delta
+                FROM changed AS c
+                JOIN booking AS b
+                  ON b.booking_id = c.booking_id
+                 AND b.booking_status_id = 4
+                CROSS JOIN LATERAL (
+                    SELECT count(*) AS n
+                    FROM character_dm_match AS m
+                    WHERE m.booking_id = c.booking_id
+                      AND m.dm_id = c.dm_id
+                ) AS cur
+            )
+            INSERT INTO dm_daily_workload (dm_id, work_date, store_id, session_count, worked_minutes)
+            SELECT dm_id, work_date, store_id, sum(delta), sum(delta * minutes)
+            FROM deltas
+            WHERE delta <> 0
+            GROUP BY dm_id, work_date, store_id
+            ON CONFLICT (dm_id, work_date, store_id) DO UPDATE
+            SET session_count = dm_daily_workload.session_count + EXCLUDED.session_count,
+                worked_minutes = dm_daily_workload.worked_minutes + EXCLUDED.worked_minutes;
+        END;
+        $$ LANGUAGE plpgsql;
+        """
+    )
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION refresh_dm_workload_from_matches()
+        RETURNS trigger AS $$
+        DECLARE
+            old_booking_ids bigint[] := '{}';
+            old_dm_ids bigint[] := '{}';
+            new_booking_ids bigint[] := '{}';
+            new_dm_ids bigint[] := '{}';
+        BEGIN
+            IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                SELECT COALESCE(array_agg(booking_id), '{}'), COALESCE(array_agg(dm_id), '{}')
+                  INTO old_booking_ids, old_dm_ids
+                  FROM old_rows;
+            END IF;
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                SELECT COALESCE(array_agg(booking_id), '{}'), COALESCE(array_agg(dm_id), '{}')
+                  INTO new_booking_ids, new_dm_ids
+                  FROM new_rows;
+            END IF;
+            PERFORM apply_dm_match_changes(old_booking_ids, old_dm_ids, new_booking_ids, new_dm_ids);
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER trg_character_dm_match_workload_insert
+        AFTER INSERT ON character_dm_match
+        REFERENCING NEW TABLE AS new_rows
+        FOR EACH STATEMENT
+        EXECUTE FUNCTION refresh_dm_workload_from_matches();
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER trg_character_dm_match_workload_update
+        AFTER UPDATE ON character_dm_match
+        REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+        FOR EACH STATEMENT
+        EXECUTE FUNCTION refresh_dm_workload_from_matches();
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER trg_character_dm_match_workload_delete
+        AFTER DELETE ON character_dm_match
+        REFERENCING OLD TABLE AS old_rows
+        FOR EACH STATEMENT
+        EXECUTE FUNCTION refresh_dm_workload_from_matches();
+        """
+    )
+
+    # Booking deletes are handled BEFORE the row goes: the cascade removes its matches
+    # first otherwise, and the match trigger can no longer see the completed booking.
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION refresh_dm_workload_from_booking()
+        RETURNS trigger AS $$
+        DECLARE
+            match_dm_id bigint;
+        BEGIN
+            FOR match_dm_id IN
+                SELECT DISTINCT dm_id
+                FROM character_dm_match
+                WHERE booking_id = COALESCE(NEW.booking_id, OLD.booking_id)
+            LOOP
+                IF OLD.booking_status_id = 4 THEN
+                    PERFORM apply_dm_workload(
+                        match_dm_id, OLD.store_id, OLD.start_at, OLD.end_at, -1
+                    );
+                END IF;
+                IF TG_OP = 'UPDATE' AND NEW.booking_status_id = 4 THEN
+                    PERFORM apply_dm_workload(
+                        match_dm_id, NEW.store_id, NEW.start_at, NEW.end_at, 1
+                    );
+                END IF;
+            END LOOP;
+            IF TG_OP = 'DELETE' THEN
+                RETURN OLD;
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+        """
+    )
+    # `end_at` is written by set_booking_end_at(), and UPDATE OF only sees columns named
+    # in the statement, so the duration inputs have to be listed as well.
+    op.execute(
+        """
+        CREATE TRIGGER trg_booking_dm_workload_update
+        AFTER UPDATE OF
+            booking_status_id, store_id, script_id, start_at, end_at, duration_override_minutes
+        ON booking
+        FOR EACH ROW
+        WHEN (
+            (OLD.booking_status_id = 4 OR NEW.booking_status_id = 4)
+            AND (OLD.booking_status_id, OLD.store_id, OLD.start_at, OLD.end_at)
+                IS DISTINCT FROM
+                (NEW.booking_status_id, NEW.store_id, NEW.start_at, NEW.end_at)
+        )
+        EXECUTE FUNCTION refresh_dm_workload_from_booking();
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER trg_booking_dm_workload_delete
+        BEFORE DELETE ON booking
+        FOR EACH ROW
+        WHEN (OLD.booking_status_id = 4)
+        EXECUTE FUNCTION refresh_dm_workload_from_booking();
+        """
+    )
+
+    op.execute(
+        """
+        INSERT INTO dm_daily_workload (dm_id, work_date, store_id, session_count, worked_minutes)
+        SELECT s.dm_id,
+               store_local_date(b.start_at),
+               b.store_id,
+               count(*),
+               sum(round(extract(epoch FROM b.end_at - b.start_at) / 60))::integer
+        FROM (SELECT DISTINCT booking_id, dm_id FROM character_dm_match) AS s
+        JOIN booking AS b
+          ON b.booking_id = s.booking_id
+        WHERE b.booking_status_id = 4
+        GROUP BY s.dm_id, store_local_date(b.start_at), b.store_id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS trg_booking_dm_workload_delete ON booking;")
+    op.execute("DROP TRIGGER IF EXISTS trg_booking_dm_workload_update ON booking;")
+    op.execute("DROP FUNCTION IF EXISTS refresh_dm_workload_from_booking();")
+    op.execute("DROP TRIGGER IF EXISTS trg_character_dm_match_workload_delete ON character_dm_match;")
+    op.execute("DROP TRIGGER IF EXISTS trg_character_dm_match_workload_update ON character_dm_match;")
+    op.execute("DROP TRIGGER IF EXISTS trg_character_dm_match_workload_insert ON character_dm_match;")
+    op.execute("DROP FUNCTION IF EXISTS refresh_dm_workload_from_matches();")
+    op.execute("DROP FUNCTION IF EXISTS apply_dm_match_changes(bigint[], bigint[], bigint[], bigint[]);")
+    op.execute(
+        "DROP FUNCTION IF EXISTS apply_dm_workload(bigint, bigint, timestamptz, timestamptz, integer);"
+    )
+    op.drop_index("ix_dm_daily_workload_store_date", table_name="dm_daily_workload")
+    op.drop_table("dm_daily_workload")
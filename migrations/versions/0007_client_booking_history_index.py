@@ -0,0 +1,121 @@
+"""0007_client_booking_history_index
+
+Revision ID: 0007_client_booking_history
+Revises: 0006_dm_daily_workload
+Create Date: 2026-10-19 13:00:00
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "0007_client_booking_history"
+down_revision: Union[str, Sequence[str], None] = "0006_dm_daily_workload"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Scheduled bookings sort by start time, unscheduled ones by the start of their
+    # target month in store-local time.
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION booking_sort_at(start_at timestamptz, target_month date)
+        RETURNS timestamptz AS $$
+            SELECT COALESCE(start_at, target_month::timestamp AT TIME ZONE 'America/Toronto')
+        $$ LANGUAGE sql IMMUTABLE;
+        """
+    )
+
+    # The store and sort key are copied onto booking_client so a client's history page
+    # is read in order straight from ix_booking_client_history (index-only, stopping at
+    # the page limit) and booking rows are fetched only for the bookings returned.
+    op.add_column("booking_client", sa.Column("store_id", sa.BigInteger(), nullable=True))
+    op.add_column(
+        "booking_client",
+        sa.Column("booking_sort_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    op.execute(
+        """
+        UPDATE booking_client AS bc
+        SET store_id = b.store_id,
+            booking_sort_at = booking_sort_at(b.start_at, b.target_month)
+        FROM booking AS b
+        WHERE b.booking_id = bc.booking_id
+        """
+    )
+    op.alter_column("booking_client", "store_id", nullable=False)
+    op.alter_column("booking_client", "booking_sort_at", nullable=False)
+
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION set_booking_client_history_keys()
+        RETURNS trigger AS $$
+        BEGIN
+            SELECT b.store_id, booking_sort_at(b.start_at, b.target_month)
+              INTO NEW.store_id, NEW.booking_sort_at
+              FROM booking AS b
+             WHERE b.booking_id = NEW.booking_id;
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql;
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER trg_booking_client_set_history_keys
+        BEFORE INSERT OR UPDATE OF booking_id ON booking_client
+        FOR EACH ROW
+        EXECUTE FUNCTION set_booking_client_history_keys();
+        """
+    )
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION sync_booking_client_history_keys()
+        RETURNS trigger AS $$
+        BEGIN
+            UPDATE booking_client
+            SET booking_sort_at = booking_sort_at(NEW.start_at, NEW.target_month)
+            WHERE booking_id = NEW.booking_id;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER trg_booking_sync_client_history_keys
+        AFTER UPDATE OF start_at, target_month ON booking
+        FOR EACH ROW
+        WHEN (
+            booking_sort_at(OLD.start_at, OLD.target_month)
+            IS DISTINCT FROM booking_sort_at(NEW.start_at, NEW.target_month)
+        )
+        EXECUTE FUNCTION sync_booking_client_history_keys();
+        """
+    )
+
+    op.create_index(
+        "ix_booking_client_history",
+        "booking_client",
+        ["client_id", sa.text("booking_sort_at DESC"), sa.text("booking_id DESC")],
+        unique=False,
+        postgresql_include=["store_id"],
+    )
+    # Fully covered by the history index's leading column.
+    op.drop_index("ix_booking_client_client_id", table_name="booking_client")
+
+
+def downgrade() -> None:
+    op.create_index("ix_booking_client_client_id", "booking_client", ["client_id"], unique=False)
+    op.drop_index("ix_booking_client_history", table_name="booking_client")
+    op.execute("DROP TRIGGER IF EXISTS trg_booking_sync_client_history_keys ON booking;")
+    op.execute("DROP FUNCTION IF EXISTS sync_booking_client_history_keys();")
+    op.execute("DROP TRIGGER IF EXISTS trg_booking_client_set_history_keys ON booking_client;")
+    op.execute("DROP FUNCTION IF EXISTS set_booking_client_history_keys();")
+    op.drop_column("booking_client", "booking_sort_at")
+    op.drop_column("booking_client", "store_id")
+    op.execute("DROP FUNCTION IF EXISTS booking_sort_at(timestamptz, date);")
@@ -0,0 +1,182 @@
+"""0008_client_played_script
+
+Revision ID: 0008_client_played_script
+Revises: 0007_client_booking_history
+Create Date: 2026-10-19 15:00:00
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "0008_client_played_script"
+down_revision: Union[str, Sequence[str], None] = "0007_client_booking_history"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "client_played_script",
+        sa.Column("client_id", sa.BigInteger(), nullable=False),
+        sa.Column("script_id", sa.BigInteger(), nullable=False),
+        sa.Column("play_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.ForeignKeyConstraint(
+            ["client_id"],
+            ["client.client_id"],
+            name="fk_client_played_script_client_id",
+            ondelete="CASCADE",
+        ),
+        sa.ForeignKeyConstraint(
+            ["script_id"],
+            ["script.script_id"],
+            name="fk_client_played_script_script_id",
+            ondelete="CASCADE",
+        ),
+        sa.PrimaryKeyConstraint("client_id", "script_id", name="pk_client_played_script"),
+    )
+
+    # play_count is the number of scheduled or completed bookings of the script the
+    # client is on; a script counts as played while it is above zero.
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION apply_client_played_script(
+            p_client_id bigint,
+            p_script_id bigint,
+            p_delta integer
+        )
+        RETURNS void AS $$
+        BEGIN
+            INSERT INTO client_played_script (client_id, script_id, play_count)
+            VALUES (p_client_id, p_script_id, p_delta)
+            ON CONFLICT (client_id, script_id) DO UPDATE
+            SET play_count = client_played_script.play_count + EXCLUDED.play_count;
+        END;
+        $$ LANGUAGE plpgsql;
+        """
+    )
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION refresh_client_played_from_booking_client()
+        RETURNS trigger AS $$
+        DECLARE
+            played_script_id bigint;
+        BEGIN
+            IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                SELECT script_id INTO played_script_id
+                  FROM booking
+                 WHERE booking_id = OLD.booking_id
+                   AND booking_status_id IN (2, 4);
+                IF played_script_id IS NOT NULL THEN
+                    PERFORM apply_client_played_script(OLD.client_id, played_script_id, -1);
+                END IF;
+            END IF;
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                SELECT script_id INTO played_script_id
+                  FROM booking
+                 WHERE booking_id = NEW.booking_id
+                   AND booking_status_id IN (2, 4);
+                IF played_script_id IS NOT NULL THEN
+                    PERFORM apply_client_played_script(NEW.client_id, played_script_id, 1);
+                END IF;
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER trg_booking_client_played_insert_delete
+        AFTER INSERT OR DELETE ON booking_client
+        FOR EACH ROW
+        EXECUTE FUNCTION refresh_client_played_from_booking_client();
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER trg_booking_client_played_update
+        AFTER UPDATE OF booking_id, client_id ON booking_client
+        FOR EACH ROW
+        WHEN ((OLD.booking_id, OLD.client_id) IS DISTINCT FROM (NEW.booking_id, NEW.client_id))
+        EXECUTE FUNCTION refresh_client_played_from_booking_client();
+        """
+    )
+
+    # Like dm_daily_workload, booking deletes are applied BEFORE the row goes, while its
+    # booking_client rows are still there to enumerate.
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION refresh_client_played_from_booking()
+        RETURNS trigger AS $$
+        DECLARE
+            played_client_id bigint;
+        BEGIN
+            FOR played_client_id IN
+                SELECT client_id
+                FROM booking_client
+                WHERE booking_id = OLD.booking_id
+            LOOP
+                IF OLD.booking_status_id IN (2, 4) AND OLD.script_id IS NOT NULL THEN
+                    PERFORM apply_client_played_script(played_client_id, OLD.script_id, -1);
+                END IF;
+                IF TG_OP = 'UPDATE' AND NEW.booking_status_id IN (2, 4) AND NEW.script_id IS NOT NULL THEN
+                    PERFORM apply_client_played_script(played_client_id, NEW.script_id, 1);
+                END IF;
+            END LOOP;
+            IF TG_OP = 'DELETE' THEN
+                RETURN OLD;
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER trg_booking_client_played_update
+        AFTER UPDATE OF booking_status_id, script_id ON booking
+        FOR EACH ROW
+        WHEN (
+            (OLD.booking_status_id IN (2, 4)) IS DISTINCT FROM (NEW.booking_status_id IN (2, 4))
+            OR OLD.script_id IS DISTINCT FROM NEW.script_id
+        )
+        EXECUTE FUNCTION refresh_client_played_from_booking();
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER trg_booking_client_played_delete
+        BEFORE DELETE ON booking
+        FOR EACH ROW
+        WHEN (OLD.booking_status_id IN (2, 4))
+        EXECUTE FUNCTION refresh_client_played_from_booking();
+        """
+    )
+
+    op.execute(
+        """
+        INSERT INTO client_played_script (client_id, script_id, play_count)
+        SELECT bc.client_id, b.script_id, count(*)
+        FROM booking_client AS bc
+        JOIN booking AS b
+          ON b.booking_id = bc.booking_id
+        WHERE b.booking_status_id IN (2, 4)
+          AND b.script_id IS NOT NULL
+        GROUP BY bc.client_id, b.script_id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS trg_booking_client_played_delete ON booking;")
+    op.execute("DROP TRIGGER IF EXISTS trg_booking_client_played_update ON booking;")
+    op.execute("DROP FUNCTION IF EXISTS refresh_client_played_from_booking();")
+    op.execute("DROP TRIGGER IF EXISTS trg_booking_client_played_update ON booking_client;")
+    op.execute("DROP TRIGGER IF EXISTS trg_booking_client_played_insert_delete ON booking_client;")
+    op.execute("DROP FUNCTION IF EXISTS refresh_client_played_from_booking_client();")
+    op.execute("DROP FUNCTION IF EXISTS apply_client_played_script(bigint, bigint, integer);")
+    op.drop_table("client_played_script")
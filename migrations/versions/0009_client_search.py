@@ -0,0 +1,59 @@
+"""0009_client_search
+
+Revision ID: 0009_client_search
+Revises: 0008_client_played_script
+Create Date: 2026-10-19 16:00:00
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "0009_client_search"
+down_revision: Union[str, Sequence[str], None] = "0008_client_played_script"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Phones are stored as typed ("(416) 555-0101", "416.555.0101"); search matches on
+    # the digits only.
+    op.add_column(
+        "client",
+        sa.Column(
+            "phone_digits",
+            sa.Text(),
+            sa.Computed("nullif(regexp_replace(phone, '[^0-9]', '', 'g'), '')", persisted=True),
+            nullable=True,
+        ),
+    )
+
+    # Trigram GIN indexes serve the substring ILIKE/LIKE predicates of client search,
+    # including non-Latin names where prefix matching is not useful. Databases without
+    # the pg_trgm contrib module still migrate; search then falls back to a scan.
+    op.execute(
+        """
+        DO $$
+        BEGIN
+            IF EXISTS (SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm') THEN
+                CREATE EXTENSION IF NOT EXISTS pg_trgm;
+                CREATE INDEX ix_client_display_name_trgm
+                    ON client USING gin (display_name gin_trgm_ops);
+                CREATE INDEX ix_client_phone_digits_trgm
+                    ON client USING gin (phone_digits gin_trgm_ops);
+            ELSE
+                RAISE NOTICE 'pg_trgm is not available; client search indexes were not created.';
+            END IF;
+        END;
+        $$;
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_client_phone_digits_trgm;")
+    op.execute("DROP INDEX IF EXISTS ix_client_display_name_trgm;")
+    op.drop_column("client", "phone_digits")
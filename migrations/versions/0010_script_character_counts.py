@@ -0,0 +1,120 @@
+"""0010_script_character_counts
+
+Revision ID: 0010_script_character_counts
+Revises: 0009_client_search
+Create Date: 2026-10-19 17:00:00
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "0010_script_character_counts"
+down_revision: Union[str, Sequence[str], None] = "0009_client_search"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Active character counts, split into player (non-DM) and DM roles, so catalog
+    # listings can filter on group size without aggregating script_character.
+    op.add_column(
+        "script",
+        sa.Column("player_count", sa.Integer(), nullable=False, server_default="0"),
+    )
+    op.add_column(
+        "script",
+        sa.Column("dm_count", sa.Integer(), nullable=False, server_default="0"),
+    )
+    op.create_index("ix_script_player_count", "script", ["player_count", "name"], unique=False)
+
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION refresh_script_character_counts(p_script_ids bigint[])
+        RETURNS void AS $$
+        BEGIN
+            UPDATE script AS s
+            SET player_count = counts.player_count,
+                dm_count = counts.dm_count
+            FROM (
+                SELECT ids.script_id,
+                       count(sc.character_id) FILTER (WHERE NOT sc.is_dm) AS player_count,
+                       count(sc.character_id) FILTER (WHERE sc.is_dm) AS dm_count
+                FROM (SELECT DISTINCT unnest(p_script_ids)) AS ids(script_id)
+                LEFT JOIN script_character AS sc
+                  ON sc.script_id = ids.script_id
+                 AND sc.is_active
+                GROUP BY ids.script_id
+            ) AS counts
+            WHERE s.script_id = counts.script_id
+              AND (s.player_count, s.dm_count) IS DISTINCT FROM (counts.player_count, counts.dm_count);
+        END;
+        $$ LANGUAGE plpgsql;
+        """
+    )
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION refresh_script_counts_from_characters()
+        RETURNS trigger AS $$
+        DECLARE
+            changed_script_ids bigint[] := '{}';
+        BEGIN
+            IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                SELECT changed_script_ids || COALESCE(array_agg(DISTINCT script_id), '{}')
+                  INTO changed_script_ids
+                  FROM old_rows;
+            END IF;
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                SELECT changed_script_ids || COALESCE(array_agg(DISTINCT script_id), '{}')
+                  INTO changed_script_ids
+                  FROM new_rows;
+            END IF;
+            PERFORM refresh_script_character_counts(changed_script_ids);
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER trg_script_character_counts_insert
+        AFTER INSERT ON script_character
+        REFERENCING NEW TABLE AS new_rows
+        FOR EACH STATEMENT
+        EXECUTE FUNCTION refresh_script_counts_from_characters();
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER trg_script_character_counts_update
+        AFTER UPDATE ON script_character
+        REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+        FOR EACH STATEMENT
+        EXECUTE FUNCTION refresh_script_counts_from_characters();
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER trg_script_character_counts_delete
+        AFTER DELETE ON script_character
+        REFERENCING OLD TABLE AS old_rows
+        FOR EACH STATEMENT
+        EXECUTE FUNCTION refresh_script_counts_from_characters();
+        """
+    )
+
+    op.execute("SELECT refresh_script_character_counts(array_agg(script_id)) FROM script;")
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS trg_script_character_counts_delete ON script_character;")
+    op.execute("DROP TRIGGER IF EXISTS trg_script_character_counts_update ON script_character;")
+    op.execute("DROP TRIGGER IF EXISTS trg_script_character_counts_insert ON script_character;")
+    op.execute("DROP FUNCTION IF EXISTS refresh_script_counts_from_characters();")
+    op.execute("DROP FUNCTION IF EXISTS refresh_script_character_counts(bigint[]);")
+    op.drop_index("ix_script_player_count", table_name="script")
+    op.drop_column("script", "dm_count")
+    op.drop_column("script", "player_count")
@@ -0,0 +1,33 @@
+"""0011_booking_duration_index
+
+Revision ID: 0011_booking_duration_index
+Revises: 0010_script_character_counts
+Create Date: 2026-10-19 18:00:00
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0011_booking_duration_index"
+down_revision: Union[str, Sequence[str], None] = "0010_script_character_counts"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Overlap lookups bound the (store_room_id, start_at) range scan by the longest
+    # room-occupying booking; this index answers that max() from its last entry.
+    op.execute(
+        """
+        CREATE INDEX ix_booking_occupied_duration
+        ON booking ((end_at - start_at))
+        WHERE booking_status_id IN (2, 4)
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_booking_occupied_duration", table_name="booking")
@@ -0,0 +1,213 @@
+"""0012_room_day_occupancy
+
+Revision ID: 0012_room_day_occupancy
+Revises: 0011_booking_duration_index
+Create Date: 2026-10-19 19:00:00
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "0012_room_day_occupancy"
+down_revision: Union[str, Sequence[str], None] = "0011_booking_duration_index"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # One 96-bit mask per room and store-local day; bit N (leftmost = 0) is set when a
+    # scheduled or completed booking overlaps the N-th quarter hour of the wall-clock day.
+    # Partial quarters count as occupied. On DST change days the missing spring hour is
+    # never set and the repeated autumn hour shares its bits.
+    op.create_table(
+        "store_room_day_occupancy",
+        sa.Column("store_room_id", sa.BigInteger(), nullable=False),
+        sa.Column("occupancy_date", sa.Date(), nullable=False),
+        sa.Column("store_id", sa.BigInteger(), nullable=False),
+        sa.Column("quarter_hours", postgresql.BIT(96), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["store_id"],
+            ["store.store_id"],
+            name="fk_store_room_day_occupancy_store_id",
+            ondelete="CASCADE",
+        ),
+        sa.ForeignKeyConstraint(
+            ["store_room_id"],
+            ["store_room.store_room_id"],
+            name="fk_store_room_day_occupancy_store_room_id",
+            ondelete="CASCADE",
+        ),
+        sa.PrimaryKeyConstraint(
+            "store_room_id", "occupancy_date", name="pk_store_room_day_occupancy"
+        ),
+    )
+    op.create_index(
+        "ix_store_room_day_occupancy_store_date",
+        "store_room_day_occupancy",
+        ["store_id", "occupancy_date"],
+        unique=False,
+    )
+
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION quarter_hour_mask(
+            p_date date,
+            p_start_at timestamptz,
+            p_end_at timestamptz
+        )
+        RETURNS bit(96) AS $$
+        DECLARE
+            day_start timestamp := p_date::timestamp;
+            first_quarter integer := greatest(
+                0,
+                floor(extract(epoch FROM (p_start_at AT TIME ZONE 'America/Toronto') - day_start) / 900)
+            )::integer;
+            last_quarter integer := least(
+                96,
+                ceil(extract(epoch FROM (p_end_at AT TIME ZONE 'America/Toronto') - day_start) / 900)
+            )::integer;
+        BEGIN
+            IF last_quarter <= first_quarter THEN
+                RETURN repeat('0', 96)::bit(96);
+            END IF;
+            RETURN (
+                repeat('0', first_quarter)
+                || repeat('1', last_quarter - first_quarter)
+                || repeat('0', 96 - last_quarter)
+            )::bit(96);
+        END;
+        $$ LANGUAGE plpgsql IMMUTABLE;
+        """
+    )
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION refresh_room_day_occupancy(p_store_room_id bigint, p_date date)
+        RETURNS void AS $$
+        DECLARE
+            day_start timestamptz := p_date::timestamp AT TIME ZONE 'America/Toronto';
+            day_end timestamptz := (p_date + 1)::timestamp AT TIME ZONE 'America/Toronto';
+            day_mask bit(96);
+            room_store_id bigint;
+        BEGIN
+            SELECT bit_or(quarter_hour_mask(p_date, b.start_at, b.end_at)), min(b.store_id)
+              INTO day_mask, room_store_id
+              FROM booking AS b
+             WHERE b.store_room_id = p_store_room_id
+               AND b.booking_status_id IN (2, 4)
+               AND b.start_at > day_start - (
+                   SELECT max(end_at - start_at) FROM booking WHERE booking_status_id IN (2, 4)
+               )
+               AND b.start_at < day_end
+               AND b.end_at > day_start;
+
+            IF day_mask IS NULL THEN
+                DELETE FROM store_room_day_occupancy
+                WHERE store_room_id = p_store_room_id
+                  AND occupancy_date = p_date;
+            ELSE
+                INSERT INTO store_room_day_occupancy (
+                    store_room_id, occupancy_date, store_id, quarter_hours
+                )
+                VALUES (p_store_room_id, p_date, room_store_id, day_mask)
+                ON CONFLICT (store_room_id, occupancy_date) DO UPDATE
+                SET quarter_hours = EXCLUDED.quarter_hours;
+            END IF;
+        END;
+        $$ LANGUAGE plpgsql;
+        """
+    )
+
+    # Overlapping bookings share bits, so a day is rebuilt from its bookings rather than
+    # patched with the changed booking's mask.
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION refresh_room_occupancy_from_booking()
+        RETURNS trigger AS $$
+        DECLARE
+            touched_date date;
+        BEGIN
+            IF TG_OP IN ('UPDATE', 'DELETE') AND OLD.booking_status_id IN (2, 4) THEN
+                FOR touched_date IN
+                    SELECT generate_series(
+                        store_local_date(OLD.start_at),
+                        store_local_date(OLD.end_at - interval '1 microsecond'),
+                        interval '1 day'
+                    )::date
+                LOOP
+                    PERFORM refresh_room_day_occupancy(OLD.store_room_id, touched_date);
+                END LOOP;
+            END IF;
+            IF TG_OP IN ('INSERT', 'UPDATE') AND NEW.booking_status_id IN (2, 4) THEN
+                FOR touched_date IN
+                    SELECT generate_series(
+                        store_local_date(NEW.start_at),
+                        store_local_date(NEW.end_at - interval '1 microsecond'),
+                        interval '1 day'
+                    )::date
+                LOOP
+                    PERFORM refresh_room_day_occupancy(NEW.store_room_id, touched_date);
+                END LOOP;
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER trg_booking_room_occupancy_insert_delete
+        AFTER INSERT OR DELETE ON booking
+        FOR EACH ROW
+        EXECUTE FUNCTION refresh_room_occupancy_from_booking();
+        """
+    )
+    # end_at is derived by set_booking_end_at(), so its inputs are listed as well.
+    op.execute(
+        """
+        CREATE TRIGGER trg_booking_room_occupancy_update
+        AFTER UPDATE OF booking_status_id, store_room_id, script_id, start_at, end_at,
+                        duration_override_minutes ON booking
+        FOR EACH ROW
+        WHEN (
+            (OLD.booking_status_id IN (2, 4), OLD.store_room_id, OLD.start_at, OLD.end_at)
+            IS DISTINCT FROM
+            (NEW.booking_status_id IN (2, 4), NEW.store_room_id, NEW.start_at, NEW.end_at)
+        )
+        EXECUTE FUNCTION refresh_room_occupancy_from_booking();
+        """
+    )
+
+    op.execute(
+        """
+        INSERT INTO store_room_day_occupancy (store_room_id, occupancy_date, store_id, quarter_hours)
+        SELECT b.store_room_id,
+               d.day::date,
+               b.store_id,
+               bit_or(quarter_hour_mask(d.day::date, b.start_at, b.end_at))
+        FROM booking AS b
+        CROSS JOIN LATERAL generate_series(
+            store_local_date(b.start_at),
+            store_local_date(b.end_at - interval '1 microsecond'),
+            interval '1 day'
+        ) AS d(day)
+        WHERE b.booking_status_id IN (2, 4)
+        GROUP BY b.store_room_id, d.day::date, b.store_id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS trg_booking_room_occupancy_update ON booking;")
+    op.execute("DROP TRIGGER IF EXISTS trg_booking_room_occupancy_insert_delete ON booking;")
+    op.execute("DROP FUNCTION IF EXISTS refresh_room_occupancy_from_booking();")
+    op.execute("DROP FUNCTION IF EXISTS refresh_room_day_occupancy(bigint, date);")
+    op.execute("DROP FUNCTION IF EXISTS quarter_hour_mask(date, timestamptz, timestamptz);")
+    op.drop_index(
+        "ix_store_room_day_occupancy_store_date", table_name="store_room_day_occupancy"
+    )
+    op.drop_table("store_room_day_occupancy")
@@ -0,0 +1,127 @@
+"""0013_store_occupancy_version
+
+Revision ID: 0013_store_occupancy_version
+Revises: 0012_room_day_occupancy
+Create Date: 2026-10-19 20:00:00
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "0013_store_occupancy_version"
+down_revision: Union[str, Sequence[str], None] = "0012_room_day_occupancy"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Bumped whenever one of the store's occupancy masks actually changes, so views
+    # rendered from the masks can be cached until the next change.
+    op.create_table(
+        "store_occupancy_version",
+        sa.Column("store_id", sa.BigInteger(), nullable=False),
+        sa.Column("version", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.ForeignKeyConstraint(
+            ["store_id"],
+            ["store.store_id"],
+            name="fk_store_occupancy_version_store_id",
+            ondelete="CASCADE",
+        ),
+        sa.PrimaryKeyConstraint("store_id", name="pk_store_occupancy_version"),
+    )
+    op.execute("INSERT INTO store_occupancy_version (store_id) SELECT store_id FROM store")
+
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION refresh_room_day_occupancy(p_store_room_id bigint, p_date date)
+        RETURNS void AS $$
+        DECLARE
+            day_start timestamptz := p_date::timestamp AT TIME ZONE 'America/Toronto';
+            day_end timestamptz := (p_date + 1)::timestamp AT TIME ZONE 'America/Toronto';
+            day_mask bit(96);
+            room_store_id bigint;
+        BEGIN
+            SELECT store_id INTO room_store_id
+              FROM store_room
+             WHERE store_room_id = p_store_room_id;
+
+            SELECT bit_or(quarter_hour_mask(p_date, b.start_at, b.end_at))
+              INTO day_mask
+              FROM booking AS b
+             WHERE b.store_room_id = p_store_room_id
+               AND b.booking_status_id IN (2, 4)
+               AND b.start_at > day_start - (
+                   SELECT max(end_at - start_at) FROM booking WHERE booking_status_id IN (2, 4)
+               )
+               AND b.start_at < day_end
+               AND b.end_at > day_start;
+
+            IF day_mask IS NULL THEN
+                DELETE FROM store_room_day_occupancy
+                WHERE store_room_id = p_store_room_id
+                  AND occupancy_date = p_date;
+            ELSE
+                INSERT INTO store_room_day_occupancy (
+                    store_room_id, occupancy_date, store_id, quarter_hours
+                )
+                VALUES (p_store_room_id, p_date, room_store_id, day_mask)
+                ON CONFLICT (store_room_id, occupancy_date) DO UPDATE
+                SET quarter_hours = EXCLUDED.quarter_hours
+                WHERE store_room_day_occupancy.quarter_hours IS DISTINCT FROM EXCLUDED.quarter_hours;
+            END IF;
+
+            IF FOUND THEN
+                INSERT INTO store_occupancy_version (store_id, version)
+                VALUES (room_store_id, 1)
+                ON CONFLICT (store_id) DO UPDATE
+                SET version = store_occupancy_version.version + 1;
+            END IF;
+        END;
+        $$ LANGUAGE plpgsql;
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION refresh_room_day_occupancy(p_store_room_id bigint, p_date date)
+        RETURNS void AS $$
+        DECLARE
+            day_start timestamptz := p_date::timestamp AT TIME ZONE 'America/Toronto';
+            day_end timestamptz := (p_date + 1)::timestamp AT TIME ZONE 'America/Toronto';
+            day_mask bit(96);
+            room_store_id bigint;
+        BEGIN
+            SELECT bit_or(quarter_hour_mask(p_date, b.start_at, b.end_at)), min(b.store_id)
+              INTO day_mask, room_store_id
+              FROM booking AS b
+             WHERE b.store_room_id = p_store_room_id
+               AND b.booking_status_id IN (2, 4)
+               AND b.start_at > day_start - (
+                   SELECT max(end_at - start_at) FROM booking WHERE booking_status_id IN (2, 4)
+               )
+               AND b.start_at < day_end
+               AND b.end_at > day_start;
+
+            IF day_mask IS NULL THEN
+                DELETE FROM store_room_day_occupancy
+                WHERE store_room_id = p_store_room_id
+                  AND occupancy_date = p_date;
+            ELSE
+                INSERT INTO store_room_day_occupancy (
+                    store_room_id, occupancy_date, store_id, quarter_hours
+                )
+                VALUES (p_store_room_id, p_date, room_store_id, day_mask)
+                ON CONFLICT (store_room_id, occupancy_date) DO UPDATE
+                SET quarter_hours = EXCLUDED.quarter_hours;
+            END IF;
+        END;
+        $$ LANGUAGE plpgsql;
+        """
+    )
+    op.drop_table("store_occupancy_version")
@@ -0,0 +1,185 @@
+"""0014_dm_booking_interval
+
+Revision ID: 0014_dm_booking_interval
+Revises: 0013_store_occupancy_version
+Create Date: 2026-10-19 21:00:00
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "0014_dm_booking_interval"
+down_revision: Union[str, Sequence[str], None] = "0013_store_occupancy_version"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # One row per DM and scheduled/completed booking they are matched to, across stores.
+    # Overlap lookups are range scans on (dm_id, start_at) bounded below by the longest
+    # booking, the same bound the room conflict reads use; a GiST exclusion on
+    # (dm_id, tstzrange) would need btree_gist, which is not assumed to be installed.
+    op.create_table(
+        "dm_booking_interval",
+        sa.Column("dm_id", sa.BigInteger(), nullable=False),
+        sa.Column("booking_id", sa.BigInteger(), nullable=False),
+        sa.Column("store_id", sa.BigInteger(), nullable=False),
+        sa.Column("start_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("end_at", sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["booking_id"],
+            ["booking.booking_id"],
+            name="fk_dm_booking_interval_booking_id",
+            ondelete="CASCADE",
+        ),
+        sa.ForeignKeyConstraint(
+            ["dm_id"],
+            ["dm.dm_id"],
+            name="fk_dm_booking_interval_dm_id",
+            ondelete="CASCADE",
+        ),
+        sa.PrimaryKeyConstraint("dm_id", "booking_id", name="pk_dm_booking_interval"),
+    )
+    op.create_index(
+        "ix_dm_booking_interval_dm_start_at",
+        "dm_booking_interval",
+        ["dm_id", "start_at"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_dm_booking_interval_booking_id",
+        "dm_booking_interval",
+        ["booking_id"],
+        unique=False,
+    )
+
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION refresh_dm_booking_intervals(p_booking_ids bigint[])
+        RETURNS void AS $$
+        BEGIN
+            DELETE FROM dm_booking_interval
+            WHERE booking_id = ANY(p_booking_ids);
+
+            INSERT INTO dm_booking_interval (dm_id, booking_id, store_id, start_at, end_at)
+            SELECT DISTINCT m.dm_id, b.booking_id, b.store_id, b.start_at, b.end_at
+            FROM character_dm_match AS m
+            JOIN booking AS b
+              ON b.booking_id = m.booking_id
+            WHERE m.booking_id = ANY(p_booking_ids)
+              AND b.booking_status_id IN (2, 4)
+              AND b.start_at IS NOT NULL
+              AND b.end_at IS NOT NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+        """
+    )
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION refresh_dm_intervals_from_matches()
+        RETURNS trigger AS $$
+        DECLARE
+            changed_booking_ids bigint[] := '{}';
+        BEGIN
+            IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                SELECT changed_booking_ids || COALESCE(array_agg(DISTINCT booking_id), '{}')
+                  INTO changed_booking_ids
+                  FROM old_rows;
+            END IF;
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                SELECT changed_booking_ids || COALESCE(array_agg(DISTINCT booking_id), '{}')
+                  INTO changed_booking_ids
+                  FROM new_rows;
+            END IF;
+            PERFORM refresh_dm_booking_intervals(changed_booking_ids);
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER trg_character_dm_match_interval_insert
+        AFTER INSERT ON character_dm_match
+        REFERENCING NEW TABLE AS new_rows
+        FOR EACH STATEMENT
+        EXECUTE FUNCTION refresh_dm_intervals_from_matches();
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER trg_character_dm_match_interval_update
+        AFTER UPDATE ON character_dm_match
+        REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+        FOR EACH STATEMENT
+        EXECUTE FUNCTION refresh_dm_intervals_from_matches();
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER trg_character_dm_match_interval_delete
+        AFTER DELETE ON character_dm_match
+        REFERENCING OLD TABLE AS old_rows
+        FOR EACH STATEMENT
+        EXECUTE FUNCTION refresh_dm_intervals_from_matches();
+        """
+    )
+
+    # Booking deletes need no trigger: the foreign key cascade removes the rows.
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION refresh_dm_intervals_from_booking()
+        RETURNS trigger AS $$
+        BEGIN
+            PERFORM refresh_dm_booking_intervals(ARRAY[NEW.booking_id]);
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+        """
+    )
+    # end_at is derived by set_booking_end_at(), so its inputs are listed as well.
+    op.execute(
+        """
+        CREATE TRIGGER trg_booking_dm_interval_update
+        AFTER UPDATE OF
+            booking_status_id, store_id, script_id, start_at, end_at, duration_override_minutes
+        ON booking
+        FOR EACH ROW
+        WHEN (
+            (OLD.booking_status_id IN (2, 4), OLD.store_id, OLD.start_at, OLD.end_at)
+            IS DISTINCT FROM
+            (NEW.booking_status_id IN (2, 4), NEW.store_id, NEW.start_at, NEW.end_at)
+        )
+        EXECUTE FUNCTION refresh_dm_intervals_from_booking();
+        """
+    )
+
+    op.execute(
+        """
+        INSERT INTO dm_booking_interval (dm_id, booking_id, store_id, start_at, end_at)
+        SELECT DISTINCT m.dm_id, b.booking_id, b.store_id, b.start_at, b.end_at
+        FROM character_dm_match AS m
+        JOIN booking AS b
+          ON b.booking_id = m.booking_id
+        WHERE b.booking_status_id IN (2, 4)
+          AND b.start_at IS NOT NULL
+          AND b.end_at IS NOT NULL
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS trg_booking_dm_interval_update ON booking;")
+    op.execute("DROP FUNCTION IF EXISTS refresh_dm_intervals_from_booking();")
+    op.execute("DROP TRIGGER IF EXISTS trg_character_dm_match_interval_delete ON character_dm_match;")
+    op.execute("DROP TRIGGER IF EXISTS trg_character_dm_match_interval_update ON character_dm_match;")
+    op.execute("DROP TRIGGER IF EXISTS trg_character_dm_match_interval_insert ON character_dm_match;")
+    op.execute("DROP FUNCTION IF EXISTS refresh_dm_intervals_from_matches();")
+    op.execute("DROP FUNCTION IF EXISTS refresh_dm_booking_intervals(bigint[]);")
+    op.drop_index("ix_dm_booking_interval_booking_id", table_name="dm_booking_interval")
+    op.drop_index("ix_dm_booking_interval_dm_start_at", table_name="dm_booking_interval")
+    op.drop_table("dm_booking_interval")
@@ -0,0 +1,235 @@
+"""0015_booking_conflict_columns
+
+Revision ID: 0015_booking_conflict_columns
+Revises: 0014_dm_booking_interval
+Create Date: 2026-10-19 22:00:00
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "0015_booking_conflict_columns"
+down_revision: Union[str, Sequence[str], None] = "0014_dm_booking_interval"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Same-room overlaps of a scheduled/completed booking, kept on the row so list filters
+    # and responses read them instead of probing booking per row. Empty for every other
+    # status. `scripts.repair_booking_conflicts` re-derives them in batches.
+    op.add_column(
+        "booking",
+        sa.Column(
+            "conflict_booking_ids",
+            postgresql.ARRAY(sa.BigInteger()),
+            nullable=False,
+            server_default="{}",
+        ),
+    )
+    op.add_column(
+        "booking",
+        sa.Column("conflict_count", sa.Integer(), nullable=False, server_default="0"),
+    )
+    op.create_index(
+        "ix_booking_store_conflicting",
+        "booking",
+        ["store_id", sa.text("updated_at DESC"), sa.text("booking_id DESC")],
+        unique=False,
+        postgresql_where=sa.text("conflict_count > 0"),
+    )
+
+    # `p_longest` is the longest scheduled/completed booking, the lower bound that keeps
+    # the (store_room_id, start_at) scan short; callers read it once per trigger call.
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION booking_room_overlaps(
+            p_booking_id bigint,
+            p_store_room_id bigint,
+            p_start_at timestamptz,
+            p_end_at timestamptz,
+            p_longest interval
+        )
+        RETURNS bigint[] AS $$
+            SELECT COALESCE(array_agg(b2.booking_id ORDER BY b2.booking_id), '{}')
+            FROM booking AS b2
+            WHERE b2.store_room_id = p_store_room_id
+              AND b2.booking_id <> p_booking_id
+              AND b2.booking_status_id IN (2, 4)
+              AND b2.start_at > p_start_at - p_longest
+              AND b2.start_at < p_end_at
+              AND b2.end_at > p_start_at;
+        $$ LANGUAGE sql STABLE;
+        """
+    )
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION longest_booking()
+        RETURNS interval AS $$
+            SELECT COALESCE(max(end_at - start_at), interval '0')
+            FROM booking
+            WHERE booking_status_id IN (2, 4);
+        $$ LANGUAGE sql STABLE;
+        """
+    )
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION refresh_booking_conflicts(
+            p_booking_ids bigint[],
+            p_longest interval DEFAULT longest_booking()
+        )
+        RETURNS integer AS $$
+        DECLARE
+            changed_rows integer;
+        BEGIN
+            UPDATE booking AS b
+            SET conflict_booking_ids = c.conflict_booking_ids,
+                conflict_count = cardinality(c.conflict_booking_ids)
+            FROM (
+                SELECT b1.booking_id,
+                       CASE
+                           WHEN b1.booking_status_id IN (2, 4) AND b1.start_at IS NOT NULL
+                           THEN booking_room_overlaps(
+                               b1.booking_id, b1.store_room_id, b1.start_at, b1.end_at, p_longest
+                           )
+                           ELSE '{}'
+                       END AS conflict_booking_ids
+                FROM booking AS b1
+                WHERE b1.booking_id = ANY(p_booking_ids)
+            ) AS c
+            WHERE b.booking_id = c.booking_id
+              AND b.conflict_booking_ids IS DISTINCT FROM c.conflict_booking_ids;
+            GET DIAGNOSTICS changed_rows = ROW_COUNT;
+            RETURN changed_rows;
+        END;
+        $$ LANGUAGE plpgsql;
+        """
+    )
+
+    # The row's own ids are set before the write so RETURNING sees them. The trigger name
+    # sorts after trg_booking_set_end_at, which has to fill in end_at first.
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION set_booking_conflicts()
+        RETURNS trigger AS $$
+        BEGIN
+            IF NEW.booking_status_id IN (2, 4) AND NEW.start_at IS NOT NULL THEN
+                NEW.conflict_booking_ids := booking_room_overlaps(
+                    NEW.booking_id, NEW.store_room_id, NEW.start_at, NEW.end_at, longest_booking()
+                );
+            ELSE
+                NEW.conflict_booking_ids := '{}';
+            END IF;
+            NEW.conflict_count := cardinality(NEW.conflict_booking_ids);
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql;
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER trg_booking_sync_conflicts
+        BEFORE INSERT OR UPDATE OF
+            booking_status_id, store_room_id, script_id, start_at, end_at, duration_override_minutes
+        ON booking
+        FOR EACH ROW
+        EXECUTE FUNCTION set_booking_conflicts();
+        """
+    )
+
+    # Neighbours are re-derived after the write: the old room/time's overlaps lose the row
+    # and the new ones gain it. The row itself is refreshed again because a multi-row
+    # UPDATE (the day repack) computes its BEFORE value before later rows have moved.
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION refresh_conflict_neighbours_from_booking()
+        RETURNS trigger AS $$
+        DECLARE
+            affected_booking_ids bigint[] := '{}';
+            longest interval := longest_booking();
+        BEGIN
+            IF TG_OP IN ('UPDATE', 'DELETE')
+               AND OLD.booking_status_id IN (2, 4)
+               AND OLD.start_at IS NOT NULL THEN
+                affected_booking_ids := booking_room_overlaps(
+                    OLD.booking_id, OLD.store_room_id, OLD.start_at, OLD.end_at, longest
+                );
+            END IF;
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                affected_booking_ids := affected_booking_ids
+                    || NEW.booking_id
+                    || NEW.conflict_booking_ids;
+            END IF;
+            PERFORM refresh_booking_conflicts(affected_booking_ids, longest);
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER trg_booking_sync_conflict_neighbours_insert_delete
+        AFTER INSERT OR DELETE ON booking
+        FOR EACH ROW
+        EXECUTE FUNCTION refresh_conflict_neighbours_from_booking();
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER trg_booking_sync_conflict_neighbours_update
+        AFTER UPDATE OF
+            booking_status_id, store_room_id, script_id, start_at, end_at, duration_override_minutes
+        ON booking
+        FOR EACH ROW
+        WHEN (
+            (OLD.booking_status_id IN (2, 4), OLD.store_room_id, OLD.start_at, OLD.end_at)
+            IS DISTINCT FROM
+            (NEW.booking_status_id IN (2, 4), NEW.store_room_id, NEW.start_at, NEW.end_at)
+        )
+        EXECUTE FUNCTION refresh_conflict_neighbours_from_booking();
+        """
+    )
+
+    op.execute(
+        """
+        UPDATE booking AS b
+        SET conflict_booking_ids = c.conflict_booking_ids,
+            conflict_count = cardinality(c.conflict_booking_ids)
+        FROM (
+            SELECT b1.booking_id, array_agg(b2.booking_id ORDER BY b2.booking_id) AS conflict_booking_ids
+            FROM booking AS b1
+            JOIN booking AS b2
+              ON b2.store_room_id = b1.store_room_id
+             AND b2.booking_id <> b1.booking_id
+             AND b2.booking_status_id IN (2, 4)
+             AND b2.start_at < b1.end_at
+             AND b2.end_at > b1.start_at
+            WHERE b1.booking_status_id IN (2, 4)
+            GROUP BY b1.booking_id
+        ) AS c
+        WHERE b.booking_id = c.booking_id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS trg_booking_sync_conflict_neighbours_update ON booking;")
+    op.execute(
+        "DROP TRIGGER IF EXISTS trg_booking_sync_conflict_neighbours_insert_delete ON booking;"
+    )
+    op.execute("DROP FUNCTION IF EXISTS refresh_conflict_neighbours_from_booking();")
+    op.execute("DROP TRIGGER IF EXISTS trg_booking_sync_conflicts ON booking;")
+    op.execute("DROP FUNCTION IF EXISTS set_booking_conflicts();")
+    op.execute("DROP FUNCTION IF EXISTS refresh_booking_conflicts(bigint[], interval);")
+    op.execute("DROP FUNCTION IF EXISTS longest_booking();")
+    op.execute(
+        "DROP FUNCTION IF EXISTS booking_room_overlaps(bigint, bigint, timestamptz, timestamptz, interval);"
+    )
+    op.drop_index("ix_booking_store_conflicting", table_name="booking")
+    op.drop_column("booking", "conflict_count")
+    op.drop_column("booking", "conflict_booking_ids")
@@ -0,0 +1,98 @@
+"""0016_booking_index_maintenance
+
+Revision ID: 0016_booking_index_maintenance
+Revises: 0015_booking_conflict_columns
+Create Date: 2026-10-19 23:00:00
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "0016_booking_index_maintenance"
+down_revision: Union[str, Sequence[str], None] = "0015_booking_conflict_columns"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BOOKING_AUTOVACUUM_OPTIONS = (
+    "autovacuum_vacuum_scale_factor",
+    "autovacuum_vacuum_insert_scale_factor",
+    "autovacuum_analyze_scale_factor",
+)
+
+
+def upgrade() -> None:
+    # booking is not range-partitioned by start month: it is the target of four cascading
+    # foreign keys, start_at is nullable and moves on reschedule, and a cross-partition
+    # UPDATE runs as DELETE + INSERT, which would skip the rollup triggers' UPDATE paths.
+    # Instead the indexes only cover the rows their readers can match, so cancelled history
+    # and incomplete bookings stop adding to every room scan, vacuum pass and reindex.
+    #
+    # Every room/time read filters on booking_status_id IN (2, 4) (delete_room's = 2 is
+    # implied by it), and target_month is only set on incomplete bookings.
+    op.drop_index("ix_booking_store_room_start_at", table_name="booking")
+    op.create_index(
+        "ix_booking_store_room_start_at",
+        "booking",
+        ["store_room_id", "start_at"],
+        unique=False,
+        postgresql_where=sa.text("booking_status_id IN (2, 4)"),
+    )
+    op.drop_index("ix_booking_store_room_end_at", table_name="booking")
+    op.create_index(
+        "ix_booking_store_room_end_at",
+        "booking",
+        ["store_room_id", "end_at"],
+        unique=False,
+        postgresql_where=sa.text("booking_status_id IN (2, 4)"),
+    )
+    op.drop_index("ix_booking_store_target_month", table_name="booking")
+    op.create_index(
+        "ix_booking_store_target_month",
+        "booking",
+        ["store_id", "target_month"],
+        unique=False,
+        postgresql_where=sa.text("target_month IS NOT NULL"),
+    )
+    # Only read by the slot foreign key's delete check, which never looks up NULL.
+    op.drop_index("ix_booking_slot_id", table_name="booking")
+    op.create_index(
+        "ix_booking_slot_id",
+        "booking",
+        ["slot_id"],
+        unique=False,
+        postgresql_where=sa.text("slot_id IS NOT NULL"),
+    )
+
+    # The default 20% dead-row threshold lets a large store's booking table build up a
+    # long vacuum backlog; smaller, more frequent passes keep each one short.
+    op.execute(
+        """
+        ALTER TABLE booking SET (
+            autovacuum_vacuum_scale_factor = 0.02,
+            autovacuum_vacuum_insert_scale_factor = 0.05,
+            autovacuum_analyze_scale_factor = 0.01
+        )
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute(f"ALTER TABLE booking RESET ({', '.join(BOOKING_AUTOVACUUM_OPTIONS)})")
+    op.drop_index("ix_booking_slot_id", table_name="booking")
+    op.create_index("ix_booking_slot_id", "booking", ["slot_id"], unique=False)
+    op.drop_index("ix_booking_store_target_month", table_name="booking")
+    op.create_index(
+        "ix_booking_store_target_month", "booking", ["store_id", "target_month"], unique=False
+    )
+    op.drop_index("ix_booking_store_room_end_at", table_name="booking")
+    op.create_index(
+        "ix_booking_store_room_end_at", "booking", ["store_room_id", "end_at"], unique=False
+    )
+    op.drop_index("ix_booking_store_room_start_at", table_name="booking")
+    op.create_index(
+        "ix_booking_store_room_start_at", "booking", ["store_room_id", "start_at"], unique=False
+    )
@@ -0,0 +1,364 @@
+"""0017_booking_archive
+
+Revision ID: 0017_booking_archive
+Revises: 0016_booking_index_maintenance
+Create Date: 2026-10-20 09:00:00
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "0017_booking_archive"
+down_revision: Union[str, Sequence[str], None] = "0016_booking_index_maintenance"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Delete triggers that keep history rollups (usage, DM workload, played scripts, occupancy)
+# in step with booking. Archiving moves history rather than removing it, so they are
+# skipped while archive_bookings() deletes. Conflict ids and DM intervals still follow the
+# live table. (name, table, timing and events, level, WHEN condition, function)
+ROLLUP_DELETE_TRIGGERS = (
+    (
+        "trg_booking_client_played_delete",
+        "booking",
+        "BEFORE DELETE",
+        "FOR EACH ROW",
+        "OLD.booking_status_id IN (2, 4)",
+        "refresh_client_played_from_booking()",
+    ),
+    (
+        "trg_booking_dm_workload_delete",
+        "booking",
+        "BEFORE DELETE",
+        "FOR EACH ROW",
+        "OLD.booking_status_id = 4",
+        "refresh_dm_workload_from_booking()",
+    ),
+    (
+        "trg_booking_usage_insert_delete",
+        "booking",
+        "AFTER INSERT OR DELETE",
+        "FOR EACH ROW",
+        None,
+        "refresh_booking_usage()",
+    ),
+    (
+        "trg_booking_room_occupancy_insert_delete",
+        "booking",
+        "AFTER INSERT OR DELETE",
+        "FOR EACH ROW",
+        None,
+        "refresh_room_occupancy_from_booking()",
+    ),
+    (
+        "trg_booking_client_played_insert_delete",
+        "booking_client",
+        "AFTER INSERT OR DELETE",
+        "FOR EACH ROW",
+        None,
+        "refresh_client_played_from_booking_client()",
+    ),
+    (
+        "trg_character_dm_match_workload_delete",
+        "character_dm_match",
+        "AFTER DELETE",
+        "REFERENCING OLD TABLE AS old_rows FOR EACH STATEMENT",
+        None,
+        "refresh_dm_workload_from_matches()",
+    ),
+)
+
+
+def _create_trigger(
+    name: str, table: str, timing: str, level: str, condition: str | None, function: str
+) -> None:
+    when_clause = f"WHEN ({condition})" if condition else ""
+    op.execute(f"DROP TRIGGER IF EXISTS {name} ON {table};")
+    op.execute(
+        f"""
+        CREATE TRIGGER {name}
+        {timing} ON {table}
+        {level}
+        {when_clause}
+        EXECUTE FUNCTION {function};
+        """
+    )
+
+
+def upgrade() -> None:
+    # Cold copies of terminal bookings and their client/match rows. Ids are kept as they
+    # were; there are no foreign keys to rooms, slots, scripts or characters, which may be
+    # deleted once nothing live refers to them.
+    op.create_table(
+        "booking_archive",
+        sa.Column("booking_id", sa.BigInteger(), nullable=False),
+        sa.Column("store_id", sa.BigInteger(), nullable=False),
+        sa.Column("script_id", sa.BigInteger(), nullable=True),
+        sa.Column("slot_id", sa.BigInteger(), nullable=True),
+        sa.Column("store_room_id", sa.BigInteger(), nullable=True),
+        sa.Column("booking_status_id", sa.SmallInteger(), nullable=False),
+        sa.Column("target_month", sa.Date(), nullable=True),
+        sa.Column("start_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("end_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("duration_override_minutes", sa.Integer(), nullable=True),
+        sa.Column(
+            "conflict_booking_ids",
+            postgresql.ARRAY(sa.BigInteger()),
+            nullable=False,
+            server_default="{}",
+        ),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column(
+            "archived_at",
+            sa.DateTime(timezone=True),
+            nullable=False,
+            server_default=sa.text("now()"),
+        ),
+        sa.CheckConstraint(
+            "booking_status_id IN (3, 4)", name="ck_booking_archive_terminal_status"
+        ),
+        sa.PrimaryKeyConstraint("booking_id", name="pk_booking_archive"),
+    )
+    op.create_index(
+        "ix_booking_archive_store_start_at",
+        "booking_archive",
+        ["store_id", "start_at"],
+        unique=False,
+    )
+
+    op.create_table(
+        "booking_client_archive",
+        sa.Column("booking_client_id", sa.BigInteger(), nullable=False),
+        sa.Column("booking_id", sa.BigInteger(), nullable=False),
+        sa.Column("client_id", sa.BigInteger(), nullable=False),
+        sa.Column("store_id", sa.BigInteger(), nullable=False),
+        sa.Column("booking_sort_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["booking_id"],
+            ["booking_archive.booking_id"],
+            name="fk_booking_client_archive_booking_id",
+            ondelete="CASCADE",
+        ),
+        sa.PrimaryKeyConstraint("booking_client_id", name="pk_booking_client_archive"),
+        sa.UniqueConstraint(
+            "booking_id", "client_id", name="uq_booking_client_archive_booking_id_client_id"
+        ),
+    )
+    op.create_index(
+        "ix_booking_client_archive_history",
+        "booking_client_archive",
+        ["client_id", sa.text("booking_sort_at DESC"), sa.text("booking_id DESC")],
+        unique=False,
+        postgresql_include=["store_id"],
+    )
+
+    op.create_table(
+        "character_client_match_archive",
+        sa.Column("character_client_match_id", sa.BigInteger(), nullable=False),
+        sa.Column("booking_id", sa.BigInteger(), nullable=False),
+        sa.Column("character_id", sa.BigInteger(), nullable=False),
+        sa.Column("client_id", sa.BigInteger(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["booking_id"],
+            ["booking_archive.booking_id"],
+            name="fk_character_client_match_archive_booking_id",
+            ondelete="CASCADE",
+        ),
+        sa.PrimaryKeyConstraint(
+            "character_client_match_id", name="pk_character_client_match_archive"
+        ),
+    )
+    op.create_index(
+        "ix_character_client_match_archive_booking_id",
+        "character_client_match_archive",
+        ["booking_id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_character_client_match_archive_client_id",
+        "character_client_match_archive",
+        ["client_id"],
+        unique=False,
+    )
+
+    op.create_table(
+        "character_dm_match_archive",
+        sa.Column("character_dm_match_id", sa.BigInteger(), nullable=False),
+        sa.Column("booking_id", sa.BigInteger(), nullable=False),
+        sa.Column("character_id", sa.BigInteger(), nullable=True),
+        sa.Column("dm_id", sa.BigInteger(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["booking_id"],
+            ["booking_archive.booking_id"],
+            name="fk_character_dm_match_archive_booking_id",
+            ondelete="CASCADE",
+        ),
+        sa.PrimaryKeyConstraint("character_dm_match_id", name="pk_character_dm_match_archive"),
+    )
+    op.create_index(
+        "ix_character_dm_match_archive_booking_id",
+        "character_dm_match_archive",
+        ["booking_id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_character_dm_match_archive_dm_id",
+        "character_dm_match_archive",
+        ["dm_id"],
+        unique=False,
+    )
+
+    # Every archived booking of a store sorts before `archived_before`
+    # (booking_sort_at), so reads of later ranges skip the archive tables entirely.
+    op.create_table(
+        "booking_archive_horizon",
+        sa.Column("store_id", sa.BigInteger(), nullable=False),
+        sa.Column("archived_before", sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["store_id"],
+            ["store.store_id"],
+            name="fk_booking_archive_horizon_store_id",
+            ondelete="CASCADE",
+        ),
+        sa.PrimaryKeyConstraint("store_id", name="pk_booking_archive_horizon"),
+    )
+
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION is_archiving_bookings()
+        RETURNS boolean AS $$
+            SELECT COALESCE(current_setting('trs.archiving_bookings', true), '') = 'on'
+        $$ LANGUAGE sql STABLE;
+        """
+    )
+    for name, table, timing, level, condition, function in ROLLUP_DELETE_TRIGGERS:
+        archiving_condition = "NOT is_archiving_bookings()"
+        _create_trigger(
+            name,
+            table,
+            timing,
+            level,
+            f"{condition} AND {archiving_condition}" if condition else archiving_condition,
+            function,
+        )
+
+    # Moves the given bookings that are cancelled/completed and sort before
+    # `p_archived_before`; rows locked by a concurrent write are left for the next run.
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION archive_bookings(
+            p_booking_ids bigint[],
+            p_archived_before timestamptz
+        )
+        RETURNS integer AS $$
+        DECLARE
+            moved_booking_ids bigint[];
+        BEGIN
+            SELECT COALESCE(array_agg(booking_id), '{}')
+              INTO moved_booking_ids
+              FROM (
+                  SELECT booking_id
+                  FROM booking
+                  WHERE booking_id = ANY(p_booking_ids)
+                    AND booking_status_id IN (3, 4)
+                    AND booking_sort_at(start_at, target_month) < p_archived_before
+                  FOR UPDATE SKIP LOCKED
+              ) AS eligible;
+            IF cardinality(moved_booking_ids) = 0 THEN
+                RETURN 0;
+            END IF;
+
+            INSERT INTO booking_archive (
+                booking_id, store_id, script_id, slot_id, store_room_id, booking_status_id,
+                target_month, start_at, end_at, duration_override_minutes,
+                conflict_booking_ids, created_at, updated_at
+            )
+            SELECT booking_id, store_id, script_id, slot_id, store_room_id, booking_status_id,
+                   target_month, start_at, end_at, duration_override_minutes,
+                   conflict_booking_ids, created_at, updated_at
+            FROM booking
+            WHERE booking_id = ANY(moved_booking_ids);
+
+            INSERT INTO booking_client_archive (
+                booking_client_id, booking_id, client_id, store_id, booking_sort_at,
+                created_at, updated_at
+            )
+            SELECT booking_client_id, booking_id, client_id, store_id, booking_sort_at,
+                   created_at, updated_at
+            FROM booking_client
+            WHERE booking_id = ANY(moved_booking_ids);
+
+            INSERT INTO character_client_match_archive (
+                character_client_match_id, booking_id, character_id, client_id,
+                created_at, updated_at
+            )
+            SELECT character_client_match_id, booking_id, character_id, client_id,
+                   created_at, updated_at
+            FROM character_client_match
+            WHERE booking_id = ANY(moved_booking_ids);
+
+            INSERT INTO character_dm_match_archive (
+                character_dm_match_id, booking_id, character_id, dm_id, created_at, updated_at
+            )
+            SELECT character_dm_match_id, booking_id, character_id, dm_id, created_at, updated_at
+            FROM character_dm_match
+            WHERE booking_id = ANY(moved_booking_ids);
+
+            INSERT INTO booking_archive_horizon (store_id, archived_before)
+            SELECT DISTINCT store_id, p_archived_before
+            FROM booking
+            WHERE booking_id = ANY(moved_booking_ids)
+            ON CONFLICT (store_id) DO UPDATE
+            SET archived_before = greatest(
+                booking_archive_horizon.archived_before, EXCLUDED.archived_before
+            );
+
+            -- Client and match rows go with the foreign key cascades.
+            PERFORM set_config('trs.archiving_bookings', 'on', true);
+            DELETE FROM booking
+            WHERE booking_id = ANY(moved_booking_ids);
+            PERFORM set_config('trs.archiving_bookings', 'off', true);
+
+            RETURN cardinality(moved_booking_ids);
+        END;
+        $$ LANGUAGE plpgsql;
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP FUNCTION IF EXISTS archive_bookings(bigint[], timestamptz);")
+    for name, table, timing, level, condition, function in ROLLUP_DELETE_TRIGGERS:
+        _create_trigger(name, table, timing, level, condition, function)
+    op.execute("DROP FUNCTION IF EXISTS is_archiving_bookings();")
+    op.drop_table("booking_archive_horizon")
+    op.drop_index("ix_character_dm_match_archive_dm_id", table_name="character_dm_match_archive")
+    op.drop_index(
+        "ix_character_dm_match_archive_booking_id", table_name="character_dm_match_archive"
+    )
+    op.drop_table("character_dm_match_archive")
+    op.drop_index(
+        "ix_character_client_match_archive_client_id",
+        table_name="character_client_match_archive",
+    )
+    op.drop_index(
+        "ix_character_client_match_archive_booking_id",
+        table_name="character_client_match_archive",
+    )
+    op.drop_table("character_client_match_archive")
+    op.drop_index("ix_booking_client_archive_history", table_name="booking_client_archive")
+    op.drop_table("booking_client_archive")
+    op.drop_index("ix_booking_archive_store_start_at", table_name="booking_archive")
+    op.drop_table("booking_archive")
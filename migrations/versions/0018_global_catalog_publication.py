@@ -0,0 +1,42 @@
+"""0018_global_catalog_publication
+
+Revision ID: 0018_global_catalog_publication
+Revises: 0017_booking_archive
+Create Date: 2026-10-20 01:00:00
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import context, op
+
+# revision identifiers, used by Alembic.
+revision: str = "0018_global_catalog_publication"
+down_revision: Union[str, Sequence[str], None] = "0017_booking_archive"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Tables written only through the primary and copied to every store shard. dm_store_membership
+# rides along so shard-side DM scope checks see memberships managed from the DM routes.
+GLOBAL_CATALOG_TABLES = (
+    "store",
+    "client",
+    "script",
+    "script_character",
+    "dm",
+    "dm_store_membership",
+)
+
+
+def upgrade() -> None:
+    # Store shards are migrated with `alembic -x shard=true upgrade head` and subscribe to
+    # the primary's publication instead of publishing their own copies.
+    if context.get_x_argument(as_dictionary=True).get("shard") == "true":
+        return
+    op.execute(
+        f"CREATE PUBLICATION trs_global_catalog FOR TABLE {', '.join(GLOBAL_CATALOG_TABLES)}"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP PUBLICATION IF EXISTS trs_global_catalog")
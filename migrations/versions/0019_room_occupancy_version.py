@@ -0,0 +1,60 @@
+"""0019_room_occupancy_version
+
+Revision ID: 0019_room_occupancy_version
+Revises: 0018_global_catalog_publication
+Create Date: 2026-10-20 02:00:00
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0019_room_occupancy_version"
+down_revision: Union[str, Sequence[str], None] = "0018_global_catalog_publication"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Heatmaps list the store's active rooms by name, so adding, removing, renaming or
+    # (de)activating a room invalidates them just like a mask change does.
+    #
+    # store_occupancy_version is one hot row per store: every booking write that changes a
+    # mask (and every room change) updates it, so concurrent booking writes in the same store
+    # queue on its row lock until the earlier one commits. Other stores are unaffected.
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION bump_store_occupancy_version_for_room()
+        RETURNS trigger AS $$
+        BEGIN
+            INSERT INTO store_occupancy_version (store_id, version)
+            SELECT DISTINCT changed.store_id, 1
+            FROM (
+                SELECT NEW.store_id WHERE TG_OP <> 'DELETE'
+                UNION ALL
+                SELECT OLD.store_id WHERE TG_OP <> 'INSERT'
+            ) AS changed(store_id)
+            JOIN store AS s
+              ON s.store_id = changed.store_id
+            ON CONFLICT (store_id) DO UPDATE
+            SET version = store_occupancy_version.version + 1;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER trg_store_room_occupancy_version
+        AFTER INSERT OR DELETE OR UPDATE OF store_id, name, is_active ON store_room
+        FOR EACH ROW
+        EXECUTE FUNCTION bump_store_occupancy_version_for_room()
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS trg_store_room_occupancy_version ON store_room")
+    op.execute("DROP FUNCTION IF EXISTS bump_store_occupancy_version_for_room()")
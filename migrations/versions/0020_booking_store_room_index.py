@@ -0,0 +1,35 @@
+"""0020_booking_store_room_index
+
+Revision ID: 0020_booking_store_room_index
+Revises: 0019_room_occupancy_version
+Create Date: 2026-10-20 03:00:00
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "0020_booking_store_room_index"
+down_revision: Union[str, Sequence[str], None] = "0019_room_occupancy_version"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # 0016 made the room/time indexes partial on booking_status_id IN (2, 4), so the
+    # store_room foreign key's delete check (which matches bookings of any status) lost its
+    # index and scanned booking. Like ix_booking_slot_id, this one skips NULL rooms.
+    op.create_index(
+        "ix_booking_store_room_id",
+        "booking",
+        ["store_room_id"],
+        unique=False,
+        postgresql_where=sa.text("store_room_id IS NOT NULL"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_booking_store_room_id", table_name="booking")
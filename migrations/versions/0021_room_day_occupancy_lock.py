@@ -0,0 +1,82 @@
+"""0021_room_day_occupancy_lock
+
+Revision ID: 0021_room_day_occupancy_lock
+Revises: 0020_booking_store_room_index
+Create Date: 2026-10-20 04:00:00
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0021_room_day_occupancy_lock"
+down_revision: Union[str, Sequence[str], None] = "0020_booking_store_room_index"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+REFRESH_ROOM_DAY_OCCUPANCY_SQL = """
+    CREATE OR REPLACE FUNCTION refresh_room_day_occupancy(p_store_room_id bigint, p_date date)
+    RETURNS void AS $$
+    DECLARE
+        day_start timestamptz := p_date::timestamp AT TIME ZONE 'America/Toronto';
+        day_end timestamptz := (p_date + 1)::timestamp AT TIME ZONE 'America/Toronto';
+        day_mask bit(96);
+        room_store_id bigint;
+    BEGIN
+        {lock}SELECT store_id INTO room_store_id
+          FROM store_room
+         WHERE store_room_id = p_store_room_id;
+
+        SELECT bit_or(quarter_hour_mask(p_date, b.start_at, b.end_at))
+          INTO day_mask
+          FROM booking AS b
+         WHERE b.store_room_id = p_store_room_id
+           AND b.booking_status_id IN (2, 4)
+           AND b.start_at > day_start - longest_booking()
+           AND b.start_at < day_end
+           AND b.end_at > day_start;
+
+        IF day_mask IS NULL THEN
+            DELETE FROM store_room_day_occupancy
+            WHERE store_room_id = p_store_room_id
+              AND occupancy_date = p_date;
+        ELSE
+            INSERT INTO store_room_day_occupancy (
+                store_room_id, occupancy_date, store_id, quarter_hours
+            )
+            VALUES (p_store_room_id, p_date, room_store_id, day_mask)
+            ON CONFLICT (store_room_id, occupancy_date) DO UPDATE
+            SET quarter_hours = EXCLUDED.quarter_hours
+            WHERE store_room_day_occupancy.quarter_hours IS DISTINCT FROM EXCLUDED.quarter_hours;
+        END IF;
+
+        IF FOUND THEN
+            INSERT INTO store_occupancy_version (store_id, version)
+            VALUES (room_store_id, 1)
+            ON CONFLICT (store_id) DO UPDATE
+            SET version = store_occupancy_version.version + 1;
+        END IF;
+    END;
+    $$ LANGUAGE plpgsql;
+"""
+
+# Two writers in the same room and day each rebuilt the mask from a snapshot missing the
+# other's booking, and the later commit overwrote the earlier one's bits. The transaction
+# lock makes the second writer wait for the first to commit; its rebuild then runs on a new
+# READ COMMITTED snapshot that includes both bookings. Writers touching several room-days
+# in opposite orders can deadlock, and Postgres aborts one of them.
+ROOM_DAY_LOCK_SQL = """PERFORM pg_advisory_xact_lock(
+            hashtextextended('store_room_day_occupancy:' || p_store_room_id || ':' || p_date, 0)
+        );
+
+        """
+
+
+def upgrade() -> None:
+    op.execute(REFRESH_ROOM_DAY_OCCUPANCY_SQL.format(lock=ROOM_DAY_LOCK_SQL))
+
+
+def downgrade() -> None:
+    op.execute(REFRESH_ROOM_DAY_OCCUPANCY_SQL.format(lock=""))
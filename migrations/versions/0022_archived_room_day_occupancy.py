@@ -0,0 +1,121 @@
+"""0022_archived_room_day_occupancy
+
+Revision ID: 0022_archived_room_day_occupancy
+Revises: 0021_room_day_occupancy_lock
+Create Date: 2026-10-20 05:00:00
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "0022_archived_room_day_occupancy"
+down_revision: Union[str, Sequence[str], None] = "0021_room_day_occupancy_lock"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+REFRESH_ROOM_DAY_OCCUPANCY_SQL = """
+    CREATE OR REPLACE FUNCTION refresh_room_day_occupancy(p_store_room_id bigint, p_date date)
+    RETURNS void AS $$
+    DECLARE
+        day_start timestamptz := p_date::timestamp AT TIME ZONE 'America/Toronto';
+        day_end timestamptz := (p_date + 1)::timestamp AT TIME ZONE 'America/Toronto';
+        day_mask bit(96);
+        room_store_id bigint;
+    BEGIN
+        PERFORM pg_advisory_xact_lock(
+            hashtextextended('store_room_day_occupancy:' || p_store_room_id || ':' || p_date, 0)
+        );
+
+        SELECT store_id INTO room_store_id
+          FROM store_room
+         WHERE store_room_id = p_store_room_id;
+
+        SELECT bit_or(quarter_hour_mask(p_date, b.start_at, b.end_at))
+          INTO day_mask
+          FROM (
+              SELECT start_at, end_at
+              FROM booking
+              WHERE store_room_id = p_store_room_id
+                AND booking_status_id IN (2, 4)
+                AND start_at > day_start - longest_booking()
+                AND start_at < day_end
+                AND end_at > day_start{archived}
+          ) AS b;
+
+        IF day_mask IS NULL THEN
+            DELETE FROM store_room_day_occupancy
+            WHERE store_room_id = p_store_room_id
+              AND occupancy_date = p_date;
+        ELSE
+            INSERT INTO store_room_day_occupancy (
+                store_room_id, occupancy_date, store_id, quarter_hours
+            )
+            VALUES (p_store_room_id, p_date, room_store_id, day_mask)
+            ON CONFLICT (store_room_id, occupancy_date) DO UPDATE
+            SET quarter_hours = EXCLUDED.quarter_hours
+            WHERE store_room_day_occupancy.quarter_hours IS DISTINCT FROM EXCLUDED.quarter_hours;
+        END IF;
+
+        IF FOUND THEN
+            INSERT INTO store_occupancy_version (store_id, version)
+            VALUES (room_store_id, 1)
+            ON CONFLICT (store_id) DO UPDATE
+            SET version = store_occupancy_version.version + 1;
+        END IF;
+    END;
+    $$ LANGUAGE plpgsql;
+"""
+
+# Archiving skips the occupancy delete trigger so the archived bookings' bits stay, but any
+# later rebuild of that room-day read live bookings only and dropped them. Archived rows keep
+# their room id and only completed ones occupied the room.
+ARCHIVED_OCCUPANCY_SQL = """
+              UNION ALL
+              SELECT start_at, end_at
+              FROM booking_archive
+              WHERE store_room_id = p_store_room_id
+                AND booking_status_id = 4
+                AND start_at > day_start - longest_archived_booking()
+                AND start_at < day_end
+                AND end_at > day_start"""
+
+
+def upgrade() -> None:
+    # The rebuild and the repair job look archived bookings up by room, like live ones.
+    op.create_index(
+        "ix_booking_archive_occupied_room_start_at",
+        "booking_archive",
+        ["store_room_id", "start_at"],
+        unique=False,
+        postgresql_where=sa.text("booking_status_id = 4"),
+    )
+    # Same role as ix_booking_occupied_duration: the archive's lower bound is one index probe.
+    op.execute(
+        """
+        CREATE INDEX ix_booking_archive_occupied_duration
+        ON booking_archive ((end_at - start_at))
+        WHERE booking_status_id = 4
+        """
+    )
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION longest_archived_booking()
+        RETURNS interval AS $$
+            SELECT COALESCE(max(end_at - start_at), interval '0')
+            FROM booking_archive
+            WHERE booking_status_id = 4;
+        $$ LANGUAGE sql STABLE;
+        """
+    )
+    op.execute(REFRESH_ROOM_DAY_OCCUPANCY_SQL.format(archived=ARCHIVED_OCCUPANCY_SQL))
+
+
+def downgrade() -> None:
+    op.execute(REFRESH_ROOM_DAY_OCCUPANCY_SQL.format(archived=""))
+    op.execute("DROP FUNCTION IF EXISTS longest_archived_booking();")
+    op.drop_index("ix_booking_archive_occupied_duration", table_name="booking_archive")
+    op.drop_index("ix_booking_archive_occupied_room_start_at", table_name="booking_archive")
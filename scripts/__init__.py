@@ -0,0 +1 @@
+"""Operational and benchmarking command-line tools."""
@@ -0,0 +1,107 @@
+"""Move old cancelled and completed bookings into the archive tables.
+
+Bookings whose sort time (start, or target month when never scheduled) is older than
+`--older-than-days` move with their client and character match rows into
+`booking_archive` and friends. The job walks bookings in primary-key batches, each in its
+own short transaction; rows locked by a concurrent write are picked up by the next run:
+
+    python -m scripts.archive_bookings \
+        --database-url postgresql+asyncpg://postgres@localhost/trs --older-than-days 183
+
+Usage, DM workload and played-script rollups keep counting archived bookings.
+"""
+
+import argparse
+import asyncio
+import os
+import time
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+ARCHIVE_BATCH_SQL = """
+    WITH batch AS (
+        SELECT booking_id
+        FROM booking
+        WHERE booking_id > :after_booking_id
+          AND (CAST(:store_id AS bigint) IS NULL OR store_id = :store_id)
+        ORDER BY booking_id
+        LIMIT :batch_size
+    )
+    SELECT max(booking_id) AS last_booking_id,
+           count(*) AS checked,
+           archive_bookings(array_agg(booking_id), :archived_before) AS archived
+    FROM batch
+"""
+
+
+async def archive(
+    database_url: str,
+    *,
+    store_id: int | None,
+    archived_before: datetime,
+    batch_size: int,
+) -> tuple[int, int]:
+    """Return (checked, archived) booking counts."""
+    engine = create_async_engine(database_url)
+    checked = archived = 0
+    after_booking_id = 0
+    try:
+        while True:
+            async with engine.begin() as conn:
+                result = await conn.execute(
+                    text(ARCHIVE_BATCH_SQL),
+                    {
+                        "after_booking_id": after_booking_id,
+                        "store_id": store_id,
+                        "archived_before": archived_before,
+                        "batch_size": batch_size,
+                    },
+                )
+                row = result.mappings().one()
+            if not row["checked"]:
+                return checked, archived
+            checked += row["checked"]
+            archived += row["archived"]
+            after_booking_id = row["last_booking_id"]
+    finally:
+        await engine.dispose()
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--database-url", default=os.getenv("DATABASE_URL"))
+    parser.add_argument("--store-id", type=int, default=None)
+    parser.add_argument("--older-than-days", type=int, default=183)
+    parser.add_argument("--batch-size", type=int, default=1_000)
+    args = parser.parse_args(argv)
+    if not args.database_url:
+        parser.error("--database-url or DATABASE_URL is required.")
+    if args.older_than_days < 1:
+        parser.error("--older-than-days must be >= 1.")
+    if args.batch_size < 1:
+        parser.error("--batch-size must be >= 1.")
+    return args
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = parse_args(argv)
+    archived_before = datetime.now(timezone.utc) - timedelta(days=args.older_than_days)
+    started = time.perf_counter()
+    checked, archived = asyncio.run(
+        archive(
+            args.database_url,
+            store_id=args.store_id,
+            archived_before=archived_before,
+            batch_size=args.batch_size,
+        )
+    )
+    print(
+        f"checked={checked} archived={archived} before={archived_before.isoformat()} "
+        f"in {time.perf_counter() - started:.1f}s"
+    )
+
+
+if __name__ == "__main__":
+    main()
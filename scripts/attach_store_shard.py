@@ -0,0 +1,196 @@
+"""Subscribe a store shard to the primary's global catalog.
+
+Migrate the new shard database with `alembic -x shard=true upgrade head`, run this script,
+then add the shard to `DATABASE_SHARD_URLS`. The shard copies the current `store`, `client`,
+`script`, `script_character`, `dm` and `dm_store_membership` rows and keeps streaming changes:
+
+    python -m scripts.attach_store_shard \
+        --shard-url postgresql+asyncpg://postgres@shard-2/trs \
+        --primary-conninfo "host=primary dbname=trs user=replicator" \
+        --shard-number 2
+
+A freshly migrated shard still carries the 0001 demo seed; pass `--truncate-seed-data` to
+clear the catalog tables (and everything referencing them) before the initial copy.
+
+Shard N hands out booking, slot, room and match ids from [N * 10^12, (N + 1) * 10^12), so
+ids stay unique across the primary (below 10^12) and every shard.
+
+The primary needs `wal_level = logical`. Catalog tables on a shard are read-only for the app;
+every catalog write goes through the primary. The subscription disables itself on an apply
+error instead of retrying forever; `/ready` reports such a shard as `catalog_disabled`.
+
+The apply worker runs with `session_replication_role = replica`, which skips foreign key
+triggers, so a catalog delete would silently orphan the shard's bookings. The script marks
+the catalog tables' referenced-side FK triggers `ENABLE ALWAYS`: such a delete now cascades
+or fails on the shard as it would on one database, and a failure disables the subscription.
+Rerun with `--enforce-foreign-keys` after a migration adds a foreign key to a catalog table.
+"""
+
+import argparse
+import asyncio
+import os
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection, create_async_engine
+
+SHARD_ID_SPAN = 10**12
+
+# Tables whose ids come from the primary, through the subscription or the seed migration.
+CATALOG_TABLES = (
+    "store",
+    "client",
+    "script",
+    "script_character",
+    "dm",
+    "dm_store_membership",
+    "booking_status",
+)
+
+SHARD_SEQUENCES_SQL = """
+    SELECT format('%I.%I', q.schemaname, q.sequencename) AS sequence_name, q.last_value
+    FROM pg_sequences AS q
+    JOIN pg_class AS c
+      ON c.relname = q.sequencename
+     AND c.relnamespace = q.schemaname::regnamespace
+    JOIN pg_depend AS d
+      ON d.classid = 'pg_class'::regclass
+     AND d.objid = c.oid
+     AND d.deptype IN ('a', 'i')
+    WHERE d.refobjid::regclass::text <> ALL(:catalog_tables)
+    ORDER BY 1
+"""
+
+
+async def _move_sequences(conn: AsyncConnection, shard_number: int) -> None:
+    first_id = shard_number * SHARD_ID_SPAN
+    last_id = first_id + SHARD_ID_SPAN - 1
+    result = await conn.execute(
+        text(SHARD_SEQUENCES_SQL), {"catalog_tables": list(CATALOG_TABLES)}
+    )
+    for row in result.mappings().all():
+        last_value = row["last_value"]
+        if last_value is not None and last_value > last_id:
+            raise RuntimeError(f"{row['sequence_name']} is already past shard {shard_number}.")
+        restart = f" RESTART WITH {first_id}" if last_value is None or last_value < first_id else ""
+        await conn.execute(
+            text(
+                f"ALTER SEQUENCE {row['sequence_name']} "
+                f"MINVALUE {first_id} MAXVALUE {last_id} START WITH {first_id}{restart}"
+            )
+        )
+
+
+async def _clear_catalog(conn: AsyncConnection, *, truncate_seed_data: bool) -> None:
+    """The subscription's initial copy needs empty catalog tables on the shard."""
+    tables = [table for table in CATALOG_TABLES if table != "booking_status"]
+    probes = " OR ".join(f"EXISTS (SELECT 1 FROM {table})" for table in tables)
+    result = await conn.execute(text(f"SELECT {probes}"))
+    if not result.scalar_one():
+        return
+    if not truncate_seed_data:
+        raise RuntimeError(
+            "shard catalog tables are not empty (the 0001 demo seed?); rerun with "
+            "--truncate-seed-data to clear them and everything that references them."
+        )
+    await conn.execute(text(f"TRUNCATE {', '.join(tables)} CASCADE"))
+
+
+async def _enforce_catalog_foreign_keys(conn: AsyncConnection) -> None:
+    result = await conn.execute(
+        text(
+            """
+            SELECT t.tgrelid::regclass::text AS table_name, t.tgname
+            FROM pg_trigger AS t
+            JOIN pg_constraint AS c
+              ON c.oid = t.tgconstraint
+            WHERE t.tgrelid::regclass::text = ANY(:published_tables)
+              AND c.contype = 'f'
+              AND c.confrelid = t.tgrelid
+              AND t.tgenabled <> 'A'
+            ORDER BY 1, 2
+            """
+        ),
+        {"published_tables": [table for table in CATALOG_TABLES if table != "booking_status"]},
+    )
+    for row in result.mappings().all():
+        await conn.execute(
+            text(f'ALTER TABLE {row["table_name"]} ENABLE ALWAYS TRIGGER "{row["tgname"]}"')
+        )
+
+
+async def enforce_foreign_keys(shard_url: str) -> None:
+    engine = create_async_engine(shard_url, isolation_level="AUTOCOMMIT")
+    try:
+        async with engine.connect() as conn:
+            await _enforce_catalog_foreign_keys(conn)
+    finally:
+        await engine.dispose()
+
+
+async def attach(
+    shard_url: str, *, primary_conninfo: str, shard_number: int, truncate_seed_data: bool
+) -> None:
+    # CREATE SUBSCRIPTION cannot run inside a transaction block or take bind parameters.
+    engine = create_async_engine(shard_url, isolation_level="AUTOCOMMIT")
+    conninfo = primary_conninfo.replace("'", "''")
+    try:
+        async with engine.connect() as conn:
+            await _clear_catalog(conn, truncate_seed_data=truncate_seed_data)
+            await _move_sequences(conn, shard_number)
+            await _enforce_catalog_foreign_keys(conn)
+            # Left behind when a shard was migrated without `-x shard=true`.
+            await conn.execute(text("DROP PUBLICATION IF EXISTS trs_global_catalog"))
+            await conn.execute(
+                text(
+                    f"""
+                    CREATE SUBSCRIPTION trs_catalog_shard_{shard_number}
+                    CONNECTION '{conninfo}'
+                    PUBLICATION trs_global_catalog
+                    WITH (copy_data = true, disable_on_error = true)
+                    """
+                )
+            )
+    finally:
+        await engine.dispose()
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--shard-url", required=True)
+    parser.add_argument("--primary-conninfo", default=os.getenv("PRIMARY_CONNINFO"))
+    parser.add_argument("--shard-number", type=int)
+    parser.add_argument("--truncate-seed-data", action="store_true")
+    parser.add_argument(
+        "--enforce-foreign-keys",
+        action="store_true",
+        help="only (re)mark catalog FK triggers ENABLE ALWAYS on an attached shard",
+    )
+    args = parser.parse_args(argv)
+    if args.enforce_foreign_keys:
+        return args
+    if not args.primary_conninfo:
+        parser.error("--primary-conninfo or PRIMARY_CONNINFO is required.")
+    if args.shard_number is None or not 1 <= args.shard_number < 9_000:
+        parser.error("--shard-number must be between 1 and 8999.")
+    return args
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = parse_args(argv)
+    if args.enforce_foreign_keys:
+        asyncio.run(enforce_foreign_keys(args.shard_url))
+        print("catalog foreign keys enforced")
+        return
+    asyncio.run(
+        attach(
+            args.shard_url,
+            primary_conninfo=args.primary_conninfo,
+            shard_number=args.shard_number,
+            truncate_seed_data=args.truncate_seed_data,
+        )
+    )
+    print(f"subscription trs_catalog_shard_{args.shard_number} created")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,377 @@
+"""Replay recorded or synthetic API traffic against a running server.
+
+    uvicorn app.main:app --port 8000 --workers 4
+    python -m scripts.load_test --base-url http://127.0.0.1:8000 --store-ids 1,2,3 \
+        --profile weekend-evening --rate 200 --concurrency 64 --duration 120
+
+`--replay traffic.jsonl` sends recorded calls instead of the synthetic profile. Each line is
+{"method": "GET", "path": "/api/v1/...", "body": {...}, "offset_ms": 1234}. With
+`--preserve-timing` the recorded offsets drive arrivals, otherwise `--rate` does.
+Arrivals are Poisson at `--rate` requests/second. `--rate 0` runs closed-loop, which
+keeps `--concurrency` requests in flight. Latency is measured from the scheduled
+arrival time, so queueing behind the concurrency limit shows up in the percentiles.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import re
+import statistics
+import time
+from collections import defaultdict
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from datetime import date
+from pathlib import Path
+
+import httpx
+
+NUMERIC_SEGMENT = re.compile(r"/\d+(?=/|$)")
+
+
+@dataclass(slots=True)
+class PlannedRequest:
+    method: str
+    path: str
+    route: str
+    body: dict | None = None
+    offset_s: float | None = None
+
+
+@dataclass(slots=True)
+class RouteStats:
+    latencies_ms: list[float] = field(default_factory=list)
+    statuses: dict[int, int] = field(default_factory=lambda: defaultdict(int))
+    errors: int = 0
+
+    def summary(self) -> dict[str, object]:
+        count = len(self.latencies_ms)
+        quantiles = (
+            statistics.quantiles(self.latencies_ms, n=100, method="inclusive")
+            if count > 1
+            else self.latencies_ms * 99
+        )
+        return {
+            "count": count,
+            "errors": self.errors,
+            "error_rate": round(self.errors / count, 4) if count else 0.0,
+            "p50_ms": round(quantiles[49], 2) if count else None,
+            "p95_ms": round(quantiles[94], 2) if count else None,
+            "p99_ms": round(quantiles[98], 2) if count else None,
+            "max_ms": round(max(self.latencies_ms), 2) if count else None,
+            "statuses": dict(sorted(self.statuses.items())),
+        }
+
+
+def route_template(method: str, path: str) -> str:
+    return f"{method.upper()} {NUMERIC_SEGMENT.sub('/{id}', path.split('?', 1)[0])}"
+
+
+class WeekendEveningProfile:
+    """Front-desk traffic on a busy Friday/Saturday night.
+
+    Staff mostly refresh tonight's schedule and open individual bookings, look up
+    returning clients, and browse rooms and scripts. Writes are a small share and
+    only create incomplete bookings, so the profile is safe on a shared bench
+    database.
+    """
+
+    def __init__(self, rng: random.Random, context: "TrafficContext", include_writes: bool) -> None:
+        self.rng = rng
+        self.context = context
+        self.mix: list[tuple[int, str]] = [
+            (28, "scheduled_bookings"),
+            (18, "booking_detail"),
+            (5, "conflicting_bookings"),
+            (6, "incomplete_bookings"),
+            (8, "rooms"),
+            (8, "slots"),
+            (10, "store_scripts"),
+            (6, "clients_page"),
+            (6, "client_detail"),
+            (3, "dms"),
+        ]
+        if include_writes:
+            self.mix.append((2, "create_incomplete_booking"))
+        self.weights = [weight for weight, _ in self.mix]
+        self.names = [name for _, name in self.mix]
+
+    def __iter__(self) -> Iterator[PlannedRequest]:
+        while True:
+            name = self.rng.choices(self.names, weights=self.weights)[0]
+            yield getattr(self, f"_{name}")(self.rng.choice(self.context.store_ids))
+
+    def _get(self, path: str, route: str) -> PlannedRequest:
+        return PlannedRequest(method="GET", path=path, route=route)
+
+    def _scheduled_bookings(self, store_id: int) -> PlannedRequest:
+        return self._get(
+            f"/api/v1/stores/{store_id}/bookings?booking_status_id=2&limit=50",
+            "GET /api/v1/stores/{id}/bookings",
+        )
+
+    def _booking_detail(self, store_id: int) -> PlannedRequest:
+        booking_ids = self.context.booking_ids.get(store_id)
+        if not booking_ids:
+            return self._scheduled_bookings(store_id)
+        return self._get(
+            f"/api/v1/stores/{store_id}/bookings/{self.rng.choice(booking_ids)}",
+            "GET /api/v1/stores/{id}/bookings/{id}",
+        )
+
+    def _conflicting_bookings(self, store_id: int) -> PlannedRequest:
+        return self._get(
+            f"/api/v1/stores/{store_id}/bookings?has_conflict=true&limit=20",
+            "GET /api/v1/stores/{id}/bookings?has_conflict",
+        )
+
+    def _incomplete_bookings(self, store_id: int) -> PlannedRequest:
+        return self._get(
+            f"/api/v1/stores/{store_id}/bookings?booking_status_id=1&limit=20",
+            "GET /api/v1/stores/{id}/bookings?booking_status_id=1",
+        )
+
+    def _rooms(self, store_id: int) -> PlannedRequest:
+        return self._get(f"/api/v1/stores/{store_id}/rooms", "GET /api/v1/stores/{id}/rooms")
+
+    def _slots(self, store_id: int) -> PlannedRequest:
+        return self._get(f"/api/v1/stores/{store_id}/slots?limit=50", "GET /api/v1/stores/{id}/slots")
+
+    def _store_scripts(self, store_id: int) -> PlannedRequest:
+        return self._get(
+            f"/api/v1/stores/{store_id}/scripts?limit=100",
+            "GET /api/v1/stores/{id}/scripts",
+        )
+
+    def _clients_page(self, store_id: int) -> PlannedRequest:
+        return self._get(
+            f"/api/v1/clients?limit=20&offset={self.rng.randrange(0, 2000, 20)}",
+            "GET /api/v1/clients",
+        )
+
+    def _client_detail(self, store_id: int) -> PlannedRequest:
+        if not self.context.client_ids:
+            return self._clients_page(store_id)
+        return self._get(
+            f"/api/v1/clients/{self.rng.choice(self.context.client_ids)}",
+            "GET /api/v1/clients/{id}",
+        )
+
+    def _dms(self, store_id: int) -> PlannedRequest:
+        return self._get("/api/v1/dms?limit=50", "GET /api/v1/dms")
+
+    def _create_incomplete_booking(self, store_id: int) -> PlannedRequest:
+        if not self.context.client_ids:
+            return self._scheduled_bookings(store_id)
+        today = date.today()
+        month = date(today.year + today.month // 12, today.month % 12 + 1, 1)
+        return PlannedRequest(
+            method="POST",
+            path=f"/api/v1/stores/{store_id}/bookings/incomplete",
+            route="POST /api/v1/stores/{id}/bookings/incomplete",
+            body={
+                "target_month": month.isoformat(),
+                "client_ids": self.rng.sample(
+                    self.context.client_ids, k=min(4, len(self.context.client_ids))
+                ),
+            },
+        )
+
+
+@dataclass(slots=True)
+class TrafficContext:
+    store_ids: list[int]
+    booking_ids: dict[int, list[int]] = field(default_factory=dict)
+    client_ids: list[int] = field(default_factory=list)
+
+    async def discover(self, client: httpx.AsyncClient) -> None:
+        for store_id in self.store_ids:
+            response = await client.get(
+                f"/api/v1/stores/{store_id}/bookings",
+                params={"booking_status_id": 2, "limit": 100},
+            )
+            response.raise_for_status()
+            self.booking_ids[store_id] = [item["booking_id"] for item in response.json()["items"]]
+        response = await client.get("/api/v1/clients", params={"limit": 100})
+        response.raise_for_status()
+        self.client_ids = [item["client_id"] for item in response.json()["items"]]
+
+
+def load_replay(path: Path) -> list[PlannedRequest]:
+    planned: list[PlannedRequest] = []
+    with path.open(encoding="utf-8") as replay_file:
+        for line in replay_file:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            method = record.get("method", "GET").upper()
+            offset_ms = record.get("offset_ms")
+            planned.append(
+                PlannedRequest(
+                    method=method,
+                    path=record["path"],
+                    route=record.get("route") or route_template(method, record["path"]),
+                    body=record.get("body"),
+                    offset_s=offset_ms / 1000 if offset_ms is not None else None,
+                )
+            )
+    return planned
+
+
+class LoadRunner:
+    def __init__(
+        self,
+        client: httpx.AsyncClient,
+        *,
+        concurrency: int,
+        rate: float,
+        duration: float | None,
+        max_requests: int | None,
+        preserve_timing: bool,
+        rng: random.Random,
+    ) -> None:
+        self.client = client
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.concurrency = concurrency
+        self.rate = rate
+        self.duration = duration
+        self.max_requests = max_requests
+        self.preserve_timing = preserve_timing
+        self.rng = rng
+        self.stats: dict[str, RouteStats] = defaultdict(RouteStats)
+
+    async def _send(self, planned: PlannedRequest, scheduled_at: float) -> None:
+        async with self.semaphore:
+            stats = self.stats[planned.route]
+            try:
+                response = await self.client.request(planned.method, planned.path, json=planned.body)
+                status_code = response.status_code
+            except httpx.HTTPError:
+                status_code = 0
+            stats.latencies_ms.append((time.perf_counter() - scheduled_at) * 1000)
+            stats.statuses[status_code] += 1
+            if status_code == 0 or status_code >= 500:
+                stats.errors += 1
+
+    def _should_stop(self, sent: int, started: float) -> bool:
+        if self.max_requests is not None and sent >= self.max_requests:
+            return True
+        return self.duration is not None and time.perf_counter() - started >= self.duration
+
+    async def run(self, requests: Iterator[PlannedRequest]) -> float:
+        started = time.perf_counter()
+        next_arrival = started
+        pending: set[asyncio.Task] = set()
+        sent = 0
+        for planned in requests:
+            if self._should_stop(sent, started):
+                break
+            if self.preserve_timing and planned.offset_s is not None:
+                next_arrival = started + planned.offset_s
+            elif self.rate > 0:
+                next_arrival += self.rng.expovariate(self.rate)
+            else:
+                await self.semaphore.acquire()
+                self.semaphore.release()
+                next_arrival = time.perf_counter()
+            delay = next_arrival - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            task = asyncio.create_task(self._send(planned, next_arrival))
+            pending.add(task)
+            task.add_done_callback(pending.discard)
+            sent += 1
+            if self.rate <= 0 and not self.preserve_timing:
+                await asyncio.sleep(0)
+        if pending:
+            await asyncio.gather(*pending)
+        return time.perf_counter() - started
+
+
+def print_report(stats: dict[str, RouteStats], elapsed: float) -> dict[str, object]:
+    total = sum(len(route_stats.latencies_ms) for route_stats in stats.values())
+    errors = sum(route_stats.errors for route_stats in stats.values())
+    routes = {route: stats[route].summary() for route in sorted(stats)}
+    print(f"{'route':<56} {'count':>7} {'err%':>6} {'p50':>8} {'p95':>8} {'p99':>8} {'max':>8}")
+    for route, summary in routes.items():
+        print(
+            f"{route:<56} {summary['count']:>7} {summary['error_rate'] * 100:>6.2f} "
+            f"{summary['p50_ms']:>8.1f} {summary['p95_ms']:>8.1f} "
+            f"{summary['p99_ms']:>8.1f} {summary['max_ms']:>8.1f}"
+        )
+    throughput = total / elapsed if elapsed else 0.0
+    print(f"total={total} errors={errors} elapsed={elapsed:.1f}s throughput={throughput:.1f} req/s")
+    return {
+        "total": total,
+        "errors": errors,
+        "elapsed_s": round(elapsed, 3),
+        "throughput_rps": round(throughput, 2),
+        "routes": routes,
+    }
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--actor-id", default="load-test")
+    parser.add_argument("--store-ids", required=True, help="Comma-separated X-Allowed-Store-Ids.")
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--profile", choices=["weekend-evening"], default="weekend-evening")
+    source.add_argument("--replay", type=Path)
+    parser.add_argument("--preserve-timing", action="store_true")
+    parser.add_argument("--include-writes", action="store_true")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--rate", type=float, default=100.0, help="Requests/second; 0 for closed loop.")
+    parser.add_argument("--duration", type=float, default=60.0, help="Seconds; 0 for no limit.")
+    parser.add_argument("--requests", type=int, default=None, help="Stop after this many requests.")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--output", type=Path, default=None, help="Write the report as JSON.")
+    args = parser.parse_args(argv)
+    if args.concurrency < 1:
+        parser.error("--concurrency must be >= 1.")
+    if args.duration <= 0 and args.requests is None and args.replay is None:
+        parser.error("set --duration or --requests for synthetic traffic.")
+    return args
+
+
+async def run(args: argparse.Namespace) -> dict[str, object]:
+    rng = random.Random(args.seed)
+    store_ids = [int(item) for item in args.store_ids.split(",") if item.strip()]
+    headers = {"X-Actor-Id": args.actor_id, "X-Allowed-Store-Ids": ",".join(map(str, store_ids))}
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(
+        base_url=args.base_url,
+        headers=headers,
+        limits=limits,
+        timeout=args.timeout,
+    ) as client:
+        if args.replay is not None:
+            requests: Iterator[PlannedRequest] = iter(load_replay(args.replay))
+        else:
+            context = TrafficContext(store_ids=store_ids)
+            await context.discover(client)
+            requests = iter(WeekendEveningProfile(rng, context, include_writes=args.include_writes))
+        runner = LoadRunner(
+            client,
+            concurrency=args.concurrency,
+            rate=args.rate,
+            duration=args.duration if args.duration > 0 else None,
+            max_requests=args.requests,
+            preserve_timing=args.preserve_timing,
+            rng=rng,
+        )
+        elapsed = await runner.run(requests)
+    return print_report(runner.stats, elapsed)
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = parse_args(argv)
+    report = asyncio.run(run(args))
+    if args.output is not None:
+        args.output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""Re-derive the stored same-room conflict ids on every booking and fix any drift.
+
+The booking triggers keep `conflict_booking_ids` / `conflict_count` current, but two
+transactions that commit overlapping bookings in the same room at the same time cannot
+see each other's rows. This job walks bookings in primary-key batches, each in its own
+short transaction, and rewrites only the rows whose stored ids differ:
+
+    python -m scripts.repair_booking_conflicts \
+        --database-url postgresql+asyncpg://postgres@localhost/trs --store-id 3
+
+Run it from cron; it exits non-zero when rows were repaired so drift gets noticed.
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+REPAIR_BATCH_SQL = """
+    WITH batch AS (
+        SELECT booking_id
+        FROM booking
+        WHERE booking_id > :after_booking_id
+          AND (CAST(:store_id AS bigint) IS NULL OR store_id = :store_id)
+        ORDER BY booking_id
+        LIMIT :batch_size
+    )
+    SELECT max(booking_id) AS last_booking_id,
+           count(*) AS checked,
+           refresh_booking_conflicts(array_agg(booking_id)) AS repaired
+    FROM batch
+"""
+
+
+async def repair(database_url: str, *, store_id: int | None, batch_size: int) -> tuple[int, int]:
+    """Return (checked, repaired) booking counts."""
+    engine = create_async_engine(database_url)
+    checked = repaired = 0
+    after_booking_id = 0
+    try:
+        while True:
+            async with engine.begin() as conn:
+                result = await conn.execute(
+                    text(REPAIR_BATCH_SQL),
+                    {
+                        "after_booking_id": after_booking_id,
+                        "store_id": store_id,
+                        "batch_size": batch_size,
+                    },
+                )
+                row = result.mappings().one()
+            if not row["checked"]:
+                return checked, repaired
+            checked += row["checked"]
+            repaired += row["repaired"]
+            after_booking_id = row["last_booking_id"]
+    finally:
+        await engine.dispose()
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--database-url", default=os.getenv("DATABASE_URL"))
+    parser.add_argument("--store-id", type=int, default=None)
+    parser.add_argument("--batch-size", type=int, default=5_000)
+    args = parser.parse_args(argv)
+    if not args.database_url:
+        parser.error("--database-url or DATABASE_URL is required.")
+    if args.batch_size < 1:
+        parser.error("--batch-size must be >= 1.")
+    return args
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = parse_args(argv)
+    started = time.perf_counter()
+    checked, repaired = asyncio.run(
+        repair(args.database_url, store_id=args.store_id, batch_size=args.batch_size)
+    )
+    print(f"checked={checked} repaired={repaired} in {time.perf_counter() - started:.1f}s")
+    if repaired:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
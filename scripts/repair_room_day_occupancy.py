@@ -0,0 +1,143 @@
+"""Re-derive every room-day occupancy mask from its bookings and fix any drift.
+
+The booking triggers keep `store_room_day_occupancy` current and serialize writers on the
+same room and day, but rows written before that lock existed, or by hand, can still be
+stale. This job walks rooms in primary-key batches, each in its own short transaction,
+and rebuilds only the room-days whose stored mask differs from their bookings, archived
+completed ones included:
+
+    python -m scripts.repair_room_day_occupancy \
+        --database-url postgresql+asyncpg://postgres@localhost/trs --store-id 3
+
+Pass `--verify` to only report drift. Like `repair_booking_conflicts`, it exits non-zero
+when drift was found so it gets noticed from cron.
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+REPAIR_BATCH_SQL = """
+    WITH rooms AS (
+        SELECT store_room_id
+        FROM store_room
+        WHERE store_room_id > :after_store_room_id
+          AND (CAST(:store_id AS bigint) IS NULL OR store_id = :store_id)
+        ORDER BY store_room_id
+        LIMIT :batch_size
+    ),
+    expected AS (
+        SELECT b.store_room_id,
+               d.day::date AS occupancy_date,
+               bit_or(quarter_hour_mask(d.day::date, b.start_at, b.end_at)) AS quarter_hours
+        FROM (
+            SELECT store_room_id, start_at, end_at
+            FROM booking
+            WHERE booking_status_id IN (2, 4)
+            UNION ALL
+            SELECT store_room_id, start_at, end_at
+            FROM booking_archive
+            WHERE booking_status_id = 4
+        ) AS b
+        JOIN rooms AS r
+          ON r.store_room_id = b.store_room_id
+        CROSS JOIN LATERAL generate_series(
+            store_local_date(b.start_at),
+            store_local_date(b.end_at - interval '1 microsecond'),
+            interval '1 day'
+        ) AS d(day)
+        GROUP BY b.store_room_id, d.day::date
+    ),
+    stored AS (
+        SELECT o.store_room_id, o.occupancy_date, o.quarter_hours
+        FROM store_room_day_occupancy AS o
+        JOIN rooms AS r
+          ON r.store_room_id = o.store_room_id
+    ),
+    drift AS (
+        SELECT store_room_id, occupancy_date
+        FROM expected
+        FULL JOIN stored USING (store_room_id, occupancy_date)
+        WHERE expected.quarter_hours IS DISTINCT FROM stored.quarter_hours
+    ),
+    repaired AS MATERIALIZED (
+        SELECT refresh_room_day_occupancy(store_room_id, occupancy_date)
+        FROM drift
+        WHERE NOT :verify_only
+    )
+    SELECT (SELECT max(store_room_id) FROM rooms) AS last_store_room_id,
+           (SELECT count(*) FROM rooms) AS checked,
+           (SELECT count(*) FROM drift) AS drifted,
+           (SELECT count(*) FROM repaired) AS repaired
+"""
+
+
+async def repair(
+    database_url: str, *, store_id: int | None, batch_size: int, verify_only: bool
+) -> tuple[int, int]:
+    """Return (checked room, drifted room-day) counts."""
+    engine = create_async_engine(database_url)
+    checked = drifted = 0
+    after_store_room_id = 0
+    try:
+        while True:
+            async with engine.begin() as conn:
+                result = await conn.execute(
+                    text(REPAIR_BATCH_SQL),
+                    {
+                        "after_store_room_id": after_store_room_id,
+                        "store_id": store_id,
+                        "batch_size": batch_size,
+                        "verify_only": verify_only,
+                    },
+                )
+                row = result.mappings().one()
+            if not row["checked"]:
+                return checked, drifted
+            checked += row["checked"]
+            drifted += row["drifted"]
+            after_store_room_id = row["last_store_room_id"]
+    finally:
+        await engine.dispose()
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--database-url", default=os.getenv("DATABASE_URL"))
+    parser.add_argument("--store-id", type=int, default=None)
+    parser.add_argument("--batch-size", type=int, default=50)
+    parser.add_argument("--verify", action="store_true")
+    args = parser.parse_args(argv)
+    if not args.database_url:
+        parser.error("--database-url or DATABASE_URL is required.")
+    if args.batch_size < 1:
+        parser.error("--batch-size must be >= 1.")
+    return args
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = parse_args(argv)
+    started = time.perf_counter()
+    checked, drifted = asyncio.run(
+        repair(
+            args.database_url,
+            store_id=args.store_id,
+            batch_size=args.batch_size,
+            verify_only=args.verify,
+        )
+    )
+    action = "found" if args.verify else "repaired"
+    print(
+        f"rooms={checked} {action}={drifted} room-days in {time.perf_counter() - started:.1f}s"
+    )
+    if drifted:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
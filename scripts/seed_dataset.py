@@ -0,0 +1,472 @@
+"""Seed a local Postgres with a realistic, scalable scheduler dataset.
+
+The schema is created through the Alembic migrations, then rows are bulk-loaded with
+COPY in fixed-size chunks so memory stays flat even for millions of bookings.
+
+    python -m scripts.seed_dataset \
+        --database-url postgresql+asyncpg://postgres@localhost/trs_bench \
+        --stores 20 --rooms-per-store 8 --clients 100000 --bookings 2000000
+
+Bookings are laid out per room and day (afternoon, evening and late sessions in store
+local time). `--overlap-rate` is the share of sessions that start before the previous
+session in the same room has ended, which is what the conflict paths have to find.
+The history span is derived from `--bookings` and the number of active rooms, and
+ends `--future-days` after today. The seeder appends to whatever is already in the
+database and assumes it is the only writer while it runs.
+"""
+
+import argparse
+import asyncio
+import math
+import os
+import random
+import time
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from zoneinfo import ZoneInfo
+
+from alembic import command
+from alembic.config import Config
+from sqlalchemy.ext.asyncio import create_async_engine
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+STORE_TIMEZONE = ZoneInfo("America/Toronto")
+
+CN_SURNAMES = list("王李张刘陈杨黄赵吴周徐孙马朱胡郭何林罗高梁郑谢宋唐")
+CN_GIVEN = ["伟", "芳", "娜", "敏", "静", "丽", "强", "磊", "洋", "艳", "勇", "军", "杰", "娟", "涛", "明", "超", "秀英", "华", "慧"]
+EN_FIRST = ["Alex", "Jordan", "Taylor", "Morgan", "Casey", "Riley", "Jamie", "Avery", "Quinn", "Drew", "Skyler", "Cameron"]
+EN_LAST = ["Chen", "Lee", "Wong", "Smith", "Nguyen", "Patel", "Kim", "Brown", "Singh", "Martin", "Zhang", "Liu"]
+AREA_CODES = ["416", "647", "437", "905", "289"]
+SCRIPT_MINUTES = [150, 180, 180, 210, 240, 240, 270, 300]
+PLAYER_COUNTS = [3, 4, 5, 6, 7, 8, 9, 10]
+PLAYER_WEIGHTS = [2, 6, 8, 10, 8, 6, 3, 1]
+SESSIONS_PER_ROOM_DAY = 2.6
+
+
+@dataclass(slots=True)
+class SeedConfig:
+    database_url: str
+    stores: int = 5
+    rooms_per_store: int = 6
+    scripts: int = 200
+    dms: int = 60
+    clients: int = 100_000
+    bookings: int = 1_000_000
+    overlap_rate: float = 0.03
+    incomplete_rate: float = 0.03
+    future_days: int = 45
+    chunk_size: int = 20_000
+    seed: int = 20260206
+    skip_migrations: bool = False
+
+
+@dataclass(slots=True)
+class Catalog:
+    store_ids: list[int] = field(default_factory=list)
+    active_room_ids: dict[int, list[int]] = field(default_factory=dict)
+    active_script_ids: dict[int, list[int]] = field(default_factory=dict)
+    script_minutes: dict[int, int] = field(default_factory=dict)
+    player_character_ids: dict[int, list[int]] = field(default_factory=dict)
+    dm_character_ids: dict[int, list[int]] = field(default_factory=dict)
+    member_dm_ids: dict[int, list[int]] = field(default_factory=dict)
+    client_ids: list[int] = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class BookingChunk:
+    slots: list[tuple] = field(default_factory=list)
+    bookings: list[tuple] = field(default_factory=list)
+    booking_clients: list[tuple] = field(default_factory=list)
+    client_matches: list[tuple] = field(default_factory=list)
+    dm_matches: list[tuple] = field(default_factory=list)
+
+    def __len__(self) -> int:
+        return len(self.bookings)
+
+
+def run_migrations(database_url: str) -> None:
+    os.environ["DATABASE_URL"] = database_url
+    alembic_config = Config(str(ROOT_DIR / "alembic.ini"))
+    alembic_config.set_main_option("script_location", str(ROOT_DIR / "migrations"))
+    command.upgrade(alembic_config, "head")
+
+
+def _client_name(rng: random.Random) -> str:
+    if rng.random() < 0.6:
+        return rng.choice(CN_SURNAMES) + "".join(rng.choices(CN_GIVEN, k=rng.choice([1, 2])))
+    return f"{rng.choice(EN_FIRST)} {rng.choice(EN_LAST)}"
+
+
+def _client_phone(rng: random.Random) -> str | None:
+    if rng.random() < 0.15:
+        return None
+    area, exchange, line = rng.choice(AREA_CODES), rng.randint(200, 999), rng.randint(0, 9999)
+    return rng.choice(
+        [
+            f"{area}-{exchange}-{line:04d}",
+            f"({area}) {exchange} {line:04d}",
+            f"+1 {area} {exchange} {line:04d}",
+        ]
+    )
+
+
+class DatasetSeeder:
+    def __init__(self, config: SeedConfig) -> None:
+        self.config = config
+        self.rng = random.Random(config.seed)
+        self.catalog = Catalog()
+        self.slot_ids: dict[tuple[int, datetime], int] = {}
+        self.next_ids: dict[str, int] = {}
+        self.now = datetime.now(timezone.utc)
+
+    async def run(self) -> None:
+        engine = create_async_engine(self.config.database_url)
+        try:
+            async with engine.connect() as conn:
+                raw_connection = await conn.get_raw_connection()
+                self.pg = raw_connection.driver_connection
+                await self._load_next_ids()
+                await self._seed_catalog()
+                await self._seed_clients()
+                await self._seed_bookings()
+                await self._finalize()
+        finally:
+            await engine.dispose()
+
+    async def _load_next_ids(self) -> None:
+        for table, column in (
+            ("store", "store_id"),
+            ("store_room", "store_room_id"),
+            ("script", "script_id"),
+            ("script_character", "character_id"),
+            ("dm", "dm_id"),
+            ("client", "client_id"),
+            ("slot", "slot_id"),
+            ("booking", "booking_id"),
+        ):
+            current = await self.pg.fetchval(f"SELECT coalesce(max({column}), 0) FROM {table}")
+            self.next_ids[table] = current + 1
+
+    def _take_id(self, table: str) -> int:
+        value = self.next_ids[table]
+        self.next_ids[table] = value + 1
+        return value
+
+    async def _copy(self, table: str, columns: list[str], records: list[tuple]) -> None:
+        if records:
+            await self.pg.copy_records_to_table(table, records=records, columns=columns)
+
+    async def _seed_catalog(self) -> None:
+        rng, catalog, config = self.rng, self.catalog, self.config
+        stores, rooms, scripts, characters, store_scripts, dms, memberships = [], [], [], [], [], [], []
+
+        for _ in range(config.stores):
+            store_id = self._take_id("store")
+            stores.append((store_id, f"Bench Store {store_id}"))
+            catalog.store_ids.append(store_id)
+            catalog.active_room_ids[store_id] = []
+            for room_number in range(1, config.rooms_per_store + 1):
+                room_id = self._take_id("store_room")
+                is_active = room_number == 1 or rng.random() > 0.1
+                rooms.append((room_id, store_id, f"Room {room_number}", is_active))
+                if is_active:
+                    catalog.active_room_ids[store_id].append(room_id)
+
+        for _ in range(config.scripts):
+            script_id = self._take_id("script")
+            minutes = rng.choice(SCRIPT_MINUTES)
+            scripts.append((script_id, f"Bench Script {script_id}", minutes))
+            catalog.script_minutes[script_id] = minutes
+            players = rng.choices(PLAYER_COUNTS, weights=PLAYER_WEIGHTS)[0]
+            dm_roles = rng.choices([1, 2, 3], weights=[5, 3, 1])[0]
+            catalog.player_character_ids[script_id] = []
+            catalog.dm_character_ids[script_id] = []
+            for number in range(1, players + 1):
+                character_id = self._take_id("script_character")
+                characters.append((character_id, script_id, f"Role {number}", False))
+                catalog.player_character_ids[script_id].append(character_id)
+            for number in range(1, dm_roles + 1):
+                character_id = self._take_id("script_character")
+                characters.append((character_id, script_id, f"DM Role {number}", True))
+                catalog.dm_character_ids[script_id].append(character_id)
+
+        for store_id in catalog.store_ids:
+            catalog.active_script_ids[store_id] = []
+            for script_id, _name, _minutes in scripts:
+                is_active = rng.random() < 0.85
+                store_scripts.append((store_id, script_id, is_active))
+                if is_active:
+                    catalog.active_script_ids[store_id].append(script_id)
+
+        catalog.member_dm_ids = {store_id: [] for store_id in catalog.store_ids}
+        for index in range(config.dms):
+            dm_id = self._take_id("dm")
+            dms.append((dm_id, f"DM {dm_id}", True))
+            home_store_id = catalog.store_ids[index % len(catalog.store_ids)]
+            member_store_ids = {home_store_id}
+            if len(catalog.store_ids) > 1 and rng.random() < 0.3:
+                member_store_ids.add(rng.choice(catalog.store_ids))
+            for store_id in member_store_ids:
+                memberships.append((dm_id, store_id))
+                catalog.member_dm_ids[store_id].append(dm_id)
+
+        await self._copy("store", ["store_id", "name"], stores)
+        await self._copy("store_room", ["store_room_id", "store_id", "name", "is_active"], rooms)
+        await self._copy("script", ["script_id", "name", "estimated_minutes"], scripts)
+        await self._copy(
+            "script_character",
+            ["character_id", "script_id", "character_name", "is_dm"],
+            characters,
+        )
+        await self._copy("store_script", ["store_id", "script_id", "is_active"], store_scripts)
+        await self._copy("dm", ["dm_id", "display_name", "is_active"], dms)
+        await self._copy("dm_store_membership", ["dm_id", "store_id"], memberships)
+        print(
+            f"catalog: {len(stores)} stores, {len(rooms)} rooms, {len(scripts)} scripts, "
+            f"{len(characters)} characters, {len(dms)} dms"
+        )
+
+    async def _seed_clients(self) -> None:
+        batch: list[tuple] = []
+        for _ in range(self.config.clients):
+            client_id = self._take_id("client")
+            batch.append((client_id, _client_name(self.rng), _client_phone(self.rng)))
+            self.catalog.client_ids.append(client_id)
+            if len(batch) >= self.config.chunk_size:
+                await self._copy("client", ["client_id", "display_name", "phone"], batch)
+                batch = []
+        await self._copy("client", ["client_id", "display_name", "phone"], batch)
+        print(f"clients: {self.config.clients}")
+
+    def _pick_clients(self, count: int) -> list[int]:
+        # Skewed towards low indexes so a core of regulars accumulates hundreds of sessions.
+        client_ids = self.catalog.client_ids
+        picked: dict[int, None] = {}
+        while len(picked) < min(count, len(client_ids)):
+            picked[client_ids[int(len(client_ids) * self.rng.random() ** 2.5)]] = None
+        return list(picked)
+
+    def _pick_script(self, store_id: int) -> int:
+        script_ids = self.catalog.active_script_ids[store_id]
+        # Popularity follows a long tail: the first scripts of the store catalog dominate.
+        return script_ids[min(int(self.rng.paretovariate(1.2)) - 1, len(script_ids) - 1)]
+
+    def _emit_booking(
+        self,
+        chunk: BookingChunk,
+        store_id: int,
+        script_id: int | None,
+        *,
+        status_id: int,
+        room_id: int | None = None,
+        start_at: datetime | None = None,
+        target_month: date | None = None,
+        duration_override: int | None = None,
+        with_matches: bool = True,
+    ) -> None:
+        rng, catalog = self.rng, self.catalog
+        booking_id = self._take_id("booking")
+        slot_id = None
+        if start_at is not None:
+            slot_key = (store_id, start_at)
+            slot_id = self.slot_ids.get(slot_key)
+            if slot_id is None:
+                slot_id = self._take_id("slot")
+                self.slot_ids[slot_key] = slot_id
+                chunk.slots.append((slot_id, store_id, start_at))
+        chunk.bookings.append(
+            (
+                booking_id,
+                store_id,
+                script_id,
+                slot_id,
+                room_id,
+                status_id,
+                target_month,
+                start_at,
+                duration_override,
+            )
+        )
+
+        player_ids = catalog.player_character_ids.get(script_id, []) if script_id else []
+        client_count = len(player_ids) if player_ids else rng.randint(1, 6)
+        client_ids = self._pick_clients(client_count)
+        chunk.booking_clients.extend((booking_id, client_id) for client_id in client_ids)
+        if not with_matches or not player_ids:
+            return
+        chunk.client_matches.extend(
+            (booking_id, character_id, client_id)
+            for character_id, client_id in zip(
+                player_ids[: len(client_ids)], client_ids, strict=True
+            )
+        )
+        member_dm_ids = catalog.member_dm_ids[store_id]
+        dm_character_ids = catalog.dm_character_ids[script_id]
+        dm_ids = rng.sample(member_dm_ids, k=min(len(dm_character_ids), len(member_dm_ids)))
+        chunk.dm_matches.extend(
+            (booking_id, character_id, dm_id)
+            for character_id, dm_id in zip(dm_character_ids[: len(dm_ids)], dm_ids, strict=True)
+        )
+
+    def _scheduled_status(self, start_at: datetime) -> int:
+        roll = self.rng.random()
+        if start_at < self.now:
+            return 4 if roll < 0.88 else (3 if roll < 0.98 else 2)
+        return 2 if roll < 0.92 else 3
+
+    def _store_bookings(self, store_id: int, count: int) -> Iterator[BookingChunk]:
+        rng, config = self.rng, self.config
+        room_ids = self.catalog.active_room_ids[store_id]
+        incomplete_count = int(count * config.incomplete_rate)
+        scheduled_count = count - incomplete_count
+        days = max(1, math.ceil(scheduled_count / (len(room_ids) * SESSIONS_PER_ROOM_DAY)))
+        last_day = (self.now.astimezone(STORE_TIMEZONE) + timedelta(days=config.future_days)).date()
+        day = last_day - timedelta(days=days - 1)
+
+        chunk = BookingChunk()
+        emitted = 0
+        while emitted < scheduled_count:
+            for room_id in room_ids:
+                local_start = datetime(day.year, day.month, day.day, 12, rng.choice([0, 30]), tzinfo=STORE_TIMEZONE)
+                cursor = local_start.astimezone(timezone.utc)
+                last_start = (local_start + timedelta(hours=10)).astimezone(timezone.utc)
+                previous_end = None
+                while emitted < scheduled_count and cursor < last_start:
+                    script_id = self._pick_script(store_id)
+                    minutes = self.catalog.script_minutes[script_id]
+                    duration_override = None
+                    if rng.random() < 0.05:
+                        duration_override = minutes + rng.choice([-30, 30, 60])
+                    start_at = cursor
+                    if previous_end is not None and rng.random() < config.overlap_rate:
+                        start_at = previous_end - timedelta(minutes=rng.choice([30, 60, 90]))
+                    end_at = start_at + timedelta(minutes=duration_override or minutes)
+                    self._emit_booking(
+                        chunk,
+                        store_id,
+                        script_id,
+                        status_id=self._scheduled_status(start_at),
+                        room_id=room_id,
+                        start_at=start_at,
+                        duration_override=duration_override,
+                    )
+                    emitted += 1
+                    previous_end = end_at
+                    cursor = end_at + timedelta(minutes=rng.choice([15, 30, 45, 60]))
+                    if len(chunk) >= config.chunk_size:
+                        yield chunk
+                        chunk = BookingChunk()
+            day += timedelta(days=1)
+
+        this_month = self.now.date().replace(day=1)
+        for _ in range(incomplete_count):
+            target_month = (this_month + timedelta(days=32 * rng.randint(0, 2))).replace(day=1)
+            script_id = self._pick_script(store_id) if rng.random() < 0.7 else None
+            self._emit_booking(
+                chunk,
+                store_id,
+                script_id,
+                status_id=1,
+                target_month=target_month,
+                with_matches=rng.random() < 0.5,
+            )
+            if len(chunk) >= config.chunk_size:
+                yield chunk
+                chunk = BookingChunk()
+        if len(chunk):
+            yield chunk
+
+    async def _write_chunk(self, chunk: BookingChunk) -> None:
+        await self._copy("slot", ["slot_id", "store_id", "start_at"], chunk.slots)
+        await self._copy(
+            "booking",
+            [
+                "booking_id",
+                "store_id",
+                "script_id",
+                "slot_id",
+                "store_room_id",
+                "booking_status_id",
+                "target_month",
+                "start_at",
+                "duration_override_minutes",
+            ],
+            chunk.bookings,
+        )
+        await self._copy("booking_client", ["booking_id", "client_id"], chunk.booking_clients)
+        await self._copy(
+            "character_client_match",
+            ["booking_id", "character_id", "client_id"],
+            chunk.client_matches,
+        )
+        await self._copy("character_dm_match", ["booking_id", "character_id", "dm_id"], chunk.dm_matches)
+
+    async def _seed_bookings(self) -> None:
+        store_ids = self.catalog.store_ids
+        per_store = self.config.bookings // len(store_ids)
+        remainder = self.config.bookings - per_store * len(store_ids)
+        written = 0
+        started = time.perf_counter()
+        for index, store_id in enumerate(store_ids):
+            count = per_store + (remainder if index == 0 else 0)
+            for chunk in self._store_bookings(store_id, count):
+                await self._write_chunk(chunk)
+                written += len(chunk)
+                elapsed = time.perf_counter() - started
+                print(f"bookings: {written}/{self.config.bookings} ({written / elapsed:,.0f}/s)")
+
+    async def _finalize(self) -> None:
+        for table, column in (
+            ("store", "store_id"),
+            ("store_room", "store_room_id"),
+            ("script", "script_id"),
+            ("script_character", "character_id"),
+            ("dm", "dm_id"),
+            ("client", "client_id"),
+            ("slot", "slot_id"),
+            ("booking", "booking_id"),
+        ):
+            await self.pg.execute(
+                f"SELECT setval(pg_get_serial_sequence('{table}', '{column}'), "
+                f"(SELECT max({column}) FROM {table}))"
+            )
+        await self.pg.execute("ANALYZE")
+
+
+def parse_args(argv: list[str] | None = None) -> SeedConfig:
+    defaults = SeedConfig(database_url="")
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--database-url", default=os.getenv("DATABASE_URL"))
+    parser.add_argument("--stores", type=int, default=defaults.stores)
+    parser.add_argument("--rooms-per-store", type=int, default=defaults.rooms_per_store)
+    parser.add_argument("--scripts", type=int, default=defaults.scripts)
+    parser.add_argument("--dms", type=int, default=defaults.dms)
+    parser.add_argument("--clients", type=int, default=defaults.clients)
+    parser.add_argument("--bookings", type=int, default=defaults.bookings)
+    parser.add_argument("--overlap-rate", type=float, default=defaults.overlap_rate)
+    parser.add_argument("--incomplete-rate", type=float, default=defaults.incomplete_rate)
+    parser.add_argument("--future-days", type=int, default=defaults.future_days)
+    parser.add_argument("--chunk-size", type=int, default=defaults.chunk_size)
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+    parser.add_argument("--skip-migrations", action="store_true")
+    args = parser.parse_args(argv)
+    if not args.database_url:
+        parser.error("--database-url or DATABASE_URL is required.")
+    if args.stores < 1 or args.rooms_per_store < 1 or args.scripts < 1 or args.clients < 10:
+        parser.error("stores, rooms-per-store and scripts must be >= 1 and clients >= 10.")
+    return SeedConfig(**{key.replace("-", "_"): value for key, value in vars(args).items()})
+
+
+def main(argv: list[str] | None = None) -> None:
+    config = parse_args(argv)
+    if not config.skip_migrations:
+        run_migrations(config.database_url)
+    started = time.perf_counter()
+    asyncio.run(DatasetSeeder(config).run())
+    print(f"done in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
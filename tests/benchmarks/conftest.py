@@ -0,0 +1,169 @@
+"""Scale benchmarks against a database seeded by `python -m scripts.seed_dataset`.
+
+Every test here is skipped unless BENCH_DATABASE_URL is set:
+
+    BENCH_DATABASE_URL=postgresql+asyncpg://postgres@localhost/trs_bench \
+        python -m pytest tests/benchmarks -q
+
+BENCH_ITERATIONS controls samples per benchmark (default 30) and BENCH_OUTPUT, when set,
+receives the summary as JSON. Mutating benchmarks run inside an outer transaction that
+is rolled back, so the seeded dataset is left untouched.
+"""
+
+import json
+import os
+import statistics
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+
+BENCH_DATABASE_URL = os.getenv("BENCH_DATABASE_URL")
+BENCH_ITERATIONS = int(os.getenv("BENCH_ITERATIONS", "30"))
+BENCH_WARMUP = 3
+BENCH_OUTPUT = os.getenv("BENCH_OUTPUT")
+
+_IGNORED_STATEMENT_PREFIXES = ("SAVEPOINT", "RELEASE SAVEPOINT", "ROLLBACK TO SAVEPOINT")
+
+
+@dataclass(slots=True)
+class BenchResult:
+    name: str
+    timings_ms: list[float]
+    statements: list[int]
+
+    def percentile(self, q: int) -> float:
+        if len(self.timings_ms) == 1:
+            return self.timings_ms[0]
+        return statistics.quantiles(self.timings_ms, n=100, method="inclusive")[q - 1]
+
+    def summary(self) -> dict[str, object]:
+        return {
+            "name": self.name,
+            "iterations": len(self.timings_ms),
+            "p50_ms": round(self.percentile(50), 3),
+            "p95_ms": round(self.percentile(95), 3),
+            "p99_ms": round(self.percentile(99), 3),
+            "statements_per_call": round(statistics.fmean(self.statements), 2),
+            "max_statements": max(self.statements),
+        }
+
+
+_results: list[BenchResult] = []
+
+
+@dataclass(slots=True)
+class StatementCounter:
+    count: int = 0
+    ignored_prefixes: tuple[str, ...] = field(default=_IGNORED_STATEMENT_PREFIXES)
+
+    def before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        if not statement.lstrip().upper().startswith(self.ignored_prefixes):
+            self.count += 1
+
+
+class BenchmarkRunner:
+    def __init__(self, counter: StatementCounter) -> None:
+        self.counter = counter
+
+    @property
+    def calls_needed(self) -> int:
+        return BENCH_ITERATIONS + BENCH_WARMUP
+
+    async def run(
+        self,
+        name: str,
+        call: Callable[[], Awaitable[object]],
+        *,
+        iterations: int = BENCH_ITERATIONS,
+        warmup: int = BENCH_WARMUP,
+    ) -> BenchResult:
+        for _ in range(warmup):
+            await call()
+        timings_ms: list[float] = []
+        statements: list[int] = []
+        for _ in range(iterations):
+            before = self.counter.count
+            started = time.perf_counter()
+            await call()
+            timings_ms.append((time.perf_counter() - started) * 1000)
+            statements.append(self.counter.count - before)
+        result = BenchResult(name=name, timings_ms=timings_ms, statements=statements)
+        _results.append(result)
+        return result
+
+
+def pytest_collection_modifyitems(config, items):
+    if BENCH_DATABASE_URL:
+        return
+    skip = pytest.mark.skip(reason="BENCH_DATABASE_URL is not set.")
+    for item in items:
+        if "benchmark" in item.keywords:
+            item.add_marker(skip)
+
+
+def pytest_terminal_summary(terminalreporter, exitstatus, config):
+    if not _results:
+        return
+    summaries = [result.summary() for result in _results]
+    terminalreporter.section("benchmarks")
+    terminalreporter.write_line(
+        f"{'name':<48} {'n':>4} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'stmts':>7}"
+    )
+    for summary in summaries:
+        terminalreporter.write_line(
+            f"{summary['name']:<48} {summary['iterations']:>4} {summary['p50_ms']:>9.2f} "
+            f"{summary['p95_ms']:>9.2f} {summary['p99_ms']:>9.2f} "
+            f"{summary['statements_per_call']:>7.1f}"
+        )
+    if BENCH_OUTPUT:
+        with open(BENCH_OUTPUT, "w", encoding="utf-8") as output:
+            json.dump(summaries, output, indent=2)
+
+
+@pytest.fixture
+def statement_counter() -> StatementCounter:
+    return StatementCounter()
+
+
+@pytest.fixture
+async def bench_engine(statement_counter: StatementCounter) -> AsyncIterator[AsyncEngine]:
+    engine = create_async_engine(BENCH_DATABASE_URL)
+    event.listen(engine.sync_engine, "before_cursor_execute", statement_counter.before_cursor_execute)
+    try:
+        yield engine
+    finally:
+        await engine.dispose()
+
+
+@pytest.fixture
+def bench(statement_counter: StatementCounter) -> BenchmarkRunner:
+    return BenchmarkRunner(statement_counter)
+
+
+@pytest.fixture
+def rollback_sessions(bench_engine: AsyncEngine):
+    @asynccontextmanager
+    async def factory() -> AsyncIterator[async_sessionmaker[AsyncSession]]:
+        async with bench_engine.connect() as conn:
+            outer = await conn.begin()
+            try:
+                yield async_sessionmaker(
+                    bind=conn,
+                    class_=AsyncSession,
+                    join_transaction_mode="create_savepoint",
+                    expire_on_commit=False,
+                )
+            finally:
+                await outer.rollback()
+
+    return factory
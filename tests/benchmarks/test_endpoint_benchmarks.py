@@ -0,0 +1,87 @@
+import os
+
+import httpx
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+pytestmark = pytest.mark.benchmark
+
+
+@pytest.fixture
+async def api_client(bench_engine: AsyncEngine):
+    os.environ.setdefault("DATABASE_URL", os.environ["BENCH_DATABASE_URL"])
+    from app.core.database import get_async_session, get_store_session
+    from app.main import app
+
+    async def override_session():
+        async with AsyncSession(bench_engine, expire_on_commit=False) as session:
+            yield session
+
+    async with bench_engine.connect() as conn:
+        store_ids = (await conn.execute(text("SELECT store_id FROM store"))).scalars().all()
+    headers = {
+        "X-Actor-Id": "bench",
+        "X-Allowed-Store-Ids": ",".join(str(store_id) for store_id in store_ids),
+    }
+    app.dependency_overrides[get_async_session] = override_session
+    app.dependency_overrides[get_store_session] = override_session
+    transport = httpx.ASGITransport(app=app)
+    try:
+        async with httpx.AsyncClient(
+            transport=transport,
+            base_url="http://bench",
+            headers=headers,
+        ) as client:
+            yield client
+    finally:
+        app.dependency_overrides.pop(get_async_session, None)
+        app.dependency_overrides.pop(get_store_session, None)
+
+
+async def _busiest_store_id(engine: AsyncEngine) -> int:
+    async with engine.connect() as conn:
+        store_id = (
+            await conn.execute(
+                text(
+                    """
+                    SELECT store_id
+                    FROM booking
+                    GROUP BY store_id
+                    ORDER BY count(*) DESC
+                    LIMIT 1
+                    """
+                )
+            )
+        ).scalar_one_or_none()
+    if store_id is None:
+        pytest.skip("benchmark database has no bookings; run scripts.seed_dataset first.")
+    return store_id
+
+
+@pytest.mark.parametrize(
+    ("name", "path"),
+    [
+        ("GET /stores/{id}/bookings", "/api/v1/stores/{store_id}/bookings?limit=20"),
+        ("GET /stores/{id}/bookings?limit=100", "/api/v1/stores/{store_id}/bookings?limit=100"),
+        (
+            "GET /stores/{id}/bookings?has_conflict",
+            "/api/v1/stores/{store_id}/bookings?has_conflict=true",
+        ),
+        ("GET /stores/{id}/slots", "/api/v1/stores/{store_id}/slots?limit=100"),
+        ("GET /stores/{id}/rooms", "/api/v1/stores/{store_id}/rooms"),
+        ("GET /stores/{id}/scripts", "/api/v1/stores/{store_id}/scripts?limit=100"),
+        ("GET /clients", "/api/v1/clients?limit=100"),
+        ("GET /clients?offset=50000", "/api/v1/clients?limit=100&offset=50000"),
+        ("GET /dms", "/api/v1/dms?limit=100"),
+        ("GET /scripts", "/api/v1/scripts?limit=100"),
+    ],
+)
+async def test_list_endpoint(bench, bench_engine: AsyncEngine, api_client, name: str, path: str) -> None:
+    url = path.format(store_id=await _busiest_store_id(bench_engine))
+
+    async def call() -> None:
+        response = await api_client.get(url)
+        assert response.status_code == 200, response.text
+
+    await bench.run(name, call)
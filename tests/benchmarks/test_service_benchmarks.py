@@ -0,0 +1,249 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from app.schemas.booking import (
+    ConfirmBookingRequest,
+    CreateCharacterClientMatchRequest,
+    CreateCharacterDmMatchRequest,
+)
+from app.services.booking_service import BookingService
+from app.services.character_client_match_service import CharacterClientMatchService
+from app.services.character_dm_match_service import CharacterDmMatchService
+
+pytestmark = pytest.mark.benchmark
+
+
+async def _fetch(engine: AsyncEngine, query: str, params: dict | None = None) -> list[dict]:
+    async with engine.connect() as conn:
+        result = await conn.execute(text(query), params or {})
+        return [dict(row) for row in result.mappings().all()]
+
+
+async def _busiest_store_id(engine: AsyncEngine) -> int:
+    rows = await _fetch(
+        engine,
+        """
+        SELECT store_id
+        FROM booking
+        GROUP BY store_id
+        ORDER BY count(*) DESC
+        LIMIT 1
+        """,
+    )
+    if not rows:
+        pytest.skip("benchmark database has no bookings; run scripts.seed_dataset first.")
+    return rows[0]["store_id"]
+
+
+def _targets(rows: list[dict], needed: int) -> list[dict]:
+    if len(rows) < needed:
+        pytest.skip(f"benchmark needs {needed} target rows, dataset only has {len(rows)}.")
+    return rows
+
+
+@pytest.mark.parametrize(
+    ("label", "filters"),
+    [
+        ("all", {}),
+        ("scheduled", {"booking_status_id": 2}),
+        ("has_conflict", {"has_conflict": True}),
+    ],
+)
+async def test_list_bookings(bench, bench_engine: AsyncEngine, label: str, filters: dict) -> None:
+    store_id = await _busiest_store_id(bench_engine)
+
+    for limit, offset in ((20, 0), (100, 0), (20, 10_000)):
+
+        async def call(limit: int = limit, offset: int = offset) -> None:
+            async with AsyncSession(bench_engine) as session:
+                await BookingService(session).list_bookings(
+                    store_id,
+                    booking_status_id=filters.get("booking_status_id"),
+                    target_month=None,
+                    has_conflict=filters.get("has_conflict"),
+                    limit=limit,
+                    offset=offset,
+                )
+
+        await bench.run(f"list_bookings[{label},limit={limit},offset={offset}]", call)
+
+
+async def test_get_booking(bench, bench_engine: AsyncEngine) -> None:
+    store_id = await _busiest_store_id(bench_engine)
+    rows = await _fetch(
+        bench_engine,
+        """
+        SELECT booking_id
+        FROM booking
+        WHERE store_id = :store_id
+          AND booking_status_id = 4
+        ORDER BY booking_id DESC
+        LIMIT 1
+        """,
+        {"store_id": store_id},
+    )
+    booking_id = _targets(rows, 1)[0]["booking_id"]
+
+    async def call() -> None:
+        async with AsyncSession(bench_engine) as session:
+            await BookingService(session).get_booking(store_id, booking_id)
+
+    await bench.run("get_booking[completed]", call)
+
+
+async def test_confirm_booking(bench, bench_engine: AsyncEngine, rollback_sessions) -> None:
+    needed = bench.calls_needed
+    rows = await _fetch(
+        bench_engine,
+        """
+        SELECT b.booking_id, b.store_id
+        FROM booking AS b
+        JOIN store_script AS ss
+          ON ss.store_id = b.store_id
+         AND ss.script_id = b.script_id
+         AND ss.is_active = true
+        WHERE b.booking_status_id = 1
+          AND (
+              SELECT count(*)
+              FROM character_client_match AS m
+              WHERE m.booking_id = b.booking_id
+          ) = (
+              SELECT count(*)
+              FROM script_character AS c
+              WHERE c.script_id = b.script_id
+                AND c.is_dm = false
+                AND c.is_active = true
+          )
+          AND (
+              SELECT count(*)
+              FROM booking_client AS bc
+              WHERE bc.booking_id = b.booking_id
+          ) = (
+              SELECT count(*)
+              FROM character_client_match AS m
+              WHERE m.booking_id = b.booking_id
+          )
+        ORDER BY b.booking_id
+        LIMIT :limit
+        """,
+        {"limit": needed},
+    )
+    targets = iter(_targets(rows, needed))
+    evening = datetime.now(timezone.utc).replace(hour=23, minute=0, second=0, microsecond=0)
+
+    async with rollback_sessions() as session_maker:
+
+        async def call() -> None:
+            target = next(targets)
+            start_at = evening + timedelta(days=target["booking_id"] % 30)
+            async with session_maker() as session:
+                await BookingService(session).confirm_booking(
+                    target["store_id"],
+                    target["booking_id"],
+                    ConfirmBookingRequest(start_at=start_at),
+                )
+
+        await bench.run("confirm_booking", call)
+
+
+async def test_create_client_match(bench, bench_engine: AsyncEngine, rollback_sessions) -> None:
+    needed = bench.calls_needed
+    rows = await _fetch(
+        bench_engine,
+        """
+        SELECT b.booking_id,
+               b.store_id,
+               (
+                   SELECT min(c.character_id)
+                   FROM script_character AS c
+                   WHERE c.script_id = b.script_id
+                     AND c.is_dm = false
+               ) AS character_id,
+               (
+                   SELECT min(bc.client_id)
+                   FROM booking_client AS bc
+                   WHERE bc.booking_id = b.booking_id
+               ) AS client_id
+        FROM booking AS b
+        WHERE b.booking_status_id = 1
+          AND b.script_id IS NOT NULL
+          AND NOT EXISTS (
+              SELECT 1
+              FROM character_client_match AS m
+              WHERE m.booking_id = b.booking_id
+          )
+        ORDER BY b.booking_id
+        LIMIT :limit
+        """,
+        {"limit": needed},
+    )
+    targets = iter(_targets(rows, needed))
+
+    async with rollback_sessions() as session_maker:
+
+        async def call() -> None:
+            target = next(targets)
+            async with session_maker() as session:
+                await CharacterClientMatchService(session).create_match(
+                    target["store_id"],
+                    target["booking_id"],
+                    CreateCharacterClientMatchRequest(
+                        character_id=target["character_id"],
+                        client_id=target["client_id"],
+                    ),
+                )
+
+        await bench.run("character_client_match.create", call)
+
+
+async def test_create_dm_match(bench, bench_engine: AsyncEngine, rollback_sessions) -> None:
+    needed = bench.calls_needed
+    rows = await _fetch(
+        bench_engine,
+        """
+        SELECT b.booking_id,
+               b.store_id,
+               (
+                   SELECT min(c.character_id)
+                   FROM script_character AS c
+                   WHERE c.script_id = b.script_id
+                     AND c.is_dm = true
+               ) AS character_id,
+               (
+                   SELECT min(ms.dm_id)
+                   FROM dm_store_membership AS ms
+                   WHERE ms.store_id = b.store_id
+               ) AS dm_id
+        FROM booking AS b
+        WHERE b.booking_status_id = 1
+          AND b.script_id IS NOT NULL
+          AND NOT EXISTS (
+              SELECT 1
+              FROM character_dm_match AS m
+              WHERE m.booking_id = b.booking_id
+          )
+        ORDER BY b.booking_id
+        LIMIT :limit
+        """,
+        {"limit": needed},
+    )
+    targets = iter(_targets([row for row in rows if row["dm_id"] is not None], needed))
+
+    async with rollback_sessions() as session_maker:
+
+        async def call() -> None:
+            target = next(targets)
+            async with session_maker() as session:
+                await CharacterDmMatchService(session).create_match(
+                    target["store_id"],
+                    target["booking_id"],
+                    CreateCharacterDmMatchRequest(
+                        character_id=target["character_id"],
+                        dm_id=target["dm_id"],
+                    ),
+                )
+
+        await bench.run("character_dm_match.create", call)
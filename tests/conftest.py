@@ -0,0 +1,121 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+
+class FakeResult:
+    def __init__(self, *, rows=None, scalar=None, scalar_or_none=None) -> None:
+        self._rows = rows or []
+        self._scalar = scalar
+        self._scalar_or_none = scalar_or_none
+
+    def mappings(self) -> "FakeResult":
+        return self
+
+    def all(self):
+        return self._rows
+
+    def one(self):
+        return self._rows[0]
+
+    def one_or_none(self):
+        return self._rows[0] if self._rows else None
+
+    def scalar_one(self):
+        return self._scalar
+
+    def scalar_one_or_none(self):
+        return self._scalar_or_none
+
+
+class FakeBegin:
+    async def __aenter__(self):
+        return None
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return False
+
+
+def sample_row(index: int = 1, **overrides) -> dict:
+    start_at = datetime(2026, 4, 4, 23, 0, tzinfo=timezone.utc)
+    row = {
+        "booking_id": index,
+        "store_id": 10,
+        "store_name": f"Store {index}",
+        "script_id": 5,
+        "booking_status_id": 2,
+        "target_month": None,
+        "start_at": start_at,
+        "end_at": start_at + timedelta(minutes=180),
+        "duration_override_minutes": None,
+        "slot_id": index,
+        "store_room_id": index,
+        "client_id": index,
+        "dm_id": index,
+        "character_id": index,
+        "character_name": f"Character {index}",
+        "character_client_match_id": index,
+        "character_dm_match_id": index,
+        "conflict_booking_id": index + 1,
+        "conflict_kind": "dm",
+        "conflict_booking_ids": [],
+        "display_name": f"Name {index}",
+        "name": f"Name {index}",
+        "phone": None,
+        "estimated_minutes": 180,
+        "player_count": 2,
+        "dm_count": 1,
+        "is_active": True,
+        "is_dm": False,
+        "has_conflict": False,
+        "pic_storage_key": None,
+        "archived": False,
+        "archived_before": None,
+    }
+    row.update(overrides)
+    return row
+
+
+class RecordingSession:
+    """Session double that answers every statement from SQL-keyed rules.
+
+    `rules` is a list of (sql_substring, FakeResult kwargs) and the first match wins.
+    Unlike the per-file FakeSession queues, results do not depend on call order, so one
+    session can drive any service method and `execute_calls` gives the statement count.
+    Paged queries return `limit` rows and `ANY(:booking_ids)` lookups return one row per
+    id, which is what makes per-row queries show up as growth with page size.
+    """
+
+    def __init__(self, rules=()) -> None:
+        self.rules = list(rules)
+        self.execute_calls = []
+
+    async def execute(self, query, params=None):
+        params = params or {}
+        self.execute_calls.append((query, params))
+        sql = " ".join(str(query).split())
+        for needle, result in self.rules:
+            if needle in sql:
+                return FakeResult(**result)
+        if "count(*)" in sql:
+            return FakeResult(scalar=1000)
+        if "LIMIT :limit" in sql:
+            first = params.get("offset", 0) + 1
+            return FakeResult(rows=[sample_row(first + index) for index in range(params["limit"])])
+        if "ANY(:booking_ids)" in sql:
+            return FakeResult(rows=[sample_row(booking_id) for booking_id in params["booking_ids"]])
+        if "LIMIT 1" in sql:
+            return FakeResult(scalar_or_none=None)
+        return FakeResult(rows=[sample_row()], scalar=1, scalar_or_none=1)
+
+    def begin(self):
+        return FakeBegin()
+
+    @property
+    def statement_count(self) -> int:
+        return len(self.execute_calls)
+
+
+@pytest.fixture
+def recording_session():
+    return RecordingSession
@@ -0,0 +1,170 @@
+"""Integration tests against a migrated Postgres database.
+
+Skipped unless TEST_DATABASE_URL points at a database upgraded to head:
+
+    TEST_DATABASE_URL=postgresql+asyncpg://postgres@localhost/trs_test python -m pytest tests/integration
+
+Each test runs inside an outer transaction that is rolled back, so fixture rows never
+persist and the suite can share a database with local development data.
+"""
+
+import os
+
+import pytest
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL")
+_IGNORED_STATEMENT_PREFIXES = ("SAVEPOINT", "RELEASE SAVEPOINT", "ROLLBACK TO SAVEPOINT")
+
+
+def pytest_collection_modifyitems(config, items):
+    if TEST_DATABASE_URL:
+        return
+    skip = pytest.mark.skip(reason="TEST_DATABASE_URL is not set.")
+    for item in items:
+        if "integration" in item.keywords:
+            item.add_marker(skip)
+
+
+class StatementCounter:
+    def __init__(self) -> None:
+        self.count = 0
+
+    def before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        if not statement.lstrip().upper().startswith(_IGNORED_STATEMENT_PREFIXES):
+            self.count += 1
+
+
+@pytest.fixture
+def statement_counter() -> StatementCounter:
+    return StatementCounter()
+
+
+@pytest.fixture
+async def db_connection(statement_counter: StatementCounter):
+    engine = create_async_engine(TEST_DATABASE_URL)
+    event.listen(engine.sync_engine, "before_cursor_execute", statement_counter.before_cursor_execute)
+    try:
+        async with engine.connect() as conn:
+            outer = await conn.begin()
+            try:
+                yield conn
+            finally:
+                await outer.rollback()
+    finally:
+        await engine.dispose()
+
+
+@pytest.fixture
+def session_maker(db_connection) -> async_sessionmaker[AsyncSession]:
+    return async_sessionmaker(
+        bind=db_connection,
+        class_=AsyncSession,
+        join_transaction_mode="create_savepoint",
+        expire_on_commit=False,
+    )
+
+
+async def _scalar(conn, query: str, params: dict | None = None):
+    result = await conn.execute(text(query), params or {})
+    return result.scalar_one()
+
+
+@pytest.fixture
+async def store_fixture(db_connection) -> dict[str, object]:
+    conn = db_connection
+    store_id = await _scalar(
+        conn, "INSERT INTO store (name) VALUES ('Integration Store') RETURNING store_id"
+    )
+    await conn.execute(
+        text(
+            """
+            INSERT INTO store_room (store_id, name)
+            SELECT :store_id, 'Room ' || n
+            FROM generate_series(1, 2) AS n
+            """
+        ),
+        {"store_id": store_id},
+    )
+    room_id = await _scalar(
+        conn,
+        "SELECT min(store_room_id) FROM store_room WHERE store_id = :store_id",
+        {"store_id": store_id},
+    )
+    script_id = await _scalar(
+        conn,
+        """
+        INSERT INTO script (name, estimated_minutes)
+        VALUES ('Integration Script', 180)
+        RETURNING script_id
+        """,
+    )
+    await conn.execute(
+        text(
+            """
+            INSERT INTO script_character (script_id, character_name, is_dm)
+            VALUES (:script_id, 'Role A', false),
+                   (:script_id, 'Role B', false),
+                   (:script_id, 'Host', true)
+            """
+        ),
+        {"script_id": script_id},
+    )
+    await conn.execute(
+        text("INSERT INTO store_script (store_id, script_id) VALUES (:store_id, :script_id)"),
+        {"store_id": store_id, "script_id": script_id},
+    )
+    client_ids = (
+        await conn.execute(
+            text(
+                """
+                INSERT INTO client (display_name)
+                SELECT 'Integration Client ' || n
+                FROM generate_series(1, 120) AS n
+                RETURNING client_id
+                """
+            )
+        )
+    ).scalars().all()
+    await conn.execute(
+        text(
+            """
+            INSERT INTO slot (store_id, start_at)
+            SELECT :store_id, timestamptz '2026-05-01 23:00:00+00' + n * interval '2 hours'
+            FROM generate_series(1, 120) AS n
+            """
+        ),
+        {"store_id": store_id},
+    )
+    # Three-hour sessions every two hours in one room, so every booking has conflicts.
+    await conn.execute(
+        text(
+            """
+            INSERT INTO booking (
+                store_id, script_id, slot_id, store_room_id, booking_status_id, start_at
+            )
+            SELECT :store_id, :script_id, slot_id, :room_id, 2, start_at
+            FROM slot
+            WHERE store_id = :store_id
+            """
+        ),
+        {"store_id": store_id, "script_id": script_id, "room_id": room_id},
+    )
+    await conn.execute(
+        text(
+            """
+            INSERT INTO booking_client (booking_id, client_id)
+            SELECT booking_id, :client_id
+            FROM booking
+            WHERE store_id = :store_id
+            """
+        ),
+        {"store_id": store_id, "client_id": client_ids[0]},
+    )
+    return {
+        "store_id": store_id,
+        "script_id": script_id,
+        "room_id": room_id,
+        "client_ids": client_ids,
+    }
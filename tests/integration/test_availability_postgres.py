@@ -0,0 +1,86 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import text
+
+from app.services.availability_service import AvailabilityService
+
+pytestmark = pytest.mark.integration
+
+
+async def test_availability_matches_pairwise_overlap_check(
+    db_connection, session_maker, store_fixture
+):
+    conn = db_connection
+    room_id = store_fixture["room_id"]
+    start_from = datetime(2026, 5, 10, 0, 30, tzinfo=timezone.utc)
+    start_to = start_from + timedelta(days=2)
+    # Open a hole in the back-to-back schedule and add a long booking in the other room.
+    await conn.execute(
+        text(
+            """
+            UPDATE booking
+            SET booking_status_id = 3
+            WHERE store_room_id = :room_id
+              AND start_at BETWEEN '2026-05-10 10:00+00' AND '2026-05-10 16:00+00'
+            """
+        ),
+        {"room_id": room_id},
+    )
+    await conn.execute(
+        text(
+            """
+            UPDATE booking
+            SET store_room_id = (
+                    SELECT max(store_room_id) FROM store_room WHERE store_id = :store_id
+                ),
+                duration_override_minutes = 600
+            WHERE booking_id = (
+                SELECT booking_id
+                FROM booking
+                WHERE store_id = :store_id
+                  AND start_at = '2026-05-09 21:00+00'
+            )
+            """
+        ),
+        {"store_id": store_fixture["store_id"]},
+    )
+
+    async with session_maker() as session:
+        response = await AvailabilityService(session).get_availability(
+            store_fixture["store_id"],
+            script_id=store_fixture["script_id"],
+            start_from=start_from,
+            start_to=start_to,
+            step_minutes=30,
+        )
+
+    busy = (
+        await conn.execute(
+            text(
+                """
+                SELECT store_room_id, start_at, end_at
+                FROM booking
+                WHERE store_id = :store_id
+                  AND booking_status_id IN (2, 4)
+                """
+            ),
+            {"store_id": store_fixture["store_id"]},
+        )
+    ).all()
+    duration = timedelta(minutes=response.estimated_minutes)
+    assert len(response.rooms) == 2
+    for room in response.rooms:
+        expected = []
+        start_at = start_from
+        while start_at < start_to:
+            if not any(
+                row.store_room_id == room.store_room_id
+                and row.start_at < start_at + duration
+                and row.end_at > start_at
+                for row in busy
+            ):
+                expected.append(start_at)
+            start_at += timedelta(minutes=30)
+        assert room.start_times == expected
+    assert response.rooms[0].start_times
@@ -0,0 +1,219 @@
+import json
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import text
+
+from app.schemas.booking import BookingExportFormat
+from app.services.booking_service import BookingService
+from app.services.client_service import ClientService
+
+pytestmark = pytest.mark.integration
+
+ARCHIVED_BEFORE = datetime(2026, 5, 3, 0, 0, tzinfo=timezone.utc)
+
+
+async def _rollup_snapshot(conn, store_id: int, client_id: int) -> tuple:
+    result = await conn.execute(
+        text(
+            """
+            SELECT
+                (SELECT sum(booking_count) FROM store_room_daily_usage WHERE store_id = :store_id),
+                (SELECT sum(booked_minutes) FROM store_room_daily_usage WHERE store_id = :store_id),
+                (SELECT sum(play_count) FROM client_played_script WHERE client_id = :client_id),
+                (SELECT count(*) FROM store_room_day_occupancy WHERE store_id = :store_id)
+            """
+        ),
+        {"store_id": store_id, "client_id": client_id},
+    )
+    return tuple(result.one())
+
+
+async def _archive_store(conn, store_id: int) -> int:
+    result = await conn.execute(
+        text(
+            """
+            SELECT archive_bookings(array_agg(booking_id), :archived_before)
+            FROM booking
+            WHERE store_id = :store_id
+            """
+        ),
+        {"store_id": store_id, "archived_before": ARCHIVED_BEFORE},
+    )
+    return result.scalar_one()
+
+
+@pytest.fixture
+async def archived_fixture(db_connection, store_fixture) -> dict[str, object]:
+    """The first ten sessions completed, the eleventh cancelled, then archived."""
+    conn = db_connection
+    store_id = store_fixture["store_id"]
+    booking_ids = (
+        await conn.execute(
+            text("SELECT booking_id FROM booking WHERE store_id = :store_id ORDER BY start_at"),
+            {"store_id": store_id},
+        )
+    ).scalars().all()
+    await conn.execute(
+        text("UPDATE booking SET booking_status_id = 4 WHERE booking_id = ANY(:booking_ids)"),
+        {"booking_ids": booking_ids[:10]},
+    )
+    await conn.execute(
+        text("UPDATE booking SET booking_status_id = 3 WHERE booking_id = :booking_id"),
+        {"booking_id": booking_ids[10]},
+    )
+    client_id = store_fixture["client_ids"][0]
+    before = await _rollup_snapshot(conn, store_id, client_id)
+    moved = await _archive_store(conn, store_id)
+    return {
+        **store_fixture,
+        "booking_ids": booking_ids,
+        "moved": moved,
+        "rollups_before": before,
+    }
+
+
+async def test_archive_moves_terminal_bookings_and_keeps_rollups(
+    db_connection, archived_fixture
+):
+    conn = db_connection
+    store_id = archived_fixture["store_id"]
+    booking_ids = archived_fixture["booking_ids"]
+
+    # The twelfth session also starts before the cutoff but is still scheduled.
+    assert archived_fixture["moved"] == 11
+    archived_ids = (
+        await conn.execute(text("SELECT booking_id FROM booking_archive ORDER BY start_at"))
+    ).scalars().all()
+    assert archived_ids == booking_ids[:11]
+    archived_clients = await conn.execute(
+        text("SELECT count(*) FROM booking_client_archive WHERE booking_id = ANY(:booking_ids)"),
+        {"booking_ids": booking_ids[:11]},
+    )
+    assert archived_clients.scalar_one() == 11
+    assert await _rollup_snapshot(
+        conn, store_id, archived_fixture["client_ids"][0]
+    ) == archived_fixture["rollups_before"]
+
+    dangling = await conn.execute(
+        text(
+            """
+            SELECT count(*)
+            FROM booking
+            WHERE store_id = :store_id
+              AND conflict_booking_ids && CAST(:booking_ids AS bigint[])
+            """
+        ),
+        {"store_id": store_id, "booking_ids": booking_ids[:11]},
+    )
+    assert dangling.scalar_one() == 0
+    horizon = await conn.execute(
+        text("SELECT archived_before FROM booking_archive_horizon WHERE store_id = :store_id"),
+        {"store_id": store_id},
+    )
+    assert horizon.scalar_one() == ARCHIVED_BEFORE
+
+    # A second run finds nothing left to move.
+    assert await _archive_store(conn, store_id) == 0
+
+
+async def _keep_connection(execution_options=None):
+    return None
+
+
+async def test_reads_union_archive_when_range_needs_it(
+    session_maker, archived_fixture, monkeypatch
+):
+    store_id = archived_fixture["store_id"]
+    booking_ids = archived_fixture["booking_ids"]
+    client_id = archived_fixture["client_ids"][0]
+
+    async with session_maker() as session:
+        item = await BookingService(session).get_booking(store_id, booking_ids[0])
+    assert (item.booking_status_id, item.client_ids) == (4, [client_id])
+    assert item.conflict_booking_ids == [booking_ids[1]]
+
+    async def exported_ids(start_from: datetime | None) -> list[int]:
+        async with session_maker() as session:
+            # The export's REPEATABLE READ snapshot cannot be set inside the outer test
+            # transaction, which already gives it one consistent snapshot.
+            monkeypatch.setattr(session, "connection", _keep_connection)
+            chunks = await BookingService(session).export_bookings(
+                store_id,
+                start_from=start_from,
+                start_to=None,
+                export_format=BookingExportFormat.NDJSON,
+            )
+            body = b"".join([chunk async for chunk in chunks])
+        return [json.loads(line)["booking_id"] for line in body.splitlines()]
+
+    assert await exported_ids(None) == booking_ids
+    assert await exported_ids(ARCHIVED_BEFORE) == booking_ids[12:]
+
+    seen: list[int] = []
+    cursor = None
+    while True:
+        async with session_maker() as session:
+            page = await ClientService(session).list_client_bookings(
+                client_id, allowed_store_ids={store_id}, limit=25, cursor=cursor
+            )
+        seen.extend(item.booking_id for item in page.items)
+        cursor = page.next_cursor
+        if cursor is None:
+            break
+    assert seen == booking_ids[::-1]
+
+
+async def test_list_bookings_unions_archive_for_terminal_statuses(session_maker, archived_fixture):
+    store_id = archived_fixture["store_id"]
+    booking_ids = archived_fixture["booking_ids"]
+
+    async def listed(booking_status_id: int | None) -> tuple[list[int], int]:
+        async with session_maker() as session:
+            page = await BookingService(session).list_bookings(
+                store_id,
+                booking_status_id=booking_status_id,
+                target_month=None,
+                has_conflict=None,
+                limit=len(booking_ids),
+                offset=0,
+            )
+        return sorted(item.booking_id for item in page.items), page.total
+
+    assert await listed(None) == (sorted(booking_ids), len(booking_ids))
+    assert await listed(4) == (sorted(booking_ids[:10]), 10)
+    assert await listed(3) == ([booking_ids[10]], 1)
+    assert await listed(2) == (sorted(booking_ids[11:]), len(booking_ids) - 11)
+
+    async with session_maker() as session:
+        page = await BookingService(session).list_bookings(
+            store_id,
+            booking_status_id=4,
+            target_month=None,
+            has_conflict=True,
+            limit=len(booking_ids),
+            offset=0,
+        )
+    archived_item = next(item for item in page.items if item.booking_id == booking_ids[0])
+    assert archived_item.conflict_booking_ids == [booking_ids[1]]
+
+
+async def test_room_day_rebuild_keeps_archived_bookings(db_connection, archived_fixture):
+    conn = db_connection
+    store_id = archived_fixture["store_id"]
+    before = await _rollup_snapshot(conn, store_id, archived_fixture["client_ids"][0])
+
+    await conn.execute(
+        text(
+            """
+            SELECT refresh_room_day_occupancy(o.store_room_id, o.occupancy_date)
+            FROM store_room_day_occupancy AS o
+            WHERE o.store_id = :store_id
+            """
+        ),
+        {"store_id": store_id},
+    )
+
+    assert await _rollup_snapshot(
+        conn, store_id, archived_fixture["client_ids"][0]
+    ) == before
@@ -0,0 +1,209 @@
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import text
+
+from app.schemas.booking import ConfirmBookingRequest
+from app.services.booking_service import BookingService
+from scripts.repair_booking_conflicts import REPAIR_BATCH_SQL
+
+pytestmark = pytest.mark.integration
+
+
+async def _drifted_booking_ids(conn, store_id: int) -> list[int]:
+    """Bookings whose stored conflict ids differ from a pairwise overlap check."""
+    result = await conn.execute(
+        text(
+            """
+            SELECT b.booking_id
+            FROM booking AS b
+            CROSS JOIN LATERAL (
+                SELECT COALESCE(array_agg(b2.booking_id ORDER BY b2.booking_id), '{}') AS ids
+                FROM booking AS b2
+                WHERE b.booking_status_id IN (2, 4)
+                  AND b2.store_room_id = b.store_room_id
+                  AND b2.booking_id <> b.booking_id
+                  AND b2.booking_status_id IN (2, 4)
+                  AND b2.start_at < b.end_at
+                  AND b2.end_at > b.start_at
+            ) AS derived
+            WHERE b.store_id = :store_id
+              AND (b.conflict_booking_ids, b.conflict_count)
+                  IS DISTINCT FROM (derived.ids, cardinality(derived.ids))
+            ORDER BY b.booking_id
+            """
+        ),
+        {"store_id": store_id},
+    )
+    return list(result.scalars().all())
+
+
+async def _booking_id_at(conn, store_id: int, start_at: str) -> int:
+    result = await conn.execute(
+        text("SELECT booking_id FROM booking WHERE store_id = :store_id AND start_at = :start_at"),
+        {"store_id": store_id, "start_at": datetime.fromisoformat(start_at)},
+    )
+    return result.scalar_one()
+
+
+async def test_conflict_columns_follow_status_and_time_changes(
+    db_connection, session_maker, store_fixture
+):
+    conn = db_connection
+    store_id = store_fixture["store_id"]
+    assert await _drifted_booking_ids(conn, store_id) == []
+    before = await _booking_id_at(conn, store_id, "2026-05-10 11:00+00:00")
+    cancelled = await _booking_id_at(conn, store_id, "2026-05-10 13:00+00:00")
+    after = await _booking_id_at(conn, store_id, "2026-05-10 15:00+00:00")
+
+    async with session_maker() as session:
+        item = await BookingService(session).cancel_booking(store_id, cancelled)
+    assert (item.has_conflict, item.conflict_booking_ids) == (False, [])
+    async with session_maker() as session:
+        service = BookingService(session)
+        assert (await service.get_booking(store_id, before)).conflict_booking_ids == [before - 1]
+        assert (await service.get_booking(store_id, after)).conflict_booking_ids == [after + 1]
+    async with session_maker() as session:
+        completed = await BookingService(session).complete_booking(store_id, after)
+    assert completed.conflict_booking_ids == [after + 1]
+    assert await _drifted_booking_ids(conn, store_id) == []
+
+    # Reschedule one session into the second room and stretch another across two.
+    await conn.execute(
+        text(
+            """
+            UPDATE booking
+            SET store_room_id = (
+                SELECT max(store_room_id) FROM store_room WHERE store_id = :store_id
+            )
+            WHERE booking_id = :booking_id
+            """
+        ),
+        {"store_id": store_id, "booking_id": before},
+    )
+    await conn.execute(
+        text("UPDATE booking SET duration_override_minutes = 420 WHERE booking_id = :booking_id"),
+        {"booking_id": after + 2},
+    )
+    assert await _drifted_booking_ids(conn, store_id) == []
+
+    async with session_maker() as session:
+        listed = await BookingService(session).list_bookings(
+            store_id,
+            booking_status_id=None,
+            target_month=None,
+            has_conflict=False,
+            limit=200,
+            offset=0,
+        )
+    assert before in {item.booking_id for item in listed.items}
+    assert all(not item.has_conflict for item in listed.items)
+
+
+async def test_confirm_returns_stored_conflicts_and_repair_fixes_drift(
+    db_connection, session_maker, store_fixture
+):
+    conn = db_connection
+    store_id = store_fixture["store_id"]
+    client_id = store_fixture["client_ids"][0]
+    result = await conn.execute(
+        text(
+            """
+            INSERT INTO booking (store_id, script_id, booking_status_id, target_month)
+            VALUES (:store_id, :script_id, 1, '2026-05-01')
+            RETURNING booking_id
+            """
+        ),
+        {"store_id": store_id, "script_id": store_fixture["script_id"]},
+    )
+    booking_id = result.scalar_one()
+    await conn.execute(
+        text(
+            """
+            INSERT INTO booking_client (booking_id, client_id)
+            VALUES (:booking_id, :client_a), (:booking_id, :client_b)
+            """
+        ),
+        {
+            "booking_id": booking_id,
+            "client_a": client_id,
+            "client_b": store_fixture["client_ids"][1],
+        },
+    )
+    await conn.execute(
+        text(
+            """
+            INSERT INTO character_client_match (booking_id, character_id, client_id)
+            SELECT :booking_id,
+                   c.character_id,
+                   CASE c.character_name
+                       WHEN 'Role A' THEN CAST(:client_a AS bigint)
+                       ELSE CAST(:client_b AS bigint)
+                   END
+            FROM script_character AS c
+            WHERE c.script_id = :script_id
+              AND NOT c.is_dm
+            """
+        ),
+        {
+            "booking_id": booking_id,
+            "script_id": store_fixture["script_id"],
+            "client_a": client_id,
+            "client_b": store_fixture["client_ids"][1],
+        },
+    )
+    # Occupy the second room so confirm has to double-book the preferred one.
+    await conn.execute(
+        text(
+            """
+            UPDATE booking
+            SET store_room_id = (
+                SELECT max(store_room_id) FROM store_room WHERE store_id = :store_id
+            )
+            WHERE store_id = :store_id
+              AND start_at = '2026-05-10 15:00+00'
+            """
+        ),
+        {"store_id": store_id},
+    )
+
+    async with session_maker() as session:
+        item = await BookingService(session).confirm_booking(
+            store_id,
+            booking_id,
+            ConfirmBookingRequest(
+                start_at=datetime(2026, 5, 10, 14, 0, tzinfo=timezone.utc),
+                preferred_room_id=store_fixture["room_id"],
+            ),
+        )
+    neighbours = [await _booking_id_at(conn, store_id, "2026-05-10 13:00+00:00")]
+    assert item.conflict_booking_ids == neighbours
+    assert item.conflict_count == 1
+    assert await _drifted_booking_ids(conn, store_id) == []
+
+    await conn.execute(
+        text(
+            """
+            UPDATE booking
+            SET conflict_booking_ids = '{}', conflict_count = 0
+            WHERE booking_id = ANY(:booking_ids)
+            """
+        ),
+        {"booking_ids": neighbours},
+    )
+    assert await _drifted_booking_ids(conn, store_id) == neighbours
+    repaired = 0
+    after_booking_id = 0
+    while True:
+        row = (
+            await conn.execute(
+                text(REPAIR_BATCH_SQL),
+                {"after_booking_id": after_booking_id, "store_id": store_id, "batch_size": 50},
+            )
+        ).mappings().one()
+        if not row["checked"]:
+            break
+        repaired += row["repaired"]
+        after_booking_id = row["last_booking_id"]
+    assert repaired == 1
+    assert await _drifted_booking_ids(conn, store_id) == []
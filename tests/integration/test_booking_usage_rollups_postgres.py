@@ -0,0 +1,124 @@
+from datetime import date
+
+import pytest
+from sqlalchemy import text
+
+from app.services.analytics_service import AnalyticsService
+
+pytestmark = pytest.mark.integration
+
+
+async def _rollup_matches_bookings(conn, store_id: int) -> bool:
+    result = await conn.execute(
+        text(
+            """
+            WITH expected AS (
+                SELECT store_room_id,
+                       store_local_date(start_at) AS usage_date,
+                       count(*) AS booking_count,
+                       sum(round(extract(epoch FROM end_at - start_at) / 60)) AS booked_minutes
+                FROM booking
+                WHERE store_id = :store_id
+                  AND booking_status_id IN (2, 4)
+                GROUP BY 1, 2
+            ),
+            actual AS (
+                SELECT store_room_id, usage_date, booking_count, booked_minutes
+                FROM store_room_daily_usage
+                WHERE store_id = :store_id
+                  AND booking_count <> 0
+            )
+            SELECT NOT EXISTS (
+                (SELECT * FROM expected EXCEPT SELECT * FROM actual)
+                UNION ALL
+                (SELECT * FROM actual EXCEPT SELECT * FROM expected)
+            )
+            """
+        ),
+        {"store_id": store_id},
+    )
+    return result.scalar_one()
+
+
+async def test_rollups_follow_booking_transitions(db_connection, store_fixture):
+    conn = db_connection
+    store_id = store_fixture["store_id"]
+    assert await _rollup_matches_bookings(conn, store_id)
+
+    await conn.execute(
+        text(
+            """
+            UPDATE booking
+            SET booking_status_id = 4
+            WHERE store_id = :store_id
+              AND booking_id % 3 = 0
+            """
+        ),
+        {"store_id": store_id},
+    )
+    await conn.execute(
+        text(
+            """
+            UPDATE booking
+            SET booking_status_id = 3
+            WHERE store_id = :store_id
+              AND booking_id % 5 = 0
+            """
+        ),
+        {"store_id": store_id},
+    )
+    await conn.execute(
+        text(
+            """
+            UPDATE booking
+            SET store_room_id = (
+                SELECT max(store_room_id) FROM store_room WHERE store_id = :store_id
+            )
+            WHERE store_id = :store_id
+              AND booking_id % 7 = 0
+            """
+        ),
+        {"store_id": store_id},
+    )
+    await conn.execute(
+        text(
+            """
+            UPDATE booking
+            SET duration_override_minutes = 45
+            WHERE store_id = :store_id
+              AND booking_id % 2 = 0
+            """
+        ),
+        {"store_id": store_id},
+    )
+    await conn.execute(
+        text("DELETE FROM booking WHERE store_id = :store_id AND booking_id % 11 = 0"),
+        {"store_id": store_id},
+    )
+
+    assert await _rollup_matches_bookings(conn, store_id)
+
+
+async def test_analytics_reads_rollups(session_maker, store_fixture):
+    async with session_maker() as session:
+        service = AnalyticsService(session)
+        occupancy = await service.get_room_occupancy(
+            store_fixture["store_id"],
+            date_from=date(2026, 5, 1),
+            date_to=date(2026, 5, 31),
+            open_hours_per_day=24,
+        )
+        scripts = await service.get_script_monthly_usage(
+            store_fixture["store_id"],
+            date_from=date(2026, 5, 1),
+            date_to=date(2026, 5, 31),
+        )
+
+    by_room = {item.store_room_id: item for item in occupancy.items}
+    booked = by_room[store_fixture["room_id"]]
+    assert booked.booking_count == 120
+    assert booked.booked_minutes == 120 * 180
+    assert booked.occupancy_pct == round(100 * 120 * 180 / (31 * 24 * 60), 1)
+    assert [(item.script_id, item.booking_count) for item in scripts.items] == [
+        (store_fixture["script_id"], 120)
+    ]
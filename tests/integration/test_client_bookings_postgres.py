@@ -0,0 +1,75 @@
+from datetime import date, datetime, timezone
+
+import pytest
+from sqlalchemy import text
+
+from app.schemas.booking import CreateIncompleteBookingRequest
+from app.services.booking_service import BookingService
+from app.services.client_service import ClientService
+
+pytestmark = pytest.mark.integration
+
+
+async def test_history_keys_follow_booking_changes(db_connection, session_maker, store_fixture):
+    client_id = store_fixture["client_ids"][5]
+    async with session_maker() as session:
+        booking = await BookingService(session).create_incomplete_booking(
+            store_fixture["store_id"],
+            CreateIncompleteBookingRequest(
+                target_month=date(2026, 7, 1),
+                client_ids=[client_id],
+                script_id=store_fixture["script_id"],
+            ),
+        )
+
+    async def history_key():
+        result = await db_connection.execute(
+            text(
+                """
+                SELECT store_id, booking_sort_at
+                FROM booking_client
+                WHERE booking_id = :booking_id
+                """
+            ),
+            {"booking_id": booking.booking_id},
+        )
+        return tuple(result.one())
+
+    assert await history_key() == (
+        store_fixture["store_id"],
+        datetime(2026, 7, 1, 4, 0, tzinfo=timezone.utc),
+    )
+
+    await db_connection.execute(
+        text("UPDATE booking SET target_month = '2026-08-01' WHERE booking_id = :booking_id"),
+        {"booking_id": booking.booking_id},
+    )
+    assert (await history_key())[1] == datetime(2026, 8, 1, 4, 0, tzinfo=timezone.utc)
+
+
+async def test_client_history_pages_cover_every_booking(session_maker, store_fixture):
+    client_id = store_fixture["client_ids"][0]
+    seen: list[int] = []
+    cursor = None
+    while True:
+        async with session_maker() as session:
+            page = await ClientService(session).list_client_bookings(
+                client_id,
+                allowed_store_ids={store_fixture["store_id"]},
+                limit=25,
+                cursor=cursor,
+            )
+        seen.extend(item.booking_id for item in page.items)
+        cursor = page.next_cursor
+        if cursor is None:
+            break
+
+    assert len(seen) == 120
+    assert len(set(seen)) == 120
+    assert seen == sorted(seen, reverse=True)
+
+    async with session_maker() as session:
+        hidden = await ClientService(session).list_client_bookings(
+            client_id, allowed_store_ids={-1}, limit=25, cursor=None
+        )
+    assert hidden.items == []
@@ -0,0 +1,106 @@
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import text
+
+from app.schemas.booking import ConfirmBookingRequest
+from app.services.booking_service import BookingService
+
+pytestmark = pytest.mark.integration
+
+
+async def _incomplete_booking(conn, store_fixture, client_ids: list[int]) -> int:
+    result = await conn.execute(
+        text(
+            """
+            INSERT INTO booking (store_id, script_id, booking_status_id, target_month)
+            VALUES (:store_id, :script_id, 1, '2026-05-01')
+            RETURNING booking_id
+            """
+        ),
+        {"store_id": store_fixture["store_id"], "script_id": store_fixture["script_id"]},
+    )
+    booking_id = result.scalar_one()
+    await conn.execute(
+        text(
+            """
+            INSERT INTO booking_client (booking_id, client_id)
+            SELECT :booking_id, unnest(CAST(:client_ids AS bigint[]))
+            """
+        ),
+        {"booking_id": booking_id, "client_ids": client_ids},
+    )
+    await conn.execute(
+        text(
+            """
+            INSERT INTO character_client_match (booking_id, character_id, client_id)
+            SELECT :booking_id, c.character_id, m.client_id
+            FROM (
+                SELECT character_id, row_number() OVER (ORDER BY character_id) AS n
+                FROM script_character
+                WHERE script_id = :script_id
+                  AND is_dm = false
+            ) AS c
+            JOIN (
+                SELECT client_id, ordinality AS n
+                FROM unnest(CAST(:client_ids AS bigint[])) WITH ORDINALITY AS u(client_id)
+            ) AS m
+              ON m.n = c.n
+            """
+        ),
+        {"booking_id": booking_id, "script_id": store_fixture["script_id"], "client_ids": client_ids},
+    )
+    return booking_id
+
+
+async def test_confirm_reports_clients_already_in_overlapping_bookings(
+    db_connection, session_maker, store_fixture
+):
+    conn = db_connection
+    busy_client_id, free_client_id, other_client_id = store_fixture["client_ids"][:3]
+    booking_id = await _incomplete_booking(conn, store_fixture, [busy_client_id, free_client_id])
+    overlapping_ids = (
+        await conn.execute(
+            text(
+                """
+                SELECT booking_id
+                FROM booking
+                WHERE store_id = :store_id
+                  AND booking_status_id = 2
+                  AND start_at < '2026-05-10 17:00+00'
+                  AND end_at > '2026-05-10 14:00+00'
+                ORDER BY booking_id
+                """
+            ),
+            {"store_id": store_fixture["store_id"]},
+        )
+    ).scalars().all()
+
+    async with session_maker() as session:
+        item = await BookingService(session).confirm_booking(
+            store_fixture["store_id"],
+            booking_id,
+            ConfirmBookingRequest(start_at=datetime(2026, 5, 10, 14, 0, tzinfo=timezone.utc)),
+        )
+    assert item.has_client_conflict
+    assert item.client_conflict_booking_ids == list(overlapping_ids)
+
+    await conn.execute(
+        text(
+            """
+            UPDATE booking_client
+            SET client_id = :other_client_id
+            WHERE booking_id = :booking_id
+              AND client_id = :busy_client_id
+            """
+        ),
+        {
+            "booking_id": booking_id,
+            "busy_client_id": busy_client_id,
+            "other_client_id": other_client_id,
+        },
+    )
+    async with session_maker() as session:
+        item = await BookingService(session).get_booking(store_fixture["store_id"], booking_id)
+    assert not item.has_client_conflict
+    assert item.client_conflict_booking_ids == []
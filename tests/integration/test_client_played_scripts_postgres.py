@@ -0,0 +1,123 @@
+import pytest
+from sqlalchemy import text
+
+from app.services.script_service import ScriptService
+
+pytestmark = pytest.mark.integration
+
+
+async def _played_counts(conn, client_ids) -> dict[tuple[int, int], int]:
+    result = await conn.execute(
+        text(
+            """
+            SELECT client_id, script_id, play_count
+            FROM client_played_script
+            WHERE client_id = ANY(:client_ids)
+              AND play_count <> 0
+            """
+        ),
+        {"client_ids": list(client_ids)},
+    )
+    return {(row.client_id, row.script_id): row.play_count for row in result}
+
+
+async def _recomputed_counts(conn, client_ids) -> dict[tuple[int, int], int]:
+    result = await conn.execute(
+        text(
+            """
+            SELECT bc.client_id, b.script_id, count(*) AS play_count
+            FROM booking_client AS bc
+            JOIN booking AS b ON b.booking_id = bc.booking_id
+            WHERE bc.client_id = ANY(:client_ids)
+              AND b.booking_status_id IN (2, 4)
+              AND b.script_id IS NOT NULL
+            GROUP BY bc.client_id, b.script_id
+            """
+        ),
+        {"client_ids": list(client_ids)},
+    )
+    return {(row.client_id, row.script_id): row.play_count for row in result}
+
+
+async def test_played_scripts_follow_booking_changes(db_connection, store_fixture):
+    conn = db_connection
+    client_ids = store_fixture["client_ids"][:3]
+    booking_ids = (
+        await conn.execute(
+            text("SELECT booking_id FROM booking WHERE store_id = :store_id ORDER BY booking_id"),
+            {"store_id": store_fixture["store_id"]},
+        )
+    ).scalars().all()
+
+    assert await _played_counts(conn, client_ids) == {
+        (client_ids[0], store_fixture["script_id"]): len(booking_ids)
+    }
+
+    await conn.execute(
+        text("INSERT INTO booking_client (booking_id, client_id) VALUES (:booking_id, :client_id)"),
+        {"booking_id": booking_ids[0], "client_id": client_ids[1]},
+    )
+    await conn.execute(
+        text(
+            """
+            UPDATE booking_client
+            SET client_id = :new_id
+            WHERE booking_id = :booking_id
+              AND client_id = :old_id
+            """
+        ),
+        {"booking_id": booking_ids[1], "old_id": client_ids[0], "new_id": client_ids[2]},
+    )
+    await conn.execute(
+        text("UPDATE booking SET booking_status_id = 3 WHERE booking_id = ANY(:booking_ids)"),
+        {"booking_ids": booking_ids[:3]},
+    )
+    await conn.execute(
+        text("UPDATE booking SET booking_status_id = 4 WHERE booking_id = :booking_id"),
+        {"booking_id": booking_ids[2]},
+    )
+    await conn.execute(
+        text("DELETE FROM booking WHERE booking_id = ANY(:booking_ids)"),
+        {"booking_ids": booking_ids[-5:]},
+    )
+
+    assert await _played_counts(conn, client_ids) == await _recomputed_counts(conn, client_ids)
+
+
+async def test_unplayed_scripts_exclude_anything_the_group_played(
+    db_connection, session_maker, store_fixture
+):
+    conn = db_connection
+    store_id = store_fixture["store_id"]
+    unplayed_script_id, inactive_script_id = (
+        await conn.execute(
+            text(
+                """
+                INSERT INTO script (name, estimated_minutes)
+                VALUES ('Unplayed Script', 120), ('Retired Script', 120)
+                RETURNING script_id
+                """
+            )
+        )
+    ).scalars().all()
+    await conn.execute(
+        text(
+            """
+            INSERT INTO store_script (store_id, script_id, is_active)
+            VALUES (:store_id, :unplayed, true), (:store_id, :inactive, false)
+            """
+        ),
+        {"store_id": store_id, "unplayed": unplayed_script_id, "inactive": inactive_script_id},
+    )
+    regular, newcomer = store_fixture["client_ids"][0], store_fixture["client_ids"][1]
+
+    async with session_maker() as session:
+        service = ScriptService(session)
+        group = await service.list_unplayed_store_scripts(store_id, [regular, newcomer])
+        alone = await service.list_unplayed_store_scripts(store_id, [newcomer])
+
+    assert [item.script_id for item in group.items] == [unplayed_script_id]
+    assert [item.script_id for item in alone.items] == [
+        store_fixture["script_id"],
+        unplayed_script_id,
+    ]
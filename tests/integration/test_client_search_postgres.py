@@ -0,0 +1,34 @@
+import pytest
+from sqlalchemy import text
+
+from app.services.client_service import ClientService
+
+pytestmark = pytest.mark.integration
+
+
+async def test_search_ranks_exact_then_prefix_then_substring(db_connection, session_maker):
+    rows = (
+        await db_connection.execute(
+            text(
+                """
+                INSERT INTO client (display_name, phone)
+                VALUES ('陈小明', '(647) 555-0199'),
+                       ('小明', NULL),
+                       ('小明同学', NULL),
+                       ('Search 50% Off', '416.555.7788')
+                RETURNING client_id
+                """
+            )
+        )
+    ).scalars().all()
+    substring_id, exact_id, prefix_id, literal_id = rows
+
+    async with session_maker() as session:
+        service = ClientService(session)
+        by_name = await service.search_clients(q="小明", limit=10)
+        by_phone = await service.search_clients(q="555 0199", limit=10)
+        by_literal = await service.search_clients(q="50%", limit=10)
+
+    assert [item.client_id for item in by_name.items][:3] == [exact_id, prefix_id, substring_id]
+    assert [item.client_id for item in by_phone.items] == [substring_id]
+    assert [item.client_id for item in by_literal.items] == [literal_id]
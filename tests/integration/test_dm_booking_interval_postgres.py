@@ -0,0 +1,161 @@
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import text
+
+from app.services.booking_service import BookingService
+from app.services.dm_service import DmService
+
+pytestmark = pytest.mark.integration
+
+
+async def _scalar(conn, query: str, params: dict | None = None):
+    result = await conn.execute(text(query), params or {})
+    return result.scalar_one()
+
+
+async def _intervals_match_matches(conn) -> bool:
+    return await _scalar(
+        conn,
+        """
+        WITH expected AS (
+            SELECT DISTINCT m.dm_id, b.booking_id, b.store_id, b.start_at, b.end_at
+            FROM character_dm_match AS m
+            JOIN booking AS b
+              ON b.booking_id = m.booking_id
+            WHERE b.booking_status_id IN (2, 4)
+        )
+        SELECT NOT EXISTS (
+            (SELECT * FROM expected EXCEPT SELECT * FROM dm_booking_interval)
+            UNION ALL
+            (SELECT * FROM dm_booking_interval EXCEPT SELECT * FROM expected)
+        )
+        """,
+    )
+
+
+@pytest.fixture
+async def cross_store(db_connection, store_fixture) -> dict[str, int]:
+    """A DM in the fixture store and a second store, with one booking in each at 14:00."""
+    conn = db_connection
+    store_id = store_fixture["store_id"]
+    other_store_id = await _scalar(
+        conn, "INSERT INTO store (name) VALUES ('Second Store') RETURNING store_id"
+    )
+    other_room_id = await _scalar(
+        conn,
+        "INSERT INTO store_room (store_id, name) VALUES (:store_id, 'Room X') RETURNING store_room_id",
+        {"store_id": other_store_id},
+    )
+    await conn.execute(
+        text("INSERT INTO store_script (store_id, script_id) VALUES (:store_id, :script_id)"),
+        {"store_id": other_store_id, "script_id": store_fixture["script_id"]},
+    )
+    dm_id = await _scalar(conn, "INSERT INTO dm (display_name) VALUES ('Shared DM') RETURNING dm_id")
+    await conn.execute(
+        text(
+            """
+            INSERT INTO dm_store_membership (dm_id, store_id)
+            VALUES (:dm_id, :store_id), (:dm_id, :other_store_id)
+            """
+        ),
+        {"dm_id": dm_id, "store_id": store_id, "other_store_id": other_store_id},
+    )
+    booking_id = await _scalar(
+        conn,
+        """
+        SELECT booking_id FROM booking
+        WHERE store_id = :store_id AND start_at = '2026-05-10 13:00+00'
+        """,
+        {"store_id": store_id},
+    )
+    other_booking_id = await _scalar(
+        conn,
+        """
+        WITH new_slot AS (
+            INSERT INTO slot (store_id, start_at)
+            VALUES (:store_id, '2026-05-10 14:00+00')
+            RETURNING slot_id, start_at
+        )
+        INSERT INTO booking (
+            store_id, script_id, slot_id, store_room_id, booking_status_id, start_at
+        )
+        SELECT :store_id, :script_id, slot_id, :room_id, 2, start_at
+        FROM new_slot
+        RETURNING booking_id
+        """,
+        {"store_id": other_store_id, "script_id": store_fixture["script_id"], "room_id": other_room_id},
+    )
+    await conn.execute(
+        text(
+            """
+            INSERT INTO character_dm_match (booking_id, character_id, dm_id)
+            SELECT b.booking_id, c.character_id, :dm_id
+            FROM booking AS b
+            JOIN script_character AS c
+              ON c.script_id = b.script_id
+             AND c.is_dm = true
+            WHERE b.booking_id IN (:booking_id, :other_booking_id)
+            """
+        ),
+        {"dm_id": dm_id, "booking_id": booking_id, "other_booking_id": other_booking_id},
+    )
+    return {
+        "store_id": store_id,
+        "other_store_id": other_store_id,
+        "dm_id": dm_id,
+        "booking_id": booking_id,
+        "other_booking_id": other_booking_id,
+    }
+
+
+async def test_dm_conflicts_span_stores(db_connection, session_maker, cross_store):
+    conn = db_connection
+    assert await _intervals_match_matches(conn)
+
+    async with session_maker() as session:
+        item = await BookingService(session).get_booking(
+            cross_store["store_id"], cross_store["booking_id"]
+        )
+    assert item.has_dm_conflict
+    assert item.dm_conflict_booking_ids == [cross_store["other_booking_id"]]
+
+    async with session_maker() as session:
+        free_busy = await DmService(session).get_dm_free_busy(
+            cross_store["dm_id"],
+            start_from=datetime(2026, 5, 10, 12, 0, tzinfo=timezone.utc),
+            start_to=datetime(2026, 5, 10, 20, 0, tzinfo=timezone.utc),
+            allowed_store_ids={cross_store["store_id"]},
+        )
+    assert [(block.start_at.hour, block.end_at.hour) for block in free_busy.busy] == [(13, 17)]
+    assert free_busy.busy[0].booking_ids == [cross_store["booking_id"]]
+    assert [(gap.start_at.hour, gap.end_at.hour) for gap in free_busy.free] == [(12, 13), (17, 20)]
+
+    await conn.execute(
+        text("UPDATE booking SET start_at = '2026-05-10 16:00+00' WHERE booking_id = :booking_id"),
+        {"booking_id": cross_store["other_booking_id"]},
+    )
+    assert await _intervals_match_matches(conn)
+    async with session_maker() as session:
+        item = await BookingService(session).get_booking(
+            cross_store["store_id"], cross_store["booking_id"]
+        )
+    assert not item.has_dm_conflict
+
+    await conn.execute(
+        text("UPDATE booking SET booking_status_id = 3 WHERE booking_id = :booking_id"),
+        {"booking_id": cross_store["booking_id"]},
+    )
+    await conn.execute(
+        text("DELETE FROM booking WHERE booking_id = :booking_id"),
+        {"booking_id": cross_store["other_booking_id"]},
+    )
+    assert await _intervals_match_matches(conn)
+    assert (
+        await _scalar(
+            conn,
+            "SELECT count(*) FROM dm_booking_interval WHERE dm_id = :dm_id",
+            {"dm_id": cross_store["dm_id"]},
+        )
+        == 0
+    )
@@ -0,0 +1,196 @@
+from datetime import date
+
+import pytest
+from sqlalchemy import text
+
+from app.services.analytics_service import AnalyticsService
+from app.services.dm_service import DmService
+
+pytestmark = pytest.mark.integration
+
+
+async def _workload_matches_bookings(conn, store_id: int) -> bool:
+    result = await conn.execute(
+        text(
+            """
+            WITH expected AS (
+                SELECT s.dm_id,
+                       store_local_date(b.start_at) AS work_date,
+                       count(*) AS session_count,
+                       sum(round(extract(epoch FROM b.end_at - b.start_at) / 60)) AS worked_minutes
+                FROM (SELECT DISTINCT booking_id, dm_id FROM character_dm_match) AS s
+                JOIN booking AS b
+                  ON b.booking_id = s.booking_id
+                WHERE b.store_id = :store_id
+                  AND b.booking_status_id = 4
+                GROUP BY 1, 2
+            ),
+            actual AS (
+                SELECT dm_id, work_date, session_count, worked_minutes
+                FROM dm_daily_workload
+                WHERE store_id = :store_id
+                  AND session_count <> 0
+            )
+            SELECT NOT EXISTS (
+                (SELECT * FROM expected EXCEPT SELECT * FROM actual)
+                UNION ALL
+                (SELECT * FROM actual EXCEPT SELECT * FROM expected)
+            )
+            """
+        ),
+        {"store_id": store_id},
+    )
+    return result.scalar_one()
+
+
+@pytest.fixture
+async def dm_ids(db_connection, store_fixture) -> list[int]:
+    conn = db_connection
+    ids = (
+        await conn.execute(
+            text(
+                """
+                INSERT INTO dm (display_name)
+                VALUES ('Workload DM A'), ('Workload DM B')
+                RETURNING dm_id
+                """
+            )
+        )
+    ).scalars().all()
+    await conn.execute(
+        text(
+            """
+            INSERT INTO dm_store_membership (dm_id, store_id)
+            SELECT unnest(CAST(:dm_ids AS bigint[])), :store_id
+            """
+        ),
+        {"dm_ids": ids, "store_id": store_fixture["store_id"]},
+    )
+    return list(ids)
+
+
+async def test_workload_follows_matches_and_bookings(db_connection, store_fixture, dm_ids):
+    conn = db_connection
+    params = {"store_id": store_fixture["store_id"], "dm_a": dm_ids[0], "dm_b": dm_ids[1]}
+
+    await conn.execute(
+        text("UPDATE booking SET booking_status_id = 4 WHERE store_id = :store_id"), params
+    )
+    # DM A hosts the DM character and a free slot in the same booking: one paid session.
+    await conn.execute(
+        text(
+            """
+            INSERT INTO character_dm_match (booking_id, character_id, dm_id)
+            SELECT b.booking_id, c.character_id, CAST(:dm_a AS bigint)
+            FROM booking AS b
+            JOIN script_character AS c
+              ON c.script_id = b.script_id
+             AND c.is_dm = true
+            WHERE b.store_id = :store_id
+            UNION ALL
+            SELECT b.booking_id, NULL, CAST(:dm_a AS bigint)
+            FROM booking AS b
+            WHERE b.store_id = :store_id
+              AND b.booking_id % 2 = 0
+            """
+        ),
+        params,
+    )
+    assert await _workload_matches_bookings(conn, store_fixture["store_id"])
+
+    await conn.execute(
+        text(
+            """
+            UPDATE character_dm_match
+            SET dm_id = :dm_b
+            WHERE character_id IS NULL
+              AND booking_id % 4 = 0
+              AND booking_id IN (SELECT booking_id FROM booking WHERE store_id = :store_id)
+            """
+        ),
+        params,
+    )
+    await conn.execute(
+        text(
+            """
+            DELETE FROM character_dm_match
+            WHERE character_id IS NOT NULL
+              AND booking_id % 3 = 0
+              AND booking_id IN (SELECT booking_id FROM booking WHERE store_id = :store_id)
+            """
+        ),
+        params,
+    )
+    await conn.execute(
+        text(
+            """
+            UPDATE booking
+            SET booking_status_id = 3
+            WHERE store_id = :store_id
+              AND booking_id % 5 = 0
+            """
+        ),
+        params,
+    )
+    await conn.execute(
+        text(
+            """
+            UPDATE booking
+            SET duration_override_minutes = 90
+            WHERE store_id = :store_id
+              AND booking_id % 7 = 0
+            """
+        ),
+        params,
+    )
+    await conn.execute(
+        text("DELETE FROM booking WHERE store_id = :store_id AND booking_id % 11 = 0"), params
+    )
+
+    assert await _workload_matches_bookings(conn, store_fixture["store_id"])
+
+
+async def test_workload_reads(db_connection, session_maker, store_fixture, dm_ids):
+    await db_connection.execute(
+        text(
+            """
+            UPDATE booking SET booking_status_id = 4 WHERE store_id = :store_id
+            """
+        ),
+        {"store_id": store_fixture["store_id"]},
+    )
+    await db_connection.execute(
+        text(
+            """
+            INSERT INTO character_dm_match (booking_id, character_id, dm_id)
+            SELECT booking_id, NULL, :dm_id
+            FROM booking
+            WHERE store_id = :store_id
+            """
+        ),
+        {"store_id": store_fixture["store_id"], "dm_id": dm_ids[0]},
+    )
+
+    async with session_maker() as session:
+        workload = await DmService(session).get_dm_workload(
+            dm_ids[0],
+            month=date(2026, 5, 1),
+            allowed_store_ids={store_fixture["store_id"]},
+        )
+    async with session_maker() as session:
+        hidden = await DmService(session).get_dm_workload(
+            dm_ids[0],
+            month=date(2026, 5, 1),
+            allowed_store_ids={-1},
+        )
+    async with session_maker() as session:
+        store_workload = await AnalyticsService(session).get_store_dm_workload(
+            store_fixture["store_id"],
+            month=date(2026, 5, 1),
+        )
+
+    assert (workload.session_count, workload.worked_minutes) == (120, 120 * 180)
+    assert hidden.stores == []
+    assert [(item.dm_id, item.session_count) for item in store_workload.items] == [
+        (dm_ids[0], 120)
+    ]
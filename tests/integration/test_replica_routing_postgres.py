@@ -0,0 +1,46 @@
+import os
+
+import httpx
+import pytest
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.core import database
+
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL")
+
+pytestmark = pytest.mark.integration
+
+
+@pytest.fixture
+async def replica_engine(monkeypatch):
+    """The test database stands in for a replica; it is not in recovery, so it is caught up."""
+    monkeypatch.setenv("DATABASE_URL", TEST_DATABASE_URL)
+    engine = create_async_engine(TEST_DATABASE_URL)
+    read_session_maker = database._make_session_maker(engine, read_only=True)
+    monkeypatch.setattr(database, "get_replica_session_maker", lambda: read_session_maker)
+    monkeypatch.setattr(database, "get_read_session_maker", lambda: read_session_maker)
+    monkeypatch.setattr(database, "get_shard_map", lambda: ())
+    monkeypatch.setattr(database, "_actor_write_lsn", {"actor-1": 1})
+    try:
+        yield engine
+    finally:
+        await engine.dispose()
+
+
+async def test_export_runs_on_replica_after_replay_check(replica_engine):
+    from app.main import app
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.get(
+            "/api/v1/stores/1/bookings/export",
+            params={"format": "ndjson"},
+            headers={
+                "X-Actor-Id": "actor-1",
+                "X-Allowed-Store-Ids": "1",
+                "X-Read-After-LSN": "0/1",
+            },
+        )
+
+    assert response.status_code == 200
+    assert database._actor_write_lsn == {}
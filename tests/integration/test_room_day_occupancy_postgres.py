@@ -0,0 +1,230 @@
+from datetime import date
+
+import pytest
+from sqlalchemy import text
+
+from app.services.availability_service import AvailabilityService
+from scripts.repair_room_day_occupancy import REPAIR_BATCH_SQL
+
+pytestmark = pytest.mark.integration
+
+
+async def _stored_masks(conn, store_id: int) -> dict[tuple[int, object], str]:
+    result = await conn.execute(
+        text(
+            """
+            SELECT store_room_id, occupancy_date, quarter_hours::text AS quarter_hours
+            FROM store_room_day_occupancy
+            WHERE store_id = :store_id
+            """
+        ),
+        {"store_id": store_id},
+    )
+    return {(row.store_room_id, row.occupancy_date): row.quarter_hours for row in result}
+
+
+async def _recomputed_masks(conn, store_id: int) -> dict[tuple[int, object], str]:
+    result = await conn.execute(
+        text(
+            """
+            SELECT b.store_room_id,
+                   d.day::date AS occupancy_date,
+                   bit_or(quarter_hour_mask(d.day::date, b.start_at, b.end_at))::text AS quarter_hours
+            FROM booking AS b
+            CROSS JOIN LATERAL generate_series(
+                store_local_date(b.start_at),
+                store_local_date(b.end_at - interval '1 microsecond'),
+                interval '1 day'
+            ) AS d(day)
+            WHERE b.store_id = :store_id
+              AND b.booking_status_id IN (2, 4)
+            GROUP BY b.store_room_id, d.day::date
+            """
+        ),
+        {"store_id": store_id},
+    )
+    return {(row.store_room_id, row.occupancy_date): row.quarter_hours for row in result}
+
+
+async def test_occupancy_masks_follow_booking_changes(db_connection, store_fixture):
+    conn = db_connection
+    store_id = store_fixture["store_id"]
+    assert await _stored_masks(conn, store_id) == await _recomputed_masks(conn, store_id)
+
+    booking_ids = (
+        await conn.execute(
+            text("SELECT booking_id FROM booking WHERE store_id = :store_id ORDER BY start_at"),
+            {"store_id": store_id},
+        )
+    ).scalars().all()
+    other_room_id = (
+        await conn.execute(
+            text("SELECT max(store_room_id) FROM store_room WHERE store_id = :store_id"),
+            {"store_id": store_id},
+        )
+    ).scalar_one()
+
+    # Cancel one of two overlapping bookings, move one, stretch one past midnight,
+    # complete one and delete one.
+    await conn.execute(
+        text("UPDATE booking SET booking_status_id = 3 WHERE booking_id = :booking_id"),
+        {"booking_id": booking_ids[3]},
+    )
+    await conn.execute(
+        text("UPDATE booking SET store_room_id = :room_id WHERE booking_id = :booking_id"),
+        {"room_id": other_room_id, "booking_id": booking_ids[5]},
+    )
+    await conn.execute(
+        text(
+            """
+            UPDATE booking
+            SET duration_override_minutes = 900
+            WHERE booking_id = :booking_id
+            """
+        ),
+        {"booking_id": booking_ids[7]},
+    )
+    await conn.execute(
+        text("UPDATE booking SET booking_status_id = 4 WHERE booking_id = :booking_id"),
+        {"booking_id": booking_ids[9]},
+    )
+    await conn.execute(
+        text("DELETE FROM booking WHERE booking_id = :booking_id"),
+        {"booking_id": booking_ids[11]},
+    )
+
+    stored = await _stored_masks(conn, store_id)
+    assert stored == await _recomputed_masks(conn, store_id)
+    assert any(room_id == other_room_id for room_id, _ in stored)
+
+
+async def test_heatmap_recomputes_after_occupancy_changes(
+    db_connection, session_maker, store_fixture
+):
+    conn = db_connection
+    store_id = store_fixture["store_id"]
+    month = date(2026, 5, 1)
+
+    async def heatmap():
+        async with session_maker() as session:
+            return await AvailabilityService(session).get_heatmap(
+                store_id, month=month, bucket_minutes=30
+            )
+
+    before = await heatmap()
+    assert await heatmap() is before
+
+    version = await _version(conn, store_id)
+    await conn.execute(
+        text(
+            """
+            UPDATE booking
+            SET booking_status_id = 3
+            WHERE store_id = :store_id
+              AND start_at >= '2026-05-05 00:00+00'
+            """
+        ),
+        {"store_id": store_id},
+    )
+    assert await _version(conn, store_id) > version
+
+    after = await heatmap()
+    assert after is not before
+    room_before = next(r for r in before.rooms if r.store_room_id == store_fixture["room_id"])
+    room_after = next(r for r in after.rooms if r.store_room_id == store_fixture["room_id"])
+    assert sum(room_after.occupied_days) < sum(room_before.occupied_days)
+
+
+async def test_heatmap_recomputes_after_room_changes(
+    db_connection, session_maker, store_fixture
+):
+    conn = db_connection
+    store_id = store_fixture["store_id"]
+    room_id = store_fixture["room_id"]
+
+    async def heatmap():
+        async with session_maker() as session:
+            return await AvailabilityService(session).get_heatmap(
+                store_id, month=date(2026, 5, 1), bucket_minutes=60
+            )
+
+    before = await heatmap()
+    await conn.execute(
+        text("UPDATE store_room SET name = 'Renamed Room' WHERE store_room_id = :room_id"),
+        {"room_id": room_id},
+    )
+    renamed = await heatmap()
+    assert renamed is not before
+    assert next(r for r in renamed.rooms if r.store_room_id == room_id).room_name == "Renamed Room"
+
+    await conn.execute(
+        text("UPDATE store_room SET is_active = false WHERE store_room_id = :room_id"),
+        {"room_id": room_id},
+    )
+    deactivated = await heatmap()
+    assert room_id not in {r.store_room_id for r in deactivated.rooms}
+
+
+async def _repair(conn, store_id: int, *, verify_only: bool) -> int:
+    row = (
+        await conn.execute(
+            text(REPAIR_BATCH_SQL),
+            {
+                "after_store_room_id": 0,
+                "store_id": store_id,
+                "batch_size": 50,
+                "verify_only": verify_only,
+            },
+        )
+    ).mappings().one()
+    return row["drifted"]
+
+
+async def test_repair_rebuilds_drifted_room_days(db_connection, store_fixture):
+    conn = db_connection
+    store_id = store_fixture["store_id"]
+    expected = await _recomputed_masks(conn, store_id)
+    assert await _repair(conn, store_id, verify_only=True) == 0
+
+    # A lost update leaves one day's bits cleared; a stale row outlives its bookings.
+    await conn.execute(
+        text(
+            """
+            UPDATE store_room_day_occupancy
+            SET quarter_hours = repeat('0', 96)::bit(96)
+            WHERE (store_room_id, occupancy_date) = (
+                SELECT store_room_id, occupancy_date
+                FROM store_room_day_occupancy
+                WHERE store_id = :store_id
+                ORDER BY occupancy_date
+                LIMIT 1
+            )
+            """
+        ),
+        {"store_id": store_id},
+    )
+    await conn.execute(
+        text(
+            """
+            INSERT INTO store_room_day_occupancy (
+                store_room_id, occupancy_date, store_id, quarter_hours
+            )
+            VALUES (:room_id, '2030-01-01', :store_id, repeat('1', 96)::bit(96))
+            """
+        ),
+        {"room_id": store_fixture["room_id"], "store_id": store_id},
+    )
+
+    assert await _repair(conn, store_id, verify_only=True) == 2
+    assert await _stored_masks(conn, store_id) != expected
+    assert await _repair(conn, store_id, verify_only=False) == 2
+    assert await _stored_masks(conn, store_id) == expected
+    assert await _repair(conn, store_id, verify_only=True) == 0
+
+
+async def _version(conn, store_id: int) -> int:
+    result = await conn.execute(
+        text("SELECT version FROM store_occupancy_version WHERE store_id = :store_id"),
+        {"store_id": store_id},
+    )
+    return result.scalar_one()
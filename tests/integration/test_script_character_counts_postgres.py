@@ -0,0 +1,77 @@
+import pytest
+from sqlalchemy import text
+
+from app.services.script_service import ScriptService
+
+pytestmark = pytest.mark.integration
+
+
+async def _counts(conn, script_id: int) -> tuple[int, int]:
+    result = await conn.execute(
+        text("SELECT player_count, dm_count FROM script WHERE script_id = :script_id"),
+        {"script_id": script_id},
+    )
+    return tuple(result.one())
+
+
+async def test_character_counts_follow_character_changes(db_connection, store_fixture):
+    conn = db_connection
+    script_id = store_fixture["script_id"]
+    assert await _counts(conn, script_id) == (2, 1)
+
+    await conn.execute(
+        text(
+            """
+            INSERT INTO script_character (script_id, character_name, is_dm)
+            SELECT :script_id, 'Extra ' || n, false
+            FROM generate_series(1, 4) AS n
+            """
+        ),
+        {"script_id": script_id},
+    )
+    assert await _counts(conn, script_id) == (6, 1)
+
+    await conn.execute(
+        text(
+            """
+            UPDATE script_character
+            SET is_active = false
+            WHERE script_id = :script_id
+              AND character_name IN ('Extra 1', 'Extra 2')
+            """
+        ),
+        {"script_id": script_id},
+    )
+    await conn.execute(
+        text(
+            """
+            UPDATE script_character
+            SET is_dm = true
+            WHERE script_id = :script_id
+              AND character_name = 'Extra 3'
+            """
+        ),
+        {"script_id": script_id},
+    )
+    assert await _counts(conn, script_id) == (3, 2)
+
+    await conn.execute(
+        text("DELETE FROM script_character WHERE script_id = :script_id AND is_dm"),
+        {"script_id": script_id},
+    )
+    assert await _counts(conn, script_id) == (3, 0)
+
+
+async def test_store_script_listing_filters_by_players(session_maker, store_fixture):
+    async with session_maker() as session:
+        service = ScriptService(session)
+        two = await service.list_store_scripts(
+            store_fixture["store_id"], limit=20, offset=0, players=2, q="integration"
+        )
+        six = await service.list_store_scripts(
+            store_fixture["store_id"], limit=20, offset=0, players=6
+        )
+
+    assert [item.script_id for item in two.items] == [store_fixture["script_id"]]
+    assert two.items[0].dm_count == 1
+    assert six.total == 0
@@ -0,0 +1,115 @@
+from datetime import date, datetime, timezone
+
+import pytest
+from sqlalchemy import text
+
+from app.schemas.booking import ConfirmBookingRequest, CreateIncompleteBookingRequest
+from app.services.booking_service import BookingService
+from app.services.client_service import ClientService
+from app.services.dm_service import DmService
+from app.services.room_service import RoomService
+from app.services.script_service import ScriptService
+from app.services.slot_service import SlotService
+from app.services.store_service import StoreService
+
+pytestmark = pytest.mark.integration
+
+
+LIST_CALLS = {
+    "list_bookings": lambda session, ids, limit: BookingService(session).list_bookings(
+        ids["store_id"],
+        booking_status_id=None,
+        target_month=None,
+        has_conflict=None,
+        limit=limit,
+        offset=0,
+    ),
+    "list_bookings[has_conflict]": lambda session, ids, limit: BookingService(
+        session
+    ).list_bookings(
+        ids["store_id"],
+        booking_status_id=2,
+        target_month=None,
+        has_conflict=True,
+        limit=limit,
+        offset=0,
+    ),
+    "list_clients": lambda session, ids, limit: ClientService(session).list_clients(limit, 0),
+    "list_dms": lambda session, ids, limit: DmService(session).list_dms(limit, 0),
+    "list_rooms": lambda session, ids, limit: RoomService(session).list_rooms(
+        ids["store_id"], limit, 0
+    ),
+    "list_scripts": lambda session, ids, limit: ScriptService(session).list_scripts(limit, 0),
+    "list_store_scripts": lambda session, ids, limit: ScriptService(session).list_store_scripts(
+        ids["store_id"], limit, 0
+    ),
+    "list_slots": lambda session, ids, limit: SlotService(session).list_slots(
+        ids["store_id"], limit, 0
+    ),
+    "list_stores": lambda session, ids, limit: StoreService(session).list_stores(
+        {ids["store_id"]}, limit, 0
+    ),
+}
+
+
+@pytest.mark.parametrize("name", sorted(LIST_CALLS))
+async def test_list_statement_count_is_independent_of_page_size(
+    session_maker, statement_counter, store_fixture, name
+):
+    counts = {}
+    for limit in (1, 100):
+        before = statement_counter.count
+        async with session_maker() as session:
+            await LIST_CALLS[name](session, store_fixture, limit)
+        counts[limit] = statement_counter.count - before
+
+    assert counts[1] == counts[100], f"{name} grows with page size: {counts}"
+    assert counts[100] <= 5
+
+
+async def test_booking_lifecycle_statement_counts(session_maker, statement_counter, store_fixture):
+    client_ids = store_fixture["client_ids"][1:3]
+    before = statement_counter.count
+    async with session_maker() as session:
+        booking = await BookingService(session).create_incomplete_booking(
+            store_fixture["store_id"],
+            CreateIncompleteBookingRequest(
+                target_month=date(2026, 6, 1),
+                client_ids=client_ids,
+                script_id=store_fixture["script_id"],
+            ),
+        )
+    assert statement_counter.count - before <= 7
+
+    async with session_maker() as session:
+        await session.execute(
+            text(
+                """
+                INSERT INTO character_client_match (booking_id, character_id, client_id)
+                SELECT :booking_id, c.character_id, m.client_id
+                FROM (
+                    SELECT character_id, row_number() OVER (ORDER BY character_id) AS n
+                    FROM script_character
+                    WHERE script_id = :script_id
+                      AND is_dm = false
+                ) AS c
+                JOIN (
+                    SELECT client_id, row_number() OVER (ORDER BY client_id) AS n
+                    FROM booking_client
+                    WHERE booking_id = :booking_id
+                ) AS m ON m.n = c.n
+                """
+            ),
+            {"booking_id": booking.booking_id, "script_id": store_fixture["script_id"]},
+        )
+        await session.commit()
+
+    before = statement_counter.count
+    async with session_maker() as session:
+        confirmed = await BookingService(session).confirm_booking(
+            store_fixture["store_id"],
+            booking.booking_id,
+            ConfirmBookingRequest(start_at=datetime(2026, 6, 6, 23, 0, tzinfo=timezone.utc)),
+        )
+    assert confirmed.booking_status_id == 2
+    assert statement_counter.count - before <= 12
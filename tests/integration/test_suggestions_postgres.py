@@ -0,0 +1,135 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import text
+
+from app.services.availability_service import AvailabilityService
+
+pytestmark = pytest.mark.integration
+
+
+async def test_suggestions_match_pairwise_room_and_dm_check(
+    db_connection, session_maker, store_fixture
+):
+    conn = db_connection
+    store_id = store_fixture["store_id"]
+    start_from = datetime(2026, 5, 10, 8, 0, tzinfo=timezone.utc)
+    start_to = start_from + timedelta(hours=16)
+    dm_ids = (
+        await conn.execute(
+            text(
+                """
+                INSERT INTO dm (display_name, is_active)
+                VALUES ('DM A', true), ('DM B', true), ('DM Inactive', false)
+                RETURNING dm_id
+                """
+            )
+        )
+    ).scalars().all()
+    await conn.execute(
+        text(
+            """
+            INSERT INTO dm_store_membership (dm_id, store_id)
+            SELECT unnest(CAST(:dm_ids AS bigint[])), :store_id
+            """
+        ),
+        {"dm_ids": dm_ids, "store_id": store_id},
+    )
+    # DM A and DM B each host one overlapping session; the 19:00 session moves to the
+    # otherwise free second room.
+    await conn.execute(
+        text(
+            """
+            INSERT INTO character_dm_match (booking_id, character_id, dm_id)
+            SELECT b.booking_id, c.character_id, m.dm_id
+            FROM (
+                VALUES (timestamptz '2026-05-10 13:00+00', CAST(:dm_a AS bigint)),
+                       (timestamptz '2026-05-10 15:00+00', CAST(:dm_b AS bigint))
+            ) AS m(start_at, dm_id)
+            JOIN booking AS b
+              ON b.store_id = :store_id
+             AND b.start_at = m.start_at
+            JOIN script_character AS c
+              ON c.script_id = b.script_id
+             AND c.is_dm
+            """
+        ),
+        {"store_id": store_id, "dm_a": dm_ids[0], "dm_b": dm_ids[1]},
+    )
+    await conn.execute(
+        text(
+            """
+            UPDATE booking
+            SET store_room_id = (
+                SELECT max(store_room_id) FROM store_room WHERE store_id = :store_id
+            )
+            WHERE store_id = :store_id
+              AND start_at = '2026-05-10 19:00+00'
+            """
+        ),
+        {"store_id": store_id},
+    )
+
+    async with session_maker() as session:
+        response = await AvailabilityService(session).get_suggestions(
+            store_id,
+            script_id=store_fixture["script_id"],
+            start_from=start_from,
+            start_to=start_to,
+            step_minutes=30,
+        )
+
+    rooms = (
+        await conn.execute(
+            text(
+                """
+                SELECT r.store_room_id, b.start_at, b.end_at
+                FROM store_room AS r
+                LEFT JOIN booking AS b
+                  ON b.store_room_id = r.store_room_id
+                 AND b.booking_status_id IN (2, 4)
+                WHERE r.store_id = :store_id
+                """
+            ),
+            {"store_id": store_id},
+        )
+    ).all()
+    dms = (
+        await conn.execute(
+            text(
+                """
+                SELECT m.dm_id, b.start_at, b.end_at
+                FROM character_dm_match AS m
+                JOIN booking AS b ON b.booking_id = m.booking_id
+                """
+            )
+        )
+    ).all()
+    duration = timedelta(minutes=response.estimated_minutes)
+
+    def free(rows, resource_id, start_at):
+        return not any(
+            row[0] == resource_id
+            and row.start_at is not None
+            and row.start_at < start_at + duration
+            and row.end_at > start_at
+            for row in rows
+        )
+
+    expected = []
+    start_at = start_from
+    while start_at < start_to:
+        free_rooms = sorted(
+            {row.store_room_id for row in rooms if free(rooms, row.store_room_id, start_at)}
+        )
+        free_dms = [dm_id for dm_id in dm_ids[:2] if free(dms, dm_id, start_at)]
+        if free_rooms and len(free_dms) >= response.dm_count:
+            expected.append((start_at, free_rooms, free_dms))
+        start_at += timedelta(minutes=30)
+
+    assert response.dm_count == 1
+    assert [
+        (item.start_at, item.store_room_ids, item.dm_ids) for item in response.suggestions
+    ] == expected
+    # Both DMs are busy 15:00-16:00 and room 2 is busy from 19:00, so there is a gap.
+    assert expected and len(expected) < 32
@@ -0,0 +1,30 @@
+import pytest
+from sqlalchemy import text
+
+from app.core import database
+
+pytestmark = pytest.mark.integration
+
+
+async def test_write_session_reads_wal_position_before_commit(session_maker, store_fixture):
+    async with session_maker() as session:
+        session.info[database.TRACK_WRITE_LSN] = True
+        async with session.begin():
+            await session.execute(
+                text("UPDATE store SET name = 'Renamed Store' WHERE store_id = :store_id"),
+                {"store_id": store_fixture["store_id"]},
+            )
+        write_lsn = session.info[database.WRITE_LSN]
+
+        result = await session.execute(text("SELECT pg_current_wal_insert_lsn()::text"))
+        assert 0 < write_lsn <= database.parse_lsn(result.scalar_one())
+
+
+async def test_untracked_session_skips_wal_position(session_maker, store_fixture):
+    async with session_maker() as session:
+        async with session.begin():
+            await session.execute(
+                text("UPDATE store SET name = 'Renamed Store' WHERE store_id = :store_id"),
+                {"store_id": store_fixture["store_id"]},
+            )
+        assert database.WRITE_LSN not in session.info
@@ -0,0 +1,122 @@
+from datetime import date
+
+import pytest
+
+from app.core.errors import BadRequestError, NotFoundError
+from app.services.analytics_service import AnalyticsService
+
+
+class FakeResult:
+    def __init__(self, *, rows=None, scalar=None, scalar_or_none=None) -> None:
+        self._rows = rows or []
+        self._scalar = scalar
+        self._scalar_or_none = scalar_or_none
+
+    def mappings(self) -> "FakeResult":
+        return self
+
+    def all(self):
+        return self._rows
+
+    def scalar_one(self):
+        return self._scalar
+
+    def scalar_one_or_none(self):
+        return self._scalar_or_none
+
+
+class FakeSession:
+    def __init__(self, results):
+        self._results = list(results)
+        self.execute_calls = []
+
+    async def execute(self, query, params=None):
+        self.execute_calls.append((query, params))
+        return self._results.pop(0)
+
+
+@pytest.mark.asyncio
+async def test_room_daily_usage_rejects_inverted_range():
+    service = AnalyticsService(session=FakeSession([]))
+
+    with pytest.raises(BadRequestError):
+        await service.get_room_daily_usage(
+            store_id=10,
+            date_from=date(2026, 5, 2),
+            date_to=date(2026, 5, 1),
+        )
+
+
+@pytest.mark.asyncio
+async def test_room_daily_usage_rejects_long_range():
+    service = AnalyticsService(session=FakeSession([]))
+
+    with pytest.raises(BadRequestError):
+        await service.get_room_daily_usage(
+            store_id=10,
+            date_from=date(2025, 1, 1),
+            date_to=date(2026, 5, 1),
+        )
+
+
+@pytest.mark.asyncio
+async def test_room_occupancy_store_not_found():
+    service = AnalyticsService(session=FakeSession([FakeResult(scalar_or_none=None)]))
+
+    with pytest.raises(NotFoundError):
+        await service.get_room_occupancy(
+            store_id=10,
+            date_from=date(2026, 5, 1),
+            date_to=date(2026, 5, 31),
+            open_hours_per_day=12,
+        )
+
+
+@pytest.mark.asyncio
+async def test_room_occupancy_uses_open_hours_for_capacity():
+    session = FakeSession(
+        [
+            FakeResult(scalar_or_none=1),
+            FakeResult(
+                rows=[
+                    {
+                        "store_room_id": 1,
+                        "room_name": "Room 1",
+                        "booking_count": 2,
+                        "booked_minutes": 360,
+                    },
+                    {
+                        "store_room_id": 2,
+                        "room_name": "Room 2",
+                        "booking_count": 0,
+                        "booked_minutes": 0,
+                    },
+                ]
+            ),
+        ]
+    )
+    service = AnalyticsService(session=session)
+
+    response = await service.get_room_occupancy(
+        store_id=10,
+        date_from=date(2026, 5, 1),
+        date_to=date(2026, 5, 2),
+        open_hours_per_day=12,
+    )
+
+    assert [item.available_minutes for item in response.items] == [1440, 1440]
+    assert [item.occupancy_pct for item in response.items] == [25.0, 0.0]
+
+
+@pytest.mark.asyncio
+async def test_script_monthly_usage_starts_at_first_month():
+    session = FakeSession([FakeResult(scalar_or_none=1), FakeResult(rows=[])])
+    service = AnalyticsService(session=session)
+
+    await service.get_script_monthly_usage(
+        store_id=10,
+        date_from=date(2026, 5, 17),
+        date_to=date(2026, 7, 31),
+    )
+
+    assert session.execute_calls[-1][1]["month_from"] == date(2026, 5, 1)
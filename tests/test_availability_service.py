@@ -0,0 +1,329 @@
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+
+from app.core.errors import BadRequestError, NotFoundError
+from app.services import availability_service
+from app.services.availability_service import AvailabilityService
+from app.services.occupancy import (
+    chain_days,
+    day_slice,
+    format_quarter_hours,
+    parse_quarter_hours,
+    run_starts,
+)
+
+FROM = datetime(2026, 6, 1, 16, 0, tzinfo=timezone.utc)
+
+
+@pytest.fixture(autouse=True)
+def empty_heatmap_cache():
+    availability_service._heatmap_cache.clear()
+    yield
+    availability_service._heatmap_cache.clear()
+
+
+class FakeResult:
+    def __init__(self, *, rows=None, scalar_or_none=None, one_or_none=None) -> None:
+        self._rows = rows or []
+        self._scalar_or_none = scalar_or_none
+        self._one_or_none = one_or_none
+
+    def mappings(self) -> "FakeResult":
+        return self
+
+    def __iter__(self):
+        return iter(self._rows)
+
+    def scalar_one_or_none(self):
+        return self._scalar_or_none
+
+    def one_or_none(self):
+        return self._one_or_none
+
+
+class FakeSession:
+    def __init__(self, results):
+        self._results = list(results)
+        self.execute_calls = []
+
+    async def execute(self, query, params=None):
+        self.execute_calls.append((query, params))
+        return self._results.pop(0)
+
+
+def _at(hours: float) -> datetime:
+    return FROM + timedelta(hours=hours)
+
+
+def _busy(room_id: int, start: float | None, end: float | None) -> dict:
+    return {
+        "store_room_id": room_id,
+        "room_name": f"Room {room_id}",
+        "start_at": None if start is None else _at(start),
+        "end_at": None if end is None else _at(end),
+    }
+
+
+@pytest.mark.asyncio
+async def test_availability_rejects_inverted_window():
+    service = AvailabilityService(session=FakeSession([]))
+
+    with pytest.raises(BadRequestError):
+        await service.get_availability(
+            10, script_id=5, start_from=_at(2), start_to=_at(1), step_minutes=30
+        )
+
+
+@pytest.mark.asyncio
+async def test_availability_rejects_window_over_limit():
+    service = AvailabilityService(session=FakeSession([]))
+
+    with pytest.raises(BadRequestError):
+        await service.get_availability(
+            10, script_id=5, start_from=FROM, start_to=_at(24 * 32), step_minutes=30
+        )
+
+
+@pytest.mark.asyncio
+async def test_availability_requires_active_store_script():
+    session = FakeSession([FakeResult(scalar_or_none=None)])
+    service = AvailabilityService(session=session)
+
+    with pytest.raises(NotFoundError):
+        await service.get_availability(
+            10, script_id=5, start_from=FROM, start_to=_at(8), step_minutes=30
+        )
+
+    assert len(session.execute_calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_availability_sweeps_merged_busy_blocks():
+    session = FakeSession(
+        [
+            FakeResult(scalar_or_none=120),
+            FakeResult(
+                rows=[
+                    # Running at `from`, then two conflicting bookings merged into 3h-6h.
+                    _busy(1, -1, 0.5),
+                    _busy(1, 3, 5),
+                    _busy(1, 4, 6),
+                    _busy(2, None, None),
+                ]
+            ),
+        ]
+    )
+    service = AvailabilityService(session=session)
+
+    response = await service.get_availability(
+        10, script_id=5, start_from=FROM, start_to=_at(8), step_minutes=60
+    )
+
+    room_1, room_2 = response.rooms
+    assert [(gap.start_at, gap.end_at) for gap in room_1.free_intervals] == [
+        (_at(0.5), _at(3)),
+        (_at(6), _at(10)),
+    ]
+    # Starts stay on the hourly grid from `from`; the 0.5h gap opening rounds up to 1h.
+    assert room_1.start_times == [_at(1), _at(6), _at(7)]
+    assert room_2.start_times == [_at(hour) for hour in range(8)]
+    assert session.execute_calls[1][1]["window_end"] == _at(10)
+
+
+def _dm_busy(dm_id: int, start: float | None, end: float | None) -> dict:
+    return {
+        "dm_id": dm_id,
+        "start_at": None if start is None else _at(start),
+        "end_at": None if end is None else _at(end),
+    }
+
+
+@pytest.mark.asyncio
+async def test_suggestions_need_a_free_room_and_enough_free_dms():
+    session = FakeSession(
+        [
+            FakeResult(one_or_none={"estimated_minutes": 120, "dm_count": 1}),
+            FakeResult(rows=[_busy(1, 1, 3), _busy(2, 4, 6)]),
+            FakeResult(rows=[_dm_busy(7, 0, 2), _dm_busy(8, 2, 5)]),
+        ]
+    )
+    service = AvailabilityService(session=session)
+
+    response = await service.get_suggestions(
+        10, script_id=5, start_from=FROM, start_to=_at(6), step_minutes=60
+    )
+
+    # Back-to-back is free: room 2 at 0h ends as its 4h booking starts, DM 7 is free at 2h.
+    assert [
+        (item.start_at, item.end_at, item.store_room_ids, item.dm_ids)
+        for item in response.suggestions
+    ] == [
+        (_at(0), _at(2), [2], [8]),
+        (_at(2), _at(4), [2], [7]),
+        (_at(3), _at(5), [1], [7]),
+        (_at(4), _at(6), [1], [7]),
+        (_at(5), _at(7), [1], [7, 8]),
+    ]
+    assert response.dm_count == 1
+    assert session.execute_calls[2][1]["window_end"] == _at(8)
+
+
+def test_suggestion_sweep_counts_required_dms():
+    starts = [_at(hour) for hour in range(6)]
+    rooms = {1: [(_at(1), _at(3))], 2: []}
+    dms = {7: [(_at(0), _at(2))], 8: [(_at(2), _at(5))]}
+    duration = timedelta(hours=2)
+
+    two_dms = availability_service._sweep_suggestions(starts, rooms, dms, duration, 2)
+    no_dms = availability_service._sweep_suggestions(starts, rooms, dms, duration, 0)
+
+    assert [start_at for start_at, _, _ in two_dms] == [_at(5)]
+    assert [start_at for start_at, _, _ in no_dms] == starts
+
+
+@pytest.mark.asyncio
+async def test_suggestions_require_active_store_script():
+    session = FakeSession([FakeResult(one_or_none=None)])
+    service = AvailabilityService(session=session)
+
+    with pytest.raises(NotFoundError):
+        await service.get_suggestions(
+            10, script_id=5, start_from=FROM, start_to=_at(8), step_minutes=30
+        )
+
+    assert len(session.execute_calls) == 1
+
+
+def _quarters(first: int, last: int) -> str:
+    return "0" * first + "1" * (last - first) + "0" * (96 - last)
+
+
+def test_quarter_hour_masks_round_trip_and_chain_by_day():
+    evening = parse_quarter_hours(_quarters(72, 90))
+    late = parse_quarter_hours(_quarters(0, 4))
+
+    chained = chain_days([(date(2026, 6, 1), evening), (date(2026, 6, 2), late)], date(2026, 6, 1))
+
+    assert evening == sum(1 << quarter for quarter in range(72, 90))
+    assert format_quarter_hours(day_slice(chained, 1)) == _quarters(0, 4)
+    # A run across midnight: 06-01 quarters 90-95 are free, then 06-02 is busy until 01:00.
+    free = ~chained & ((1 << 192) - 1)
+    starts = run_starts(free, 8)
+    assert not starts >> 90 & 1
+    assert starts >> 100 & 1
+
+
+@pytest.mark.asyncio
+async def test_occupancy_reports_occupied_days_per_room():
+    session = FakeSession(
+        [
+            FakeResult(
+                rows=[
+                    {
+                        "store_room_id": 1,
+                        "room_name": "Room 1",
+                        "occupancy_date": date(2026, 6, 2),
+                        "quarter_hours": _quarters(72, 84),
+                    },
+                    {
+                        "store_room_id": 2,
+                        "room_name": "Room 2",
+                        "occupancy_date": None,
+                        "quarter_hours": None,
+                    },
+                ]
+            )
+        ]
+    )
+    service = AvailabilityService(session=session)
+
+    response = await service.get_occupancy(
+        10, date_from=date(2026, 6, 1), date_to=date(2026, 6, 30)
+    )
+
+    room_1, room_2 = response.rooms
+    assert room_1.occupied_minutes == 180
+    assert [(day.occupancy_date, day.quarter_hours) for day in room_1.days] == [
+        (date(2026, 6, 2), _quarters(72, 84))
+    ]
+    assert room_2.occupied_minutes == 0
+    assert room_2.days == []
+
+
+@pytest.mark.asyncio
+async def test_occupancy_rejects_range_over_limit():
+    service = AvailabilityService(session=FakeSession([]))
+
+    with pytest.raises(BadRequestError):
+        await service.get_occupancy(10, date_from=date(2026, 1, 1), date_to=date(2026, 3, 31))
+
+
+def _heatmap_rows() -> list[dict]:
+    # 18:00-21:00 on June 2 and 18:00-18:15 on June 3.
+    return [
+        {
+            "store_room_id": 1,
+            "room_name": "Room 1",
+            "occupancy_date": date(2026, 6, 2),
+            "quarter_hours": _quarters(72, 84),
+        },
+        {
+            "store_room_id": 1,
+            "room_name": "Room 1",
+            "occupancy_date": date(2026, 6, 3),
+            "quarter_hours": _quarters(72, 73),
+        },
+    ]
+
+
+@pytest.mark.asyncio
+async def test_heatmap_counts_occupied_days_per_bucket():
+    session = FakeSession([FakeResult(scalar_or_none=3), FakeResult(rows=_heatmap_rows())])
+    service = AvailabilityService(session=session)
+
+    response = await service.get_heatmap(10, month=date(2026, 6, 1), bucket_minutes=60)
+
+    assert response.days_in_month == 30
+    (room,) = response.rooms
+    assert len(room.occupied_days) == 24
+    assert room.occupied_days[17:22] == [0, 2, 1, 1, 0]
+    assert session.execute_calls[1][1]["date_to"] == date(2026, 6, 30)
+
+
+@pytest.mark.asyncio
+async def test_heatmap_is_cached_until_occupancy_version_changes():
+    first = await AvailabilityService(
+        session=FakeSession([FakeResult(scalar_or_none=3), FakeResult(rows=_heatmap_rows())])
+    ).get_heatmap(10, month=date(2026, 6, 1), bucket_minutes=30)
+
+    cached_session = FakeSession([FakeResult(scalar_or_none=3)])
+    cached = await AvailabilityService(session=cached_session).get_heatmap(
+        10, month=date(2026, 6, 1), bucket_minutes=30
+    )
+    changed_session = FakeSession([FakeResult(scalar_or_none=4), FakeResult(rows=[])])
+    changed = await AvailabilityService(session=changed_session).get_heatmap(
+        10, month=date(2026, 6, 1), bucket_minutes=30
+    )
+
+    assert cached is first
+    assert len(cached_session.execute_calls) == 1
+    assert changed.rooms == []
+    assert len(changed_session.execute_calls) == 2
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("bucket_minutes", [0, 20, 105, 1500])
+async def test_heatmap_rejects_buckets_that_do_not_tile_a_day(bucket_minutes):
+    service = AvailabilityService(session=FakeSession([]))
+
+    with pytest.raises(BadRequestError):
+        await service.get_heatmap(10, month=date(2026, 6, 1), bucket_minutes=bucket_minutes)
+
+
+@pytest.mark.asyncio
+async def test_heatmap_store_not_found():
+    service = AvailabilityService(session=FakeSession([FakeResult(scalar_or_none=None)]))
+
+    with pytest.raises(NotFoundError):
+        await service.get_heatmap(10, month=date(2026, 6, 1), bucket_minutes=30)
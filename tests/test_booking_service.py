@@ -1,4 +1,7 @@
-from datetime import datetime, timezone
+import csv
+import io
+import json
+from datetime import datetime, timedelta, timezone
 from unittest.mock import AsyncMock
 
 import pytest
@@ -7,6 +10,7 @@ from sqlalchemy.exc import IntegrityError
 from app.core.errors import ConflictError, NotFoundError
 from app.schemas.booking import (
     AddBookingClientRequest,
+    BookingExportFormat,
     ConfirmBookingRequest,
     CreateIncompleteBookingRequest,
     UpdateIncompleteBookingRequest,
@@ -60,6 +64,58 @@ class FakeSession:
         return FakeBegin()
 
 
+class FakeStreamResult:
+    def __init__(self, rows) -> None:
+        self._rows = rows
+        self.closed = False
+
+    def mappings(self) -> "FakeStreamResult":
+        return self
+
+    async def partitions(self):
+        yield self._rows
+
+    async def close(self) -> None:
+        self.closed = True
+
+
+class FakeExportSession(FakeSession):
+    def __init__(self, results, stream_rows):
+        super().__init__(results)
+        self.stream_result = FakeStreamResult(stream_rows)
+        self.connection_options = None
+        self.rolled_back = False
+
+    async def connection(self, execution_options=None):
+        self.connection_options = execution_options
+
+    async def stream(self, query, params=None, execution_options=None):
+        self.execute_calls.append((query, params))
+        return self.stream_result
+
+    async def rollback(self) -> None:
+        self.rolled_back = True
+
+
+def _export_row(**overrides):
+    base = {
+        "booking_id": 7,
+        "booking_status_id": 2,
+        "target_month": None,
+        "start_at": datetime(2026, 4, 4, 23, 0, tzinfo=timezone.utc),
+        "end_at": datetime(2026, 4, 5, 2, 0, tzinfo=timezone.utc),
+        "script_id": 5,
+        "script_name": "Script 5",
+        "store_room_id": 3,
+        "room_name": "Room 3",
+        "client_ids": [1, 2],
+        "dm_ids": [9],
+        "conflict_booking_ids": [8],
+    }
+    base.update(overrides)
+    return base
+
+
 def _booking_row(**overrides):
     base = {
         "booking_id": 1,
@@ -70,6 +126,7 @@ def _booking_row(**overrides):
         "start_at": None,
         "end_at": None,
         "duration_override_minutes": None,
+        "conflict_booking_ids": [],
     }
     base.update(overrides)
     return base
@@ -215,9 +272,12 @@ async def test_confirm_booking_success_prefers_non_conflict_room():
             FakeResult(rows=[{"character_id": 10}]),
             FakeResult(rows=[{"character_id": 10, "client_id": 1}]),
             FakeResult(scalar=180),
-            FakeResult(rows=[{"store_room_id": 2}, {"store_room_id": 3}]),
-            FakeResult(scalar_or_none=1),
-            FakeResult(scalar_or_none=None),
+            FakeResult(
+                rows=[
+                    {"store_room_id": 2, "has_conflict": True},
+                    {"store_room_id": 3, "has_conflict": False},
+                ]
+            ),
             FakeResult(scalar_or_none=None),
             FakeResult(scalar_or_none=None),
             FakeResult(rows=[_booking_row(booking_status_id=2, start_at=start_at, end_at=start_at)]),
@@ -236,6 +296,94 @@ async def test_confirm_booking_success_prefers_non_conflict_room():
     assert item.booking_status_id == 2
 
 
+@pytest.mark.asyncio
+async def test_list_bookings_filters_on_stored_conflict_count():
+    session = FakeSession(
+        [
+            FakeResult(rows=[{"archived_before": None}]),
+            FakeResult(rows=[]),
+            FakeResult(scalar=0),
+        ]
+    )
+    service = BookingService(session=session)
+
+    await service.list_bookings(
+        10, booking_status_id=None, target_month=None, has_conflict=True, limit=20, offset=0
+    )
+
+    items_sql = str(session.execute_calls[1][0])
+    assert "b.conflict_count > 0" in items_sql
+    assert "EXISTS" not in items_sql
+    assert "b.conflict_count > 0" in str(session.execute_calls[2][0])
+    assert "booking_archive" not in items_sql
+
+
+@pytest.mark.asyncio
+async def test_get_booking_splits_conflicts_by_kind():
+    start_at = datetime(2026, 4, 1, 10, 0, tzinfo=timezone.utc)
+    session = FakeSession(
+        [
+            FakeResult(
+                rows=[
+                    _booking_row(
+                        booking_status_id=2,
+                        start_at=start_at,
+                        end_at=start_at,
+                        conflict_booking_ids=[3],
+                    )
+                ]
+            ),
+            FakeResult(rows=[{"booking_id": 1, "client_id": 4}]),
+            FakeResult(
+                rows=[
+                    {"conflict_kind": "dm", "booking_id": 1, "conflict_booking_id": 8},
+                    {"conflict_kind": "dm", "booking_id": 1, "conflict_booking_id": 9},
+                    {"conflict_kind": "client", "booking_id": 1, "conflict_booking_id": 9},
+                ]
+            ),
+        ]
+    )
+    service = BookingService(session=session)
+
+    item = await service.get_booking(store_id=10, booking_id=1)
+
+    assert (item.has_conflict, item.conflict_booking_ids) == (True, [3])
+    assert (item.has_dm_conflict, item.dm_conflict_booking_ids) == (True, [8, 9])
+    assert (item.has_client_conflict, item.client_conflict_booking_ids) == (True, [9])
+    assert len(session.execute_calls) == 3
+
+
+@pytest.mark.asyncio
+async def test_get_booking_falls_back_to_archive():
+    start_at = datetime(2025, 4, 1, 10, 0, tzinfo=timezone.utc)
+    session = FakeSession(
+        [
+            FakeResult(rows=[]),
+            FakeResult(
+                rows=[
+                    _booking_row(
+                        booking_status_id=4,
+                        target_month=None,
+                        start_at=start_at,
+                        end_at=start_at,
+                        conflict_booking_ids=[3],
+                    )
+                ]
+            ),
+            FakeResult(rows=[{"booking_id": 1, "client_id": 4}]),
+        ]
+    )
+    service = BookingService(session=session)
+
+    item = await service.get_booking(store_id=10, booking_id=1)
+
+    assert (item.booking_status_id, item.client_ids) == (4, [4])
+    assert (item.conflict_booking_ids, item.dm_conflict_booking_ids) == ([3], [])
+    assert "FROM booking_archive" in str(session.execute_calls[1][0])
+    assert "FROM booking_client_archive" in str(session.execute_calls[2][0])
+    assert len(session.execute_calls) == 3
+
+
 @pytest.mark.asyncio
 async def test_add_booking_client_requires_incomplete():
     session = FakeSession([FakeResult(scalar_or_none=2)])
@@ -282,3 +430,87 @@ async def test_remove_booking_client_requires_minimum():
 
     with pytest.raises(ConflictError):
         await service.remove_booking_client(store_id=10, booking_id=1, client_id=1)
+
+
+@pytest.mark.asyncio
+async def test_export_bookings_store_not_found():
+    session = FakeExportSession([FakeResult(scalar_or_none=None)], stream_rows=[])
+    service = BookingService(session=session)
+
+    with pytest.raises(NotFoundError):
+        await service.export_bookings(
+            store_id=10,
+            start_from=None,
+            start_to=None,
+            export_format=BookingExportFormat.CSV,
+        )
+
+
+@pytest.mark.asyncio
+async def test_export_bookings_ndjson_uses_read_only_snapshot():
+    session = FakeExportSession(
+        [FakeResult(rows=[{"archived_before": None}])], stream_rows=[_export_row()]
+    )
+    service = BookingService(session=session)
+
+    chunks = await service.export_bookings(
+        store_id=10,
+        start_from=datetime(2026, 4, 1, tzinfo=timezone.utc),
+        start_to=None,
+        export_format=BookingExportFormat.NDJSON,
+    )
+    lines = b"".join([chunk async for chunk in chunks]).splitlines()
+
+    assert session.connection_options == {
+        "isolation_level": "REPEATABLE READ",
+        "postgresql_readonly": True,
+    }
+    assert "start_from" in session.execute_calls[-1][1]
+    assert [json.loads(line)["conflict_booking_ids"] for line in lines] == [[8]]
+    assert session.stream_result.closed
+    assert session.rolled_back
+
+
+@pytest.mark.asyncio
+async def test_export_bookings_reads_archive_only_below_horizon():
+    archived_before = datetime(2026, 4, 1, tzinfo=timezone.utc)
+
+    async def export_query(start_from):
+        session = FakeExportSession(
+            [FakeResult(rows=[{"archived_before": archived_before}])], stream_rows=[]
+        )
+        chunks = await BookingService(session=session).export_bookings(
+            store_id=10,
+            start_from=start_from,
+            start_to=None,
+            export_format=BookingExportFormat.NDJSON,
+        )
+        assert b"".join([chunk async for chunk in chunks]) == b""
+        return str(session.execute_calls[-1][0])
+
+    assert "booking_archive" not in await export_query(archived_before)
+    assert "FROM booking_archive" in await export_query(archived_before - timedelta(days=1))
+    assert "FROM booking_archive" in await export_query(None)
+
+
+@pytest.mark.asyncio
+async def test_export_bookings_csv_header_and_list_columns():
+    session = FakeExportSession(
+        [FakeResult(rows=[{"archived_before": None}])],
+        stream_rows=[_export_row(), _export_row(booking_id=8, booking_status_id=1, client_ids=[3])],
+    )
+    service = BookingService(session=session)
+
+    chunks = await service.export_bookings(
+        store_id=10,
+        start_from=None,
+        start_to=None,
+        export_format=BookingExportFormat.CSV,
+    )
+    body = b"".join([chunk async for chunk in chunks]).decode()
+    records = list(csv.DictReader(io.StringIO(body)))
+
+    assert [record["booking_id"] for record in records] == ["7", "8"]
+    assert records[0]["client_ids"] == "1 2"
+    assert records[0]["start_at"] == "2026-04-04T23:00:00Z"
+    assert records[1]["client_ids"] == "3"
@@ -1,6 +1,9 @@
+from datetime import datetime, timedelta, timezone
+
 import pytest
+from sqlalchemy.exc import DBAPIError
 
-from app.core.errors import ConflictError, NotFoundError
+from app.core.errors import BadRequestError, ConflictError, NotFoundError, QueryTimeoutError
 from app.schemas.client import CreateClientRequest, UpdateClientRequest
 from app.services.client_service import ClientService
 
@@ -45,7 +48,10 @@ class FakeSession:
 
     async def execute(self, query, params=None):
         self.execute_calls.append((query, params))
-        return self._results.pop(0)
+        result = self._results.pop(0)
+        if isinstance(result, Exception):
+            raise result
+        return result
 
     def begin(self):
         return FakeBegin()
@@ -75,6 +81,70 @@ async def test_list_clients_returns_items():
     assert response.items[0].pic_storage_key == "clients/1.webp"
 
 
+class FakeQueryCanceled(Exception):
+    sqlstate = "57014"
+
+
+@pytest.mark.asyncio
+async def test_search_clients_matches_name_and_phone_digits():
+    session = FakeSession(
+        [
+            FakeResult(),
+            FakeResult(
+                rows=[
+                    {
+                        "client_id": 2,
+                        "display_name": "Jordan Lee",
+                        "phone": "(416) 555-0102",
+                        "pic_storage_key": None,
+                    }
+                ]
+            ),
+        ]
+    )
+    service = ClientService(session=session)
+
+    response = await service.search_clients(q=" 416-555 ", limit=10)
+
+    assert [item.client_id for item in response.items] == [2]
+    query, params = session.execute_calls[1]
+    assert "c.phone_digits LIKE :phone_pattern" in str(query)
+    assert params["name_pattern"] == "%416-555%"
+    assert params["phone_pattern"] == "%416555%"
+
+
+@pytest.mark.asyncio
+async def test_search_clients_escapes_like_wildcards_and_skips_short_digits():
+    session = FakeSession([FakeResult(), FakeResult()])
+    service = ClientService(session=session)
+
+    await service.search_clients(q="陈_1%", limit=10)
+
+    query, params = session.execute_calls[1]
+    assert "phone_digits LIKE" not in str(query)
+    assert params["name_pattern"] == "%陈\\_1\\%%"
+    assert params["phone_digits"] is None
+
+
+@pytest.mark.asyncio
+async def test_search_clients_rejects_blank_query():
+    service = ClientService(session=FakeSession([]))
+
+    with pytest.raises(BadRequestError):
+        await service.search_clients(q="   ", limit=10)
+
+
+@pytest.mark.asyncio
+async def test_search_clients_timeout_maps_to_query_timeout():
+    session = FakeSession(
+        [FakeResult(), DBAPIError("SELECT", {}, FakeQueryCanceled("canceling statement"))]
+    )
+    service = ClientService(session=session)
+
+    with pytest.raises(QueryTimeoutError):
+        await service.search_clients(q="Alex", limit=10)
+
+
 @pytest.mark.asyncio
 async def test_create_client_returns_item():
     session = FakeSession(
@@ -133,3 +203,108 @@ async def test_get_client_not_found():
 
     with pytest.raises(NotFoundError):
         await service.get_client(1)
+
+
+def _client_booking_row(booking_id: int, sort_at: datetime) -> dict:
+    return {
+        "booking_id": booking_id,
+        "store_id": 10,
+        "store_name": "Store A",
+        "script_id": 5,
+        "script_name": "Script 5",
+        "booking_status_id": 2,
+        "target_month": None,
+        "start_at": sort_at,
+        "end_at": sort_at + timedelta(hours=3),
+        "booking_sort_at": sort_at,
+    }
+
+
+@pytest.mark.asyncio
+async def test_list_client_bookings_returns_cursor_for_next_page():
+    start = datetime(2026, 5, 1, 23, 0, tzinfo=timezone.utc)
+    rows = [
+        _client_booking_row(booking_id, start - timedelta(days=booking_id))
+        for booking_id in (1, 2, 3)
+    ]
+    session = FakeSession([FakeResult(rows=[{"archived_before": None}]), FakeResult(rows=rows)])
+    service = ClientService(session=session)
+
+    page = await service.list_client_bookings(1, allowed_store_ids={10}, limit=2, cursor=None)
+
+    assert [item.booking_id for item in page.items] == [1, 2]
+    assert session.execute_calls[-1][1]["fetch"] == 3
+
+    next_session = FakeSession(
+        [FakeResult(rows=[{"archived_before": None}]), FakeResult(rows=rows[2:])]
+    )
+    next_page = await ClientService(session=next_session).list_client_bookings(
+        1, allowed_store_ids={10}, limit=2, cursor=page.next_cursor
+    )
+
+    params = next_session.execute_calls[-1][1]
+    assert (params["cursor_sort_at"], params["cursor_booking_id"]) == (rows[1]["start_at"], 2)
+    assert [item.booking_id for item in next_page.items] == [3]
+    assert next_page.next_cursor is None
+
+
+@pytest.mark.asyncio
+async def test_list_client_bookings_merges_archive_past_horizon():
+    start = datetime(2026, 5, 1, 23, 0, tzinfo=timezone.utc)
+    rows = {
+        booking_id: _client_booking_row(booking_id, start - timedelta(days=booking_id * 30))
+        for booking_id in (1, 2, 3, 4)
+    }
+    session = FakeSession(
+        [
+            FakeResult(rows=[{"archived_before": start - timedelta(days=45)}]),
+            FakeResult(rows=[rows[1], rows[4]]),
+            FakeResult(rows=[rows[2], rows[3]]),
+        ]
+    )
+    service = ClientService(session=session)
+
+    page = await service.list_client_bookings(1, allowed_store_ids={10}, limit=2, cursor=None)
+
+    assert [item.booking_id for item in page.items] == [1, 2]
+    assert "FROM booking_client_archive" in str(session.execute_calls[-1][0])
+    assert page.next_cursor is not None
+
+
+@pytest.mark.asyncio
+async def test_list_client_bookings_skips_archive_above_horizon():
+    start = datetime(2026, 5, 1, 23, 0, tzinfo=timezone.utc)
+    rows = [
+        _client_booking_row(booking_id, start - timedelta(days=booking_id))
+        for booking_id in (1, 2, 3)
+    ]
+    session = FakeSession(
+        [
+            FakeResult(rows=[{"archived_before": start - timedelta(days=30)}]),
+            FakeResult(rows=rows),
+        ]
+    )
+    service = ClientService(session=session)
+
+    page = await service.list_client_bookings(1, allowed_store_ids={10}, limit=2, cursor=None)
+
+    assert [item.booking_id for item in page.items] == [1, 2]
+    assert len(session.execute_calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_list_client_bookings_rejects_bad_cursor():
+    service = ClientService(session=FakeSession([]))
+
+    with pytest.raises(BadRequestError):
+        await service.list_client_bookings(
+            1, allowed_store_ids={10}, limit=20, cursor="not-a-cursor"
+        )
+
+
+@pytest.mark.asyncio
+async def test_list_client_bookings_client_not_found():
+    service = ClientService(session=FakeSession([FakeResult(scalar_or_none=None)]))
+
+    with pytest.raises(NotFoundError):
+        await service.list_client_bookings(1, allowed_store_ids={10}, limit=20, cursor=None)
@@ -0,0 +1,162 @@
+from types import SimpleNamespace
+
+import pytest
+
+from app.core import database
+from app.core.config import Settings
+from app.core.errors import BadRequestError
+
+
+class FakeSession:
+    def __init__(self, name: str, bind=None) -> None:
+        self.name = name
+        self.bind = bind
+        self.info: dict = {}
+
+    async def __aenter__(self) -> "FakeSession":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        return None
+
+
+class FakeReplicaConnection:
+    def __init__(self, state: dict) -> None:
+        self.state = state
+
+    async def __aenter__(self) -> "FakeReplicaConnection":
+        self.state["connections"] += 1
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        return None
+
+    async def execute(self, statement, params):
+        replayed = self.state["replayed"] >= params["lsn"]
+        return SimpleNamespace(scalar_one=lambda: replayed)
+
+    async def rollback(self) -> None:
+        self.state["rollbacks"] += 1
+
+
+class FakeSessionMaker:
+    def __init__(self, name: str, state: dict | None = None) -> None:
+        self.name = name
+        self.kw = {"bind": SimpleNamespace(connect=lambda: FakeReplicaConnection(state))}
+
+    def __call__(self, bind=None) -> FakeSession:
+        return FakeSession(self.name, bind)
+
+
+def _request(method: str, **headers: str) -> SimpleNamespace:
+    return SimpleNamespace(method=method, headers=headers, state=SimpleNamespace())
+
+
+async def _session_for(request: SimpleNamespace) -> FakeSession:
+    async with database._request_session(request) as session:
+        return session
+
+
+@pytest.fixture(autouse=True)
+def primary(monkeypatch):
+    monkeypatch.setattr(database, "get_session_maker", lambda: FakeSessionMaker("primary"))
+    monkeypatch.setattr(
+        database, "get_read_session_maker", lambda: FakeSessionMaker("primary-read")
+    )
+    monkeypatch.setattr(database, "get_replica_session_maker", lambda: None)
+    monkeypatch.setattr(database, "_actor_write_lsn", {})
+
+
+@pytest.fixture
+def replica(monkeypatch):
+    """Route with a configured replica whose replay position is `state["replayed"]`."""
+    state = {"replayed": 0, "connections": 0, "rollbacks": 0}
+    replica_session_maker = FakeSessionMaker("replica", state)
+    monkeypatch.setattr(database, "get_replica_session_maker", lambda: replica_session_maker)
+    return state
+
+
+def test_lsn_round_trip():
+    assert database.parse_lsn("16/B374D848") == (0x16 << 32) | 0xB374D848
+    assert database.format_lsn(database.parse_lsn("16/B374D848")) == "16/B374D848"
+    with pytest.raises(ValueError):
+        database.parse_lsn("not-an-lsn")
+
+
+async def test_request_session_uses_primary_without_replica():
+    assert (await _session_for(_request("GET"))).name == "primary-read"
+    write_session = await _session_for(_request("PATCH", **{"X-Actor-Id": "a"}))
+    assert write_session.name == "primary"
+    assert database.TRACK_WRITE_LSN not in write_session.info
+
+
+async def test_request_session_sends_reads_to_replica_and_writes_to_primary(replica):
+    assert (await _session_for(_request("GET"))).name == "replica"
+    write_session = await _session_for(_request("POST", **{"X-Actor-Id": "a"}))
+    assert write_session.name == "primary"
+    assert write_session.info[database.TRACK_WRITE_LSN] is True
+    assert replica["connections"] == 0
+
+
+async def test_request_session_checks_replay_on_the_connection_it_reads_with(replica):
+    database._actor_write_lsn["actor-1"] = 200
+    request = _request("GET", **{"X-Actor-Id": "actor-1"})
+
+    replica["replayed"] = 100
+    assert (await _session_for(request)).name == "primary-read"
+    assert (await _session_for(_request("GET"))).name == "replica"
+
+    replica["replayed"] = 200
+    session = await _session_for(request)
+    assert session.name == "replica"
+    assert isinstance(session.bind, FakeReplicaConnection)
+    assert replica["connections"] == replica["rollbacks"] == 2
+    assert database._actor_write_lsn == {}
+
+
+async def test_request_session_honours_read_after_header(replica):
+    replica["replayed"] = 0xFF
+    request = _request("GET", **{"X-Read-After-LSN": "0/100"})
+    assert (await _session_for(request)).name == "primary-read"
+
+    with pytest.raises(BadRequestError):
+        await _session_for(_request("GET", **{"X-Read-After-LSN": "zz"}))
+
+
+def test_record_actor_write_evicts_oldest_actor(monkeypatch):
+    monkeypatch.setattr(database, "_actor_write_lsn", {"old": 1, "recent": 2})
+    monkeypatch.setattr(database, "ACTOR_WRITE_LSN_SIZE", 2)
+    session = FakeSession("primary")
+    session.info[database.WRITE_LSN] = 0x1_0000_0010
+    request = _request("POST", **{"X-Actor-Id": "new"})
+
+    database._record_actor_write(request, session)
+
+    assert database._actor_write_lsn == {"recent": 2, "new": 0x1_0000_0010}
+    assert request.state.read_after_lsn == "1/10"
+
+
+def test_get_database_shards_parses_ranges():
+    settings = Settings(
+        database_url="postgresql+asyncpg://primary/trs",
+        database_shard_urls=(
+            " 2000=postgresql+asyncpg://shard-2/trs?host=/tmp,1000=postgresql+asyncpg://shard-1/trs"
+        ),
+    )
+    assert settings.get_database_shards() == [
+        (1000, "postgresql+asyncpg://shard-1/trs"),
+        (2000, "postgresql+asyncpg://shard-2/trs?host=/tmp"),
+    ]
+    with pytest.raises(ValueError):
+        Settings(database_url="x", database_shard_urls="1000").get_database_shards()
+
+
+def test_get_store_shard_url_maps_store_ranges(monkeypatch):
+    monkeypatch.setattr(
+        database, "get_shard_map", lambda: ((1000, "shard-1"), (2000, "shard-2"))
+    )
+
+    assert database.get_store_shard_url(999) is None
+    assert database.get_store_shard_url(1000) == "shard-1"
+    assert database.get_store_shard_url(1999) == "shard-1"
+    assert database.get_store_shard_url(5000) == "shard-2"
@@ -1,6 +1,8 @@
+from datetime import date, datetime, timedelta, timezone
+
 import pytest
 
-from app.core.errors import ConflictError, NotFoundError
+from app.core.errors import BadRequestError, ConflictError, NotFoundError
 from app.schemas.dm import CreateDmRequest, CreateDmStoreMembershipRequest, UpdateDmRequest
 from app.services.dm_service import DmService
 
@@ -168,3 +170,112 @@ async def test_delete_dm_store_membership_not_found():
 
     with pytest.raises(NotFoundError):
         await service.delete_dm_store_membership(1, 10)
+
+
+@pytest.mark.asyncio
+async def test_get_dm_workload_requires_month_start():
+    service = DmService(session=FakeSession([]))
+
+    with pytest.raises(BadRequestError):
+        await service.get_dm_workload(1, month=date(2026, 5, 2), allowed_store_ids={10})
+
+
+@pytest.mark.asyncio
+async def test_get_dm_workload_totals_stores():
+    session = FakeSession(
+        [
+            FakeResult(scalar_or_none=1),
+            FakeResult(
+                rows=[
+                    {
+                        "store_id": 10,
+                        "store_name": "Store A",
+                        "session_count": 3,
+                        "worked_minutes": 540,
+                    },
+                    {
+                        "store_id": 11,
+                        "store_name": "Store B",
+                        "session_count": 1,
+                        "worked_minutes": 150,
+                    },
+                ]
+            ),
+        ]
+    )
+    service = DmService(session=session)
+
+    workload = await service.get_dm_workload(1, month=date(2026, 12, 1), allowed_store_ids={11, 10})
+
+    assert (workload.session_count, workload.worked_minutes) == (4, 690)
+    params = session.execute_calls[-1][1]
+    assert params["next_month"] == date(2027, 1, 1)
+    assert params["allowed_store_ids"] == [10, 11]
+
+
+FREE_BUSY_FROM = datetime(2026, 6, 6, 14, 0, tzinfo=timezone.utc)
+
+
+def _interval(booking_id: int, store_id: int, start: float, end: float) -> dict:
+    return {
+        "booking_id": booking_id,
+        "store_id": store_id,
+        "start_at": FREE_BUSY_FROM + timedelta(hours=start),
+        "end_at": FREE_BUSY_FROM + timedelta(hours=end),
+    }
+
+
+@pytest.mark.asyncio
+async def test_get_dm_free_busy_merges_overlaps_and_hides_other_stores():
+    session = FakeSession(
+        [
+            FakeResult(scalar_or_none=1),
+            FakeResult(
+                rows=[
+                    _interval(1, 10, -1, 2),
+                    _interval(2, 20, 1, 4),
+                    _interval(3, 10, 6, 9),
+                ]
+            ),
+        ]
+    )
+    service = DmService(session=session)
+
+    response = await service.get_dm_free_busy(
+        1,
+        start_from=FREE_BUSY_FROM,
+        start_to=FREE_BUSY_FROM + timedelta(hours=12),
+        allowed_store_ids={10},
+    )
+
+    assert [
+        (block.start_at.hour, block.end_at.hour, block.booking_ids) for block in response.busy
+    ] == [(13, 18, [1]), (20, 23, [3])]
+    assert [(gap.start_at.hour, gap.end_at.hour) for gap in response.free] == [(18, 20), (23, 2)]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("hours", [0, -1, 24 * 32])
+async def test_get_dm_free_busy_rejects_bad_windows(hours):
+    service = DmService(session=FakeSession([]))
+
+    with pytest.raises(BadRequestError):
+        await service.get_dm_free_busy(
+            1,
+            start_from=FREE_BUSY_FROM,
+            start_to=FREE_BUSY_FROM + timedelta(hours=hours),
+            allowed_store_ids={10},
+        )
+
+
+@pytest.mark.asyncio
+async def test_get_dm_free_busy_not_found():
+    service = DmService(session=FakeSession([FakeResult(scalar_or_none=None)]))
+
+    with pytest.raises(NotFoundError):
+        await service.get_dm_free_busy(
+            1,
+            start_from=FREE_BUSY_FROM,
+            start_to=FREE_BUSY_FROM + timedelta(hours=1),
+            allowed_store_ids={10},
+        )
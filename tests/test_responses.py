@@ -0,0 +1,48 @@
+import httpx
+from fastapi import Depends, FastAPI
+from pydantic import BaseModel, field_serializer
+
+from app.api.responses import ModelResponse
+
+events: list[str] = []
+
+
+class Item(BaseModel):
+    name: str
+
+    @field_serializer("name")
+    def serialize_name(self, name: str) -> str:
+        events.append("serialize")
+        return name
+
+
+async def get_session():
+    events.append("session open")
+    try:
+        yield object()
+    finally:
+        events.append("session closed")
+
+
+app = FastAPI()
+
+
+@app.get("/item", response_model=Item)
+async def get_item(_session: object = Depends(get_session, scope="function")) -> ModelResponse:
+    response = ModelResponse(Item.model_construct(name="room-a"), headers={"X-Extra": "1"})
+    response.set_cookie("seen", "1")
+    return response
+
+
+async def test_model_response_renders_after_function_scoped_session_closes():
+    events.clear()
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.get("/item")
+
+    assert events == ["session open", "session closed", "serialize"]
+    assert response.json() == {"name": "room-a"}
+    assert response.headers["content-length"] == str(len(response.content))
+    assert response.headers["content-type"] == "application/json"
+    assert response.headers["x-extra"] == "1"
+    assert response.cookies["seen"] == "1"
@@ -1,8 +1,13 @@
+from datetime import date, datetime, timedelta, timezone
+from itertools import pairwise
+
 import pytest
 
-from app.core.errors import NotFoundError
+from app.core.errors import ConflictError, NotFoundError
 from app.schemas.room import CreateRoomRequest, UpdateRoomRequest
-from app.services.room_service import RoomService
+from app.services.room_service import RoomService, _repack_rooms
+
+DAY_START = datetime(2026, 6, 6, 14, 0, tzinfo=timezone.utc)
 
 
 class FakeResult:
@@ -146,3 +151,171 @@ async def test_list_rooms_store_missing():
 
     with pytest.raises(NotFoundError):
         await service.list_rooms(store_id=10, limit=20, offset=0)
+
+
+def _at(hours: float) -> datetime:
+    return DAY_START + timedelta(hours=hours)
+
+
+def _booking(booking_id: int, room_id: int, start: float, end: float, movable=True) -> dict:
+    return {
+        "booking_id": booking_id,
+        "store_room_id": room_id,
+        "start_at": _at(start),
+        "end_at": _at(end),
+        "is_movable": movable,
+    }
+
+
+def _rooms(*room_ids: int, inactive: tuple[int, ...] = ()) -> FakeResult:
+    return FakeResult(
+        rows=[
+            {"store_id": 10, "store_room_id": room_id, "is_active": room_id not in inactive}
+            for room_id in room_ids
+        ]
+    )
+
+
+def test_repack_keeps_free_rooms_and_moves_only_overlaps():
+    bookings = [
+        _booking(1, 1, 0, 3),
+        _booking(2, 1, 2, 5),
+        _booking(3, 2, 0, 2),
+        _booking(4, 2, 4, 6),
+    ]
+
+    assignment, unresolved = _repack_rooms(bookings, [1, 2, 3], {})
+
+    assert assignment == {1: 1, 2: 3, 3: 2, 4: 2}
+    assert unresolved == []
+
+
+def test_repack_prefers_room_whose_next_booking_starts_latest():
+    bookings = [
+        _booking(1, 1, 0, 3),
+        _booking(2, 1, 1, 3),
+        _booking(3, 2, 3, 5),
+        _booking(4, 3, 8, 10),
+    ]
+
+    assignment, _ = _repack_rooms(bookings, [1, 2, 3], {})
+
+    assert assignment[2] == 3
+    assert assignment[3] == 2
+
+
+def test_repack_reaches_peak_overlap_and_reports_overflow():
+    # Three-hour sessions every two hours, all in one room, overlap at most pairwise.
+    chain = [_booking(n, 1, 2 * n, 2 * n + 3) for n in range(8)]
+    assignment, unresolved = _repack_rooms(chain, [1, 2], {})
+    assert unresolved == []
+    for first, second in pairwise(chain):
+        assert assignment[first["booking_id"]] != assignment[second["booking_id"]]
+
+    # Each session left in the single room still holds it, so the next one overlaps it too.
+    assignment, unresolved = _repack_rooms(chain, [1], {})
+    assert set(assignment.values()) == {1}
+    assert unresolved == [1, 2, 3, 4, 5, 6, 7]
+
+
+def test_repack_makes_fewest_moves():
+    # Moving booking 3 into room 1 ahead of booking 1 clears room 2 for booking 2; a sweep
+    # that keeps booking 3 and moves booking 2 then has to move booking 1 as well.
+    bookings = [_booking(1, 1, 2, 5), _booking(2, 2, 1, 4), _booking(3, 2, 0, 2)]
+
+    assignment, unresolved = _repack_rooms(bookings, [1, 2], {})
+
+    assert assignment == {1: 1, 2: 2, 3: 1}
+    assert unresolved == []
+
+
+def test_repack_unresolved_booking_holds_its_room():
+    # Room 1 is blocked all morning, so only one of bookings 1 and 3 fits in room 2. Booking 3
+    # stays there unresolved until 12, and booking 2 must not be moved on top of it.
+    bookings = [_booking(1, 2, 9, 11), _booking(3, 2, 10, 12), _booking(2, 1, 11, 13)]
+
+    assignment, unresolved = _repack_rooms(bookings, [1, 2], {1: [(_at(9), _at(13))]})
+
+    assert assignment == {1: 2, 3: 2, 2: 1}
+    assert unresolved == [3, 2]
+
+
+def test_repack_routes_around_fixed_bookings():
+    bookings = [_booking(1, 1, 2, 4), _booking(2, 5, 2, 4)]
+
+    assignment, unresolved = _repack_rooms(bookings, [1, 2], {1: [(_at(3), _at(6))]})
+
+    assert assignment == {1: 2, 2: 5}
+    assert unresolved == [2]
+
+
+@pytest.mark.asyncio
+async def test_repack_day_previews_moves_without_updating():
+    session = FakeSession(
+        [
+            _rooms(1, 2, 3, inactive=(3,)),
+            FakeResult(
+                rows=[
+                    _booking(7, 1, -2, 1, movable=False),
+                    _booking(1, 1, 0, 3),
+                    _booking(2, 3, 4, 6),
+                ]
+            ),
+        ]
+    )
+
+    response = await RoomService(session).repack_day(10, day=date(2026, 6, 6), apply=False)
+
+    assert response.booking_count == 2
+    assert response.applied is False
+    assert [
+        (move.booking_id, move.from_store_room_id, move.to_store_room_id)
+        for move in response.moves
+    ] == [(1, 1, 2), (2, 3, 1)]
+    assert response.unresolved_booking_ids == []
+    assert len(session.execute_calls) == 2
+    assert session.execute_calls[1][1]["room_ids"] == [1, 2, 3]
+    assert "FOR UPDATE" not in str(session.execute_calls[1][0])
+
+
+@pytest.mark.asyncio
+async def test_repack_day_applies_moves_in_one_update():
+    session = FakeSession(
+        [
+            _rooms(1, 2),
+            FakeResult(rows=[_booking(1, 1, 0, 3), _booking(2, 1, 1, 3)]),
+            FakeResult(),
+        ]
+    )
+
+    response = await RoomService(session).repack_day(10, day=date(2026, 6, 6), apply=True)
+
+    assert response.applied is True
+    assert "FOR UPDATE" in str(session.execute_calls[1][0])
+    assert session.execute_calls[2][1] == {"booking_ids": [2], "store_room_ids": [2]}
+
+
+@pytest.mark.asyncio
+async def test_repack_day_skips_update_when_nothing_moves():
+    session = FakeSession([_rooms(1, 2), FakeResult(rows=[_booking(1, 1, 0, 3)])])
+
+    response = await RoomService(session).repack_day(10, day=date(2026, 6, 6), apply=True)
+
+    assert response.moves == []
+    assert len(session.execute_calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_repack_day_store_not_found():
+    service = RoomService(FakeSession([FakeResult()]))
+
+    with pytest.raises(NotFoundError):
+        await service.repack_day(10, day=date(2026, 6, 6), apply=False)
+
+
+@pytest.mark.asyncio
+async def test_repack_day_requires_active_rooms():
+    service = RoomService(FakeSession([_rooms(1, inactive=(1,))]))
+
+    with pytest.raises(ConflictError):
+        await service.repack_day(10, day=date(2026, 6, 6), apply=False)
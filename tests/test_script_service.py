@@ -22,6 +22,9 @@ class FakeResult:
     def mappings(self) -> "FakeResult":
         return self
 
+    def scalars(self) -> "FakeResult":
+        return self
+
     def all(self):
         return self._rows
 
@@ -69,12 +72,16 @@ async def test_list_scripts_returns_items_and_total():
                         "script_id": 1,
                         "name": "Haunted Mansion",
                         "estimated_minutes": 180,
+                        "player_count": 4,
+                        "dm_count": 1,
                         "pic_storage_key": "scripts/1/cover.webp",
                     },
                     {
                         "script_id": 2,
                         "name": "Midnight Train",
                         "estimated_minutes": 240,
+                        "player_count": 4,
+                        "dm_count": 1,
                         "pic_storage_key": None,
                     },
                 ]
@@ -124,6 +131,8 @@ async def test_create_script_returns_pic_storage_key():
                         "script_id": 9,
                         "name": "New Script",
                         "estimated_minutes": 90,
+                        "player_count": 4,
+                        "dm_count": 1,
                         "pic_storage_key": "scripts/9/cover.webp",
                     }
                 ]
@@ -175,6 +184,8 @@ async def test_update_script_updates_pic_storage_key():
                         "script_id": 1,
                         "name": "Haunted Mansion",
                         "estimated_minutes": 180,
+                        "player_count": 4,
+                        "dm_count": 1,
                         "pic_storage_key": "scripts/1/new-cover.webp",
                     }
                 ]
@@ -201,6 +212,8 @@ async def test_update_script_can_clear_pic_storage_key():
                         "script_id": 1,
                         "name": "Haunted Mansion",
                         "estimated_minutes": 180,
+                        "player_count": 4,
+                        "dm_count": 1,
                         "pic_storage_key": None,
                     }
                 ]
@@ -276,6 +289,8 @@ async def test_list_store_scripts_returns_items():
                         "script_id": 1,
                         "name": "Haunted Mansion",
                         "estimated_minutes": 180,
+                        "player_count": 4,
+                        "dm_count": 1,
                         "pic_storage_key": "scripts/1/cover.webp",
                         "is_active": True,
                     }
@@ -293,6 +308,75 @@ async def test_list_store_scripts_returns_items():
     assert response.items[0].pic_storage_key == "scripts/1/cover.webp"
 
 
+@pytest.mark.asyncio
+async def test_list_unplayed_store_scripts_client_missing():
+    session = FakeSession([FakeResult(rows=[7])])
+    service = ScriptService(session=session)
+
+    with pytest.raises(NotFoundError, match="client_id=7"):
+        await service.list_unplayed_store_scripts(store_id=10, client_ids=[7, 3])
+
+    assert len(session.execute_calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_list_unplayed_store_scripts_returns_items():
+    session = FakeSession(
+        [
+            FakeResult(rows=[]),
+            FakeResult(
+                rows=[
+                    {
+                        "script_id": 4,
+                        "name": "Lighthouse",
+                        "estimated_minutes": 240,
+                        "player_count": 4,
+                        "dm_count": 1,
+                        "pic_storage_key": None,
+                        "is_active": True,
+                    }
+                ]
+            ),
+        ]
+    )
+    service = ScriptService(session=session)
+
+    response = await service.list_unplayed_store_scripts(store_id=10, client_ids=[5, 2, 5])
+
+    assert response.client_ids == [2, 5]
+    assert [item.script_id for item in response.items] == [4]
+    assert session.execute_calls[1][1] == {"store_id": 10, "client_ids": [2, 5]}
+
+
+@pytest.mark.asyncio
+async def test_list_store_scripts_filters_players_and_name():
+    session = FakeSession([FakeResult(rows=[]), FakeResult(scalar=0)])
+    service = ScriptService(session=session)
+
+    response = await service.list_store_scripts(
+        store_id=10, limit=20, offset=0, players=6, q=" 100%_ "
+    )
+
+    assert response.total == 0
+    items_query, items_params = session.execute_calls[0]
+    count_query, count_params = session.execute_calls[1]
+    assert "s.player_count = :players" in str(items_query)
+    assert "s.name ILIKE :name_pattern" in str(count_query)
+    assert count_params == {"store_id": 10, "players": 6, "name_pattern": "%100\\%\\_%"}
+    assert items_params == {**count_params, "limit": 20, "offset": 0}
+
+
+@pytest.mark.asyncio
+async def test_list_scripts_without_filters_has_no_where_clause():
+    session = FakeSession([FakeResult(rows=[]), FakeResult(scalar=0)])
+    service = ScriptService(session=session)
+
+    await service.list_scripts(limit=20, offset=0, q="  ")
+
+    assert "WHERE" not in str(session.execute_calls[0][0])
+    assert session.execute_calls[1][1] == {}
+
+
 @pytest.mark.asyncio
 async def test_create_store_script_store_missing():
     session = FakeSession([FakeResult(scalar_or_none=None)])
@@ -345,6 +429,8 @@ async def test_create_store_script_success():
                         "script_id": 3,
                         "name": "New Script",
                         "estimated_minutes": 120,
+                        "player_count": 4,
+                        "dm_count": 1,
                         "pic_storage_key": "scripts/3/cover.webp",
                         "is_active": True,
                     }
@@ -385,6 +471,8 @@ async def test_update_store_script_success():
                         "script_id": 3,
                         "name": "New Script",
                         "estimated_minutes": 120,
+                        "player_count": 4,
+                        "dm_count": 1,
                         "pic_storage_key": "scripts/3/cover.webp",
                         "is_active": False,
                     }
@@ -0,0 +1,414 @@
+from datetime import date, datetime, timezone
+
+import pytest
+
+from app.schemas.booking import (
+    AddBookingClientRequest,
+    ConfirmBookingRequest,
+    CreateCharacterClientMatchRequest,
+    CreateCharacterDmMatchRequest,
+    CreateIncompleteBookingRequest,
+    UpdateCharacterClientMatchRequest,
+    UpdateCharacterDmMatchRequest,
+    UpdateIncompleteBookingRequest,
+)
+from app.schemas.client import CreateClientRequest, UpdateClientRequest
+from app.schemas.dm import CreateDmRequest, CreateDmStoreMembershipRequest, UpdateDmRequest
+from app.schemas.room import CreateRoomRequest, UpdateRoomRequest
+from app.schemas.script import (
+    CreateScriptRequest,
+    CreateStoreScriptRequest,
+    UpdateScriptRequest,
+    UpdateStoreScriptRequest,
+)
+from app.schemas.script_character import CreateScriptCharacterRequest, UpdateScriptCharacterRequest
+from app.schemas.slot import CreateSlotRequest, UpdateSlotRequest
+from app.schemas.store import CreateStoreRequest, UpdateStoreRequest
+from app.services.booking_service import BookingService
+from app.services.character_client_match_service import CharacterClientMatchService
+from app.services.character_dm_match_service import CharacterDmMatchService
+from app.services.client_service import ClientService
+from app.services.dm_service import DmService
+from app.services.room_service import RoomService
+from app.services.script_character_service import ScriptCharacterService
+from app.services.script_service import ScriptService
+from app.services.slot_service import SlotService
+from app.services.store_service import StoreService
+
+START_AT = datetime(2026, 4, 4, 23, 0, tzinfo=timezone.utc)
+INCOMPLETE_BOOKING_ROW = (
+    "conflict_booking_ids FROM booking WHERE store_id = :store_id AND booking_id = :booking_id",
+    {
+        "rows": [
+            {
+                "booking_id": 1,
+                "store_id": 10,
+                "script_id": 5,
+                "booking_status_id": 1,
+                "target_month": date(2026, 4, 1),
+                "start_at": None,
+                "end_at": None,
+                "duration_override_minutes": None,
+                "conflict_booking_ids": [],
+            }
+        ]
+    },
+)
+SCHEDULED_STATUS = ("SELECT booking_status_id FROM booking", {"scalar_or_none": 2})
+
+# (service class, method, kwargs, rules, max statements)
+LIST_CASES = {
+    "BookingService.list_bookings": (
+        BookingService,
+        "list_bookings",
+        {"store_id": 10, "booking_status_id": None, "target_month": None, "has_conflict": None},
+        5,
+    ),
+    "ClientService.list_clients": (ClientService, "list_clients", {}, 2),
+    "DmService.list_dms": (DmService, "list_dms", {}, 2),
+    "DmService.list_dm_store_memberships": (
+        DmService,
+        "list_dm_store_memberships",
+        {"dm_id": 1},
+        3,
+    ),
+    "RoomService.list_rooms": (RoomService, "list_rooms", {"store_id": 10}, 3),
+    "ScriptCharacterService.list_script_characters": (
+        ScriptCharacterService,
+        "list_script_characters",
+        {"script_id": 5},
+        3,
+    ),
+    "ScriptService.list_scripts": (ScriptService, "list_scripts", {}, 2),
+    "ScriptService.list_store_scripts": (ScriptService, "list_store_scripts", {"store_id": 10}, 2),
+    "SlotService.list_slots": (SlotService, "list_slots", {"store_id": 10}, 3),
+    "StoreService.list_stores": (StoreService, "list_stores", {"allowed_store_ids": {10, 11}}, 2),
+}
+
+METHOD_CASES = {
+    "BookingService.create_incomplete_booking": (
+        BookingService,
+        "create_incomplete_booking",
+        {
+            "store_id": 10,
+            "payload": CreateIncompleteBookingRequest(
+                target_month=date(2026, 4, 1), client_ids=[1], script_id=5
+            ),
+        },
+        [],
+        7,
+    ),
+    "BookingService.get_booking": (
+        BookingService,
+        "get_booking",
+        {"store_id": 10, "booking_id": 1},
+        [],
+        3,
+    ),
+    "BookingService.update_incomplete_booking": (
+        BookingService,
+        "update_incomplete_booking",
+        {
+            "store_id": 10,
+            "booking_id": 1,
+            "payload": UpdateIncompleteBookingRequest(script_id=5),
+        },
+        [],
+        4,
+    ),
+    "BookingService.confirm_booking": (
+        BookingService,
+        "confirm_booking",
+        {
+            "store_id": 10,
+            "booking_id": 1,
+            "payload": ConfirmBookingRequest(start_at=START_AT, preferred_room_id=1),
+        },
+        [INCOMPLETE_BOOKING_ROW],
+        11,
+    ),
+    "BookingService.cancel_booking": (
+        BookingService,
+        "cancel_booking",
+        {"store_id": 10, "booking_id": 1},
+        [],
+        3,
+    ),
+    "BookingService.complete_booking": (
+        BookingService,
+        "complete_booking",
+        {"store_id": 10, "booking_id": 1},
+        [SCHEDULED_STATUS],
+        4,
+    ),
+    "BookingService.add_booking_client": (
+        BookingService,
+        "add_booking_client",
+        {"store_id": 10, "booking_id": 1, "payload": AddBookingClientRequest(client_id=3)},
+        [],
+        6,
+    ),
+    "BookingService.remove_booking_client": (
+        BookingService,
+        "remove_booking_client",
+        {"store_id": 10, "booking_id": 1, "client_id": 2},
+        [],
+        6,
+    ),
+    "CharacterClientMatchService.create_match": (
+        CharacterClientMatchService,
+        "create_match",
+        {
+            "store_id": 10,
+            "booking_id": 1,
+            "payload": CreateCharacterClientMatchRequest(character_id=1, client_id=1),
+        },
+        [],
+        2,
+    ),
+    "CharacterClientMatchService.update_match": (
+        CharacterClientMatchService,
+        "update_match",
+        {
+            "store_id": 10,
+            "booking_id": 1,
+            "match_id": 1,
+            "payload": UpdateCharacterClientMatchRequest(client_id=2),
+        },
+        [],
+        2,
+    ),
+    "CharacterClientMatchService.delete_match": (
+        CharacterClientMatchService,
+        "delete_match",
+        {"store_id": 10, "booking_id": 1, "match_id": 1},
+        [],
+        2,
+    ),
+    "CharacterDmMatchService.create_match": (
+        CharacterDmMatchService,
+        "create_match",
+        {
+            "store_id": 10,
+            "booking_id": 1,
+            "payload": CreateCharacterDmMatchRequest(dm_id=1, character_id=2),
+        },
+        [],
+        2,
+    ),
+    "CharacterDmMatchService.update_match": (
+        CharacterDmMatchService,
+        "update_match",
+        {
+            "store_id": 10,
+            "booking_id": 1,
+            "match_id": 1,
+            "payload": UpdateCharacterDmMatchRequest(dm_id=2),
+        },
+        [],
+        2,
+    ),
+    "CharacterDmMatchService.delete_match": (
+        CharacterDmMatchService,
+        "delete_match",
+        {"store_id": 10, "booking_id": 1, "match_id": 1},
+        [],
+        2,
+    ),
+    "ClientService.get_client": (ClientService, "get_client", {"client_id": 1}, [], 1),
+    "ClientService.create_client": (
+        ClientService,
+        "create_client",
+        {"payload": CreateClientRequest(display_name="Ada")},
+        [],
+        1,
+    ),
+    "ClientService.update_client": (
+        ClientService,
+        "update_client",
+        {"client_id": 1, "payload": UpdateClientRequest(phone="416-555-0101")},
+        [],
+        1,
+    ),
+    "ClientService.delete_client": (ClientService, "delete_client", {"client_id": 1}, [], 4),
+    "DmService.get_dm": (DmService, "get_dm", {"dm_id": 1}, [], 1),
+    "DmService.create_dm": (
+        DmService,
+        "create_dm",
+        {"payload": CreateDmRequest(display_name="Mika")},
+        [],
+        1,
+    ),
+    "DmService.update_dm": (
+        DmService,
+        "update_dm",
+        {"dm_id": 1, "payload": UpdateDmRequest(is_active=False)},
+        [],
+        1,
+    ),
+    "DmService.delete_dm": (DmService, "delete_dm", {"dm_id": 1}, [], 3),
+    "DmService.create_dm_store_membership": (
+        DmService,
+        "create_dm_store_membership",
+        {"dm_id": 1, "payload": CreateDmStoreMembershipRequest(store_id=10)},
+        [
+            ("SELECT name FROM store", {"scalar_or_none": "Downtown"}),
+            ("FROM dm_store_membership WHERE", {"scalar_or_none": None}),
+        ],
+        4,
+    ),
+    "DmService.delete_dm_store_membership": (
+        DmService,
+        "delete_dm_store_membership",
+        {"dm_id": 1, "store_id": 10},
+        [],
+        2,
+    ),
+    "RoomService.create_room": (
+        RoomService,
+        "create_room",
+        {"store_id": 10, "payload": CreateRoomRequest(name="Room A")},
+        [],
+        2,
+    ),
+    "RoomService.update_room": (
+        RoomService,
+        "update_room",
+        {"store_id": 10, "store_room_id": 1, "payload": UpdateRoomRequest(is_active=False)},
+        [],
+        1,
+    ),
+    "RoomService.delete_room": (
+        RoomService,
+        "delete_room",
+        {"store_id": 10, "store_room_id": 1},
+        [],
+        2,
+    ),
+    "ScriptCharacterService.create_script_character": (
+        ScriptCharacterService,
+        "create_script_character",
+        {"script_id": 5, "payload": CreateScriptCharacterRequest(character_name="Detective")},
+        [],
+        2,
+    ),
+    "ScriptCharacterService.get_script_character": (
+        ScriptCharacterService,
+        "get_script_character",
+        {"script_id": 5, "character_id": 1},
+        [],
+        1,
+    ),
+    "ScriptCharacterService.update_script_character": (
+        ScriptCharacterService,
+        "update_script_character",
+        {
+            "script_id": 5,
+            "character_id": 1,
+            "payload": UpdateScriptCharacterRequest(is_active=False),
+        },
+        [],
+        1,
+    ),
+    "ScriptCharacterService.delete_script_character": (
+        ScriptCharacterService,
+        "delete_script_character",
+        {"script_id": 5, "character_id": 1},
+        [],
+        1,
+    ),
+    "ScriptService.get_script": (ScriptService, "get_script", {"script_id": 5}, [], 1),
+    "ScriptService.create_script": (
+        ScriptService,
+        "create_script",
+        {"payload": CreateScriptRequest(name="Night Train", estimated_minutes=180)},
+        [],
+        1,
+    ),
+    "ScriptService.update_script": (
+        ScriptService,
+        "update_script",
+        {"script_id": 5, "payload": UpdateScriptRequest(estimated_minutes=200)},
+        [],
+        1,
+    ),
+    "ScriptService.delete_script": (ScriptService, "delete_script", {"script_id": 5}, [], 5),
+    "ScriptService.create_store_script": (
+        ScriptService,
+        "create_store_script",
+        {"store_id": 10, "payload": CreateStoreScriptRequest(script_id=5)},
+        [("SELECT 1 FROM store_script", {"scalar_or_none": None})],
+        5,
+    ),
+    "ScriptService.update_store_script": (
+        ScriptService,
+        "update_store_script",
+        {"store_id": 10, "script_id": 5, "payload": UpdateStoreScriptRequest(is_active=False)},
+        [],
+        2,
+    ),
+    "ScriptService.delete_store_script": (
+        ScriptService,
+        "delete_store_script",
+        {"store_id": 10, "script_id": 5},
+        [],
+        2,
+    ),
+    "SlotService.create_slot": (
+        SlotService,
+        "create_slot",
+        {"store_id": 10, "payload": CreateSlotRequest(start_at=START_AT)},
+        [],
+        2,
+    ),
+    "SlotService.update_slot": (
+        SlotService,
+        "update_slot",
+        {"store_id": 10, "slot_id": 1, "payload": UpdateSlotRequest(start_at=START_AT)},
+        [],
+        1,
+    ),
+    "SlotService.delete_slot": (SlotService, "delete_slot", {"store_id": 10, "slot_id": 1}, [], 2),
+    "StoreService.get_store": (StoreService, "get_store", {"store_id": 10}, [], 1),
+    "StoreService.create_store": (
+        StoreService,
+        "create_store",
+        {"payload": CreateStoreRequest(name="Downtown")},
+        [],
+        1,
+    ),
+    "StoreService.update_store": (
+        StoreService,
+        "update_store",
+        {"store_id": 10, "payload": UpdateStoreRequest(name="Uptown")},
+        [],
+        1,
+    ),
+    "StoreService.delete_store": (StoreService, "delete_store", {"store_id": 10}, [], 6),
+}
+
+
+@pytest.mark.parametrize("case", sorted(LIST_CASES))
+async def test_list_statement_count_is_independent_of_page_size(recording_session, case):
+    service_class, method_name, kwargs, max_statements = LIST_CASES[case]
+    counts = {}
+    for limit in (1, 100):
+        session = recording_session()
+        response = await getattr(service_class(session=session), method_name)(
+            **kwargs, limit=limit, offset=0
+        )
+        assert len(response.items) == limit
+        counts[limit] = session.statement_count
+
+    assert counts[1] == counts[100], f"{case} grows with page size: {counts}"
+    assert counts[100] <= max_statements
+
+
+@pytest.mark.parametrize("case", sorted(METHOD_CASES))
+async def test_method_statement_count(recording_session, case):
+    service_class, method_name, kwargs, rules, max_statements = METHOD_CASES[case]
+    session = recording_session(rules=rules)
+
+    await getattr(service_class(session=session), method_name)(**kwargs)
+
+    assert session.statement_count <= max_statements